@@ -113,15 +113,17 @@ def get_mt5_data(symbol: str, timeframes: list, data_fetcher):
     """Fetch MT5 data for multiple timeframes"""
     data_dict = {}
     
+    with st.spinner(f"Fetching {symbol} {', '.join(timeframes)} data..."):
+        log_to_console(f"Fetching {symbol} {timeframes}...", "DEBUG")
+        fetched = data_fetcher.get_multi_timeframe_data(symbol, timeframes, count=1000)
+    
     for tf in timeframes:
-        with st.spinner(f"Fetching {symbol} {tf} data..."):
-            log_to_console(f"Fetching {symbol} {tf}...", "DEBUG")
-            df = data_fetcher.get_ohlcv(symbol, tf, count=1000)
-            if df is not None and not df.empty:
-                data_dict[tf] = df
-                log_to_console(f"✓ Fetched {len(df)} bars for {tf}", "DEBUG")
-            else:
-                log_to_console(f"✗ Failed to fetch {tf}", "WARNING")
+        df = fetched.get(tf)
+        if df is not None and not df.empty:
+            data_dict[tf] = df
+            log_to_console(f"✓ Fetched {len(df)} bars for {tf}", "DEBUG")
+        else:
+            log_to_console(f"✗ Failed to fetch {tf}", "WARNING")
     
     return data_dict
 
@@ -0,0 +1,20 @@
+"""
+Benchmarks
+Timing and peak-memory benchmarks for the analysis pipeline on synthetic OHLCV
+
+Usage:
+    python -m benchmarks run --sizes 1k,10k --output results.json
+    python -m benchmarks compare baseline.json results.json
+"""
+from benchmarks.data import generate_ohlcv, generate_timeframes, parse_size
+from benchmarks.runner import BenchmarkRunner, compare_results, load_results, save_results
+
+__all__ = [
+    'generate_ohlcv',
+    'generate_timeframes',
+    'parse_size',
+    'BenchmarkRunner',
+    'compare_results',
+    'load_results',
+    'save_results',
+]
@@ -0,0 +1,239 @@
+"""
+Benchmark command line
+    
+    python -m benchmarks run [--sizes 1k,10k,100k,1M] [--filter SMC] [--output FILE]
+    python -m benchmarks compare BASELINE CURRENT [--threshold 0.1]
+    python -m benchmarks memory [--sizes 10k,100k]
+    python -m benchmarks conversion [--bars 100k] [--ticks 10M]
+    python -m benchmarks fetch [--bars 1000] [--latency-ms 20]
+    python -m benchmarks list
+"""
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Make `src` and `config` importable when run from anywhere
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.data import DEFAULT_SIZES, parse_size  # noqa: E402
+from benchmarks.runner import BenchmarkRunner, compare_results, load_results, save_results  # noqa: E402
+
+RESULTS_DIR = ROOT / 'reports' / 'benchmarks'
+
+
+def _quiet_logging(verbose: bool):
+    """Keep per-call analysis logs out of the console and log files"""
+    from src.utils.logger import setup_logging
+    if verbose:
+        setup_logging()
+    else:
+        setup_logging(level='ERROR', console_output=False, file_output=False, json_output=False)
+
+
+def _format_seconds(value) -> str:
+    if value is None:
+        return '-'
+    if value < 1e-3:
+        return f"{value * 1e6:.0f}us"
+    if value < 1:
+        return f"{value * 1e3:.1f}ms"
+    return f"{value:.2f}s"
+
+
+def _format_bytes(value) -> str:
+    if value is None:
+        return '-'
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if value < 1024 or unit == 'GB':
+            return f"{value:.0f}{unit}" if unit == 'B' else f"{value:.1f}{unit}"
+        value /= 1024
+
+
+def _print_result(result):
+    line = f"{result['bars']:>9,}  {result['target']:<55}"
+    if result['status'] == 'ok':
+        line += (f" {_format_seconds(result['median_s']):>9}  (min {_format_seconds(result['min_s'])},"
+                 f" {result['runs']} runs)  peak {_format_bytes(result.get('peak_memory_bytes'))}")
+    else:
+        line += f" {result['status'].upper()}: {result.get('error') or result.get('reason', '')}"
+    print(line, flush=True)
+
+
+def cmd_run(args) -> int:
+    _quiet_logging(args.verbose)
+    from benchmarks.suite import default_targets
+    
+    sizes = [parse_size(size) for size in args.sizes.split(',')] if args.sizes else DEFAULT_SIZES
+    targets = default_targets(args.filter)
+    if not targets:
+        print("No benchmark targets match the filter")
+        return 1
+    
+    runner = BenchmarkRunner(
+        targets,
+        repeat=args.repeat,
+        max_seconds=args.max_seconds,
+        measure_memory=not args.no_memory,
+        seed=args.seed,
+        progress=_print_result
+    )
+    results = runner.run(sizes)
+    
+    output = Path(args.output) if args.output else \
+        RESULTS_DIR / f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    save_results(results, output)
+    print(f"\nResults written to {output}")
+    
+    if args.compare:
+        return _report_comparison(load_results(args.compare), results, args)
+    return 0
+
+
+def cmd_compare(args) -> int:
+    return _report_comparison(load_results(args.baseline), load_results(args.current), args)
+
+
+def _report_comparison(baseline, current, args) -> int:
+    rows = compare_results(
+        baseline, current,
+        threshold=args.threshold,
+        memory_threshold=args.memory_threshold,
+        min_delta_s=args.min_delta
+    )
+    
+    for row in rows:
+        # Targets run in only one of the files are summarized, not listed
+        if row['status'] in ('unchanged', 'new', 'missing') and not args.all:
+            continue
+        timing = ''
+        if 'time_ratio' in row:
+            timing = (f"{_format_seconds(row['base_s']):>9} -> {_format_seconds(row['current_s']):>9}"
+                      f"  x{row['time_ratio']:.2f}")
+        reasons = f"  [{', '.join(row['reasons'])}]" if row['reasons'] else ''
+        print(f"{row['status'].upper():<15}{row['bars']:>9,}  {row['target']:<55}{timing}{reasons}")
+    
+    regressions = [row for row in rows if row['status'] == 'regression']
+    counts = {status: sum(row['status'] == status for row in rows)
+              for status in ('improvement', 'unchanged', 'new', 'missing', 'not_comparable')}
+    print(f"\n{len(regressions)} regression(s), {counts['improvement']} improvement(s), "
+          f"{counts['unchanged']} unchanged, {counts['not_comparable']} not comparable, "
+          f"{counts['new']} new, {counts['missing']} missing")
+    return 1 if regressions else 0
+
+
+def cmd_memory(args) -> int:
+    _quiet_logging(args.verbose)
+    from benchmarks.memory import pipeline_memory
+    
+    sizes = [parse_size(size) for size in args.sizes.split(',')]
+    print(f"{'bars':>9}  {'stage':<16}{'float64':>10}{'compact':>10}{'ratio':>8}  max rel. error")
+    for bars in sizes:
+        for row in pipeline_memory(bars, seed=args.seed):
+            print(f"{row['bars']:>9,}  {row['stage']:<16}{_format_bytes(row['float64_bytes']):>10}"
+                  f"{_format_bytes(row['compact_bytes']):>10}{row['ratio']:>8.2f}  {row['max_relative_error']:.2e}",
+                  flush=True)
+    return 0
+
+
+def cmd_conversion(args) -> int:
+    from benchmarks.conversion import conversion_timings
+    
+    rows = conversion_timings(parse_size(args.bars), parse_size(args.ticks), seed=args.seed, repeat=args.repeat)
+    print(f"{'kind':<7}{'rows':>12}{'legacy':>10}{'zero-copy':>11}{'speedup':>9}  shares memory")
+    for row in rows:
+        print(f"{row['kind']:<7}{row['rows']:>12,}{_format_seconds(row['legacy_s']):>10}"
+              f"{_format_seconds(row['zero_copy_s']):>11}{row['speedup']:>8.0f}x  {row['shares_memory']}")
+    return 0
+
+
+def cmd_fetch(args) -> int:
+    from benchmarks.fetch import fetch_timings
+    
+    rows = fetch_timings(count=parse_size(args.bars), latency=args.latency_ms / 1000, seed=args.seed,
+                         workers=args.workers)
+    print(f"{'mode':<19}{'requests':>9}{'time':>10}{'bars/sec':>12}{'MT5 calls':>11}")
+    for row in rows:
+        print(f"{row['mode']:<19}{row['requests']:>9}{_format_seconds(row['seconds']):>10}"
+              f"{row['bars_per_sec']:>12,.0f}{row['api_calls']:>11}")
+    return 0
+
+
+def cmd_list(args) -> int:
+    _quiet_logging(False)
+    from benchmarks.suite import default_targets
+    for target in default_targets(args.filter):
+        print(target.name)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    def add_compare_options(sub):
+        sub.add_argument('--threshold', type=float, default=0.10,
+                         help='Allowed relative slowdown of the median time (default 0.10)')
+        sub.add_argument('--memory-threshold', type=float, default=0.20,
+                         help='Allowed relative growth of peak memory (default 0.20)')
+        sub.add_argument('--min-delta', type=float, default=0.001,
+                         help='Ignore slowdowns below this many seconds (default 0.001)')
+        sub.add_argument('--all', action='store_true', help='Also list unchanged results')
+    
+    run = commands.add_parser('run', help='Run benchmarks and write a JSON results file')
+    run.add_argument('--sizes', help='Comma separated bar counts, e.g. 1k,10k,100k,1M')
+    run.add_argument('--filter', nargs='*', help='Only run targets whose name contains one of these')
+    run.add_argument('--repeat', type=int, default=3, help='Timed runs per target and size')
+    run.add_argument('--max-seconds', type=float, default=60.0,
+                     help='Time budget per target and size; slower targets skip larger sizes')
+    run.add_argument('--no-memory', action='store_true', help='Skip peak memory measurement')
+    run.add_argument('--seed', type=int, default=42, help='Synthetic data seed')
+    run.add_argument('--output', help='Results file (default reports/benchmarks/benchmark_<time>.json)')
+    run.add_argument('--compare', metavar='BASELINE', help='Compare against a baseline results file')
+    run.add_argument('--verbose', action='store_true', help='Keep analysis logging enabled')
+    add_compare_options(run)
+    run.set_defaults(func=cmd_run)
+    
+    compare = commands.add_parser('compare', help='Flag regressions between two results files')
+    compare.add_argument('baseline')
+    compare.add_argument('current')
+    add_compare_options(compare)
+    compare.set_defaults(func=cmd_compare)
+    
+    memory = commands.add_parser('memory', help='Compare pipeline memory in float64 and compact mode')
+    memory.add_argument('--sizes', default='10k,100k', help='Comma separated bar counts (default 10k,100k)')
+    memory.add_argument('--seed', type=int, default=42, help='Synthetic data seed')
+    memory.add_argument('--verbose', action='store_true', help='Keep analysis logging enabled')
+    memory.set_defaults(func=cmd_memory)
+    
+    conversion = commands.add_parser('conversion', help='Time MT5 rate and tick array conversion')
+    conversion.add_argument('--bars', default='100k', help='Bars in the rates array (default 100k)')
+    conversion.add_argument('--ticks', default='10M', help='Ticks in the tick array (default 10M)')
+    conversion.add_argument('--repeat', type=int, default=3, help='Timed runs per conversion')
+    conversion.add_argument('--seed', type=int, default=42, help='Synthetic data seed')
+    conversion.set_defaults(func=cmd_conversion)
+    
+    fetch = commands.add_parser('fetch', help='Time OHLCV fetching against the offline MT5 stand-in')
+    fetch.add_argument('--bars', default='1000', help='Bars per request (default 1000)')
+    fetch.add_argument('--latency-ms', type=float, default=20.0, help='Simulated latency per copy_rates call')
+    fetch.add_argument('--workers', type=int, help='Scheduler processing threads')
+    fetch.add_argument('--seed', type=int, default=42, help='Market data seed')
+    fetch.set_defaults(func=cmd_fetch)
+    
+    listing = commands.add_parser('list', help='List benchmark targets')
+    listing.add_argument('--filter', nargs='*')
+    listing.set_defaults(func=cmd_list)
+    
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
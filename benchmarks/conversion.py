@@ -0,0 +1,112 @@
+"""
+MT5 Conversion Benchmark
+Record array to DataFrame conversion: the parsing chain vs field views
+"""
+import time
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from src.mt5.rates import RATE_DTYPE, TICK_DTYPE, rates_to_frame, ticks_to_frame
+
+_START = 946_857_600  # 2000-01-03
+
+
+def synthetic_rates(n_bars: int, seed: int = 42) -> np.ndarray:
+    """M15 rates array in the copy_rates_* layout"""
+    rng = np.random.default_rng(seed)
+    close = (1.1 + np.cumsum(rng.normal(0, 0.0005, n_bars))).round(5)
+    rates = np.zeros(n_bars, dtype=RATE_DTYPE)
+    rates['time'] = _START + 900 * np.arange(n_bars)
+    rates['open'] = np.r_[1.1, close[:-1]]
+    rates['close'] = close
+    rates['high'] = np.maximum(rates['open'], close) + rng.uniform(0, 0.0005, n_bars).round(5)
+    rates['low'] = np.minimum(rates['open'], close) - rng.uniform(0, 0.0005, n_bars).round(5)
+    rates['tick_volume'] = rng.integers(100, 5000, n_bars)
+    rates['spread'] = rng.integers(5, 20, n_bars)
+    return rates
+
+
+def synthetic_ticks(n_ticks: int, seed: int = 42) -> np.ndarray:
+    """Tick array in the copy_ticks_* layout, about four ticks a second"""
+    rng = np.random.default_rng(seed)
+    time_msc = _START * 1000 + np.cumsum(rng.integers(1, 500, n_ticks))
+    ticks = np.zeros(n_ticks, dtype=TICK_DTYPE)
+    ticks['time_msc'] = time_msc
+    ticks['time'] = time_msc // 1000
+    ticks['bid'] = (1.1 + np.cumsum(rng.normal(0, 0.00002, n_ticks))).round(5)
+    ticks['ask'] = ticks['bid'] + 0.0001
+    ticks['flags'] = 6
+    return ticks
+
+
+def legacy_rates_to_frame(rates: np.ndarray) -> pd.DataFrame:
+    """The conversion get_ohlcv used before rates_to_frame"""
+    df = pd.DataFrame(rates)
+    df['time'] = pd.to_datetime(df['time'], unit='s')
+    df.set_index('time', inplace=True)
+    df.rename(columns={
+        'open': 'Open',
+        'high': 'High',
+        'low': 'Low',
+        'close': 'Close',
+        'tick_volume': 'Volume',
+        'spread': 'Spread',
+        'real_volume': 'RealVolume'
+    }, inplace=True)
+    return df[['Open', 'High', 'Low', 'Close', 'Volume', 'Spread', 'RealVolume']]
+
+
+def legacy_ticks_to_frame(ticks: np.ndarray) -> pd.DataFrame:
+    """The conversion get_ticks used before ticks_to_frame"""
+    df = pd.DataFrame(ticks)
+    df['time'] = pd.to_datetime(df['time'], unit='s')
+    df.set_index('time', inplace=True)
+    return df
+
+
+def _best_time(function: Callable, argument: Any, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(argument)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def _row(kind: str, records: np.ndarray, legacy: Callable, current: Callable, repeat: int) -> Dict[str, Any]:
+    legacy_s = _best_time(legacy, records, repeat)
+    current_s = _best_time(current, records, repeat)
+    # Same values and index either way
+    pd.testing.assert_frame_equal(current(records), legacy(records), check_index_type=False)
+    frame = current(records)
+    return {
+        'kind': kind,
+        'rows': len(records),
+        'legacy_s': legacy_s,
+        'zero_copy_s': current_s,
+        'speedup': legacy_s / current_s if current_s else None,
+        'shares_memory': all(np.shares_memory(frame[column].to_numpy(), records) for column in frame.columns),
+    }
+
+
+def conversion_timings(n_bars: int = 100_000, n_ticks: int = 10_000_000,
+                       seed: int = 42, repeat: int = 3) -> List[Dict[str, Any]]:
+    """
+    Time both conversions on synthetic MT5 arrays
+    
+    Args:
+        n_bars: Bars in the rates array
+        n_ticks: Ticks in the tick array
+        seed: Synthetic data seed
+        repeat: Timed runs per conversion (the best is reported)
+    
+    Returns:
+        One row per kind ('rates', 'ticks') with 'legacy_s', 'zero_copy_s',
+        'speedup' and 'shares_memory' (whether no column was copied)
+    """
+    return [
+        _row('rates', synthetic_rates(n_bars, seed), legacy_rates_to_frame, rates_to_frame, repeat),
+        _row('ticks', synthetic_ticks(n_ticks, seed), legacy_ticks_to_frame, ticks_to_frame, repeat),
+    ]
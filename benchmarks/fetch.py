@@ -0,0 +1,81 @@
+"""
+Fetch Benchmark
+End-to-end OHLCV fetching against the offline MetaTrader5 stand-in
+"""
+import contextlib
+import io
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+DEFAULT_SYMBOLS = ['EURUSD', 'GBPUSD', 'USDJPY', 'XAUUSD']
+DEFAULT_TIMEFRAMES = ['M15', 'H1', 'H4']
+
+
+def _row(mode: str, requests: int, seconds: float, bars: int, api_calls: int) -> Dict[str, Any]:
+    return {
+        'mode': mode,
+        'requests': requests,
+        'seconds': seconds,
+        'bars': bars,
+        'bars_per_sec': bars / seconds if seconds else None,
+        'api_calls': api_calls,
+    }
+
+
+def fetch_timings(
+    symbols: Sequence[str] = DEFAULT_SYMBOLS,
+    timeframes: Sequence[str] = DEFAULT_TIMEFRAMES,
+    count: int = 1000,
+    latency: float = 0.02,
+    seed: int = 42,
+    suffix: str = 'm',
+    workers: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Time get_ohlcv for every (symbol, timeframe), sequentially and scheduled
+    
+    A FakeMetaTrader5 with ``latency`` seconds per copy_rates call is
+    installed as the MT5 backend for the rest of the process.
+    
+    Args:
+        symbols: Requested symbols (served as broker names with ``suffix``)
+        timeframes: Timeframe strings
+        count: Bars per request
+        latency: Simulated seconds per copy_rates call
+        seed: Market data seed
+        suffix: Broker symbol suffix
+        workers: FetchScheduler processing threads
+    
+    Returns:
+        Rows for 'sequential', 'scheduler' and 'scheduler_refresh' (the
+        scheduler again with a warm bar store) with 'seconds',
+        'bars_per_sec' and 'api_calls' (MT5 calls made)
+    """
+    from src.mt5.bar_store import BarStore
+    from src.mt5.data_fetcher import MT5DataFetcher
+    from src.mt5.fake_mt5 import FakeMetaTrader5, install
+    from src.mt5.fetch_scheduler import FetchScheduler
+    
+    fake = install(FakeMetaTrader5(seed=seed, suffix=suffix, latency={'copy_rates_from_pos': latency}))
+    fake.initialize()
+    requests = len(symbols) * len(timeframes)
+    rows = []
+    
+    # The fetcher's per-call debug output would dominate the timings
+    with contextlib.redirect_stdout(io.StringIO()):
+        fetcher = MT5DataFetcher(bar_store=BarStore(persist=False))
+        fake.calls.clear()
+        started = time.perf_counter()
+        frames = [fetcher.get_ohlcv(symbol, tf, count) for symbol in symbols for tf in timeframes]
+        rows.append(_row('sequential', requests, time.perf_counter() - started,
+                         sum(len(df) for df in frames if df is not None), sum(fake.calls.values())))
+        
+        with FetchScheduler(MT5DataFetcher(bar_store=BarStore(persist=False)), workers=workers) as scheduler:
+            for mode in ('scheduler', 'scheduler_refresh'):
+                fake.calls.clear()
+                started = time.perf_counter()
+                data = scheduler.fetch_many(symbols, timeframes, count)
+                rows.append(_row(mode, requests, time.perf_counter() - started,
+                                 sum(len(df) for frames in data.values() for df in frames.values()),
+                                 sum(fake.calls.values())))
+    return rows
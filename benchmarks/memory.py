@@ -0,0 +1,79 @@
+"""
+Compact Mode Memory Benchmark
+Bytes held at each pipeline stage in float64 and in compact mode
+"""
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.data import generate_ohlcv
+
+# Synthetic prices are rounded to 5 digits, like a 5-digit FX quote
+BENCHMARK_DIGITS = 5
+
+
+def _max_relative_error(compact: Any, full: Any) -> float:
+    """Largest relative difference between matching float results"""
+    if isinstance(full, dict):
+        return max((_max_relative_error(compact[key], value) for key, value in full.items()
+                    if key in compact), default=0.0)
+    if isinstance(full, (pd.Series, pd.DataFrame)):
+        full, compact = full.to_numpy(dtype=np.float64), compact.to_numpy(dtype=np.float64)
+    elif not isinstance(full, np.ndarray) or full.dtype.kind != 'f':
+        return 0.0
+    valid = np.isfinite(full) & (full != 0)
+    if not valid.any():
+        return 0.0
+    return float(np.max(np.abs(compact[valid] - full[valid]) / np.abs(full[valid])))
+
+
+def _row(n_bars: int, stage: str, full_bytes: int, compact_bytes: int, error: float) -> Dict[str, Any]:
+    return {
+        'bars': n_bars,
+        'stage': stage,
+        'float64_bytes': full_bytes,
+        'compact_bytes': compact_bytes,
+        'ratio': compact_bytes / full_bytes if full_bytes else None,
+        'max_relative_error': error,
+    }
+
+
+def pipeline_memory(n_bars: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Memory of the OHLCV frame, cached indicator results and features
+    
+    Every stage runs once in float64 and once in compact mode on the same
+    synthetic bars.
+    
+    Args:
+        n_bars: Number of bars
+        seed: Synthetic data seed
+    
+    Returns:
+        One row per stage with 'float64_bytes', 'compact_bytes', 'ratio'
+        and 'max_relative_error' (compact vs float64 values)
+    """
+    from src.indicators.calculator import IndicatorCalculator
+    from src.ml.feature_engineering import FeatureEngineer
+    from src.utils.compact import compact_ohlcv, expand_ohlcv, memory_usage
+    
+    df = generate_ohlcv(n_bars, seed=seed)
+    compact_df = compact_ohlcv(df, digits=BENCHMARK_DIGITS)
+    rows = [_row(n_bars, 'ohlcv', memory_usage(df), memory_usage(compact_df),
+                 _max_relative_error(expand_ohlcv(compact_df), df))]
+    
+    # Results as held by the IndicatorCalculator cache
+    calculators = [IndicatorCalculator(compact=compact) for compact in (False, True)]
+    results = [calculator.calculate_for_timeframe(frame, 'BENCH', 'M15')
+               for calculator, frame in zip(calculators, (df, compact_df))]
+    cached = [calculator.get_cache_stats()['cached_bytes'] for calculator in calculators]
+    rows.append(_row(n_bars, 'indicator_cache', *cached, _max_relative_error(results[1], results[0])))
+    
+    engineer = FeatureEngineer()
+    full_features = engineer.create_features(df)
+    engineer.tech_indicators.compact = True
+    compact_features = engineer.create_features(compact_df)
+    rows.append(_row(n_bars, 'features', memory_usage(full_features), memory_usage(compact_features),
+                     _max_relative_error(compact_features, full_features)))
+    return rows
@@ -0,0 +1,313 @@
+"""
+Benchmark Runner
+Times benchmark targets, records peak memory and compares result files
+"""
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.data import generate_ohlcv, generate_timeframes
+
+RESULTS_VERSION = 1
+
+
+@dataclass
+class BenchmarkTarget:
+    """
+    A benchmarked callable
+    
+    ``prepare`` receives the benchmark inputs and returns a zero-argument
+    callable; object construction happens in ``prepare`` so it is not timed,
+    and a fresh object is built for every run so instance caches never
+    carry over between runs.
+    """
+    name: str
+    prepare: Callable[['BenchmarkInputs'], Callable[[], Any]]
+    group: str = 'default'
+
+
+@dataclass
+class BenchmarkInputs:
+    """Synthetic inputs for one benchmark size (built lazily)"""
+    n_bars: int
+    seed: int = 42
+    _ohlcv: Optional[pd.DataFrame] = field(default=None, repr=False)
+    _timeframes: Optional[Dict[str, pd.DataFrame]] = field(default=None, repr=False)
+    
+    @property
+    def ohlcv(self) -> pd.DataFrame:
+        if self._ohlcv is None:
+            self._ohlcv = generate_ohlcv(self.n_bars, seed=self.seed)
+        return self._ohlcv
+    
+    @property
+    def timeframes(self) -> Dict[str, pd.DataFrame]:
+        if self._timeframes is None:
+            self._timeframes = generate_timeframes(self.n_bars, seed=self.seed)
+        return self._timeframes
+
+
+class BenchmarkRunner:
+    """
+    Run benchmark targets across input sizes
+    
+    Each (target, size) pair gets one untimed warm-up run (which also
+    absorbs JIT compilation and lazy imports), up to ``repeat`` timed runs
+    and one run under tracemalloc for peak memory. A target whose warm-up
+    exceeds ``max_seconds`` is skipped at larger sizes.
+    """
+    
+    def __init__(
+        self,
+        targets: List[BenchmarkTarget],
+        repeat: int = 3,
+        max_seconds: float = 60.0,
+        measure_memory: bool = True,
+        seed: int = 42,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None
+    ):
+        """
+        Initialize benchmark runner
+        
+        Args:
+            targets: Targets to run
+            repeat: Timed runs per (target, size)
+            max_seconds: Time budget per (target, size); also the warm-up
+                time above which larger sizes are skipped
+            measure_memory: Record peak traced memory
+            seed: Seed for the synthetic data
+            progress: Callback receiving each result as it completes
+        """
+        self.targets = targets
+        self.repeat = max(1, repeat)
+        self.max_seconds = max_seconds
+        self.measure_memory = measure_memory
+        self.seed = seed
+        self.progress = progress
+    
+    def run(self, sizes: List[int]) -> Dict[str, Any]:
+        """
+        Run every target at every size
+        
+        Returns:
+            Results document (see save_results)
+        """
+        results = []
+        too_slow: Dict[str, int] = {}
+        
+        for n_bars in sorted(sizes):
+            inputs = BenchmarkInputs(n_bars, seed=self.seed)
+            for target in self.targets:
+                if target.name in too_slow:
+                    result = self._result(target, n_bars, 'skipped')
+                    result['reason'] = f"warm-up exceeded {self.max_seconds}s at {too_slow[target.name]} bars"
+                else:
+                    result = self.run_target(target, inputs)
+                    if result['status'] == 'ok' and result['warmup_s'] > self.max_seconds:
+                        too_slow[target.name] = n_bars
+                
+                results.append(result)
+                if self.progress:
+                    self.progress(result)
+            del inputs
+            gc.collect()
+        
+        return {
+            'version': RESULTS_VERSION,
+            'meta': environment_info(sizes, self.repeat, self.seed),
+            'results': results,
+        }
+    
+    def run_target(self, target: BenchmarkTarget, inputs: BenchmarkInputs) -> Dict[str, Any]:
+        """Benchmark one target on one input size"""
+        result = self._result(target, inputs.n_bars, 'ok')
+        
+        try:
+            warmup = self._timed(target.prepare(inputs))
+            result['warmup_s'] = warmup
+            
+            timings = []
+            budget = self.max_seconds - warmup
+            for _ in range(self.repeat):
+                if timings and sum(timings) > budget:
+                    break
+                timings.append(self._timed(target.prepare(inputs)))
+            
+            result.update({
+                'runs': len(timings),
+                'min_s': min(timings),
+                'median_s': statistics.median(timings),
+                'mean_s': statistics.fmean(timings),
+                'max_s': max(timings),
+                'bars_per_s': inputs.n_bars / min(timings) if min(timings) > 0 else None,
+            })
+            
+            if self.measure_memory:
+                result['peak_memory_bytes'] = self._peak_memory(target.prepare(inputs))
+        
+        except Exception as e:
+            result['status'] = 'error'
+            result['error'] = f"{type(e).__name__}: {e}"
+        
+        return result
+    
+    @staticmethod
+    def _result(target: BenchmarkTarget, n_bars: int, status: str) -> Dict[str, Any]:
+        return {'target': target.name, 'group': target.group, 'bars': n_bars, 'status': status}
+    
+    @staticmethod
+    def _timed(call: Callable[[], Any]) -> float:
+        gc.collect()
+        start = time.perf_counter()
+        call()
+        return time.perf_counter() - start
+    
+    @staticmethod
+    def _peak_memory(call: Callable[[], Any]) -> int:
+        """Peak memory traced during one call, above the pre-call baseline"""
+        gc.collect()
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        try:
+            baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            call()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            if not tracing:
+                tracemalloc.stop()
+        return max(peak - baseline, 0)
+
+
+# ==================== Results Files ====================
+
+def environment_info(sizes: List[int], repeat: int, seed: int) -> Dict[str, Any]:
+    """Metadata recorded with every results file"""
+    meta = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sizes': sorted(sizes),
+        'repeat': repeat,
+        'seed': seed,
+    }
+    try:
+        meta['git_commit'] = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, timeout=5,
+            cwd=Path(__file__).resolve().parent
+        ).stdout.strip() or None
+    except Exception:
+        meta['git_commit'] = None
+    return meta
+
+
+def save_results(results: Dict[str, Any], path) -> Path:
+    """Write a results document as JSON"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, default=str)
+    return path
+
+
+def load_results(path) -> Dict[str, Any]:
+    """Read a results document written by save_results"""
+    with open(path) as f:
+        results = json.load(f)
+    if 'results' not in results:
+        raise ValueError(f"{path} is not a benchmark results file")
+    return results
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = 0.10,
+    memory_threshold: float = 0.20,
+    min_delta_s: float = 0.001
+) -> List[Dict[str, Any]]:
+    """
+    Compare two results documents
+    
+    A (target, size) pair is a regression when its median time grows by
+    more than ``threshold`` (relative) and ``min_delta_s`` (absolute, to
+    ignore timer noise on tiny runs), or its peak memory grows by more than
+    ``memory_threshold``. Pairs that stopped working are regressions too.
+    
+    Args:
+        baseline: Baseline results document
+        current: Current results document
+        threshold: Allowed relative slowdown
+        memory_threshold: Allowed relative peak memory growth
+        min_delta_s: Ignore slowdowns smaller than this many seconds
+    
+    Returns:
+        One row per (target, bars) with 'status' of 'regression',
+        'improvement', 'unchanged', 'new', 'missing' or 'not_comparable'
+    """
+    def index(document):
+        return {(r['target'], r['bars']): r for r in document['results']}
+    
+    base_rows = index(baseline)
+    current_rows = index(current)
+    
+    rows = []
+    for key in sorted(set(base_rows) | set(current_rows), key=lambda k: (k[1], k[0])):
+        base, cur = base_rows.get(key), current_rows.get(key)
+        row = {'target': key[0], 'bars': key[1], 'reasons': []}
+        
+        if base is None:
+            row['status'] = 'new'
+        elif cur is None:
+            row['status'] = 'missing'
+        elif base['status'] == 'ok' and cur['status'] != 'ok':
+            row['status'] = 'regression'
+            row['reasons'].append(f"now {cur['status']}: {cur.get('error') or cur.get('reason', '')}")
+        elif base['status'] != 'ok' or cur['status'] != 'ok':
+            row['status'] = 'not_comparable'
+        else:
+            row['base_s'] = base['median_s']
+            row['current_s'] = cur['median_s']
+            row['time_ratio'] = cur['median_s'] / base['median_s'] if base['median_s'] > 0 else None
+            
+            slower = (row['time_ratio'] is not None
+                      and row['time_ratio'] > 1 + threshold
+                      and cur['median_s'] - base['median_s'] > min_delta_s)
+            faster = (row['time_ratio'] is not None
+                      and row['time_ratio'] < 1 / (1 + threshold)
+                      and base['median_s'] - cur['median_s'] > min_delta_s)
+            if slower:
+                row['reasons'].append(f"time x{row['time_ratio']:.2f}")
+            
+            base_mem, cur_mem = base.get('peak_memory_bytes'), cur.get('peak_memory_bytes')
+            if base_mem and cur_mem is not None:
+                row['memory_ratio'] = cur_mem / base_mem
+                if row['memory_ratio'] > 1 + memory_threshold:
+                    row['reasons'].append(f"memory x{row['memory_ratio']:.2f}")
+            
+            if row['reasons']:
+                row['status'] = 'regression'
+            elif faster:
+                row['status'] = 'improvement'
+            else:
+                row['status'] = 'unchanged'
+        
+        rows.append(row)
+    
+    return rows
@@ -0,0 +1,134 @@
+"""
+Benchmark Suite
+Targets covering the analysis pipeline
+"""
+import importlib
+import inspect
+from typing import Any, Callable, List, Optional
+
+from benchmarks.runner import BenchmarkInputs, BenchmarkTarget
+
+# (module, class) whose public per-frame methods are benchmarked individually
+METHOD_CLASSES = [
+    ('src.indicators.smc', 'SMCAnalyzer'),
+    ('src.indicators.technical', 'TechnicalIndicators'),
+    ('src.analysis.regime_detector', 'RegimeDetector'),
+]
+
+BENCHMARK_SYMBOL = 'EURUSD'
+BENCHMARK_TIMEFRAME = 'M15'
+
+
+def _load_class(module: str, name: str):
+    return getattr(importlib.import_module(module), name)
+
+
+def _lazy_class(module: str, name: str) -> Callable[[], Any]:
+    """Import on first use so a missing dependency fails only its own targets"""
+    return lambda: _load_class(module, name)
+
+
+def frame_methods(cls) -> List[str]:
+    """Public methods of ``cls`` whose first argument is the OHLCV frame"""
+    methods = []
+    for name, member in inspect.getmembers(cls, inspect.isfunction):
+        # Skip private helpers and context managers such as TechnicalIndicators.context
+        if name.startswith('_') or inspect.isgeneratorfunction(inspect.unwrap(member)):
+            continue
+        params = list(inspect.signature(member).parameters)
+        if len(params) >= 2 and params[1] == 'df':
+            methods.append(name)
+    return methods
+
+
+def _method_target(module: str, class_name: str, method: str) -> BenchmarkTarget:
+    load = _lazy_class(module, class_name)
+    
+    def prepare(inputs: BenchmarkInputs):
+        bound = getattr(load()(), method)
+        df = inputs.ohlcv
+        return lambda: bound(df)
+    
+    return BenchmarkTarget(name=f"{class_name}.{method}", prepare=prepare, group=class_name)
+
+
+def _pipeline_targets() -> List[BenchmarkTarget]:
+    feature_engineer = _lazy_class('src.ml.feature_engineering', 'FeatureEngineer')
+    sentiment_engine = _lazy_class('src.analysis.sentiment_engine', 'SentimentEngine')
+    mtf_analyzer = _lazy_class('src.analysis.multi_timeframe', 'MultiTimeframeAnalyzer')
+    
+    def features(inputs: BenchmarkInputs):
+        engineer, df = feature_engineer()(), inputs.ohlcv
+        return lambda: engineer.create_features(df)
+    
+    def sentiment(inputs: BenchmarkInputs):
+        engine, df = sentiment_engine()(), inputs.ohlcv
+        return lambda: engine.analyze_sentiment(df, BENCHMARK_SYMBOL, BENCHMARK_TIMEFRAME)
+    
+    def multi_timeframe(inputs: BenchmarkInputs):
+        analyzer, data = mtf_analyzer()(), inputs.timeframes
+        return lambda: analyzer.analyze_multiple_timeframes(data, BENCHMARK_SYMBOL)
+    
+    return [
+        BenchmarkTarget('FeatureEngineer.create_features', features, group='pipeline'),
+        BenchmarkTarget('SentimentEngine.analyze_sentiment', sentiment, group='pipeline'),
+        BenchmarkTarget('MultiTimeframeAnalyzer.analyze_multiple_timeframes', multi_timeframe, group='pipeline'),
+    ]
+
+
+def _backend_targets() -> List[BenchmarkTarget]:
+    """calculate_all_indicators on every available indicator backend"""
+    try:
+        from src.indicators.indicator_backend import available_backends
+        backends = available_backends()
+    except Exception as e:
+        return [BenchmarkTarget('TechnicalIndicators[*]', _ImportFailure(e), group='indicator_backends')]
+    load = _lazy_class('src.indicators.technical', 'TechnicalIndicators')
+    
+    def target(backend: str) -> BenchmarkTarget:
+        def prepare(inputs: BenchmarkInputs):
+            indicators, df = load()(backend=backend), inputs.ohlcv
+            return lambda: indicators.calculate_all_indicators(df)
+        return BenchmarkTarget(f"TechnicalIndicators[{backend}].calculate_all_indicators", prepare,
+                               group='indicator_backends')
+    
+    return [target(backend) for backend in backends]
+
+
+class _ImportFailure:
+    """Stand-in target for a class that cannot be imported"""
+    
+    def __init__(self, error: Exception):
+        self.error = error
+    
+    def __call__(self, inputs: BenchmarkInputs):
+        raise self.error
+
+
+def default_targets(patterns: Optional[List[str]] = None) -> List[BenchmarkTarget]:
+    """
+    All benchmark targets, optionally filtered
+    
+    Args:
+        patterns: Substrings matched against target names (case-insensitive)
+    
+    Returns:
+        List of BenchmarkTarget
+    """
+    targets = []
+    for module, class_name in METHOD_CLASSES:
+        try:
+            methods = frame_methods(_load_class(module, class_name))
+        except Exception as e:
+            # Keep the failure visible in the results instead of dropping the class
+            targets.append(BenchmarkTarget(f"{class_name}.*", _ImportFailure(e), group=class_name))
+            continue
+        targets.extend(_method_target(module, class_name, method) for method in methods)
+    
+    targets.extend(_backend_targets())
+    targets.extend(_pipeline_targets())
+    
+    if patterns:
+        lowered = [pattern.lower() for pattern in patterns]
+        targets = [t for t in targets if any(p in t.name.lower() for p in lowered)]
+    return targets
@@ -4,7 +4,7 @@ Centralized configuration loading and validation
 """
 import os
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -31,6 +31,13 @@ class MT5Config:
     TIMEOUT: int = int(os.getenv("MT5_TIMEOUT", "60000"))
     PATH: str = os.getenv("MT5_PATH", r"C:\Program Files\MetaTrader 5\terminal64.exe")
     PORTABLE: bool = os.getenv("MT5_PORTABLE", "False").lower() == "true"
+    
+    # "terminal" uses the MetaTrader5 package; "fake" the offline stand-in
+    # (src/mt5/fake_mt5.py) with deterministic data, for tests and benchmarks
+    BACKEND: str = os.getenv("MT5_BACKEND", "terminal").lower()
+    FAKE_SEED: int = int(os.getenv("MT5_FAKE_SEED", "42"))
+    FAKE_LATENCY_MS: float = float(os.getenv("MT5_FAKE_LATENCY_MS", "0"))
+    FAKE_SYMBOL_SUFFIX: str = os.getenv("MT5_FAKE_SYMBOL_SUFFIX", "")
 
 
 class DatabaseConfig:
@@ -76,6 +83,9 @@ class MLConfig:
     MIN_MOVE_PIPS: float = float(os.getenv("MIN_MOVE_PIPS", "10.0"))  # Minimum meaningful move
     LOOKFORWARD_BARS: int = int(os.getenv("LOOKFORWARD_BARS", "3"))  # Multi-horizon target
     
+    # Per-bar SMC state columns from SMCAnalyzer.analyze_history()
+    USE_SMC_HISTORY_FEATURES: bool = os.getenv("USE_SMC_HISTORY_FEATURES", "True").lower() == "true"
+    
     # NEW: Class balancing
     USE_CLASS_BALANCING: bool = os.getenv("USE_CLASS_BALANCING", "True").lower() == "true"
     USE_TSCV: bool = os.getenv("USE_TSCV", "True").lower() == "true"  # Time-series CV
@@ -95,6 +105,25 @@ class DataConfig:
         "M15,H1,H4,D1"
     ).split(",")
     
+    # Local bar store: refreshes fetch only the bars since the last stored one
+    BAR_STORE_ENABLED: bool = os.getenv("BAR_STORE_ENABLED", "True").lower() == "true"
+    BAR_STORE_DIR: Path = DATA_DIR / "bars"
+    BAR_STORE_MAX_BARS: int = int(os.getenv("BAR_STORE_MAX_BARS", "50000"))
+    # Seconds between writes of a refreshed series (0 writes every refresh)
+    BAR_STORE_FLUSH_SECONDS: float = float(os.getenv("BAR_STORE_FLUSH_SECONDS", "60"))
+    
+    # Resolved symbol names and symbol_info are cached between fetches
+    SYMBOL_CACHE_TTL_SECONDS: int = int(os.getenv("SYMBOL_CACHE_TTL_SECONDS", "3600"))
+    
+    # Tick-built bars page through copy_ticks_range this many seconds at a time
+    TICK_CHUNK_SECONDS: int = int(os.getenv("TICK_CHUNK_SECONDS", "3600"))
+    
+    # Historical backfills fetch date ranges in chunks of this many bars,
+    # with up to BACKFILL_CONCURRENCY chunks in flight
+    BACKFILL_DIR: Path = DATA_DIR / "history"
+    BACKFILL_CHUNK_BARS: int = int(os.getenv("BACKFILL_CHUNK_BARS", "20000"))
+    BACKFILL_CONCURRENCY: int = int(os.getenv("BACKFILL_CONCURRENCY", "4"))
+    
     # Data validation
     MAX_MISSING_PERCENTAGE: float = 1.0
     MAX_SPIKE_MULTIPLIER: float = 5.0
@@ -145,6 +174,18 @@ class IndicatorConfig:
     STOCH_K: int = 14
     STOCH_D: int = 3
     STOCH_SMOOTH: int = 3
+    
+    # Volume Profile
+    VOLUME_PROFILE_BINS: int = 24
+    VOLUME_PROFILE_VALUE_AREA: float = 0.70  # Share of volume inside the value area
+    
+    # Parameter sweeps (default period ranges)
+    SWEEP_MA_PERIODS: Tuple[int, ...] = tuple(range(5, 201))
+    SWEEP_OSCILLATOR_PERIODS: Tuple[int, ...] = tuple(range(7, 29))
+    
+    # Result cache (IndicatorCalculator)
+    CACHE_SIZE: int = 64
+    CACHE_MAX_BYTES: int = 64 * 1024 * 1024
 
 
 class SMCConfig:
@@ -153,6 +194,13 @@ class SMCConfig:
     SWING_LOOKBACK: int = 5
     MIN_STRUCTURE_POINTS: int = 3
     
+    # Swing point cache (frames are fingerprinted by their trailing bars)
+    SWING_CACHE_SIZE: int = 32
+    SWING_CACHE_FINGERPRINT_BARS: int = 32
+    
+    # Incremental analysis (per symbol/timeframe SMCStream instead of full re-analysis)
+    INCREMENTAL_ANALYSIS: bool = True
+    
     # Order Blocks
     OB_MIN_BODY_PERCENTAGE: float = 0.6
     OB_MIN_VOLUME_MULTIPLIER: float = 1.5
@@ -165,6 +213,10 @@ class SMCConfig:
     # Liquidity
     LIQUIDITY_PROXIMITY_PIPS: int = 5
     LIQUIDITY_MIN_TOUCHES: int = 2
+    LIQUIDITY_TOLERANCE: float = 0.001  # Equal highs/lows within 0.1%
+    LIQUIDITY_USE_ATR_TOLERANCE: bool = False  # Use ATR-relative tolerance instead
+    LIQUIDITY_ATR_MULTIPLIER: float = 0.1
+    LIQUIDITY_ATR_PERIOD: int = 14
     
     # Supply/Demand
     ZONE_STRENGTH_BARS: int = 10
@@ -279,6 +331,16 @@ class PerformanceConfig:
     CACHE_TTL_SECONDS: int = int(os.getenv("CACHE_TTL_SECONDS", "300"))
     MAX_WORKERS: int = int(os.getenv("MAX_WORKERS", "4"))
     
+    # SMC kernel backend: auto (numba when installed), numba or numpy
+    SMC_KERNEL_BACKEND: str = os.getenv("SMC_KERNEL_BACKEND", "auto")
+    
+    # Technical indicator backend: auto (TA-Lib when installed), talib or numpy
+    INDICATOR_BACKEND: str = os.getenv("INDICATOR_BACKEND", "auto")
+    
+    # Compact mode: float32 prices / int32 volumes from the fetcher and
+    # float32 indicator results (see src/utils/compact.py for the error bounds)
+    COMPACT_MODE: bool = os.getenv("COMPACT_MODE", "False").lower() == "true"
+    
     # Data retention
     KEEP_CANDLES_DAYS: int = 365
     KEEP_PREDICTIONS_DAYS: int = 90
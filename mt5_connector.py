@@ -9,6 +9,9 @@ import time
 from datetime import datetime
 from typing import Optional, Dict, Any
 
+from src.mt5.connection import import_metatrader5, mark_connected
+from src.mt5.rates import OHLCV_COLUMNS, rates_to_frame
+
 # Lazy import MT5
 _mt5 = None
 _initialized = False
@@ -18,8 +21,7 @@ def _ensure_mt5():
     global _mt5
     if _mt5 is None:
         try:
-            import MetaTrader5 as mt5_module
-            _mt5 = mt5_module
+            _mt5 = import_metatrader5()
         except ImportError:
             raise ImportError(
                 "MetaTrader5 not installed. Install with: pip install MetaTrader5"
@@ -121,6 +123,7 @@ def connect(login: int, password: str, server: str, timeout: int = 60000) -> boo
         _connection_active = True
         _connection_time = datetime.now()
         _last_error = None
+        mark_connected()
         
         print(f"✅ Connected successfully!")
         print(f"   Balance: {account_info.balance} {account_info.currency}")
@@ -309,7 +312,6 @@ def get_ohlcv(symbol: str, timeframe: str, bars: int = 1000):
         return None
     
     try:
-        import pandas as pd
         mt5 = _ensure_mt5()
         
         # Map timeframe string to MT5 constant
@@ -336,21 +338,7 @@ def get_ohlcv(symbol: str, timeframe: str, bars: int = 1000):
             print(f"❌ No data for {symbol} {timeframe}")
             return None
         
-        # Convert to DataFrame
-        df = pd.DataFrame(rates)
-        df['time'] = pd.to_datetime(df['time'], unit='s')
-        df.set_index('time', inplace=True)
-        
-        # Rename columns to standard OHLCV format
-        df.rename(columns={
-            'open': 'Open',
-            'high': 'High',
-            'low': 'Low',
-            'close': 'Close',
-            'tick_volume': 'Volume'
-        }, inplace=True)
-        
-        return df[['Open', 'High', 'Low', 'Close', 'Volume']]
+        return rates_to_frame(rates, OHLCV_COLUMNS)
         
     except Exception as e:
         print(f"❌ Error fetching data: {e}")
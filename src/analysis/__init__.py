@@ -5,19 +5,11 @@ Advanced market analysis and regime detection
 from src.analysis.confidence_scorer import ConfidenceScorer
 from src.analysis.multi_timeframe import MultiTimeframeAnalyzer
 from src.analysis.sentiment_engine import SentimentEngine
-from src.analysis.regime_detector import (
-    RegimeDetector,
-    TrendRegime,
-    VolatilityRegime,
-    VolumeRegime
-)
+from src.analysis.regime_detector import RegimeDetector
 
 __all__ = [
     'ConfidenceScorer',
     'MultiTimeframeAnalyzer',
     'SentimentEngine',
     'RegimeDetector',
-    'TrendRegime',
-    'VolatilityRegime',
-    'VolumeRegime'
 ]
@@ -12,7 +12,7 @@ from src.indicators.smc import SMCAnalyzer
 from src.indicators.calculator import IndicatorCalculator
 from .confidence_scorer import ConfidenceScorer
 from .regime_detector import RegimeDetector  # v2.0
-from config.settings import SentimentConfig, RegimeConfig  # v2.0
+from config.settings import SentimentConfig, RegimeConfig, SMCConfig  # v2.0
 from src.utils.logger import get_logger
 
 logger = get_logger()
@@ -60,6 +60,9 @@ class SentimentEngine:
         self.config = SentimentConfig
         self.regime_config = RegimeConfig  # v2.0
         self.logger = logger
+        
+        # Incremental SMC state per (symbol, timeframe)
+        self._smc_streams: Dict[tuple, Any] = {}
     
     def analyze_sentiment(
         self,
@@ -85,7 +88,7 @@ class SentimentEngine:
             tech_signals = self._analyze_technical(df)
             
             # Get SMC analysis
-            smc_signals = self._analyze_smc(df)
+            smc_signals = self._analyze_smc(df, symbol, timeframe)
             
             # v2.0: Get market regime analysis (if enabled)
             regime_data = None
@@ -146,7 +149,8 @@ class SentimentEngine:
                 'insights': insights,
                 'price': df['Close'].iloc[-1],
                 'timestamp': datetime.now(),
-                'regime': regime_data  # v2.0: Include regime data
+                'regime': regime_data,  # v2.0: Include regime data
+                'indicator_stats': self.tech_indicators.last_context_stats
             }
             
             # v2.0: Check regime filtering
@@ -175,11 +179,12 @@ class SentimentEngine:
     
     def _analyze_technical(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Analyze technical indicators"""
-        # Get all signals
-        trend_signal = self.tech_indicators.get_trend_signal(df)
-        momentum_signal = self.tech_indicators.get_momentum_signal(df)
-        volatility_signal = self.tech_indicators.get_volatility_signal(df)
-        volume_signal = self.tech_indicators.get_volume_signal(df)
+        # One indicator context so the signals share their inputs
+        with self.tech_indicators.context(df):
+            trend_signal = self.tech_indicators.get_trend_signal(df)
+            momentum_signal = self.tech_indicators.get_momentum_signal(df)
+            volatility_signal = self.tech_indicators.get_volatility_signal(df)
+            volume_signal = self.tech_indicators.get_volume_signal(df)
         
         return {
             'trend': trend_signal,
@@ -188,8 +193,36 @@ class SentimentEngine:
             'volume': volume_signal
         }
     
-    def _analyze_smc(self, df: pd.DataFrame) -> Dict[str, Any]:
-        """Analyze Smart Money Concepts"""
+    def _analyze_smc(
+        self,
+        df: pd.DataFrame,
+        symbol: Optional[str] = None,
+        timeframe: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Analyze Smart Money Concepts
+        
+        With INCREMENTAL_ANALYSIS enabled and a known symbol/timeframe, a
+        per-instrument SMCStream is synced to the frame so repeated calls on
+        a sliding fetch only process the new and revised bars.
+        """
+        if not SMCConfig.INCREMENTAL_ANALYSIS or symbol is None or timeframe is None:
+            return self.smc_analyzer.analyze(df)
+        
+        key = (symbol, timeframe)
+        try:
+            stream = self._smc_streams.get(key)
+            if stream is None or stream.max_bars != len(df):
+                stream = self.smc_analyzer.create_stream(max_bars=len(df))
+                self._smc_streams[key] = stream
+            stream.sync(df)
+            result = stream.analyze()
+            if 'error' not in result:
+                return result
+        except Exception as e:
+            self.logger.warning(f"Incremental SMC failed for {symbol} {timeframe}: {str(e)}", category="analysis")
+        
+        self._smc_streams.pop(key, None)
         return self.smc_analyzer.analyze(df)
     
     def _aggregate_signals(
@@ -63,7 +63,8 @@ class SystemDiagnostics:
         
         # Test 1: MT5 Import
         try:
-            import MetaTrader5 as mt5
+            from src.mt5.connection import import_metatrader5
+            import_metatrader5()
             tests.append({'name': 'MT5 Library Import', 'passed': True})
         except Exception as e:
             tests.append({'name': 'MT5 Library Import', 'passed': False, 'error': str(e)})
@@ -158,7 +158,8 @@ class HealthMonitor:
             
             # Test connection quality with MT5 API
             try:
-                import MetaTrader5 as mt5
+                from src.mt5.connection import import_metatrader5
+                mt5 = import_metatrader5()
                 start = time.time()
                 account_info = mt5.account_info()
                 ping_ms = (time.time() - start) * 1000
@@ -2,11 +2,16 @@
 Indicator Calculator
 Helper class for batch indicator calculations and caching
 """
+import time
+from collections import OrderedDict
+import numpy as np
 import pandas as pd
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 
-from .technical import TechnicalIndicators
+from config.settings import DataConfig, IndicatorConfig, PerformanceConfig
+from .technical import TechnicalIndicators, make_panel
+from src.utils.compact import memory_usage
 from src.utils.logger import get_logger
 
 logger = get_logger()
@@ -23,12 +28,134 @@ class IndicatorCalculator:
     - Signal aggregation
     """
     
-    def __init__(self):
-        """Initialize calculator"""
-        self.tech_indicators = TechnicalIndicators()
-        self.cache = {}
-        self.cache_ttl = 300  # 5 minutes
+    def __init__(self, compact: Optional[bool] = None):
+        """
+        Initialize calculator
+        
+        Args:
+            compact: Cache float32 indicator results (default
+                PerformanceConfig.COMPACT_MODE)
+        """
+        self.config = IndicatorConfig
+        self.tech_indicators = TechnicalIndicators(compact=compact)
         self.logger = logger
+        
+        # LRU cache of results, keyed by symbol, timeframe, parameters and the
+        # last bar; entries expire when their bar closes
+        self.cache: OrderedDict = OrderedDict()
+        self.cache_ttl = PerformanceConfig.CACHE_TTL_SECONDS  # for unknown timeframes
+        self._cache_bytes = 0
+        self._cache_stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+        }
+        self._clock = time.time
+        self._config_stamp: Optional[Tuple] = None
+        self._config_params: Optional[Tuple] = None
+        self._config_generation = 0
+    
+    # ==================== Caching ====================
+    
+    def _config_version(self) -> int:
+        """
+        Version of the indicator settings and backend in effect
+        
+        The settings are compared only when an attribute of the config
+        class was rebound, so a lookup costs one pass over attribute
+        identities instead of rebuilding and hashing every setting (the
+        sweep period lists alone hold hundreds of values).
+        """
+        stamp = (
+            tuple(map(id, vars(self.config).values())),
+            self.tech_indicators.backend.name,
+            self.tech_indicators.compact
+        )
+        if stamp != self._config_stamp:
+            params = tuple(
+                (name, value) for name, value in sorted(vars(self.config).items())
+                if name.isupper() and not name.startswith('CACHE_')
+            ) + stamp[1:]
+            if params != self._config_params:
+                self._config_params = params
+                self._config_generation += 1
+            self._config_stamp = stamp
+        return self._config_generation
+    
+    def _cache_key(self, df: pd.DataFrame, symbol: str, timeframe: str) -> Tuple:
+        """
+        Cache key for one frame
+        
+        The key holds the version of the indicator settings and backend in
+        effect, and the fingerprint is the frame length, first timestamp and
+        the last bar, so a new bar or a revision of the forming bar changes
+        the key.
+        """
+        version = self._config_version()
+        if df.empty:
+            return (symbol, timeframe, version, (0,))
+        fingerprint = (
+            len(df), df.index[0], df.index[-1],
+            tuple(float(df[column].iat[-1]) for column in ('Open', 'High', 'Low', 'Close', 'Volume') if column in df)
+        )
+        return (symbol, timeframe, version, fingerprint)
+    
+    def _cache_expiry(self, timeframe: str, now: float) -> float:
+        """
+        Time at which the current bar of ``timeframe`` closes
+        
+        Bar boundaries are taken as multiples of the timeframe since the Unix
+        epoch, which matches intraday bars; for brokers whose H4/D1 bars are
+        offset the fingerprint still changes as soon as the new bar arrives.
+        """
+        minutes = DataConfig.TIMEFRAME_MAP.get(timeframe)
+        if not minutes:
+            return now + self.cache_ttl
+        period = minutes * 60
+        return (now // period + 1) * period
+    
+    @staticmethod
+    def _result_bytes(value: Any) -> int:
+        """Approximate memory held by an indicator result"""
+        # The index is the input frame's, shared by every result
+        return memory_usage(value, index=False)
+    
+    def _cache_get(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        entry = self.cache.get(key)
+        if entry is None:
+            self._cache_stats['misses'] += 1
+            return None
+        
+        results, expires, size = entry
+        if self._clock() >= expires:
+            del self.cache[key]
+            self._cache_bytes -= size
+            self._cache_stats['expirations'] += 1
+            self._cache_stats['misses'] += 1
+            return None
+        
+        self.cache.move_to_end(key)
+        self._cache_stats['hits'] += 1
+        return results
+    
+    def _cache_put(self, key: Tuple, timeframe: str, results: Dict[str, Any]):
+        size = self._result_bytes(results)
+        if size > self.config.CACHE_MAX_BYTES:
+            return
+        
+        previous = self.cache.pop(key, None)
+        if previous is not None:
+            self._cache_bytes -= previous[2]
+        self.cache[key] = (results, self._cache_expiry(timeframe, self._clock()), size)
+        self._cache_bytes += size
+        
+        while len(self.cache) > self.config.CACHE_SIZE or self._cache_bytes > self.config.CACHE_MAX_BYTES:
+            _, (_, _, evicted) = self.cache.popitem(last=False)
+            self._cache_bytes -= evicted
+            self._cache_stats['evictions'] += 1
+    
+    # ==================== Calculation ====================
     
     def calculate_for_timeframe(
         self,
@@ -49,15 +176,14 @@ class IndicatorCalculator:
         Returns:
             Dict with all indicator results
         """
-        cache_key = f"{symbol}_{timeframe}_{len(df)}"
+        cache_key = self._cache_key(df, symbol, timeframe)
         
         # Check cache
-        if use_cache and cache_key in self.cache:
-            cached_data, timestamp = self.cache[cache_key]
-            age = (datetime.now() - timestamp).total_seconds()
-            if age < self.cache_ttl:
+        if use_cache:
+            cached = self._cache_get(cache_key)
+            if cached is not None:
                 self.logger.debug(f"Using cached indicators for {symbol} {timeframe}")
-                return cached_data
+                return dict(cached)
         
         # Calculate indicators
         try:
@@ -73,9 +199,9 @@ class IndicatorCalculator:
             results['latest_close'] = df['Close'].iloc[-1]
             
             # Cache results
-            self.cache[cache_key] = (results, datetime.now())
+            self._cache_put(cache_key, timeframe, results)
             
-            return results
+            return dict(results)
             
         except Exception as e:
             self.logger.error(f"Error calculating indicators for {symbol} {timeframe}: {str(e)}", category="analysis")
@@ -104,6 +230,29 @@ class IndicatorCalculator:
         
         return results
     
+    def calculate_panel_signals(
+        self,
+        data_dict: Dict[str, pd.DataFrame]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Trend and momentum signals for many symbols in one vectorized pass
+        
+        Args:
+            data_dict: Dict mapping symbol to DataFrame (one timeframe)
+            
+        Returns:
+            Dict mapping symbol to {'trend_signal', 'momentum_signal'}
+        """
+        frames = {symbol: df for symbol, df in data_dict.items() if df is not None and not df.empty}
+        if not frames:
+            return {}
+        
+        try:
+            return self.tech_indicators.get_panel_signals(make_panel(frames))
+        except Exception as e:
+            self.logger.error(f"Error calculating panel signals: {str(e)}", category="analysis")
+            return {}
+    
     def get_timeframe_alignment(
         self,
         mtf_results: Dict[str, Dict[str, Any]]
@@ -247,12 +396,19 @@ class IndicatorCalculator:
     def clear_cache(self):
         """Clear indicator cache"""
         self.cache.clear()
+        self._cache_bytes = 0
         self.logger.debug("Indicator cache cleared")
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
+        lookups = self._cache_stats['hits'] + self._cache_stats['misses']
         return {
+            **self._cache_stats,
+            'hit_rate': self._cache_stats['hits'] / lookups if lookups else 0.0,
             'cached_items': len(self.cache),
+            'cached_bytes': self._cache_bytes,
+            'max_items': self.config.CACHE_SIZE,
+            'max_bytes': self.config.CACHE_MAX_BYTES,
             'cache_ttl_seconds': self.cache_ttl
         }
 
@@ -302,6 +458,7 @@ if __name__ == "__main__":
     
     # Cache stats
     stats = calculator.get_cache_stats()
-    print(f"✓ Cache: {stats['cached_items']} items")
+    print(f"✓ Cache: {stats['cached_items']} items, {stats['cached_bytes'] / 1024:.0f} KB, "
+          f"{stats['hits']} hits / {stats['misses']} misses")
     
     print("\n✓ Calculator test completed")
@@ -0,0 +1,524 @@
+"""
+Indicator Backends
+TA-Lib, or a built-in vectorized NumPy implementation with the same calling convention
+"""
+import numpy as np
+import pandas as pd
+from typing import List, Optional, Sequence, Tuple
+try:
+    import talib
+except Exception:  # pragma: no cover
+    talib = None
+
+from src.utils.logger import get_logger
+
+logger = get_logger()
+
+BACKENDS = ('talib', 'numpy')
+
+# TA-Lib's tolerance for treating a value as zero
+_ZERO = 1e-14
+
+
+# ==================== Helpers ====================
+
+def _values(data) -> np.ndarray:
+    return np.asarray(data, dtype=np.float64)
+
+
+def _like(result: np.ndarray, data):
+    """Return a Series (or panel DataFrame) aligned with ``data`` when it is one, like TA-Lib"""
+    if isinstance(data, pd.Series):
+        return pd.Series(result, index=data.index)
+    if isinstance(data, pd.DataFrame):
+        return pd.DataFrame(result, index=data.index, columns=data.columns)
+    return result
+
+
+def _nans(shape) -> np.ndarray:
+    return np.full(shape, np.nan)
+
+
+def _rolling_sum(values: np.ndarray, period: int) -> np.ndarray:
+    """Sums of every full window, offset to keep the cumulative sums small"""
+    offset = values[0] if len(values) else 0.0
+    sums = np.concatenate((np.zeros((1,) + values.shape[1:]), np.cumsum(values - offset, axis=0)))
+    return sums[period:] - sums[:-period] + offset * period
+
+
+def _linear_filter(values: np.ndarray, alpha: float, seed: float) -> np.ndarray:
+    """
+    y[0] = seed, y[t] = y[t-1] + alpha * (values[t] - y[t-1])
+    
+    The recurrence is solved in blocks: within a block the closed form
+    sum of decayed inputs is one scaled cumsum, and only the carry between
+    blocks is propagated sequentially. Blocks are sized so the scale factors
+    stay within float range.
+    """
+    n = len(values)
+    decay = 1.0 - alpha
+    inputs = alpha * values
+    inputs[0] = seed
+    if decay <= 0.0 or n == 1:
+        return inputs
+    
+    block = int(min(n, max(1, 200 * np.log(10) // -np.log(decay))))
+    blocks = -(-n // block)
+    columns = values.shape[1:]
+    padded = np.zeros((blocks * block,) + columns)
+    padded[:n] = inputs
+    padded = padded.reshape((blocks, block) + columns)
+    
+    # Bar offsets within a block, broadcast over any symbol columns
+    steps = np.arange(block).reshape((block,) + (1,) * len(columns))
+    partial = np.cumsum(padded * decay ** -steps, axis=1) * decay ** steps
+    
+    carry_in = np.empty((blocks,) + columns)
+    carry, block_decay = 0.0, decay ** block
+    for k, end in enumerate(partial[:, -1] if columns else partial[:, -1].tolist()):
+        carry_in[k] = carry
+        carry = block_decay * carry + end
+    result = partial + carry_in[:, None] * decay ** (steps + 1)
+    return result.reshape((blocks * block,) + columns)[:n]
+
+
+def _smooth(values: np.ndarray, alpha: float, start: int, seed: float) -> np.ndarray:
+    """
+    First-order recursive smoothing of values[start:] seeded with ``seed``
+    at ``start`` (NaN before). NaN inputs leave the average unchanged.
+    
+    2D values are smoothed per column; ``seed`` is then one value per column.
+    """
+    if values.ndim > 1:
+        seeds = np.broadcast_to(seed, values.shape[1:])
+        gaps = np.isnan(values[start + 1:]).any(axis=0)
+        if gaps.any():
+            out = np.empty(values.shape)
+            for column in np.flatnonzero(gaps):
+                out[:, column] = _smooth(values[:, column], alpha, start, seeds[column])
+            clean = ~gaps
+            out[:, clean] = _smooth(values[:, clean], alpha, start, seeds[clean])
+            return out
+    
+    out = _nans(values.shape)
+    tail = values[start:]
+    missing = np.isnan(tail[1:])
+    if missing.any():
+        # Rare (e.g. DX on flat prices): pandas' filter can skip missing bars
+        tail = tail.copy()
+        tail[0] = seed
+        out[start:] = pd.Series(tail).ewm(alpha=alpha, adjust=False, ignore_na=True).mean().to_numpy()
+    else:
+        out[start:] = _linear_filter(tail.copy(), alpha, seed)
+    return out
+
+
+def _sweep_periods(periods: Sequence[int]) -> List[int]:
+    periods = [int(period) for period in periods]
+    if not periods or min(periods) < 2:
+        raise ValueError("Sweep periods must be a non-empty list of integers >= 2")
+    return periods
+
+
+def _sweep_output(n: int, periods: List[int]) -> np.ndarray:
+    # Column-major, so filling one period's column is a contiguous write
+    return np.full((n, len(periods)), np.nan, order='F')
+
+
+def _window_reduce(values: np.ndarray, period: int, op) -> np.ndarray:
+    """
+    Reduce every full window with a binary ufunc (np.add, np.maximum, ...)
+    
+    One pass per window offset, accumulating in window order like TA-Lib.
+    """
+    m = len(values) - period + 1
+    out = values[:m].copy()
+    for j in range(1, period):
+        op(out, values[j:j + m], out=out)
+    return out
+
+
+def _sma(values: np.ndarray, period: int, start: int = 0) -> np.ndarray:
+    """SMA of values[start:], NaN until ``start + period - 1``"""
+    out = _nans(values.shape)
+    if len(values) - start >= period:
+        out[start + period - 1:] = _rolling_sum(values[start:], period) / period
+    return out
+
+
+def _ema_from(values: np.ndarray, period: int, start: int) -> np.ndarray:
+    """EMA seeded with the SMA of the ``period`` values ending at ``start``"""
+    if start >= len(values) or start < period - 1:
+        return _nans(values.shape)
+    seed = values[start - period + 1:start + 1].sum(axis=0) / period
+    return _smooth(values, 2.0 / (period + 1), start, seed)
+
+
+def _true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """True range per bar (NaN for the first bar)"""
+    tr = _nans(close.shape)
+    if len(close) > 1:
+        prev_close = close[:-1]
+        tr[1:] = np.maximum.reduce([
+            high[1:] - low[1:],
+            np.abs(prev_close - high[1:]),
+            np.abs(low[1:] - prev_close)
+        ])
+    return tr
+
+
+def _window_extremes(high: np.ndarray, low: np.ndarray, period: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Highest high and lowest low of every full window"""
+    return _window_reduce(high, period, np.maximum), _window_reduce(low, period, np.minimum)
+
+
+def _window_deviation(values: np.ndarray, average: np.ndarray, period: int, squared: bool) -> np.ndarray:
+    """Sum of absolute (or squared) deviations from each full window's average"""
+    m = len(average)
+    total = np.zeros(average.shape)
+    deviation = np.empty(average.shape)
+    for j in range(period):
+        np.subtract(values[j:j + m], average, out=deviation)
+        if squared:
+            np.multiply(deviation, deviation, out=deviation)
+        else:
+            np.abs(deviation, out=deviation)
+        total += deviation
+    return total
+
+
+def _directional(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int):
+    """
+    Wilder-smoothed +DM, -DM and true range (divided by ``period``), and
+    the +DI/-DI lines, all defined from bar ``period``
+    """
+    plus_dm = np.zeros(close.shape)
+    minus_dm = np.zeros(close.shape)
+    up = high[1:] - high[:-1]
+    down = low[:-1] - low[1:]
+    plus_dm[1:] = np.where((up > 0) & (up > down), up, 0.0)
+    minus_dm[1:] = np.where((down > 0) & (up < down), down, 0.0)
+    tr = _true_range(high, low, close)
+    
+    # Raw sums over bars 1..period-1, then S[t] = S[t-1] * (1 - 1/p) + x[t]
+    start = period - 1
+    smoothed = [
+        _smooth(values, 1.0 / period, start, values[1:period].sum(axis=0) / period)
+        for values in (plus_dm, minus_dm, tr)
+    ]
+    plus_s, minus_s, tr_s = smoothed
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        valid = np.abs(tr_s * period) >= _ZERO
+        plus_di = np.where(valid, 100.0 * (plus_s / tr_s), 0.0)
+        minus_di = np.where(valid, 100.0 * (minus_s / tr_s), 0.0)
+    plus_di[:period] = np.nan
+    minus_di[:period] = np.nan
+    return plus_di, minus_di, valid
+
+
+# ==================== NumPy Indicators ====================
+
+class NumpyIndicators:
+    """
+    Vectorized NumPy implementations of the TA-Lib functions used by
+    TechnicalIndicators
+    
+    Signatures, warm-up NaNs and edge cases follow TA-Lib, and pandas
+    Series inputs give Series outputs on the same index. 2D inputs (bars x
+    symbols arrays or DataFrames) are computed column by column in the same
+    vectorized pass.
+    """
+    
+    name = 'numpy'
+    
+    @staticmethod
+    def SMA(real, timeperiod: int = 30):
+        return _like(_sma(_values(real), timeperiod), real)
+    
+    @staticmethod
+    def EMA(real, timeperiod: int = 30):
+        return _like(_ema_from(_values(real), timeperiod, timeperiod - 1), real)
+    
+    @staticmethod
+    def MACD(real, fastperiod: int = 12, slowperiod: int = 26, signalperiod: int = 9):
+        values = _values(real)
+        n = len(values)
+        if slowperiod < fastperiod:
+            fastperiod, slowperiod = slowperiod, fastperiod
+        
+        start = slowperiod - 1
+        lookback = start + signalperiod - 1
+        macd = _nans(values.shape)
+        signal = _nans(values.shape)
+        if n > lookback:
+            # Both EMAs are seeded where the slow one becomes defined
+            macd = _ema_from(values, fastperiod, start) - _ema_from(values, slowperiod, start)
+            signal = _ema_from(macd, signalperiod, lookback)
+            macd[:lookback] = np.nan
+        return _like(macd, real), _like(signal, real), _like(macd - signal, real)
+    
+    @staticmethod
+    def RSI(real, timeperiod: int = 14):
+        values = _values(real)
+        n = len(values)
+        out = _nans(values.shape)
+        if n > timeperiod:
+            change = np.zeros(values.shape)
+            change[1:] = np.diff(values, axis=0)
+            gain, loss = np.maximum(change, 0.0), np.maximum(-change, 0.0)
+            alpha = 1.0 / timeperiod
+            avg_gain = _smooth(gain, alpha, timeperiod, gain[1:timeperiod + 1].sum(axis=0) / timeperiod)
+            avg_loss = _smooth(loss, alpha, timeperiod, loss[1:timeperiod + 1].sum(axis=0) / timeperiod)
+            total = avg_gain + avg_loss
+            with np.errstate(divide='ignore', invalid='ignore'):
+                out = np.where(np.abs(total) < _ZERO, 0.0, 100.0 * (avg_gain / total))
+            out[:timeperiod] = np.nan
+        return _like(out, real)
+    
+    @staticmethod
+    def ATR(high, low, close, timeperiod: int = 14):
+        high_v, low_v, close_v = _values(high), _values(low), _values(close)
+        out = _nans(close_v.shape)
+        if len(close_v) > timeperiod:
+            tr = _true_range(high_v, low_v, close_v)
+            out = _smooth(tr, 1.0 / timeperiod, timeperiod, tr[1:timeperiod + 1].sum(axis=0) / timeperiod)
+        return _like(out, close)
+    
+    @staticmethod
+    def DMI(high, low, close, timeperiod: int = 14):
+        """
+        ADX, +DI and -DI from one directional movement pass (TA-Lib needs
+        three calls for these)
+        """
+        close_v = _values(close)
+        n = len(close_v)
+        adx = _nans(close_v.shape)
+        if n <= timeperiod:
+            return _like(adx, close), _like(_nans(close_v.shape), close), _like(_nans(close_v.shape), close)
+        
+        plus_di, minus_di, valid = _directional(_values(high), _values(low), close_v, timeperiod)
+        lookback = 2 * timeperiod - 1
+        if n > lookback:
+            di_sum = plus_di + minus_di
+            with np.errstate(divide='ignore', invalid='ignore'):
+                dx = 100.0 * (np.abs(minus_di - plus_di) / di_sum)
+            # Bars without a defined DX leave the average unchanged
+            dx[~valid | (np.abs(di_sum) < _ZERO)] = np.nan
+            seed = np.nansum(dx[timeperiod:lookback + 1], axis=0) / timeperiod
+            adx = _smooth(dx, 1.0 / timeperiod, lookback, seed)
+        return _like(adx, close), _like(plus_di, close), _like(minus_di, close)
+    
+    @staticmethod
+    def ADX(high, low, close, timeperiod: int = 14):
+        return NumpyIndicators.DMI(high, low, close, timeperiod)[0]
+    
+    @staticmethod
+    def PLUS_DI(high, low, close, timeperiod: int = 14):
+        return NumpyIndicators.DMI(high, low, close, timeperiod)[1]
+    
+    @staticmethod
+    def MINUS_DI(high, low, close, timeperiod: int = 14):
+        return NumpyIndicators.DMI(high, low, close, timeperiod)[2]
+    
+    @staticmethod
+    def STOCH(high, low, close, fastk_period: int = 5, slowk_period: int = 3, slowk_matype: int = 0,
+              slowd_period: int = 3, slowd_matype: int = 0):
+        high_v, low_v, close_v = _values(high), _values(low), _values(close)
+        n = len(close_v)
+        start = fastk_period - 1
+        lookback = start + slowk_period - 1 + slowd_period - 1
+        slow_k = _nans(close_v.shape)
+        slow_d = _nans(close_v.shape)
+        if n > lookback:
+            highest, lowest = _window_extremes(high_v, low_v, fastk_period)
+            diff = (highest - lowest) / 100.0
+            fast_k = np.zeros(close_v.shape)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                fast_k[start:] = np.where(diff != 0, (close_v[start:] - lowest) / diff, 0.0)
+            slow_k = _sma(fast_k, slowk_period, start)
+            slow_d = _sma(slow_k, slowd_period, start + slowk_period - 1)
+            slow_k[:lookback] = np.nan
+        return _like(slow_k, close), _like(slow_d, close)
+    
+    @staticmethod
+    def CCI(high, low, close, timeperiod: int = 14):
+        typical = (_values(high) + _values(low) + _values(close)) / 3
+        out = _nans(typical.shape)
+        if len(typical) >= timeperiod:
+            average = _window_reduce(typical, timeperiod, np.add) / timeperiod
+            deviation = _window_deviation(typical, average, timeperiod, squared=False) / timeperiod
+            distance = typical[timeperiod - 1:] - average
+            with np.errstate(divide='ignore', invalid='ignore'):
+                out[timeperiod - 1:] = np.where(
+                    (np.abs(distance) >= _ZERO) & (np.abs(deviation) >= _ZERO),
+                    distance / (0.015 * deviation), 0.0
+                )
+        return _like(out, close)
+    
+    @staticmethod
+    def WILLR(high, low, close, timeperiod: int = 14):
+        close_v = _values(close)
+        out = _nans(close_v.shape)
+        if len(close_v) >= timeperiod:
+            highest, lowest = _window_extremes(_values(high), _values(low), timeperiod)
+            diff = (highest - lowest) / -100.0
+            with np.errstate(divide='ignore', invalid='ignore'):
+                out[timeperiod - 1:] = np.where(diff != 0, (highest - close_v[timeperiod - 1:]) / diff, 0.0)
+        return _like(out, close)
+    
+    @staticmethod
+    def BBANDS(real, timeperiod: int = 5, nbdevup: float = 2.0, nbdevdn: float = 2.0, matype: int = 0):
+        values = _values(real)
+        middle = _sma(values, timeperiod)
+        std = _nans(values.shape)
+        if len(values) >= timeperiod:
+            average = _window_reduce(values, timeperiod, np.add) / timeperiod
+            variance = _window_deviation(values, average, timeperiod, squared=True) / timeperiod
+            std[timeperiod - 1:] = np.where(variance < _ZERO, 0.0, np.sqrt(np.maximum(variance, 0.0)))
+        upper = middle + nbdevup * std
+        lower = middle - nbdevdn * std
+        return _like(upper, real), _like(middle, real), _like(lower, real)
+    
+    @staticmethod
+    def OBV(real, volume):
+        close_v, volume_v = _values(real), _values(volume)
+        out = np.empty(close_v.shape)
+        if len(close_v):
+            out[0] = volume_v[0]
+            out[1:] = volume_v[0] + np.cumsum(np.sign(np.diff(close_v, axis=0)) * volume_v[1:], axis=0)
+        return _like(out, real)
+    
+    # Parameter sweeps: one column per period, sharing the intermediates
+    
+    @staticmethod
+    def SMA_SWEEP(real, periods: Sequence[int]) -> np.ndarray:
+        """SMA for every period (bars x periods) from one cumulative sum"""
+        values, periods = _values(real), _sweep_periods(periods)
+        n = len(values)
+        offset = values[0] if n else 0.0
+        sums = np.concatenate(([0.0], np.cumsum(values - offset)))
+        out = _sweep_output(n, periods)
+        for j, period in enumerate(periods):
+            if n >= period:
+                out[period - 1:, j] = (sums[period:] - sums[:-period] + offset * period) / period
+        return out
+    
+    @staticmethod
+    def EMA_SWEEP(real, periods: Sequence[int]) -> np.ndarray:
+        """EMA for every period (bars x periods), seeds taken from one cumulative sum"""
+        values, periods = _values(real), _sweep_periods(periods)
+        n = len(values)
+        sums = np.concatenate(([0.0], np.cumsum(values)))
+        out = _sweep_output(n, periods)
+        for j, period in enumerate(periods):
+            if n >= period:
+                out[:, j] = _smooth(values, 2.0 / (period + 1), period - 1, sums[period] / period)
+        return out
+    
+    @staticmethod
+    def RSI_SWEEP(real, periods: Sequence[int]) -> np.ndarray:
+        """RSI for every period (bars x periods), sharing the gains and losses"""
+        values, periods = _values(real), _sweep_periods(periods)
+        n = len(values)
+        change = np.zeros(n)
+        change[1:] = np.diff(values)
+        gain, loss = np.maximum(change, 0.0), np.maximum(-change, 0.0)
+        gain_sums, loss_sums = np.cumsum(gain), np.cumsum(loss)
+        
+        out = _sweep_output(n, periods)
+        for j, period in enumerate(periods):
+            if n > period:
+                alpha = 1.0 / period
+                avg_gain = _smooth(gain, alpha, period, gain_sums[period] / period)
+                avg_loss = _smooth(loss, alpha, period, loss_sums[period] / period)
+                total = avg_gain + avg_loss
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    out[period:, j] = np.where(np.abs(total[period:]) < _ZERO, 0.0,
+                                               100.0 * (avg_gain[period:] / total[period:]))
+        return out
+    
+    @staticmethod
+    def ATR_SWEEP(high, low, close, periods: Sequence[int]) -> np.ndarray:
+        """ATR for every period (bars x periods), sharing the true range"""
+        periods = _sweep_periods(periods)
+        tr = _true_range(_values(high), _values(low), _values(close))
+        n = len(tr)
+        sums = np.cumsum(np.nan_to_num(tr))
+        out = _sweep_output(n, periods)
+        for j, period in enumerate(periods):
+            if n > period:
+                out[:, j] = _smooth(tr, 1.0 / period, period, sums[period] / period)
+        return out
+    
+    @staticmethod
+    def MFI(high, low, close, volume, timeperiod: int = 14):
+        typical = (_values(high) + _values(low) + _values(close)) / 3
+        n = len(typical)
+        out = _nans(typical.shape)
+        if n > timeperiod:
+            change = np.diff(typical, axis=0)
+            # Like TA-Lib, a rounding-level change in the typical price is no change
+            flow = np.where(np.abs(change) < _ZERO, 0.0, typical[1:] * _values(volume)[1:])
+            positive = _rolling_sum(np.where(change > 0, flow, 0.0), timeperiod)
+            negative = _rolling_sum(np.where(change < 0, flow, 0.0), timeperiod)
+            total = positive + negative
+            with np.errstate(divide='ignore', invalid='ignore'):
+                out[timeperiod:] = np.where(total < 1.0, 0.0, 100.0 * (positive / total))
+        return _like(out, close)
+
+
+# ==================== Backends ====================
+
+class IndicatorBackend:
+    """Named indicator function namespace (the talib module or NumpyIndicators)"""
+    
+    def __init__(self, name: str, namespace):
+        self.name = name
+        self._namespace = namespace
+    
+    def __getattr__(self, item):
+        if item.startswith('_'):
+            raise AttributeError(item)
+        return getattr(self._namespace, item)
+    
+    def __repr__(self) -> str:
+        return f"<IndicatorBackend {self.name}>"
+
+
+NUMPY_BACKEND = IndicatorBackend('numpy', NumpyIndicators)
+_talib_backend: Optional[IndicatorBackend] = None
+
+
+def available_backends() -> List[str]:
+    """Indicator backends usable in this environment"""
+    return list(BACKENDS) if talib is not None else ['numpy']
+
+
+def get_backend(backend: str = 'auto') -> IndicatorBackend:
+    """
+    Resolve an indicator backend
+    
+    Args:
+        backend: 'auto' (TA-Lib when installed, else numpy), 'talib' or 'numpy'
+    
+    Returns:
+        IndicatorBackend (numpy when the requested backend is unavailable)
+    """
+    global _talib_backend
+    
+    backend = (backend or 'auto').lower()
+    if backend not in BACKENDS + ('auto',):
+        logger.warning(f"Unknown indicator backend '{backend}', using numpy")
+        return NUMPY_BACKEND
+    
+    if backend == 'numpy' or (backend == 'auto' and talib is None):
+        return NUMPY_BACKEND
+    
+    if talib is None:
+        logger.warning("TA-Lib is not installed, falling back to NumPy indicators")
+        return NUMPY_BACKEND
+    
+    if _talib_backend is None:
+        _talib_backend = IndicatorBackend('talib', talib)
+    return _talib_backend
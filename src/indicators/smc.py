@@ -7,8 +7,12 @@ import numpy as np
 from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 from dataclasses import dataclass
+import bisect
+from collections import OrderedDict
+from numpy.lib.stride_tricks import sliding_window_view
 
-from config.settings import SMCConfig
+from config.settings import SMCConfig, PerformanceConfig
+from .smc_kernels import get_kernels
 from src.utils.logger import get_logger
 
 logger = get_logger()
@@ -43,6 +47,8 @@ class FairValueGap:
     timestamp: datetime
     filled_percentage: float = 0.0
     active: bool = True
+    type: str = 'bullish'  # 'bullish' or 'bearish'
+    mitigated_at: Optional[datetime] = None  # bar that fully filled the gap
 
 
 @dataclass
@@ -54,6 +60,109 @@ class LiquidityZone:
     touches: int
 
 
+def _most_recent(timestamps: np.ndarray, positions: np.ndarray, limit: int) -> np.ndarray:
+    """
+    Rows of ``positions`` ordered most recent first, truncated to ``limit``
+    
+    Reversing before a stable sort keeps equal timestamps in their original
+    order, matching sorted(..., key=timestamp, reverse=True).
+    """
+    rows = np.arange(len(positions))[::-1]
+    order = np.argsort(timestamps[positions[rows]], kind='stable')
+    return rows[order][::-1][:limit]
+
+
+def _stop_hunt_events(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    timestamps,
+    liquidity_zones: List[LiquidityZone],
+    limit: int,
+    chunk: int = 256
+) -> List[Dict[str, Any]]:
+    """
+    Most recent ``limit`` stop hunt events against the given zones
+    
+    Bars are scanned backwards in growing chunks, and only the trailing
+    bars that hold the last ``limit`` events are expanded into dicts.
+    Within a bar, events follow the order of ``liquidity_zones``.
+    """
+    n = len(high)
+    if not liquidity_zones or n == 0 or limit <= 0:
+        return []
+    
+    zone_prices = np.array([zone.price for zone in liquidity_zones])
+    is_resistance = np.array([zone.type == 'resistance' for zone in liquidity_zones])
+    
+    # Zone list positions per side, sorted by price for binary search
+    sides = []
+    for mask in (is_resistance, ~is_resistance):
+        members = np.flatnonzero(mask)
+        sides.append(members[np.argsort(zone_prices[members], kind='stable')])
+    
+    def match_bounds(rows: np.ndarray) -> List[Tuple[np.ndarray, np.ndarray]]:
+        h, l, c = high[rows], low[rows], close[rows]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            upper_wick = (h - c) / (h - l) > 0.6
+            lower_wick = (c - l) / (h - l) > 0.6
+        bounds = []
+        # Resistance: close < price < high; support: low < price < close
+        for members, lower, upper, wick in ((sides[0], c, h, upper_wick),
+                                            (sides[1], l, c, lower_wick)):
+            prices = zone_prices[members]
+            start = np.searchsorted(prices, lower, side='right')
+            stop = np.searchsorted(prices, upper, side='left')
+            bounds.append((start, np.where(wick, np.maximum(stop, start), start)))
+        return bounds
+    
+    # Walk back from the last bar only as far as needed for `limit` events
+    hit_rows, hit_counts = [], []
+    total, end = 0, n
+    while end > 0 and total < limit:
+        rows = np.arange(max(end - chunk, 0), end)
+        counts = sum(stop - start for start, stop in match_bounds(rows))
+        hit = counts > 0
+        hit_rows.insert(0, rows[hit])
+        hit_counts.insert(0, counts[hit])
+        total += int(counts.sum())
+        end = rows[0]
+        chunk *= 2
+    
+    hit_rows = np.concatenate(hit_rows)
+    if len(hit_rows) == 0:
+        return []
+    needed = np.searchsorted(np.cumsum(np.concatenate(hit_counts)[::-1]), limit)
+    tail_rows = hit_rows[max(len(hit_rows) - needed - 1, 0):]
+    
+    bounds = match_bounds(tail_rows)
+    stop_hunts = []
+    for k, i in enumerate(tail_rows.tolist()):
+        matched = np.sort(np.concatenate([
+            members[start[k]:stop[k]] for members, (start, stop) in zip(sides, bounds)
+        ]))
+        for z in matched.tolist():
+            zone = liquidity_zones[z]
+            if zone.type == 'resistance':
+                stop_hunts.append({
+                    'type': 'bearish_stop_hunt',
+                    'price': zone.price,
+                    'wick_high': high[i],
+                    'close': close[i],
+                    'timestamp': timestamps[i]
+                })
+            else:
+                stop_hunts.append({
+                    'type': 'bullish_stop_hunt',
+                    'price': zone.price,
+                    'wick_low': low[i],
+                    'close': close[i],
+                    'timestamp': timestamps[i]
+                })
+    
+    return stop_hunts[-limit:]
+
+
 class SMCAnalyzer:
     """
     Smart Money Concepts analyzer for institutional trading patterns
@@ -72,8 +181,67 @@ class SMCAnalyzer:
         self.config = SMCConfig
         self.logger = logger
         
-        # Cache for swing points
-        self._swing_cache = {}
+        # NumPy or JIT-compiled kernels for the hot loops
+        self.kernels = get_kernels(PerformanceConfig.SMC_KERNEL_BACKEND)
+        
+        # LRU cache for swing points, keyed by frame fingerprint + lookbacks
+        self._swing_cache: OrderedDict = OrderedDict()
+        self._cache_stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+        }
+    
+    # ==================== Caching ====================
+    
+    def _frame_fingerprint(self, df: pd.DataFrame) -> Tuple:
+        """
+        Cheap content fingerprint of an OHLCV frame
+        
+        Uses the length, first/last timestamps and a hash of the trailing
+        High/Low/Close values, so a new or revised bar changes the key while
+        the cost stays independent of the frame length.
+        """
+        n = len(df)
+        if n == 0:
+            return (0,)
+        
+        tail = self.config.SWING_CACHE_FINGERPRINT_BARS
+        digest = hash(
+            df['High'].to_numpy()[-tail:].tobytes()
+            + df['Low'].to_numpy()[-tail:].tobytes()
+            + df['Close'].to_numpy()[-tail:].tobytes()
+        )
+        return (n, df.index[0], df.index[-1], digest)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get swing point cache statistics"""
+        lookups = self._cache_stats['hits'] + self._cache_stats['misses']
+        return {
+            **self._cache_stats,
+            'hit_rate': self._cache_stats['hits'] / lookups if lookups else 0.0,
+            'cached_items': len(self._swing_cache),
+            'max_items': self.config.SWING_CACHE_SIZE,
+            'kernel_backend': self.kernels.name,
+        }
+    
+    def clear_cache(self):
+        """Clear swing point cache"""
+        self._swing_cache.clear()
+        self.logger.debug("SMC swing cache cleared")
+    
+    def create_stream(self, max_bars: Optional[int] = None):
+        """
+        Create an incremental SMC stream sharing this analyzer's configuration
+        
+        Args:
+            max_bars: Sliding window length (None keeps all bars)
+            
+        Returns:
+            SMCStream producing the same results as analyze() bar by bar
+        """
+        from .smc_stream import SMCStream
+        return SMCStream(self, max_bars=max_bars)
     
     # ==================== Market Structure ====================
     
@@ -82,63 +250,72 @@ class SMCAnalyzer:
         df: pd.DataFrame,
         lookback_left: Optional[int] = None,
         lookback_right: Optional[int] = None
-    ) -> Dict[str, List[SwingPoint]]:
+    ) -> Dict[str, Any]:
         """
         Identify swing highs and swing lows
         
+        A bar is a swing high when its high is strictly greater than every
+        high in the surrounding window (and a swing low when its low is
+        strictly lower than every low), so equal neighbours never qualify.
+        Results are memoized per frame fingerprint, so the detectors that
+        share swings within one analysis pass compute them only once.
+        
         Args:
             df: DataFrame with OHLCV data
             lookback_left: Bars to look back
             lookback_right: Bars to look forward
             
         Returns:
-            Dict with 'highs' and 'lows' lists
+            Dict with 'highs' and 'lows' lists, plus the same points as
+            compact arrays ('high_indices', 'high_prices', 'low_indices',
+            'low_prices')
         """
         lookback_left = lookback_left or self.config.SWING_LOOKBACK
         lookback_right = lookback_right or self.config.SWING_LOOKBACK
         
-        swing_highs = []
-        swing_lows = []
+        cache_key = (self._frame_fingerprint(df), lookback_left, lookback_right)
+        cached = self._swing_cache.get(cache_key)
+        if cached is not None:
+            self._swing_cache.move_to_end(cache_key)
+            self._cache_stats['hits'] += 1
+            return dict(cached)
+        self._cache_stats['misses'] += 1
         
-        for i in range(lookback_left, len(df) - lookback_right):
-            # Check for swing high
-            current_high = df['High'].iloc[i]
-            is_swing_high = True
-            
-            for j in range(i - lookback_left, i + lookback_right + 1):
-                if j != i and df['High'].iloc[j] >= current_high:
-                    is_swing_high = False
-                    break
-            
-            if is_swing_high:
-                swing_highs.append(SwingPoint(
-                    index=i,
-                    price=current_high,
-                    type='high',
-                    timestamp=df.index[i]
-                ))
-            
-            # Check for swing low
-            current_low = df['Low'].iloc[i]
-            is_swing_low = True
-            
-            for j in range(i - lookback_left, i + lookback_right + 1):
-                if j != i and df['Low'].iloc[j] <= current_low:
-                    is_swing_low = False
-                    break
-            
-            if is_swing_low:
-                swing_lows.append(SwingPoint(
-                    index=i,
-                    price=current_low,
-                    type='low',
-                    timestamp=df.index[i]
-                ))
+        high = df['High'].to_numpy(dtype=np.float64)
+        low = df['Low'].to_numpy(dtype=np.float64)
         
-        return {
+        high_idx = np.flatnonzero(self.kernels.swing_mask(high, lookback_left, lookback_right, 'high'))
+        low_idx = np.flatnonzero(self.kernels.swing_mask(low, lookback_left, lookback_right, 'low'))
+        high_prices = high[high_idx]
+        low_prices = low[low_idx]
+        for arr in (high_idx, low_idx, high_prices, low_prices):
+            arr.flags.writeable = False  # shared through the cache
+        
+        index = df.index
+        swing_highs = [
+            SwingPoint(index=i, price=price, type='high', timestamp=index[i])
+            for i, price in zip(high_idx.tolist(), high_prices.tolist())
+        ]
+        swing_lows = [
+            SwingPoint(index=i, price=price, type='low', timestamp=index[i])
+            for i, price in zip(low_idx.tolist(), low_prices.tolist())
+        ]
+        
+        result = {
             'highs': swing_highs,
-            'lows': swing_lows
+            'lows': swing_lows,
+            'high_indices': high_idx,
+            'high_prices': high_prices,
+            'low_indices': low_idx,
+            'low_prices': low_prices,
         }
+        
+        self._swing_cache[cache_key] = result
+        while len(self._swing_cache) > self.config.SWING_CACHE_SIZE:
+            self._swing_cache.popitem(last=False)
+            self._cache_stats['evictions'] += 1
+        
+        return dict(result)
     
     def detect_market_structure(self, df: pd.DataFrame) -> Dict[str, Any]:
         """
@@ -148,8 +325,15 @@ class SMCAnalyzer:
             Dict with market structure analysis
         """
         swings = self.identify_swing_points(df)
-        
-        if len(swings['highs']) < 2 or len(swings['lows']) < 2:
+        return self._structure_from_swings(swings['highs'], swings['lows'])
+    
+    def _structure_from_swings(
+        self,
+        swing_highs: List[SwingPoint],
+        swing_lows: List[SwingPoint]
+    ) -> Dict[str, Any]:
+        """Classify market structure from the ordered swing lists"""
+        if len(swing_highs) < 2 or len(swing_lows) < 2:
             return {
                 'trend': 'UNDEFINED',
                 'structure': 'INSUFFICIENT_DATA',
@@ -158,12 +342,12 @@ class SMCAnalyzer:
             }
         
         # Analyze highs
-        recent_highs = swings['highs'][-3:]
+        recent_highs = swing_highs[-3:]
         higher_highs = sum(1 for i in range(1, len(recent_highs)) 
                           if recent_highs[i].price > recent_highs[i-1].price)
         
         # Analyze lows
-        recent_lows = swings['lows'][-3:]
+        recent_lows = swing_lows[-3:]
         higher_lows = sum(1 for i in range(1, len(recent_lows)) 
                          if recent_lows[i].price > recent_lows[i-1].price)
         
@@ -181,10 +365,10 @@ class SMCAnalyzer:
         return {
             'trend': trend,
             'structure': structure,
-            'swing_highs': swings['highs'],
-            'swing_lows': swings['lows'],
-            'latest_swing_high': swings['highs'][-1] if swings['highs'] else None,
-            'latest_swing_low': swings['lows'][-1] if swings['lows'] else None,
+            'swing_highs': swing_highs,
+            'swing_lows': swing_lows,
+            'latest_swing_high': swing_highs[-1] if swing_highs else None,
+            'latest_swing_low': swing_lows[-1] if swing_lows else None,
         }
     
     def detect_bos_choch(self, df: pd.DataFrame) -> Dict[str, Any]:
@@ -245,225 +429,311 @@ class SMCAnalyzer:
     
     # ==================== Order Blocks ====================
     
-    def identify_order_blocks(self, df: pd.DataFrame) -> List[OrderBlock]:
+    def detect_order_block_mask(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
         """
-        Identify bullish and bearish order blocks
+        Per-bar order block masks computed as whole-column operations
+        
+        Bar i is a bullish order block when it is a down candle followed by
+        an up candle whose body is more than 1.5x larger, and its own body
+        covers at least OB_MIN_BODY_PERCENTAGE of its range (bearish is the
+        mirror image). Strength is 1.2 when the bar's volume exceeds the
+        mean of the previous 5 bars by OB_MIN_VOLUME_MULTIPLIER, else 0.8.
         
         Returns:
-            List of OrderBlock objects
+            Dict with boolean 'bullish'/'bearish' arrays and a float
+            'strength' array (NaN where no order block), all len(df) long
         """
-        order_blocks = []
+        n = len(df)
+        bullish = np.zeros(n, dtype=bool)
+        bearish = np.zeros(n, dtype=bool)
+        strength = np.full(n, np.nan)
+        if n < 4:
+            return {'bullish': bullish, 'bearish': bearish, 'strength': strength}
         
-        for i in range(2, len(df) - 1):
-            current = df.iloc[i]
-            next_candle = df.iloc[i + 1]
-            
-            # Bullish order block: Down candle followed by strong up move
-            if (current['Close'] < current['Open'] and  # Down candle
-                next_candle['Close'] > next_candle['Open'] and  # Up candle
-                (next_candle['Close'] - next_candle['Open']) > 
-                (current['Open'] - current['Close']) * 1.5):  # Strong move
-                
-                # Check body percentage
-                body_pct = abs(current['Close'] - current['Open']) / (current['High'] - current['Low'])
-                
-                if body_pct >= self.config.OB_MIN_BODY_PERCENTAGE:
-                    # Check volume if available
-                    volume_strength = 1.0
-                    if i > 5:
-                        avg_volume = df['Volume'].iloc[i-5:i].mean()
-                        if current['Volume'] > avg_volume * self.config.OB_MIN_VOLUME_MULTIPLIER:
-                            volume_strength = 1.5
-                    
-                    order_blocks.append(OrderBlock(
-                        start_price=min(current['Open'], current['Close']),
-                        end_price=max(current['Open'], current['Close']),
-                        timestamp=df.index[i],
-                        type='bullish',
-                        strength=0.8 * volume_strength,
-                        tested=0,
-                        active=True
-                    ))
+        open_ = df['Open'].to_numpy(dtype=np.float64)
+        high = df['High'].to_numpy(dtype=np.float64)
+        low = df['Low'].to_numpy(dtype=np.float64)
+        close = df['Close'].to_numpy(dtype=np.float64)
+        
+        # Candidate bars are 2..n-2, each paired with the following candle
+        cur = slice(2, n - 1)
+        nxt = slice(3, n)
+        body = close[cur] - open_[cur]
+        next_body = close[nxt] - open_[nxt]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            body_pct = np.abs(body) / (high[cur] - low[cur])
+        body_ok = body_pct >= self.config.OB_MIN_BODY_PERCENTAGE
+        
+        bullish[cur] = (body < 0) & (next_body > 0) & (next_body > -body * 1.5) & body_ok
+        bearish[cur] = (body > 0) & (next_body < 0) & (-next_body > body * 1.5) & body_ok
+        
+        # Volume strength against the mean of the 5 preceding bars (bars > 5)
+        volume_strength = np.ones(n)
+        if n > 6:
+            volume = df['Volume'].to_numpy(dtype=np.float64)
+            prev_mean = sliding_window_view(volume[:-1], 5).sum(axis=1) / 5  # mean of [i-5, i)
+            strong = volume[6:] > prev_mean[1:] * self.config.OB_MIN_VOLUME_MULTIPLIER
+            volume_strength[6:][strong] = 1.5
+        
+        is_ob = bullish | bearish
+        strength[is_ob] = 0.8 * volume_strength[is_ob]
+        
+        return {'bullish': bullish, 'bearish': bearish, 'strength': strength}
+    
+    def identify_order_blocks(self, df: pd.DataFrame, limit: int = 10) -> List[OrderBlock]:
+        """
+        Identify bullish and bearish order blocks
+        
+        Args:
+            df: DataFrame with OHLCV data
+            limit: Number of most recent order blocks to return
             
-            # Bearish order block: Up candle followed by strong down move
-            elif (current['Close'] > current['Open'] and  # Up candle
-                  next_candle['Close'] < next_candle['Open'] and  # Down candle
-                  (next_candle['Open'] - next_candle['Close']) > 
-                  (current['Close'] - current['Open']) * 1.5):  # Strong move
-                
-                body_pct = abs(current['Close'] - current['Open']) / (current['High'] - current['Low'])
-                
-                if body_pct >= self.config.OB_MIN_BODY_PERCENTAGE:
-                    volume_strength = 1.0
-                    if i > 5:
-                        avg_volume = df['Volume'].iloc[i-5:i].mean()
-                        if current['Volume'] > avg_volume * self.config.OB_MIN_VOLUME_MULTIPLIER:
-                            volume_strength = 1.5
-                    
-                    order_blocks.append(OrderBlock(
-                        start_price=min(current['Open'], current['Close']),
-                        end_price=max(current['Open'], current['Close']),
-                        timestamp=df.index[i],
-                        type='bearish',
-                        strength=0.8 * volume_strength,
-                        tested=0,
-                        active=True
-                    ))
+        Returns:
+            List of OrderBlock objects, most recent first
+        """
+        masks = self.detect_order_block_mask(df)
+        positions = np.flatnonzero(masks['bullish'] | masks['bearish'])
+        if len(positions) == 0:
+            return []
+        
+        selected = positions[_most_recent(df.index.values, positions, limit)]
         
-        # Keep only most recent and untested order blocks
-        return sorted(order_blocks, key=lambda x: x.timestamp, reverse=True)[:10]
+        open_ = df['Open'].to_numpy()
+        close = df['Close'].to_numpy()
+        bullish = masks['bullish']
+        strength = masks['strength']
+        
+        return [
+            OrderBlock(
+                start_price=min(open_[i], close[i]),
+                end_price=max(open_[i], close[i]),
+                timestamp=df.index[i],
+                type='bullish' if bullish[i] else 'bearish',
+                strength=strength[i],
+                tested=0,
+                active=True
+            )
+            for i in selected.tolist()
+        ]
     
     # ==================== Fair Value Gaps ====================
     
-    def identify_fvg(self, df: pd.DataFrame) -> List[FairValueGap]:
+    def detect_fvg_arrays(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Detect all Fair Value Gaps as parallel arrays
+        
+        A bullish gap is a middle candle whose low clears the highs of both
+        neighbours; a bearish gap is a middle candle whose high sits below
+        both neighbours' lows. Fill is measured from the side the third
+        candle leaves price on, using the running extreme of all bars after
+        the pattern completes (a reverse cumulative max/min), so a gap that
+        was filled and later left behind still reports as filled.
+        
+        Returns:
+            Dict with 'index' (middle candle position), 'bottom', 'top',
+            'bullish' (bool) and 'filled' (0..1) arrays, ordered by position
+        """
+        n = len(df)
+        if n < 3:
+            empty = np.array([], dtype=np.float64)
+            return {
+                'index': np.array([], dtype=np.int64),
+                'bottom': empty, 'top': empty,
+                'bullish': np.array([], dtype=bool), 'filled': empty
+            }
+        
+        high = df['High'].to_numpy(dtype=np.float64)
+        low = df['Low'].to_numpy(dtype=np.float64)
+        
+        prev_high, next_high = high[:-2], high[2:]
+        prev_low, next_low = low[:-2], low[2:]
+        mid_high, mid_low = high[1:-1], low[1:-1]
+        
+        bull = (mid_low > prev_high) & (mid_low > next_high)
+        bear = ~bull & (mid_high < prev_low) & (mid_high < next_low)
+        
+        gap = bull | bear
+        index = np.flatnonzero(gap) + 1
+        is_bull = bull[gap]
+        bottom = np.where(is_bull, np.maximum(prev_high, next_high)[gap], mid_high[gap])
+        top = np.where(is_bull, mid_low[gap], np.minimum(prev_low, next_low)[gap])
+        
+        # Running extremes of every bar after the third candle (pad = no bars)
+        after_high = np.append(np.maximum.accumulate(high[::-1])[::-1], -np.inf)
+        after_low = np.append(np.minimum.accumulate(low[::-1])[::-1], np.inf)
+        start = index + 2
+        
+        # Bullish gaps are left from below and fill upwards; bearish the reverse
+        with np.errstate(invalid='ignore'):
+            penetration = np.where(
+                is_bull,
+                after_high[start] - bottom,
+                top - after_low[start]
+            )
+        filled = np.clip(penetration / (top - bottom), 0.0, 1.0)
+        
+        return {
+            'index': index,
+            'bottom': bottom,
+            'top': top,
+            'bullish': is_bull,
+            'filled': filled
+        }
+    
+    def identify_fvg(self, df: pd.DataFrame, limit: int = 10) -> List[FairValueGap]:
         """
         Identify Fair Value Gaps (imbalances)
         
+        Args:
+            df: DataFrame with OHLCV data
+            limit: Number of most recent gaps to return
+            
         Returns:
-            List of FairValueGap objects
+            List of FairValueGap objects, most recent first
         """
-        fvgs = []
+        gaps = self.detect_fvg_arrays(df)
+        if len(gaps['index']) == 0:
+            return []
+        
+        rows = _most_recent(df.index.values, gaps['index'], limit)
+        positions = gaps['index'][rows]
+        
+        high = df['High'].to_numpy()
+        low = df['Low'].to_numpy()
         
-        for i in range(1, len(df) - 1):
-            prev_candle = df.iloc[i - 1]
-            current = df.iloc[i]
-            next_candle = df.iloc[i + 1]
+        fvgs = []
+        for row, i in zip(rows.tolist(), positions.tolist()):
+            bullish = bool(gaps['bullish'][row])
+            bottom = gaps['bottom'][row]
+            top = gaps['top'][row]
+            filled = gaps['filled'][row]
             
-            # Bullish FVG: Gap between prev low and next high
-            if current['Low'] > prev_candle['High'] and current['Low'] > next_candle['High']:
-                gap_size = current['Low'] - max(prev_candle['High'], next_candle['High'])
-                
-                if gap_size > 0:  # Positive gap
-                    fvgs.append(FairValueGap(
-                        start_price=max(prev_candle['High'], next_candle['High']),
-                        end_price=current['Low'],
-                        timestamp=df.index[i],
-                        filled_percentage=0.0,
-                        active=True
-                    ))
+            mitigated_at = None
+            if filled >= 1.0:
+                after = high[i + 2:] >= top if bullish else low[i + 2:] <= bottom
+                if after.any():
+                    mitigated_at = df.index[i + 2 + int(np.argmax(after))]
             
-            # Bearish FVG: Gap between prev high and next low
-            elif current['High'] < prev_candle['Low'] and current['High'] < next_candle['Low']:
-                gap_size = min(prev_candle['Low'], next_candle['Low']) - current['High']
-                
-                if gap_size > 0:  # Positive gap
-                    fvgs.append(FairValueGap(
-                        start_price=current['High'],
-                        end_price=min(prev_candle['Low'], next_candle['Low']),
-                        timestamp=df.index[i],
-                        filled_percentage=0.0,
-                        active=True
-                    ))
+            fvgs.append(FairValueGap(
+                start_price=bottom,
+                end_price=top,
+                timestamp=df.index[i],
+                filled_percentage=float(filled),
+                active=bool(filled < 1.0),
+                type='bullish' if bullish else 'bearish',
+                mitigated_at=mitigated_at
+            ))
         
-        # Check which FVGs have been filled
-        current_price = df['Close'].iloc[-1]
-        for fvg in fvgs:
-            if fvg.start_price < current_price < fvg.end_price:
-                # Calculate fill percentage
-                fvg.filled_percentage = abs(current_price - fvg.start_price) / abs(fvg.end_price - fvg.start_price)
-            elif current_price >= fvg.end_price or current_price <= fvg.start_price:
-                fvg.filled_percentage = 1.0
-                fvg.active = False
-        
-        return sorted(fvgs, key=lambda x: x.timestamp, reverse=True)[:10]
+        return fvgs
     
     # ==================== Liquidity Analysis ====================
     
-    def identify_liquidity_zones(self, df: pd.DataFrame) -> List[LiquidityZone]:
+    def _liquidity_tolerance(self, df: pd.DataFrame, use_atr: bool) -> Tuple[float, bool]:
+        """
+        Tolerance for treating swing levels as equal
+        
+        Returns:
+            Tuple of (tolerance, relative); relative tolerances are a
+            fraction of price, absolute ones are in price units
+        """
+        if not use_atr:
+            return self.config.LIQUIDITY_TOLERANCE, True
+        
+        atr = self._atr_series(df).iloc[-1]
+        
+        if not np.isfinite(atr) or atr <= 0:
+            return self.config.LIQUIDITY_TOLERANCE, True
+        return atr * self.config.LIQUIDITY_ATR_MULTIPLIER, False
+    
+    def _atr_series(self, df: pd.DataFrame) -> pd.Series:
+        """Wilder ATR over LIQUIDITY_ATR_PERIOD bars"""
+        period = self.config.LIQUIDITY_ATR_PERIOD
+        prev_close = df['Close'].shift(1)
+        true_range = pd.concat([
+            df['High'] - df['Low'],
+            (df['High'] - prev_close).abs(),
+            (df['Low'] - prev_close).abs()
+        ], axis=1).max(axis=1)
+        return true_range.ewm(alpha=1.0 / period, adjust=False).mean()
+    
+    def identify_liquidity_zones(
+        self,
+        df: pd.DataFrame,
+        use_atr_tolerance: Optional[bool] = None
+    ) -> List[LiquidityZone]:
         """
         Identify liquidity pools (equal highs/lows)
         
+        Swing prices are sorted and swept once: each level opens a cluster
+        that absorbs the following levels while they stay within tolerance
+        of it, so every price level produces at most one zone.
+        
+        Args:
+            df: DataFrame with OHLCV data
+            use_atr_tolerance: Use an ATR-relative tolerance instead of the
+                percentage one (defaults to LIQUIDITY_USE_ATR_TOLERANCE)
+            
         Returns:
-            List of LiquidityZone objects
+            List of LiquidityZone objects (resistance first, then support,
+            each in ascending price order)
         """
+        if use_atr_tolerance is None:
+            use_atr_tolerance = self.config.LIQUIDITY_USE_ATR_TOLERANCE
+        
         swings = self.identify_swing_points(df)
+        tolerance, relative = self._liquidity_tolerance(df, use_atr_tolerance)
+        return self._zones_from_levels(
+            swings['high_prices'], swings['low_prices'], tolerance, relative
+        )
+    
+    def _zones_from_levels(
+        self,
+        high_prices: np.ndarray,
+        low_prices: np.ndarray,
+        tolerance: float,
+        relative: bool
+    ) -> List[LiquidityZone]:
+        """Cluster swing high/low prices into resistance/support zones"""
         liquidity_zones = []
-        
-        # Find equal highs (resistance)
-        highs = swings['highs']
-        for i in range(len(highs) - 1):
-            for j in range(i + 1, len(highs)):
-                price_diff = abs(highs[i].price - highs[j].price)
-                avg_price = (highs[i].price + highs[j].price) / 2
-                
-                # If prices are within small tolerance (equal highs)
-                if price_diff / avg_price < 0.001:  # 0.1% tolerance
-                    # Count touches at this level
-                    touches = sum(1 for h in highs if abs(h.price - avg_price) / avg_price < 0.001)
-                    
-                    if touches >= self.config.LIQUIDITY_MIN_TOUCHES:
-                        liquidity_zones.append(LiquidityZone(
-                            price=avg_price,
-                            type='resistance',
-                            strength=min(touches / 5.0, 1.0),
-                            touches=touches
-                        ))
-                    break
-        
-        # Find equal lows (support)
-        lows = swings['lows']
-        for i in range(len(lows) - 1):
-            for j in range(i + 1, len(lows)):
-                price_diff = abs(lows[i].price - lows[j].price)
-                avg_price = (lows[i].price + lows[j].price) / 2
-                
-                if price_diff / avg_price < 0.001:
-                    touches = sum(1 for l in lows if abs(l.price - avg_price) / avg_price < 0.001)
-                    
-                    if touches >= self.config.LIQUIDITY_MIN_TOUCHES:
-                        liquidity_zones.append(LiquidityZone(
-                            price=avg_price,
-                            type='support',
-                            strength=min(touches / 5.0, 1.0),
-                            touches=touches
-                        ))
-                    break
+        for prices, zone_type in ((high_prices, 'resistance'), (low_prices, 'support')):
+            for price, touches in self.kernels.cluster_levels(prices, tolerance, relative):
+                if touches >= self.config.LIQUIDITY_MIN_TOUCHES:
+                    liquidity_zones.append(LiquidityZone(
+                        price=price,
+                        type=zone_type,
+                        strength=min(touches / 5.0, 1.0),
+                        touches=touches
+                    ))
         
         return liquidity_zones
     
-    def detect_stop_hunts(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+    def detect_stop_hunts(self, df: pd.DataFrame, limit: int = 5) -> List[Dict[str, Any]]:
         """
         Detect potential stop hunts (wicks through liquidity)
         
-        Returns:
-            List of stop hunt events
-        """
-        stop_hunts = []
-        liquidity_zones = self.identify_liquidity_zones(df)
+        A bar hunts a resistance zone when the zone price lies strictly
+        between its close and high (and a support zone when it lies between
+        its low and close) with a wick of more than 60% of the bar range.
+        Zone prices are sorted once, so the matches for every bar are
+        counted with two binary searches instead of a bars x zones scan,
+        and bars are scanned backwards only until ``limit`` events are found.
         
-        for i in range(len(df)):
-            candle = df.iloc[i]
+        Args:
+            df: DataFrame with OHLCV data
+            limit: Number of most recent events to return
             
-            # Check for wick through resistance (bearish stop hunt)
-            for zone in liquidity_zones:
-                if zone.type == 'resistance':
-                    if (candle['High'] > zone.price and 
-                        candle['Close'] < zone.price and
-                        (candle['High'] - candle['Close']) / (candle['High'] - candle['Low']) > 0.6):
-                        
-                        stop_hunts.append({
-                            'type': 'bearish_stop_hunt',
-                            'price': zone.price,
-                            'wick_high': candle['High'],
-                            'close': candle['Close'],
-                            'timestamp': df.index[i]
-                        })
-                
-                # Check for wick through support (bullish stop hunt)
-                elif zone.type == 'support':
-                    if (candle['Low'] < zone.price and 
-                        candle['Close'] > zone.price and
-                        (candle['Close'] - candle['Low']) / (candle['High'] - candle['Low']) > 0.6):
-                        
-                        stop_hunts.append({
-                            'type': 'bullish_stop_hunt',
-                            'price': zone.price,
-                            'wick_low': candle['Low'],
-                            'close': candle['Close'],
-                            'timestamp': df.index[i]
-                        })
-        
-        return stop_hunts[-5:]  # Return last 5
+        Returns:
+            List of stop hunt events, oldest first
+        """
+        return _stop_hunt_events(
+            df['High'].to_numpy(dtype=np.float64),
+            df['Low'].to_numpy(dtype=np.float64),
+            df['Close'].to_numpy(dtype=np.float64),
+            df.index,
+            self.identify_liquidity_zones(df),
+            limit
+        )
     
     # ==================== Premium/Discount Analysis ====================
     
@@ -483,8 +753,16 @@ class SMCAnalyzer:
         swing_high = max(swings['highs'], key=lambda x: x.price).price
         swing_low = min(swings['lows'], key=lambda x: x.price).price
         
+        return self._premium_discount_from_range(swing_high, swing_low, df['Close'].iloc[-1])
+    
+    def _premium_discount_from_range(
+        self,
+        swing_high: float,
+        swing_low: float,
+        current_price: float
+    ) -> Dict[str, Any]:
+        """Fibonacci premium/discount levels for a swing range"""
         range_size = swing_high - swing_low
-        current_price = df['Close'].iloc[-1]
         
         # Calculate Fibonacci levels
         levels = {
@@ -521,6 +799,301 @@ class SMCAnalyzer:
             'swing_low': swing_low
         }
     
+    # ==================== Per-bar History ====================
+    
+    def analyze_history(self, df: pd.DataFrame, limit: int = 10) -> pd.DataFrame:
+        """
+        Per-bar SMC state aligned to ``df`` for ML feature generation
+        
+        Row t describes what analyze() would report on df.iloc[:t + 1]: a
+        swing at bar i only counts from bar i + SWING_LOOKBACK, an order
+        block from the candle after it and a gap from its third candle, so
+        no column looks ahead. Every detector runs once over the whole
+        frame and the per-bar state is recovered with prefix scans and
+        binary searches instead of re-running the analysis per bar.
+        
+        Columns:
+            smc_trend: 1 bullish, -1 bearish, 0 neutral/undefined structure
+            smc_bars_since_bos: Bars since the latest BOS swing in the
+                current trend direction (NaN if none)
+            smc_bars_since_choch: Bars since the latest ChOCh swing (NaN if none)
+            smc_bullish_obs / smc_bearish_obs: Order blocks among the
+                ``limit`` most recent that no close has broken through yet
+            smc_fvg_distance: Signed distance from close to the nearest
+                unfilled gap among the ``limit`` most recent, as a fraction
+                of close (positive above, 0 inside, NaN if none)
+            smc_liquidity_distance: Signed distance from close to the
+                nearest equal-high/low swing level, as a fraction of close
+                (NaN if none)
+            smc_pd_position: Close within the swing range (0 = swing low,
+                1 = swing high), as in calculate_premium_discount()
+        
+        Args:
+            df: DataFrame with OHLCV data
+            limit: Recent order blocks/gaps considered per bar (matches the
+                analyze() output size)
+            
+        Returns:
+            DataFrame indexed like ``df``
+        """
+        n = len(df)
+        bars = np.arange(n)
+        close = df['Close'].to_numpy(dtype=np.float64)
+        lag = self.config.SWING_LOOKBACK  # bars until a swing is confirmed
+        
+        swings = self.identify_swing_points(df)
+        high_idx, high_prices = swings['high_indices'], swings['high_prices']
+        low_idx, low_prices = swings['low_indices'], swings['low_prices']
+        high_count = np.searchsorted(high_idx + lag, bars, side='right')
+        low_count = np.searchsorted(low_idx + lag, bars, side='right')
+        sufficient = (high_count >= 2) & (low_count >= 2)
+        
+        history = {
+            'smc_trend': self._trend_history(
+                high_prices, low_prices, high_count, low_count, sufficient
+            )
+        }
+        history.update(self._event_history(swings, bars, history['smc_trend'], sufficient))
+        history.update(self._order_block_history(df, bars, limit))
+        history['smc_fvg_distance'] = self._fvg_history(df, bars, limit)
+        history['smc_liquidity_distance'] = self._liquidity_history(df, swings)
+        
+        # Premium/discount: running extremes of the confirmed swings
+        position = np.full(n, np.nan)
+        known = (high_count > 0) & (low_count > 0)
+        if known.any():
+            swing_high = np.maximum.accumulate(high_prices)[high_count[known] - 1]
+            swing_low = np.minimum.accumulate(low_prices)[low_count[known] - 1]
+            range_size = swing_high - swing_low
+            with np.errstate(divide='ignore', invalid='ignore'):
+                position[known] = np.where(
+                    range_size > 0, (close[known] - swing_low) / range_size, 0.5
+                )
+        history['smc_pd_position'] = position
+        
+        return pd.DataFrame(history, index=df.index)
+    
+    def _trend_history(
+        self,
+        high_prices: np.ndarray,
+        low_prices: np.ndarray,
+        high_count: np.ndarray,
+        low_count: np.ndarray,
+        sufficient: np.ndarray
+    ) -> np.ndarray:
+        """Per-bar structure trend from the last three confirmed swings per side"""
+        def rising_pairs(prices: np.ndarray) -> np.ndarray:
+            # Rises among the last three swings once the k-th swing is known
+            rises = np.zeros(len(prices), dtype=np.int64)
+            rises[1:] = prices[1:] > prices[:-1]
+            rises[1:] += rises[:-1].copy()
+            return rises
+        
+        trend = np.zeros(len(high_count), dtype=np.int64)
+        if not sufficient.any():
+            return trend
+        
+        higher_highs = rising_pairs(high_prices)[high_count[sufficient] - 1]
+        higher_lows = rising_pairs(low_prices)[low_count[sufficient] - 1]
+        trend[sufficient] = np.select(
+            [(higher_highs >= 2) & (higher_lows >= 2), (higher_highs == 0) & (higher_lows == 0)],
+            [1, -1],
+            0
+        )
+        return trend
+    
+    def _event_history(
+        self,
+        swings: Dict[str, Any],
+        bars: np.ndarray,
+        trend: np.ndarray,
+        sufficient: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """Bars since the latest BOS/ChOCh, following detect_bos_choch()"""
+        since_bos = np.full(len(bars), np.nan)
+        since_choch = np.full(len(bars), np.nan)
+        
+        # Merged swing sequence, highs before lows on the same bar
+        seq_bar = np.concatenate([swings['high_indices'], swings['low_indices']])
+        seq_price = np.concatenate([swings['high_prices'], swings['low_prices']])
+        seq_is_high = np.concatenate([
+            np.ones(len(swings['high_indices']), dtype=bool),
+            np.zeros(len(swings['low_indices']), dtype=bool)
+        ])
+        order = np.argsort(seq_bar, kind='stable')
+        seq_bar, seq_price, seq_is_high = seq_bar[order], seq_price[order], seq_is_high[order]
+        if len(seq_bar) < 2:
+            return {'smc_bars_since_bos': since_bos, 'smc_bars_since_choch': since_choch}
+        
+        def latest(flags: np.ndarray) -> np.ndarray:
+            return np.maximum.accumulate(np.where(flags, np.arange(len(flags)), -1))
+        
+        rising = np.zeros(len(seq_bar), dtype=bool)
+        falling = np.zeros(len(seq_bar), dtype=bool)
+        rising[1:] = seq_price[1:] > seq_price[:-1]
+        falling[1:] = seq_price[1:] < seq_price[:-1]
+        changed = np.zeros(len(seq_bar), dtype=bool)
+        changed[2:] = seq_is_high[2:] != seq_is_high[1:-1]
+        
+        seq_count = np.searchsorted(seq_bar + self.config.SWING_LOOKBACK, bars, side='right')
+        last = np.maximum(seq_count - 1, 0)
+        
+        # BOS direction follows the trend at each bar, as in detect_bos_choch()
+        bos = np.where(
+            trend == 1, latest(rising & seq_is_high)[last],
+            np.where(trend == -1, latest(falling & ~seq_is_high)[last], -1)
+        )
+        choch = np.where(sufficient, latest(changed)[last], -1)
+        
+        since_bos[bos >= 0] = bars[bos >= 0] - seq_bar[bos[bos >= 0]]
+        since_choch[choch >= 0] = bars[choch >= 0] - seq_bar[choch[choch >= 0]]
+        return {'smc_bars_since_bos': since_bos, 'smc_bars_since_choch': since_choch}
+    
+    def _recent_slots(self, known_at: np.ndarray, bars: np.ndarray, limit: int) -> np.ndarray:
+        """
+        Positions of the ``limit`` most recent items known at each bar
+        
+        Returns:
+            (bars x limit) int array, -1 where fewer items are known
+        """
+        count = np.searchsorted(known_at, bars, side='right')
+        slots = count[:, None] - 1 - np.arange(limit)[None, :]
+        return np.where(slots >= 0, slots, -1)
+    
+    def _order_block_history(
+        self,
+        df: pd.DataFrame,
+        bars: np.ndarray,
+        limit: int
+    ) -> Dict[str, np.ndarray]:
+        """Counts of unbroken bullish/bearish order blocks per bar"""
+        masks = self.detect_order_block_mask(df)
+        positions = np.flatnonzero(masks['bullish'] | masks['bearish'])
+        if len(positions) == 0:
+            zeros = np.zeros(len(bars), dtype=np.int64)
+            return {'smc_bullish_obs': zeros, 'smc_bearish_obs': zeros.copy()}
+        is_bull = masks['bullish'][positions]
+        
+        open_ = df['Open'].to_numpy(dtype=np.float64)
+        close = df['Close'].to_numpy(dtype=np.float64)
+        bottom = np.minimum(open_[positions], close[positions])
+        top = np.maximum(open_[positions], close[positions])
+        
+        # A block is broken by the first close through it after the confirming candle
+        broken_at = np.where(
+            is_bull,
+            self.kernels.first_crossing(close, positions + 2, bottom, 'below'),
+            self.kernels.first_crossing(close, positions + 2, top, 'above')
+        )
+        
+        slots = self._recent_slots(positions + 1, bars, limit)
+        valid = slots >= 0
+        rows = np.where(valid, slots, 0)
+        active = valid & (broken_at[rows] > bars[:, None])
+        
+        return {
+            'smc_bullish_obs': (active & is_bull[rows]).sum(axis=1),
+            'smc_bearish_obs': (active & ~is_bull[rows]).sum(axis=1),
+        }
+    
+    def _fvg_history(self, df: pd.DataFrame, bars: np.ndarray, limit: int) -> np.ndarray:
+        """Signed distance from close to the nearest unfilled recent gap"""
+        distance = np.full(len(bars), np.nan)
+        gaps = self.detect_fvg_arrays(df)
+        index = gaps['index']
+        if len(index) == 0:
+            return distance
+        
+        high = df['High'].to_numpy(dtype=np.float64)
+        low = df['Low'].to_numpy(dtype=np.float64)
+        close = df['Close'].to_numpy(dtype=np.float64)
+        bottom, top, is_bull = gaps['bottom'], gaps['top'], gaps['bullish']
+        
+        # Fully filled on the first bar reaching the far edge (see identify_fvg);
+        # nudging the edge by one ulp turns the strict crossing into >= / <=
+        filled_at = np.where(
+            is_bull,
+            self.kernels.first_crossing(high, index + 2, np.nextafter(top, -np.inf), 'above'),
+            self.kernels.first_crossing(low, index + 2, np.nextafter(bottom, np.inf), 'below')
+        )
+        
+        slots = self._recent_slots(index + 1, bars, limit)
+        rows = np.where(slots >= 0, slots, 0)
+        active = (slots >= 0) & (filled_at[rows] > bars[:, None])
+        
+        price = close[:, None]
+        offset = np.where(
+            price < bottom[rows], bottom[rows] - price,
+            np.where(price > top[rows], top[rows] - price, 0.0)
+        )
+        offset = np.where(active, offset, np.inf)
+        nearest = np.argmin(np.abs(offset), axis=1)
+        best = offset[bars, nearest]
+        
+        found = np.isfinite(best)
+        distance[found] = best[found] / close[found]
+        return distance
+    
+    def _liquidity_history(self, df: pd.DataFrame, swings: Dict[str, Any]) -> np.ndarray:
+        """
+        Signed distance from close to the nearest equal-high/low level
+        
+        A confirmed swing becomes a liquidity level once another swing on
+        the same side lies within the liquidity tolerance of it (the pairwise
+        form of the clustering in identify_liquidity_zones). Levels are
+        inserted as they are confirmed and each run of bars between
+        insertions is answered with one binary search.
+        """
+        n = len(df)
+        close = df['Close'].to_numpy(dtype=np.float64)
+        distance = np.full(n, np.nan)
+        lag = self.config.SWING_LOOKBACK
+        
+        atr = None
+        if self.config.LIQUIDITY_USE_ATR_TOLERANCE:
+            atr = self._atr_series(df).to_numpy() * self.config.LIQUIDITY_ATR_MULTIPLIER
+        
+        def within(a: float, b: float, confirmed: int) -> bool:
+            if atr is not None and np.isfinite(atr[confirmed]) and atr[confirmed] > 0:
+                return abs(a - b) < atr[confirmed]
+            return abs(a - b) < min(a, b) * self.config.LIQUIDITY_TOLERANCE
+        
+        insertions = []  # (bar, price)
+        for indices, prices in ((swings['high_indices'], swings['high_prices']),
+                                (swings['low_indices'], swings['low_prices'])):
+            seen: List[float] = []
+            paired = set()
+            for i, price in zip(indices.tolist(), prices.tolist()):
+                confirmed = i + lag
+                pos = bisect.bisect_left(seen, price)
+                for neighbour in (pos - 1, pos):
+                    if 0 <= neighbour < len(seen) and within(price, seen[neighbour], confirmed):
+                        for level in (price, seen[neighbour]):
+                            if level not in paired:
+                                paired.add(level)
+                                insertions.append((confirmed, level))
+                seen.insert(pos, price)
+        
+        if not insertions:
+            return distance
+        insertions.sort(key=lambda item: item[0])
+        
+        levels = np.array([], dtype=np.float64)
+        boundaries = [bar for bar, _ in insertions] + [n]
+        for k, (bar, level) in enumerate(insertions):
+            levels = np.insert(levels, np.searchsorted(levels, level), level)
+            segment = slice(min(bar, n), min(boundaries[k + 1], n))
+            if segment.start >= segment.stop:
+                continue
+            price = close[segment]
+            pos = np.searchsorted(levels, price)
+            below = levels[np.maximum(pos - 1, 0)]
+            above = levels[np.minimum(pos, len(levels) - 1)]
+            nearest = np.where(np.abs(above - price) < np.abs(price - below), above, below)
+            distance[segment] = (nearest - price) / price
+        
+        return distance
+    
     # ==================== Comprehensive SMC Analysis ====================
     
     def analyze(self, df: pd.DataFrame) -> Dict[str, Any]:
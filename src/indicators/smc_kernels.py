@@ -0,0 +1,339 @@
+"""
+SMC Kernels
+Interchangeable NumPy and JIT-compiled implementations of the SMC hot loops
+"""
+import numpy as np
+from typing import List, Tuple, Optional
+from numpy.lib.stride_tricks import sliding_window_view
+try:
+    import numba
+except Exception:  # pragma: no cover
+    numba = None
+
+from src.utils.logger import get_logger
+
+logger = get_logger()
+
+BACKENDS = ('numpy', 'numba')
+
+
+# ==================== NumPy Kernels ====================
+
+def _window_extreme(values: np.ndarray, window: int, kind: str) -> np.ndarray:
+    """Rolling max/min over every full window of ``values``"""
+    windows = sliding_window_view(values, window)
+    return windows.max(axis=1) if kind == 'high' else windows.min(axis=1)
+
+
+def _swing_mask(values: np.ndarray, left: int, right: int, kind: str) -> np.ndarray:
+    """
+    Boolean mask of strict swing highs/lows
+
+    Bar i qualifies when values[i] is strictly above (kind='high') or below
+    (kind='low') every value in [i - left, i + right] except itself. The
+    left and right neighbourhoods are reduced separately with sliding
+    windows, so the cost is a handful of vectorized passes over the array.
+    """
+    n = len(values)
+    mask = np.zeros(n, dtype=bool)
+    if n < left + right + 1:
+        return mask
+
+    centre = values[left:n - right]
+    fill = -np.inf if kind == 'high' else np.inf
+
+    if left > 0:
+        left_ext = _window_extreme(values[:n - right - 1], left, kind)
+    else:
+        left_ext = np.full(len(centre), fill)
+    if right > 0:
+        right_ext = _window_extreme(values[left + 1:], right, kind)
+    else:
+        right_ext = np.full(len(centre), fill)
+
+    if kind == 'high':
+        mask[left:n - right] = centre > np.maximum(left_ext, right_ext)
+    else:
+        mask[left:n - right] = centre < np.minimum(left_ext, right_ext)
+    return mask
+
+
+# Positions scanned per step of the blocked crossing search
+_SCAN_BLOCK = 64
+
+
+def _first_crossing(
+    values: np.ndarray,
+    starts: np.ndarray,
+    levels: np.ndarray,
+    kind: str
+) -> np.ndarray:
+    """
+    First position k >= starts[q] where values[k] crosses levels[q]
+
+    Crossing means values[k] < level (kind='below') or values[k] > level
+    (kind='above'). Every query scans the rest of its block of _SCAN_BLOCK
+    values, finds the first later block whose extreme crosses with the
+    same search over the block extremes, and scans that block. All queries
+    advance together in vectorized steps, and the extra memory is the
+    block extremes (n / _SCAN_BLOCK values per level).
+
+    Returns:
+        Int array of positions, len(values) where no crossing occurs
+    """
+    starts = np.asarray(starts, dtype=np.int64)
+    below = kind == 'below'
+    return _first_crossing_blocked(values, starts, np.asarray(levels, dtype=np.float64), below)
+
+
+def _first_crossing_blocked(values: np.ndarray, starts: np.ndarray, levels: np.ndarray, below: bool) -> np.ndarray:
+    n = len(values)
+    crosses = np.less if below else np.greater
+    if n == 0 or len(starts) == 0:
+        return np.full(len(starts), n, dtype=np.int64)
+    pos = np.maximum(starts, n)
+
+    def scan(queries: np.ndarray, first: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        # Step through [first, ends); returns the queries without a crossing
+        searching = np.ones(len(queries), dtype=bool)
+        for offset in range(_SCAN_BLOCK):
+            k = first + offset
+            step = np.flatnonzero(searching & (k < ends))
+            if not len(step):
+                break
+            hit = step[crosses(values[k[step]], levels[queries[step]])]
+            pos[queries[hit]] = k[hit]
+            searching[hit] = False
+        return queries[searching]
+
+    # The rest of each start's own block
+    queries = np.flatnonzero(starts < n)
+    block_starts = starts[queries]
+    queries = scan(queries, block_starts, np.minimum((block_starts // _SCAN_BLOCK + 1) * _SCAN_BLOCK, n))
+    if not len(queries) or n <= _SCAN_BLOCK:
+        return pos
+
+    # The first later block whose extreme crosses holds the crossing
+    extremes = (np.fmin if below else np.fmax).reduceat(values, np.arange(0, n, _SCAN_BLOCK))
+    blocks = _first_crossing_blocked(extremes, starts[queries] // _SCAN_BLOCK + 1, levels[queries], below)
+    found = blocks < len(extremes)
+    queries, first = queries[found], blocks[found] * _SCAN_BLOCK
+    scan(queries, first, np.minimum(first + _SCAN_BLOCK, n))
+    return pos
+
+
+def _cluster_starts(levels: np.ndarray, tolerance: float, relative: bool) -> np.ndarray:
+    """
+    Start positions of the anchored clusters in sorted ``levels``
+
+    Each cluster is anchored at its lowest level and absorbs every following
+    level closer than the tolerance (a fraction of the anchor price when
+    ``relative``).
+    """
+    starts = [0] if len(levels) else []
+    start = 0
+    for k in range(1, len(levels)):
+        anchor = levels[start]
+        width = anchor * tolerance if relative else tolerance
+        if not levels[k] - anchor < width:
+            start = k
+            starts.append(k)
+    return np.array(starts, dtype=np.int64)
+
+
+# ==================== Loop Kernels ====================
+
+# Plain Python loops written for numba's nopython mode. They are compiled
+# when numba is installed and otherwise only used to check parity.
+
+def _swing_mask_loop(values, left, right, is_high):
+    n = len(values)
+    mask = np.zeros(n, dtype=np.bool_)
+    for i in range(left, n - right):
+        centre = values[i]
+        ok = centre > -np.inf if is_high else centre < np.inf
+        j = i - left
+        while ok and j <= i + right:
+            if j != i:
+                ok = centre > values[j] if is_high else centre < values[j]
+            j += 1
+        mask[i] = ok
+    return mask
+
+
+def _first_crossing_loop(values, starts, levels, below):
+    """
+    Offline next-crossing search with a monotonic stack
+
+    Walking backwards, the stack holds the chain of successive record
+    values (new lows for 'below', new highs for 'above') starting at the
+    current bar, so each query is one binary search over the chain.
+    """
+    n = len(values)
+    q = len(starts)
+    result = np.full(q, n, dtype=np.int64)
+    order = np.argsort(-starts, kind='mergesort')
+
+    sign = 1.0 if below else -1.0
+    stack_pos = np.empty(n, dtype=np.int64)
+    stack_val = np.empty(n, dtype=np.float64)  # ascending from the bottom
+    size = 0
+
+    k = n
+    for o in range(q):
+        query = order[o]
+        start = starts[query]
+        while k > start:
+            k -= 1
+            value = sign * values[k]
+            while size > 0 and stack_val[size - 1] >= value:
+                size -= 1
+            stack_pos[size] = k
+            stack_val[size] = value
+            size += 1
+        if start >= n:
+            result[query] = start
+            continue
+
+        # Deepest stack entry (nearest bar) below the level
+        target = sign * levels[query]
+        lo, hi = 0, size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if stack_val[mid] < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo > 0:
+            result[query] = stack_pos[lo - 1]
+    return result
+
+
+def _cluster_starts_loop(levels, tolerance, relative):
+    starts = np.empty(len(levels), dtype=np.int64)
+    count = 0
+    start = 0
+    for k in range(len(levels)):
+        if k == 0:
+            starts[count] = 0
+            count += 1
+            continue
+        anchor = levels[start]
+        width = anchor * tolerance if relative else tolerance
+        if not levels[k] - anchor < width:
+            start = k
+            starts[count] = k
+            count += 1
+    return starts[:count]
+
+
+# ==================== Backends ====================
+
+class SMCKernels:
+    """
+    A set of SMC kernels sharing one calling convention
+
+    The NumPy backend runs whole-array passes; the numba backend runs the
+    same logic as compiled loops, which wins on the inherently sequential
+    parts (cluster sweeps, crossing searches) and on very long frames.
+    """
+
+    def __init__(self, name: str, swing_mask, first_crossing, cluster_starts):
+        self.name = name
+        self._swing_mask = swing_mask
+        self._first_crossing = first_crossing
+        self._cluster_starts = cluster_starts
+
+    def swing_mask(self, values: np.ndarray, left: int, right: int, kind: str) -> np.ndarray:
+        """Boolean mask of strict swing highs (kind='high') or lows"""
+        return self._swing_mask(np.ascontiguousarray(values, dtype=np.float64), left, right, kind)
+
+    def first_crossing(
+        self,
+        values: np.ndarray,
+        starts: np.ndarray,
+        levels: np.ndarray,
+        kind: str
+    ) -> np.ndarray:
+        """First position k >= start where values[k] goes below/above each level"""
+        return self._first_crossing(
+            np.ascontiguousarray(values, dtype=np.float64),
+            np.ascontiguousarray(starts, dtype=np.int64),
+            np.ascontiguousarray(levels, dtype=np.float64),
+            kind
+        )
+
+    def cluster_levels(
+        self,
+        prices: np.ndarray,
+        tolerance: float,
+        relative: bool = True
+    ) -> List[Tuple[float, int]]:
+        """
+        Sort-and-sweep clustering of price levels
+
+        Returns:
+            List of (mean price, member count) tuples in ascending price order
+        """
+        levels = np.sort(np.asarray(prices, dtype=np.float64))
+        bounds = np.append(self._cluster_starts(levels, float(tolerance), bool(relative)), len(levels))
+        return [
+            (float(levels[start:stop].mean()), int(stop - start))
+            for start, stop in zip(bounds[:-1].tolist(), bounds[1:].tolist())
+        ]
+
+    def __repr__(self) -> str:
+        return f"<SMCKernels backend={self.name}>"
+
+
+def _make_loop_kernels(name: str, compile_loops: bool) -> SMCKernels:
+    """Kernels backed by the loop implementations, optionally JIT-compiled"""
+    swing_loop, crossing_loop, cluster_loop = _swing_mask_loop, _first_crossing_loop, _cluster_starts_loop
+    if compile_loops:
+        jit = numba.njit(cache=True, nogil=True)
+        swing_loop, crossing_loop, cluster_loop = jit(swing_loop), jit(crossing_loop), jit(cluster_loop)
+
+    return SMCKernels(
+        name,
+        swing_mask=lambda values, left, right, kind: swing_loop(values, left, right, kind == 'high'),
+        first_crossing=lambda values, starts, levels, kind: crossing_loop(values, starts, levels, kind == 'below'),
+        cluster_starts=cluster_loop
+    )
+
+
+NUMPY_KERNELS = SMCKernels('numpy', _swing_mask, _first_crossing, _cluster_starts)
+_numba_kernels: Optional[SMCKernels] = None
+
+
+def available_backends() -> List[str]:
+    """Kernel backends usable in this environment"""
+    return list(BACKENDS) if numba is not None else ['numpy']
+
+
+def get_kernels(backend: str = 'auto') -> SMCKernels:
+    """
+    Resolve a kernel backend
+
+    Args:
+        backend: 'auto' (numba when installed, else numpy), 'numba' or 'numpy'
+
+    Returns:
+        SMCKernels instance (numpy when the requested backend is unavailable)
+    """
+    global _numba_kernels
+
+    backend = (backend or 'auto').lower()
+    if backend not in BACKENDS + ('auto',):
+        logger.warning(f"Unknown SMC kernel backend '{backend}', using numpy")
+        return NUMPY_KERNELS
+
+    if backend == 'numpy' or (backend == 'auto' and numba is None):
+        return NUMPY_KERNELS
+
+    if numba is None:
+        logger.warning("numba is not installed, falling back to NumPy SMC kernels")
+        return NUMPY_KERNELS
+
+    if _numba_kernels is None:
+        _numba_kernels = _make_loop_kernels('numba', compile_loops=True)
+    return _numba_kernels
@@ -0,0 +1,614 @@
+"""
+Incremental SMC Analysis
+Stateful, bar-by-bar counterpart of SMCAnalyzer for live updates
+"""
+import bisect
+import itertools
+from collections import deque
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Callable
+
+import numpy as np
+import pandas as pd
+
+from .smc import (
+    SMCAnalyzer,
+    SwingPoint,
+    OrderBlock,
+    FairValueGap,
+    LiquidityZone,
+    _stop_hunt_events,
+)
+from src.utils.logger import get_logger
+
+logger = get_logger()
+
+# Output sizes of the corresponding SMCAnalyzer detectors
+ORDER_BLOCK_LIMIT = 10
+FVG_LIMIT = 10
+STOP_HUNT_LIMIT = 5
+EVENT_LIMIT = 5
+
+
+class _BarBuffer:
+    """
+    Growable OHLCV arrays addressed by absolute bar number
+
+    Bars [start, end) form the analysis window. Storage is compacted (or
+    doubled) only when full, so appends are amortized O(1).
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.base = 0   # absolute bar number stored at position 0
+        self.start = 0  # first bar of the analysis window
+        self.end = 0    # one past the last bar
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int, keep_from: Optional[int] = None):
+        old = getattr(self, 'timestamps', None)
+        arrays = {name: np.empty(capacity) for name in ('open', 'high', 'low', 'close', 'volume')}
+        timestamps = np.empty(capacity, dtype=object)
+
+        if old is not None:
+            src = slice(keep_from - self.base, self.end - self.base)
+            live = self.end - keep_from
+            for name, arr in arrays.items():
+                arr[:live] = getattr(self, name)[src]
+            timestamps[:live] = old[src]
+            self.base = keep_from
+
+        self.open, self.high, self.low = arrays['open'], arrays['high'], arrays['low']
+        self.close, self.volume = arrays['close'], arrays['volume']
+        self.timestamps = timestamps
+
+    def append(self, timestamp, open_: float, high: float, low: float, close: float, volume: float):
+        capacity = len(self.timestamps)
+        if self.end - self.base == capacity:
+            # Keep one bar before the window so an eviction can be undone
+            keep_from = max(self.start - 1, self.base)
+            live = self.end - keep_from
+            self._allocate(capacity * 2 if live > capacity // 2 else capacity, keep_from)
+
+        pos = self.end - self.base
+        self.open[pos] = open_
+        self.high[pos] = high
+        self.low[pos] = low
+        self.close[pos] = close
+        self.volume[pos] = volume
+        self.timestamps[pos] = timestamp
+        self.end += 1
+
+    def pop(self):
+        self.end -= 1
+
+    def pos(self, bar: int) -> int:
+        """Storage position of an absolute bar number"""
+        return bar - self.base
+
+    def window(self, start: Optional[int] = None) -> slice:
+        """Storage slice from ``start`` (default: window start) to the last bar"""
+        return slice((self.start if start is None else start) - self.base, self.end - self.base)
+
+
+class SMCStream:
+    """
+    Incremental Smart Money Concepts analysis
+
+    Maintains swings, market structure, BOS/ChOCh events, order blocks,
+    FVG fill state and liquidity zones as bars arrive, producing the same
+    dict as SMCAnalyzer.analyze() on the current window:
+
+    - update() appends a bar, or revises the still-forming last bar when
+      its timestamp repeats
+    - every update does a constant amount of work (swing confirmation
+      waits for the right-hand lookback, i.e. bar i is checked when bar
+      i + SWING_LOOKBACK arrives)
+    - liquidity zones are re-clustered only when the swing set changes,
+      and stop hunts are rescanned only when the zones change
+
+    With ``max_bars`` set, the window slides like a fixed-size fetch, so
+    results match analyze() on the last ``max_bars`` bars.
+    """
+
+    def __init__(self, analyzer: Optional[SMCAnalyzer] = None, max_bars: Optional[int] = None):
+        """
+        Initialize SMC stream
+
+        Args:
+            analyzer: SMCAnalyzer providing configuration and signal
+                generation (a new one is created if None)
+            max_bars: Sliding window length (None keeps all bars)
+        """
+        self.analyzer = analyzer or SMCAnalyzer()
+        self.config = self.analyzer.config
+        self.max_bars = max_bars
+        self.logger = logger
+        self._versions = itertools.count(1)
+        self.reset()
+
+    def reset(self):
+        """Drop all bars and derived state"""
+        self._buffer = _BarBuffer()
+        self._undo: List[Callable[[], None]] = []
+
+        self._left = self.config.SWING_LOOKBACK
+        self._right = self.config.SWING_LOOKBACK
+
+        # Confirmed swings in the window: (bar, price, timestamp)
+        self._highs: deque = deque()
+        self._lows: deque = deque()
+        # Sorted swing prices for the range and liquidity clustering
+        self._high_levels: List[float] = []
+        self._low_levels: List[float] = []
+        # Merged swing sequence: (seq, bar, type, price, timestamp)
+        self._sequence: deque = deque()
+        self._next_seq = 0
+        self._swing_version = next(self._versions)
+
+        # Candidate structure events keyed by the seq of their second swing
+        self._bullish_bos: deque = deque()
+        self._bearish_bos: deque = deque()
+        self._choch: deque = deque()
+
+        # (bar, type, start_price, end_price, timestamp, high_volume)
+        self._order_blocks: deque = deque()
+        # [bar, bottom, top, bullish, timestamp, reach, mitigated_bar]
+        self._gaps: deque = deque()
+
+        self._zone_cache = None
+        self._hunt_cache = None
+
+    # ==================== Journaled Mutations ====================
+
+    # Every state change made while processing a bar records its inverse,
+    # so a revision of the forming bar can be rolled back exactly.
+
+    def _append(self, items: deque, item):
+        items.append(item)
+        self._undo.append(items.pop)
+
+    def _popleft(self, items: deque):
+        item = items.popleft()
+        self._undo.append(lambda: items.appendleft(item))
+        return item
+
+    def _assign(self, obj, name: str, value):
+        old = getattr(obj, name)
+        setattr(obj, name, value)
+        self._undo.append(lambda: setattr(obj, name, old))
+
+    def _set_item(self, entry: list, key: int, value):
+        old = entry[key]
+        entry[key] = value
+        self._undo.append(lambda: entry.__setitem__(key, old))
+
+    def _insort(self, levels: List[float], price: float):
+        pos = bisect.bisect_right(levels, price)
+        levels.insert(pos, price)
+        self._undo.append(lambda: levels.pop(pos))
+
+    def _discard(self, levels: List[float], price: float):
+        pos = bisect.bisect_left(levels, price)
+        del levels[pos]
+        self._undo.append(lambda: levels.insert(pos, price))
+
+    def _rollback(self):
+        while self._undo:
+            self._undo.pop()()
+
+    # ==================== Bar Input ====================
+
+    @property
+    def bar_count(self) -> int:
+        """Number of bars in the analysis window"""
+        return self._buffer.end - self._buffer.start
+
+    @property
+    def last_timestamp(self):
+        """Timestamp of the latest bar (None when empty)"""
+        buf = self._buffer
+        return buf.timestamps[buf.pos(buf.end - 1)] if buf.end > buf.start else None
+
+    def update(
+        self,
+        timestamp,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float = 0.0
+    ):
+        """
+        Append a closed bar, or revise the forming bar
+
+        A bar with the same timestamp as the latest one replaces it; older
+        timestamps are rejected.
+        """
+        last = self.last_timestamp
+        if last is not None:
+            if timestamp == last:
+                self._rollback()
+            elif timestamp < last:
+                raise ValueError(f"Bar at {timestamp} is older than the latest bar {last}")
+
+        self._undo = []
+        self._buffer.append(timestamp, open_, high, low, close, volume)
+        self._undo.append(self._buffer.pop)
+        self._process_bar()
+
+    def update_frame(self, df: pd.DataFrame):
+        """Feed every row of an OHLCV frame through update()"""
+        volume = df['Volume'] if 'Volume' in df.columns else pd.Series(0.0, index=df.index)
+        for row in zip(df.index, df['Open'].to_numpy(dtype=np.float64),
+                       df['High'].to_numpy(dtype=np.float64), df['Low'].to_numpy(dtype=np.float64),
+                       df['Close'].to_numpy(dtype=np.float64), volume.to_numpy(dtype=np.float64)):
+            self.update(*row)
+
+    def sync(self, df: pd.DataFrame):
+        """
+        Bring the stream in line with a freshly fetched frame
+
+        Only rows from the stream's latest bar onwards are fed (revising the
+        forming bar and appending new ones). The stream is reseeded when the
+        frame does not continue its history.
+        """
+        last = self.last_timestamp
+        if last is not None and len(df) and df.index[0] >= self._buffer.timestamps[
+                self._buffer.pos(self._buffer.start)] and last in df.index:
+            self.update_frame(df.iloc[df.index.get_loc(last):])
+        else:
+            self.reset()
+            self.update_frame(df)
+
+        if self.bar_count != len(df) or (len(df) and self._buffer.timestamps[
+                self._buffer.pos(self._buffer.start)] != df.index[0]):
+            self.logger.debug("SMC stream out of step with frame, reseeding", category="analysis")
+            self.reset()
+            self.update_frame(df)
+
+    def frame(self) -> pd.DataFrame:
+        """Current analysis window as an OHLCV DataFrame"""
+        buf = self._buffer
+        window = buf.window()
+        return pd.DataFrame(
+            {
+                'Open': buf.open[window].copy(),
+                'High': buf.high[window].copy(),
+                'Low': buf.low[window].copy(),
+                'Close': buf.close[window].copy(),
+                'Volume': buf.volume[window].copy(),
+            },
+            index=pd.Index(list(buf.timestamps[window]))
+        )
+
+    # ==================== Incremental Processing ====================
+
+    def _process_bar(self):
+        """Apply the effects of the latest bar to every detector"""
+        buf = self._buffer
+        if self.max_bars is not None and buf.end - buf.start > self.max_bars:
+            self._evict_bar()
+
+        t = buf.end - 1
+        self._confirm_swings(t - self._right)
+        self._update_gaps(t)
+        if t - 1 - buf.start >= 2:
+            self._detect_order_block(t - 1)
+        if t - 1 - buf.start >= 1:
+            self._detect_gap(t - 1)
+
+    def _evict_bar(self):
+        """Slide the window start forward by one bar"""
+        buf = self._buffer
+        self._assign(buf, 'start', buf.start + 1)
+        first_swing = buf.start + self._left
+
+        changed = False
+        for swings, levels in ((self._highs, self._high_levels), (self._lows, self._low_levels)):
+            while swings and swings[0][0] < first_swing:
+                self._discard(levels, self._popleft(swings)[1])
+                changed = True
+        while self._sequence and self._sequence[0][1] < first_swing:
+            self._popleft(self._sequence)
+        if changed:
+            self._assign(self, '_swing_version', next(self._versions))
+
+        # Events need both of their swings inside the window
+        first_seq = self._sequence[0][0] if self._sequence else self._next_seq
+        for events in (self._bullish_bos, self._bearish_bos, self._choch):
+            while events and events[0][0] <= first_seq:
+                self._popleft(events)
+
+        while self._order_blocks and self._order_blocks[0][0] < buf.start + 2:
+            self._popleft(self._order_blocks)
+        while self._gaps and self._gaps[0][0] < buf.start + 1:
+            self._popleft(self._gaps)
+
+    def _confirm_swings(self, c: int):
+        """Check whether bar ``c`` is a swing now that its right side is complete"""
+        buf = self._buffer
+        if c - self._left < buf.start:
+            return
+
+        p = buf.pos(c)
+        for kind, values in (('high', buf.high), ('low', buf.low)):
+            others = np.concatenate((values[p - self._left:p], values[p + 1:p + self._right + 1]))
+            centre = values[p]
+            if kind == 'high':
+                is_swing = len(others) == 0 or centre > others.max()
+            else:
+                is_swing = len(others) == 0 or centre < others.min()
+            if is_swing:
+                self._add_swing(kind, c, float(centre), buf.timestamps[p])
+
+    def _add_swing(self, kind: str, bar: int, price: float, timestamp):
+        if kind == 'high':
+            self._append(self._highs, (bar, price, timestamp))
+            self._insort(self._high_levels, price)
+        else:
+            self._append(self._lows, (bar, price, timestamp))
+            self._insort(self._low_levels, price)
+
+        seq = self._next_seq
+        self._assign(self, '_next_seq', seq + 1)
+        prev = self._sequence[-1] if self._sequence else None
+        self._append(self._sequence, (seq, bar, kind, price, timestamp))
+        self._assign(self, '_swing_version', next(self._versions))
+
+        if prev is None:
+            return
+        _, _, prev_kind, prev_price, _ = prev
+        if kind == 'high' and price > prev_price:
+            self._push_event(self._bullish_bos, (seq, price, timestamp))
+        elif kind == 'low' and price < prev_price:
+            self._push_event(self._bearish_bos, (seq, price, timestamp))
+        if kind != prev_kind:
+            self._push_event(self._choch, (seq, price, timestamp, prev_kind, kind))
+
+    def _push_event(self, events: deque, event: tuple):
+        self._append(events, event)
+        # One spare: the oldest ChOCh may be filtered out at output time
+        if len(events) > EVENT_LIMIT + 1:
+            self._popleft(events)
+
+    def _detect_order_block(self, j: int):
+        """Order block check for bar ``j`` once its following candle exists"""
+        buf = self._buffer
+        p = buf.pos(j)
+        open_, high, low, close = buf.open[p], buf.high[p], buf.low[p], buf.close[p]
+        body = close - open_
+        next_body = buf.close[p + 1] - buf.open[p + 1]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            body_ok = np.abs(body) / (high - low) >= self.config.OB_MIN_BODY_PERCENTAGE
+        bullish = body < 0 and next_body > 0 and next_body > -body * 1.5 and body_ok
+        bearish = body > 0 and next_body < 0 and -next_body > body * 1.5 and body_ok
+        if not (bullish or bearish):
+            return
+
+        high_volume = False
+        if j - 5 >= buf.base:
+            prev_mean = buf.volume[p - 5:p].sum() / 5
+            high_volume = bool(buf.volume[p] > prev_mean * self.config.OB_MIN_VOLUME_MULTIPLIER)
+
+        self._append(self._order_blocks, (
+            j, 'bullish' if bullish else 'bearish',
+            min(open_, close), max(open_, close), buf.timestamps[p], high_volume
+        ))
+        if len(self._order_blocks) > ORDER_BLOCK_LIMIT:
+            self._popleft(self._order_blocks)
+
+    def _detect_gap(self, m: int):
+        """FVG check for middle candle ``m`` once the third candle exists"""
+        buf = self._buffer
+        p = buf.pos(m)
+        prev_high, next_high = buf.high[p - 1], buf.high[p + 1]
+        prev_low, next_low = buf.low[p - 1], buf.low[p + 1]
+        mid_high, mid_low = buf.high[p], buf.low[p]
+
+        if mid_low > prev_high and mid_low > next_high:
+            entry = [m, max(prev_high, next_high), mid_low, True, buf.timestamps[p], -np.inf, None]
+        elif mid_high < prev_low and mid_high < next_low:
+            entry = [m, mid_high, min(prev_low, next_low), False, buf.timestamps[p], np.inf, None]
+        else:
+            return
+
+        self._append(self._gaps, entry)
+        if len(self._gaps) > FVG_LIMIT:
+            self._popleft(self._gaps)
+
+    def _update_gaps(self, t: int):
+        """Extend the running post-formation extreme of each tracked gap"""
+        buf = self._buffer
+        high, low = buf.high[buf.pos(t)], buf.low[buf.pos(t)]
+        for gap in self._gaps:
+            bar, bottom, top, bullish, _, reach, mitigated = gap
+            if t < bar + 2:
+                continue
+            if bullish and high > reach:
+                self._set_item(gap, 5, high)
+            elif not bullish and low < reach:
+                self._set_item(gap, 5, low)
+            if mitigated is None and (high >= top if bullish else low <= bottom):
+                self._set_item(gap, 6, t)
+
+    # ==================== Results ====================
+
+    def _swing_points(self, swings: deque, kind: str) -> List[SwingPoint]:
+        start = self._buffer.start
+        return [
+            SwingPoint(index=bar - start, price=price, type=kind, timestamp=timestamp)
+            for bar, price, timestamp in swings
+        ]
+
+    def _bos_choch(self, structure: Dict[str, Any]) -> Dict[str, Any]:
+        bos_events = []
+        choch_events = []
+
+        if structure['structure'] != 'INSUFFICIENT_DATA':
+            if structure['trend'] == 'BULLISH':
+                bos_events = [
+                    {'type': 'BOS', 'direction': 'BULLISH', 'price': price, 'timestamp': timestamp}
+                    for _, price, timestamp in self._bullish_bos
+                ]
+            elif structure['trend'] == 'BEARISH':
+                bos_events = [
+                    {'type': 'BOS', 'direction': 'BEARISH', 'price': price, 'timestamp': timestamp}
+                    for _, price, timestamp in self._bearish_bos
+                ]
+
+            # ChOCh needs a swing before the pair, as in detect_bos_choch()
+            first_seq = self._sequence[0][0]
+            choch_events = [
+                {'type': 'ChOCh', 'from': from_kind, 'to': to_kind, 'price': price, 'timestamp': timestamp}
+                for seq, price, timestamp, from_kind, to_kind in self._choch
+                if seq >= first_seq + 2
+            ]
+
+        return {
+            'bos': bos_events[-EVENT_LIMIT:] if bos_events else [],
+            'choch': choch_events[-EVENT_LIMIT:] if choch_events else [],
+            'latest_bos': bos_events[-1] if bos_events else None,
+            'latest_choch': choch_events[-1] if choch_events else None,
+        }
+
+    def _order_block_list(self) -> List[OrderBlock]:
+        start = self._buffer.start
+        return [
+            OrderBlock(
+                start_price=start_price,
+                end_price=end_price,
+                timestamp=timestamp,
+                type=kind,
+                strength=0.8 * (1.5 if high_volume and bar - start > 5 else 1.0),
+                tested=0,
+                active=True
+            )
+            for bar, kind, start_price, end_price, timestamp, high_volume in reversed(self._order_blocks)
+        ]
+
+    def _fvg_list(self) -> List[FairValueGap]:
+        buf = self._buffer
+        fvgs = []
+        for bar, bottom, top, bullish, timestamp, reach, mitigated in reversed(self._gaps):
+            penetration = reach - bottom if bullish else top - reach
+            filled = float(np.clip(penetration / (top - bottom), 0.0, 1.0))
+            fvgs.append(FairValueGap(
+                start_price=bottom,
+                end_price=top,
+                timestamp=timestamp,
+                filled_percentage=filled,
+                active=filled < 1.0,
+                type='bullish' if bullish else 'bearish',
+                mitigated_at=buf.timestamps[buf.pos(mitigated)] if mitigated is not None else None
+            ))
+        return fvgs
+
+    def _liquidity_zones(self) -> List[LiquidityZone]:
+        if self.config.LIQUIDITY_USE_ATR_TOLERANCE:
+            # ATR tolerance depends on every bar in the window
+            tolerance, relative = self.analyzer._liquidity_tolerance(self.frame(), True)
+            return self.analyzer._zones_from_levels(
+                np.array(self._high_levels), np.array(self._low_levels), tolerance, relative
+            )
+
+        if self._zone_cache is None or self._zone_cache[0] != self._swing_version:
+            zones = self.analyzer._zones_from_levels(
+                np.array(self._high_levels), np.array(self._low_levels),
+                self.config.LIQUIDITY_TOLERANCE, True
+            )
+            self._zone_cache = (self._swing_version, zones)
+        return self._zone_cache[1]
+
+    def _hunts_between(self, zones: List[LiquidityZone], first: int, stop: int) -> List[Dict[str, Any]]:
+        buf = self._buffer
+        rows = slice(buf.pos(first), buf.pos(stop))
+        return _stop_hunt_events(
+            buf.high[rows], buf.low[rows], buf.close[rows], buf.timestamps[rows],
+            zones, STOP_HUNT_LIMIT
+        )
+
+    def _stop_hunts(self, zones: List[LiquidityZone]) -> List[Dict[str, Any]]:
+        """
+        Last stop hunts in the window
+
+        Events on closed bars are cached until the zones change; the forming
+        bar is always evaluated fresh so revisions never leak into the cache.
+        """
+        buf = self._buffer
+        last = buf.end - 1
+        zone_key = [(z.price, z.type) for z in zones]
+
+        cache = self._hunt_cache
+        if cache is None or cache['zones'] != zone_key or cache['upto'] < buf.start:
+            events = self._hunts_between(zones, buf.start, last)
+        else:
+            events = cache['events']
+            if cache['upto'] < last:
+                events = (events + self._hunts_between(zones, cache['upto'], last))[-STOP_HUNT_LIMIT:]
+
+        # Drop events on bars that slid out of the window
+        first_timestamp = buf.timestamps[buf.pos(buf.start)]
+        events = [event for event in events if event['timestamp'] >= first_timestamp]
+        self._hunt_cache = {'zones': zone_key, 'upto': last, 'events': events}
+
+        combined = events + self._hunts_between(zones, last, last + 1)
+        return [dict(event) for event in combined[-STOP_HUNT_LIMIT:]]
+
+    def analyze(self) -> Dict[str, Any]:
+        """
+        SMC analysis of the current window
+
+        Returns:
+            Dict with the same structure as SMCAnalyzer.analyze()
+        """
+        buf = self._buffer
+        if buf.end == buf.start:
+            return {'error': 'No bars in SMC stream'}
+
+        try:
+            market_structure = self.analyzer._structure_from_swings(
+                self._swing_points(self._highs, 'high'),
+                self._swing_points(self._lows, 'low')
+            )
+            bos_choch = self._bos_choch(market_structure)
+
+            order_blocks = self._order_block_list()
+            fvgs = self._fvg_list()
+
+            liquidity_zones = self._liquidity_zones()
+            stop_hunts = self._stop_hunts(liquidity_zones)
+
+            if self._high_levels and self._low_levels:
+                premium_discount = self.analyzer._premium_discount_from_range(
+                    self._high_levels[-1], self._low_levels[0], buf.close[buf.pos(buf.end - 1)]
+                )
+            else:
+                premium_discount = {'status': 'insufficient_data'}
+
+            smc_signal = self.analyzer._generate_smc_signal(
+                market_structure,
+                order_blocks,
+                fvgs,
+                liquidity_zones,
+                premium_discount
+            )
+
+            return {
+                'market_structure': market_structure,
+                'bos_choch': bos_choch,
+                'order_blocks': order_blocks,
+                'fair_value_gaps': fvgs,
+                'liquidity_zones': list(liquidity_zones),
+                'stop_hunts': stop_hunts,
+                'premium_discount': premium_discount,
+                'signal': smc_signal,
+                'timestamp': datetime.now()
+            }
+
+        except Exception as e:
+            self.logger.error(f"Error in incremental SMC analysis: {str(e)}", category="analysis")
+            return {'error': str(e)}
+
+    def __repr__(self) -> str:
+        return f"<SMCStream bars={self.bar_count} max_bars={self.max_bars}>"
@@ -1,24 +1,207 @@
 """
 Technical Indicators Calculator
-Comprehensive technical analysis indicators using TA-Lib and pandas-ta
+Comprehensive technical analysis indicators using TA-Lib (or the built-in NumPy backend)
 """
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, Optional, List
-try:
-    import talib
-except Exception as e:  # pragma: no cover
-    talib = None
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, Any, Optional, List, Callable, Sequence, Tuple
 try:
     import pandas_ta as pta
 except Exception:
     pta = None
 
-from config.settings import IndicatorConfig
+from config.settings import IndicatorConfig, PerformanceConfig
+from .indicator_backend import NUMPY_BACKEND, get_backend
+from src.utils.compact import compact_results, expand_ohlcv
 from src.utils.logger import get_logger
 
 logger = get_logger()
 
+PRICE_COLUMNS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+
+class IndicatorContext:
+    """
+    Memo of indicator results for one OHLCV frame
+    
+    Results are keyed by (name, params) with the params resolved from the
+    config defaults, so ``calculate_rsi(df)`` and ``calculate_rsi(df, 14)``
+    share one entry. A context also covers copies of its frame whose price
+    columns are unchanged (e.g. the feature frame built from ``df.copy()``),
+    which lets one context be shared between components.
+    """
+    
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._results: Dict[Tuple, Any] = {}
+        self._frames: Dict[int, Tuple[pd.DataFrame, bool]] = {}
+        self.computed = 0
+        self.reused = 0
+    
+    def covers(self, df: pd.DataFrame) -> bool:
+        """Whether ``df`` has the same bars as the bound frame"""
+        if df is self.df:
+            return True
+        seen = self._frames.get(id(df))
+        if seen is not None and seen[0] is df:
+            return seen[1]
+        
+        same = len(df) == len(self.df) and df.index.equals(self.df.index)
+        for column in PRICE_COLUMNS:
+            if not same:
+                break
+            if column in df.columns or column in self.df.columns:
+                same = (column in df.columns and column in self.df.columns
+                        and np.array_equal(df[column].to_numpy(), self.df[column].to_numpy()))
+        # Keep a reference so the id cannot be reused while cached
+        self._frames[id(df)] = (df, same)
+        return same
+    
+    def get(self, name: str, params: Tuple, compute: Callable[[], Any]) -> Any:
+        """Cached result for (name, params), computing it on first use"""
+        key = (name, params)
+        if key in self._results:
+            self.reused += 1
+            return self._results[key]
+        result = compute()
+        self._results[key] = result
+        self.computed += 1
+        return result
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Counts of computed and reused indicators"""
+        return {
+            'computed': self.computed,
+            'reused': self.reused,
+            'indicators': sorted(f"{name}{params}" for name, params in self._results),
+        }
+
+
+def _accepts_compact(method):
+    """
+    Compute a per-frame method in float64 and store top-level results compactly
+    
+    Compact frames are expanded to float64 prices first (exact at the
+    symbol's digits), since raw float32 inputs can flip the tie-sensitive
+    comparisons in ADX or MFI. In compact mode, results returned outside an
+    indicator context are converted to float32; calls inside a context keep
+    float64 so the signals read the same values as the default mode.
+    """
+    @wraps(method)
+    def wrapper(self, df, *args, **kwargs):
+        top_level = self._context is None
+        result = method(self, expand_ohlcv(df), *args, **kwargs)
+        return compact_results(result) if self.compact and top_level else result
+    return wrapper
+
+
+def _shares_context(method):
+    """Run a per-frame method inside an indicator context for its frame"""
+    @wraps(method)
+    @_accepts_compact
+    def wrapper(self, df, *args, **kwargs):
+        with self.context(df):
+            return method(self, df, *args, **kwargs)
+    return wrapper
+
+
+# ==================== Volume Profile ====================
+
+def _volume_histogram(
+    low: np.ndarray,
+    high: np.ndarray,
+    volume: np.ndarray,
+    groups: np.ndarray,
+    n_groups: int,
+    bins: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Volume per price bin, spreading each bar's volume uniformly over its range
+    
+    Every group (session) gets ``bins`` equal-width bins between its lowest
+    low and highest high. A bar covering several bins adds a partial share to
+    its first and last bin and a full bin's share to every bin in between;
+    the in-between shares go through a difference array, so the cost is
+    O(n + n_groups * bins) whatever the bar ranges.
+    
+    Returns:
+        (edges, volumes) with shapes (n_groups, bins + 1) and (n_groups, bins)
+    """
+    floor = np.full(n_groups, np.inf)
+    ceiling = np.full(n_groups, -np.inf)
+    np.minimum.at(floor, groups, low)
+    np.maximum.at(ceiling, groups, high)
+    width = (ceiling - floor) / bins
+    edges = floor[:, None] + width[:, None] * np.arange(bins + 1)
+    edges[:, -1] = ceiling
+    
+    # Bar ends in bin units; a flat group puts everything in its first bin
+    scale = np.where(width > 0, width, 1.0)[groups]
+    start = (low - floor[groups]) / scale
+    end = (high - floor[groups]) / scale
+    first = np.minimum(start.astype(np.int64), bins - 1)
+    last = np.minimum(end.astype(np.int64), bins - 1)
+    
+    # Bars inside one bin (zero-range bars included) add all their volume to it
+    inside = first == last
+    size = n_groups * bins
+    volumes = np.bincount(groups[inside] * bins + first[inside], weights=volume[inside],
+                          minlength=size).astype(float, copy=False)
+    
+    spans = ~inside
+    if spans.any():
+        group, first, last = groups[spans], first[spans], last[spans]
+        density = volume[spans] / (end[spans] - start[spans])
+        volumes += np.bincount(group * bins + first, weights=density * (first + 1 - start[spans]),
+                               minlength=size)
+        volumes += np.bincount(group * bins + last, weights=density * (end[spans] - last),
+                               minlength=size)
+        
+        # Full bins strictly between first and last
+        stride = bins + 1
+        steps = np.bincount(np.concatenate([group * stride + first + 1, group * stride + last]),
+                            weights=np.concatenate([density, -density]), minlength=n_groups * stride)
+        volumes += np.cumsum(steps.reshape(n_groups, stride), axis=1)[:, :bins].ravel()
+    
+    return edges, volumes.reshape(n_groups, bins)
+
+
+def _value_area(volumes: np.ndarray, share: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Point of control and value area of every profile row
+    
+    Starting from the highest-volume bin, the value area grows one bin at a
+    time towards the heavier neighbour (upwards on ties) until it holds
+    ``share`` of the row's volume.
+    
+    Returns:
+        (poc, low, high) bin indices per row
+    """
+    n_rows, bins = volumes.shape
+    rows = np.arange(n_rows)
+    poc = volumes.argmax(axis=1)
+    low, high = poc.copy(), poc.copy()
+    held = volumes[rows, poc].copy()
+    target = volumes.sum(axis=1) * share
+    # Padded by one bin on each side so the neighbours of an edge bin never win
+    padded = np.pad(volumes, ((0, 0), (1, 1)), constant_values=-1.0)
+    
+    for _ in range(bins - 1):
+        growing = (held < target) & ((low > 0) | (high < bins - 1))
+        if not growing.any():
+            break
+        below = padded[rows, low]
+        above = padded[rows, high + 2]
+        up = growing & (above >= below)
+        down = growing & ~up
+        high += up
+        low -= down
+        held += np.where(up, above, 0.0) + np.where(down, below, 0.0)
+    
+    return poc, low, high
+
 
 class TechnicalIndicators:
     """
@@ -30,16 +213,81 @@ class TechnicalIndicators:
     - Volatility indicators (Bollinger Bands, ATR, Keltner)
     - Volume indicators (Volume Profile, OBV, VWAP, MFI)
     - Signal generation with strength scoring
+    
+    Inside ``context(df)`` every indicator is computed once per (name,
+    params); the signal methods and calculate_all_indicators open a context
+    themselves, so their shared inputs (EMA, MACD, ATR, ...) are reused.
     """
     
-    def __init__(self):
-        """Initialize technical indicators calculator"""
+    def __init__(self, backend: Optional[str] = None, compact: Optional[bool] = None):
+        """
+        Initialize technical indicators calculator
+        
+        Args:
+            backend: Indicator backend ('auto', 'talib' or 'numpy'; default
+                PerformanceConfig.INDICATOR_BACKEND)
+            compact: Return float32 results (default
+                PerformanceConfig.COMPACT_MODE)
+        """
         self.config = IndicatorConfig
         self.logger = logger
         self.cache = {}
+        self.backend = get_backend(backend or PerformanceConfig.INDICATOR_BACKEND)
+        self.compact = PerformanceConfig.COMPACT_MODE if compact is None else compact
+        self._context: Optional[IndicatorContext] = None
+        self.last_context_stats: Dict[str, Any] = {}
+    
+    # ==================== Indicator Context ====================
+    
+    @contextmanager
+    def context(self, df: pd.DataFrame, shared: Optional[IndicatorContext] = None):
+        """
+        Share indicator results for ``df`` within the block
+        
+        Nested calls for the same frame reuse the active context. On exit of
+        the outermost block its counts are kept in ``last_context_stats``.
+        
+        Args:
+            df: DataFrame with OHLCV data
+            shared: Existing context to continue (e.g. from another
+                component analyzing the same bars); ignored if it does not
+                cover ``df``
+        
+        Yields:
+            IndicatorContext
+        """
+        if self._context is not None and self._context.covers(df):
+            yield self._context
+            return
+        
+        context = shared if shared is not None and shared.covers(df) else IndicatorContext(df)
+        previous, self._context = self._context, context
+        try:
+            yield context
+        finally:
+            self._context = previous
+            self.last_context_stats = context.get_stats()
+    
+    def create_stream(self):
+        """
+        Create a streaming indicator set sharing this calculator's configuration
+        
+        Returns:
+            TechnicalStream updating every indicator in constant time per bar
+        """
+        from .technical_stream import TechnicalStream
+        return TechnicalStream(self.config)
+    
+    def _cached(self, df: pd.DataFrame, name: str, params: Tuple, compute: Callable[[], Any]) -> Any:
+        """Route an indicator through the active context, if it covers ``df``"""
+        context = self._context
+        if context is None or not context.covers(df):
+            return compute()
+        return context.get(name, params, compute)
     
     # ==================== Trend Indicators ====================
     
+    @_accepts_compact
     def calculate_ema(
         self,
         df: pd.DataFrame,
@@ -47,10 +295,10 @@ class TechnicalIndicators:
         column: str = 'Close'
     ) -> pd.Series:
         """Calculate Exponential Moving Average"""
-        if talib is None:
-            raise ImportError("TA-Lib is required for EMA. Please install TA-Lib.")
-        return talib.EMA(df[column], timeperiod=period)
+        return self._cached(df, 'ema', (period, column),
+                            lambda: self.backend.EMA(df[column], timeperiod=period))
     
+    @_accepts_compact
     def calculate_sma(
         self,
         df: pd.DataFrame,
@@ -58,10 +306,10 @@ class TechnicalIndicators:
         column: str = 'Close'
     ) -> pd.Series:
         """Calculate Simple Moving Average"""
-        if talib is None:
-            raise ImportError("TA-Lib is required for SMA. Please install TA-Lib.")
-        return talib.SMA(df[column], timeperiod=period)
+        return self._cached(df, 'sma', (period, column),
+                            lambda: self.backend.SMA(df[column], timeperiod=period))
     
+    @_accepts_compact
     def calculate_macd(
         self,
         df: pd.DataFrame,
@@ -79,21 +327,22 @@ class TechnicalIndicators:
         slow = slow or self.config.MACD_SLOW
         signal = signal or self.config.MACD_SIGNAL
         
-        if talib is None:
-            raise ImportError("TA-Lib is required for MACD. Please install TA-Lib.")
-        macd, signal_line, histogram = talib.MACD(
-            df['Close'],
-            fastperiod=fast,
-            slowperiod=slow,
-            signalperiod=signal
-        )
+        def compute():
+            macd, signal_line, histogram = self.backend.MACD(
+                df['Close'],
+                fastperiod=fast,
+                slowperiod=slow,
+                signalperiod=signal
+            )
+            return {
+                'macd': macd,
+                'signal': signal_line,
+                'histogram': histogram
+            }
         
-        return {
-            'macd': macd,
-            'signal': signal_line,
-            'histogram': histogram
-        }
+        return self._cached(df, 'macd', (fast, slow, signal), compute)
     
+    @_accepts_compact
     def calculate_adx(
         self,
         df: pd.DataFrame,
@@ -107,18 +356,21 @@ class TechnicalIndicators:
         """
         period = period or self.config.ADX_PERIOD
         
-        if talib is None:
-            raise ImportError("TA-Lib is required for ADX. Please install TA-Lib.")
-        adx = talib.ADX(df['High'], df['Low'], df['Close'], timeperiod=period)
-        plus_di = talib.PLUS_DI(df['High'], df['Low'], df['Close'], timeperiod=period)
-        minus_di = talib.MINUS_DI(df['High'], df['Low'], df['Close'], timeperiod=period)
+        def compute():
+            dmi = getattr(self.backend, 'DMI', None)
+            if dmi is not None:
+                # One directional movement pass for all three lines
+                adx, plus_di, minus_di = dmi(df['High'], df['Low'], df['Close'], timeperiod=period)
+                return {'adx': adx, 'plus_di': plus_di, 'minus_di': minus_di}
+            return {
+                'adx': self.backend.ADX(df['High'], df['Low'], df['Close'], timeperiod=period),
+                'plus_di': self.backend.PLUS_DI(df['High'], df['Low'], df['Close'], timeperiod=period),
+                'minus_di': self.backend.MINUS_DI(df['High'], df['Low'], df['Close'], timeperiod=period)
+            }
         
-        return {
-            'adx': adx,
-            'plus_di': plus_di,
-            'minus_di': minus_di
-        }
+        return self._cached(df, 'adx', (period,), compute)
     
+    @_accepts_compact
     def calculate_ichimoku(
         self,
         df: pd.DataFrame,
@@ -160,6 +412,7 @@ class TechnicalIndicators:
     
     # ==================== Momentum Indicators ====================
     
+    @_accepts_compact
     def calculate_rsi(
         self,
         df: pd.DataFrame,
@@ -167,10 +420,10 @@ class TechnicalIndicators:
     ) -> pd.Series:
         """Calculate RSI (Relative Strength Index)"""
         period = period or self.config.RSI_PERIOD
-        if talib is None:
-            raise ImportError("TA-Lib is required for RSI. Please install TA-Lib.")
-        return talib.RSI(df['Close'], timeperiod=period)
+        return self._cached(df, 'rsi', (period,),
+                            lambda: self.backend.RSI(df['Close'], timeperiod=period))
     
+    @_accepts_compact
     def calculate_stochastic(
         self,
         df: pd.DataFrame,
@@ -188,44 +441,45 @@ class TechnicalIndicators:
         d_period = d_period or self.config.STOCH_D
         smooth = smooth or self.config.STOCH_SMOOTH
         
-        if talib is None:
-            raise ImportError("TA-Lib is required for Stochastic. Please install TA-Lib.")
-        slowk, slowd = talib.STOCH(
-            df['High'],
-            df['Low'],
-            df['Close'],
-            fastk_period=k_period,
-            slowk_period=smooth,
-            slowd_period=d_period
-        )
+        def compute():
+            slowk, slowd = self.backend.STOCH(
+                df['High'],
+                df['Low'],
+                df['Close'],
+                fastk_period=k_period,
+                slowk_period=smooth,
+                slowd_period=d_period
+            )
+            return {
+                'k': slowk,
+                'd': slowd
+            }
         
-        return {
-            'k': slowk,
-            'd': slowd
-        }
+        return self._cached(df, 'stochastic', (k_period, d_period, smooth), compute)
     
+    @_accepts_compact
     def calculate_cci(
         self,
         df: pd.DataFrame,
         period: int = 20
     ) -> pd.Series:
         """Calculate CCI (Commodity Channel Index)"""
-        if talib is None:
-            raise ImportError("TA-Lib is required for CCI. Please install TA-Lib.")
-        return talib.CCI(df['High'], df['Low'], df['Close'], timeperiod=period)
+        return self._cached(df, 'cci', (period,),
+                            lambda: self.backend.CCI(df['High'], df['Low'], df['Close'], timeperiod=period))
     
+    @_accepts_compact
     def calculate_williams_r(
         self,
         df: pd.DataFrame,
         period: int = 14
     ) -> pd.Series:
         """Calculate Williams %R"""
-        if talib is None:
-            raise ImportError("TA-Lib is required for Williams %R. Please install TA-Lib.")
-        return talib.WILLR(df['High'], df['Low'], df['Close'], timeperiod=period)
+        return self._cached(df, 'williams_r', (period,),
+                            lambda: self.backend.WILLR(df['High'], df['Low'], df['Close'], timeperiod=period))
     
     # ==================== Volatility Indicators ====================
     
+    @_accepts_compact
     def calculate_bollinger_bands(
         self,
         df: pd.DataFrame,
@@ -241,21 +495,22 @@ class TechnicalIndicators:
         period = period or self.config.BB_PERIOD
         std_dev = std_dev or self.config.BB_STD
         
-        if talib is None:
-            raise ImportError("TA-Lib is required for Bollinger Bands. Please install TA-Lib.")
-        upper, middle, lower = talib.BBANDS(
-            df['Close'],
-            timeperiod=period,
-            nbdevup=std_dev,
-            nbdevdn=std_dev
-        )
+        def compute():
+            upper, middle, lower = self.backend.BBANDS(
+                df['Close'],
+                timeperiod=period,
+                nbdevup=std_dev,
+                nbdevdn=std_dev
+            )
+            return {
+                'upper': upper,
+                'middle': middle,
+                'lower': lower
+            }
         
-        return {
-            'upper': upper,
-            'middle': middle,
-            'lower': lower
-        }
+        return self._cached(df, 'bollinger_bands', (period, std_dev), compute)
     
+    @_accepts_compact
     def calculate_atr(
         self,
         df: pd.DataFrame,
@@ -263,10 +518,10 @@ class TechnicalIndicators:
     ) -> pd.Series:
         """Calculate ATR (Average True Range)"""
         period = period or self.config.ATR_PERIOD
-        if talib is None:
-            raise ImportError("TA-Lib is required for ATR. Please install TA-Lib.")
-        return talib.ATR(df['High'], df['Low'], df['Close'], timeperiod=period)
+        return self._cached(df, 'atr', (period,),
+                            lambda: self.backend.ATR(df['High'], df['Low'], df['Close'], timeperiod=period))
     
+    @_accepts_compact
     def calculate_keltner_channels(
         self,
         df: pd.DataFrame,
@@ -293,63 +548,110 @@ class TechnicalIndicators:
     
     # ==================== Volume Indicators ====================
     
+    @_accepts_compact
     def calculate_obv(self, df: pd.DataFrame) -> pd.Series:
         """Calculate OBV (On Balance Volume)"""
-        if talib is None:
-            raise ImportError("TA-Lib is required for OBV. Please install TA-Lib.")
-        return talib.OBV(df['Close'], df['Volume'])
+        return self._cached(df, 'obv', (), lambda: self.backend.OBV(df['Close'], df['Volume']))
     
+    @_accepts_compact
     def calculate_vwap(self, df: pd.DataFrame) -> pd.Series:
         """Calculate VWAP (Volume Weighted Average Price)"""
-        typical_price = (df['High'] + df['Low'] + df['Close']) / 3
-        return (typical_price * df['Volume']).cumsum() / df['Volume'].cumsum()
+        def compute():
+            typical_price = (df['High'] + df['Low'] + df['Close']) / 3
+            return (typical_price * df['Volume']).cumsum() / df['Volume'].cumsum()
+        
+        return self._cached(df, 'vwap', (), compute)
     
+    @_accepts_compact
     def calculate_mfi(
         self,
         df: pd.DataFrame,
         period: int = 14
     ) -> pd.Series:
         """Calculate MFI (Money Flow Index)"""
-        if talib is None:
-            raise ImportError("TA-Lib is required for MFI. Please install TA-Lib.")
-        return talib.MFI(df['High'], df['Low'], df['Close'], df['Volume'], timeperiod=period)
+        return self._cached(df, 'mfi', (period,),
+                            lambda: self.backend.MFI(df['High'], df['Low'], df['Close'], df['Volume'],
+                                                     timeperiod=period))
     
+    @_accepts_compact
     def calculate_volume_profile(
         self,
         df: pd.DataFrame,
-        bins: int = 24
+        bins: Optional[int] = None,
+        value_area: Optional[float] = None,
+        session: Optional[Any] = None
     ) -> Dict[str, Any]:
         """
         Calculate Volume Profile
         
+        Each bar's volume is spread uniformly over its High-Low range and split
+        between the equal-width price bins it overlaps.
+        
+        Args:
+            df: OHLCV DataFrame
+            bins: Number of price bins (default IndicatorConfig.VOLUME_PROFILE_BINS)
+            value_area: Share of volume inside the value area
+                (default IndicatorConfig.VOLUME_PROFILE_VALUE_AREA)
+            session: Profile each session separately; a pandas frequency
+                applied to the index ('D', '4h', ...) or one label per bar
+        
         Returns:
-            Dict with volume profile data
+            Dict with 'bin_edges', 'volumes', 'poc' (centre of the
+            highest-volume bin), 'value_area_high', 'value_area_low' and
+            'total_volume'. With ``session`` every value gets a leading
+            session axis and 'sessions' holds the session labels.
         """
-        price_range = df['High'].max() - df['Low'].min()
-        bin_size = price_range / bins
+        bins = bins or self.config.VOLUME_PROFILE_BINS
+        value_area = value_area if value_area is not None else self.config.VOLUME_PROFILE_VALUE_AREA
+        if bins < 1:
+            raise ValueError(f"bins must be positive, got {bins}")
         
-        volume_profile = {}
-        for i in range(bins):
-            lower = df['Low'].min() + (i * bin_size)
-            upper = lower + bin_size
+        def compute() -> Dict[str, Any]:
+            low = df['Low'].to_numpy(dtype=float)
+            high = df['High'].to_numpy(dtype=float)
+            volume = df['Volume'].to_numpy(dtype=float)
+            valid = np.isfinite(low) & np.isfinite(high) & np.isfinite(volume)
             
-            mask = (df['Low'] <= upper) & (df['High'] >= lower)
-            volume = df.loc[mask, 'Volume'].sum()
+            if session is None:
+                groups, sessions = np.zeros(int(valid.sum()), dtype=np.int64), None
+            else:
+                labels = df.index.floor(session) if isinstance(session, str) else np.asarray(session)
+                if len(labels) != len(df):
+                    raise ValueError(f"Expected {len(df)} session labels, got {len(labels)}")
+                groups, sessions = pd.factorize(labels[valid], sort=True)
             
-            volume_profile[f"{lower:.5f}-{upper:.5f}"] = volume
+            n_groups = int(groups.max()) + 1 if len(groups) else 0
+            if n_groups == 0:
+                raise ValueError("Volume profile needs at least one bar with High, Low and Volume")
         
-        # Find POC (Point of Control) - price level with highest volume
-        poc_range = max(volume_profile, key=volume_profile.get)
-        poc_price = float(poc_range.split('-')[0])
+            edges, volumes = _volume_histogram(
+                low[valid], np.maximum(high[valid], low[valid]), volume[valid], groups, n_groups, bins
+            )
+            poc, area_low, area_high = _value_area(volumes, value_area)
+            rows = np.arange(n_groups)
         
-        return {
-            'profile': volume_profile,
-            'poc': poc_price,
-            'total_volume': df['Volume'].sum()
-        }
+            profile = {
+                'bin_edges': edges,
+                'volumes': volumes,
+                'poc': (edges[rows, poc] + edges[rows, poc + 1]) / 2,
+                'value_area_high': edges[rows, area_high + 1],
+                'value_area_low': edges[rows, area_low],
+                'total_volume': volumes.sum(axis=1),
+            }
+            if sessions is None:
+                return {key: value[0] if key in ('bin_edges', 'volumes') else float(value[0])
+                        for key, value in profile.items()}
+            profile['sessions'] = sessions
+            return profile
+        
+        # Explicit label arrays are not hashable context keys
+        if session is not None and not isinstance(session, str):
+            return compute()
+        return self._cached(df, 'volume_profile', (bins, value_area, session), compute)
     
     # ==================== Signal Generation ====================
     
+    @_shares_context
     def get_trend_signal(self, df: pd.DataFrame) -> Dict[str, Any]:
         """
         Generate trend signal from multiple indicators
@@ -357,60 +659,55 @@ class TechnicalIndicators:
         Returns:
             Dict with signal, strength, and details
         """
-        signals = []
-        
-        # EMA crossover
         ema_fast = self.calculate_ema(df, self.config.EMA_FAST)
         ema_slow = self.calculate_ema(df, self.config.EMA_SLOW)
+        macd_data = self.calculate_macd(df)
+        adx_data = self.calculate_adx(df)
+        
+        return self._trend_signal(
+            ema_fast.iloc[-1], ema_slow.iloc[-1], macd_data['histogram'].iloc[-1],
+            adx_data['adx'].iloc[-1], adx_data['plus_di'].iloc[-1], adx_data['minus_di'].iloc[-1]
+        )
+    
+    @_shares_context
+    def get_momentum_signal(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """Generate momentum signal"""
+        rsi = self.calculate_rsi(df)
+        stoch = self.calculate_stochastic(df)
+        cci = self.calculate_cci(df)
+        
+        return self._momentum_signal(rsi.iloc[-1], stoch['k'].iloc[-1], cci.iloc[-1])
+    
+    def _trend_signal(self, ema_fast, ema_slow, macd_histogram, adx, plus_di, minus_di) -> Dict[str, Any]:
+        """Score the latest trend indicator values"""
+        signals = []
         
-        if ema_fast.iloc[-1] > ema_slow.iloc[-1]:
+        # EMA crossover
+        if ema_fast > ema_slow:
             signals.append({'indicator': 'EMA', 'signal': 'BULLISH', 'strength': 0.15})
-        elif ema_fast.iloc[-1] < ema_slow.iloc[-1]:
+        elif ema_fast < ema_slow:
             signals.append({'indicator': 'EMA', 'signal': 'BEARISH', 'strength': 0.15})
         
         # MACD
-        macd_data = self.calculate_macd(df)
-        if macd_data['histogram'].iloc[-1] > 0:
+        if macd_histogram > 0:
             signals.append({'indicator': 'MACD', 'signal': 'BULLISH', 'strength': 0.20})
-        elif macd_data['histogram'].iloc[-1] < 0:
+        elif macd_histogram < 0:
             signals.append({'indicator': 'MACD', 'signal': 'BEARISH', 'strength': 0.20})
         
         # ADX
-        adx_data = self.calculate_adx(df)
-        if adx_data['adx'].iloc[-1] > self.config.ADX_THRESHOLD:
-            if adx_data['plus_di'].iloc[-1] > adx_data['minus_di'].iloc[-1]:
+        if adx > self.config.ADX_THRESHOLD:
+            if plus_di > minus_di:
                 signals.append({'indicator': 'ADX', 'signal': 'BULLISH', 'strength': 0.15})
             else:
                 signals.append({'indicator': 'ADX', 'signal': 'BEARISH', 'strength': 0.15})
         
-        # Aggregate signals
-        bullish_strength = sum(s['strength'] for s in signals if s['signal'] == 'BULLISH')
-        bearish_strength = sum(s['strength'] for s in signals if s['signal'] == 'BEARISH')
+        return self._aggregate_signals(signals)
         
-        if bullish_strength > bearish_strength:
-            overall_signal = 'BULLISH'
-            confidence = bullish_strength
-        elif bearish_strength > bullish_strength:
-            overall_signal = 'BEARISH'
-            confidence = bearish_strength
-        else:
-            overall_signal = 'NEUTRAL'
-            confidence = 0.0
-        
-        return {
-            'signal': overall_signal,
-            'confidence': confidence,
-            'indicators': signals
-        }
-    
-    def get_momentum_signal(self, df: pd.DataFrame) -> Dict[str, Any]:
-        """Generate momentum signal"""
+    def _momentum_signal(self, rsi_value, stoch_k, cci) -> Dict[str, Any]:
+        """Score the latest momentum indicator values"""
         signals = []
         
         # RSI
-        rsi = self.calculate_rsi(df)
-        rsi_value = rsi.iloc[-1]
-        
         if rsi_value > self.config.RSI_OVERBOUGHT:
             signals.append({'indicator': 'RSI', 'signal': 'BEARISH', 'strength': 0.20, 'value': rsi_value})
         elif rsi_value < self.config.RSI_OVERSOLD:
@@ -421,20 +718,22 @@ class TechnicalIndicators:
             signals.append({'indicator': 'RSI', 'signal': 'BEARISH', 'strength': 0.10, 'value': rsi_value})
         
         # Stochastic
-        stoch = self.calculate_stochastic(df)
-        if stoch['k'].iloc[-1] > 80:
+        if stoch_k > 80:
             signals.append({'indicator': 'Stochastic', 'signal': 'BEARISH', 'strength': 0.15})
-        elif stoch['k'].iloc[-1] < 20:
+        elif stoch_k < 20:
             signals.append({'indicator': 'Stochastic', 'signal': 'BULLISH', 'strength': 0.15})
         
         # CCI
-        cci = self.calculate_cci(df)
-        if cci.iloc[-1] > 100:
+        if cci > 100:
             signals.append({'indicator': 'CCI', 'signal': 'BEARISH', 'strength': 0.10})
-        elif cci.iloc[-1] < -100:
+        elif cci < -100:
             signals.append({'indicator': 'CCI', 'signal': 'BULLISH', 'strength': 0.10})
         
-        # Aggregate
+        return self._aggregate_signals(signals)
+    
+    @staticmethod
+    def _aggregate_signals(signals: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Overall signal and confidence from the individual indicator signals"""
         bullish_strength = sum(s['strength'] for s in signals if s['signal'] == 'BULLISH')
         bearish_strength = sum(s['strength'] for s in signals if s['signal'] == 'BEARISH')
         
@@ -454,6 +753,7 @@ class TechnicalIndicators:
             'indicators': signals
         }
     
+    @_shares_context
     def get_volatility_signal(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Generate volatility signal"""
         bb = self.calculate_bollinger_bands(df)
@@ -496,6 +796,7 @@ class TechnicalIndicators:
             'indicators': signals
         }
     
+    @_shares_context
     def get_volume_signal(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Generate volume signal"""
         obv = self.calculate_obv(df)
@@ -543,6 +844,7 @@ class TechnicalIndicators:
             'indicators': signals
         }
     
+    @_shares_context
     def calculate_all_indicators(self, df: pd.DataFrame) -> Dict[str, Any]:
         """
         Calculate all indicators and generate comprehensive analysis
@@ -582,6 +884,261 @@ class TechnicalIndicators:
             self.logger.error(f"Error calculating indicators: {str(e)}", category="analysis")
             return {}
 
+    # ==================== Parameter Sweeps ====================
+    
+    @_accepts_compact
+    def calculate_sma_sweep(
+        self,
+        df: pd.DataFrame,
+        periods: Optional[Sequence[int]] = None,
+        column: str = 'Close'
+    ) -> pd.DataFrame:
+        """
+        Calculate SMA for many periods at once
+        
+        Args:
+            df: OHLCV DataFrame
+            periods: Periods to compute (default IndicatorConfig.SWEEP_MA_PERIODS)
+            column: Price column
+        
+        Returns:
+            DataFrame (bars x periods) with one column per period
+        """
+        periods = tuple(periods or self.config.SWEEP_MA_PERIODS)
+        return self._sweep(df, 'SMA', periods, (df[column],), (column,))
+    
+    @_accepts_compact
+    def calculate_ema_sweep(
+        self,
+        df: pd.DataFrame,
+        periods: Optional[Sequence[int]] = None,
+        column: str = 'Close'
+    ) -> pd.DataFrame:
+        """
+        Calculate EMA for many periods at once (e.g. 5..200)
+        
+        Returns:
+            DataFrame (bars x periods) with one column per period
+        """
+        periods = tuple(periods or self.config.SWEEP_MA_PERIODS)
+        return self._sweep(df, 'EMA', periods, (df[column],), (column,))
+    
+    @_accepts_compact
+    def calculate_rsi_sweep(
+        self,
+        df: pd.DataFrame,
+        periods: Optional[Sequence[int]] = None
+    ) -> pd.DataFrame:
+        """
+        Calculate RSI for many periods at once (e.g. 7..28)
+        
+        Returns:
+            DataFrame (bars x periods) with one column per period
+        """
+        periods = tuple(periods or self.config.SWEEP_OSCILLATOR_PERIODS)
+        return self._sweep(df, 'RSI', periods, (df['Close'],))
+    
+    @_accepts_compact
+    def calculate_atr_sweep(
+        self,
+        df: pd.DataFrame,
+        periods: Optional[Sequence[int]] = None
+    ) -> pd.DataFrame:
+        """
+        Calculate ATR for many periods at once
+        
+        Returns:
+            DataFrame (bars x periods) with one column per period
+        """
+        periods = tuple(periods or self.config.SWEEP_OSCILLATOR_PERIODS)
+        return self._sweep(df, 'ATR', periods, (df['High'], df['Low'], df['Close']))
+    
+    def _sweep(
+        self,
+        df: pd.DataFrame,
+        function: str,
+        periods: Tuple[int, ...],
+        inputs: Tuple[pd.Series, ...],
+        params: Tuple = ()
+    ) -> pd.DataFrame:
+        """
+        One backend function over many periods
+        
+        Backends with a ``<function>_SWEEP`` (the NumPy one) compute every
+        period in one call that shares the intermediates (cumulative sums,
+        gains/losses, true range); TA-Lib is called once per period, which
+        its C loops make cheaper still.
+        """
+        def compute():
+            sweep = getattr(self.backend, f"{function}_SWEEP", None)
+            if sweep is not None:
+                values = sweep(*inputs, periods)
+            else:
+                single = getattr(self.backend, function)
+                values = np.column_stack([np.asarray(single(*inputs, timeperiod=period)) for period in periods])
+            return pd.DataFrame(values, index=df.index, columns=list(periods))
+        
+        return self._cached(df, f"{function.lower()}_sweep", (periods,) + params, compute)
+    
+    # ==================== Panel Mode ====================
+    
+    def calculate_panel(self, panel: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Calculate the trend and momentum indicators for many symbols at once
+        
+        Each indicator is one vectorized pass over the whole panel using the
+        NumPy backend (TA-Lib only takes single series). Symbols with a
+        shorter history (leading NaN rows) are computed on their own bars.
+        
+        Args:
+            panel: 'High', 'Low' and 'Close' as 2D (bars x symbols) arrays or
+                DataFrames with the same shape and column order (see make_panel)
+        
+        Returns:
+            Dict with 'ema_fast', 'ema_slow', 'macd', 'adx', 'rsi',
+            'stochastic' and 'cci' shaped like the inputs; multi-line
+            indicators are dicts keyed like calculate_macd/adx/stochastic
+        """
+        frame = panel['Close'] if isinstance(panel['Close'], pd.DataFrame) else None
+        results: Dict[str, Any] = {}
+        for (name, line), values in self._panel_lines(panel).items():
+            if frame is not None:
+                values = pd.DataFrame(values, index=frame.index, columns=frame.columns)
+            if line is None:
+                results[name] = values
+            else:
+                results.setdefault(name, {})[line] = values
+        return results
+    
+    def _panel_lines(self, panel: Dict[str, Any]) -> Dict[Tuple, np.ndarray]:
+        """Panel indicator arrays keyed by (name, line)"""
+        high, low, close = (np.asarray(panel[field], dtype=np.float64) for field in ('High', 'Low', 'Close'))
+        if close.ndim != 2 or high.shape != close.shape or low.shape != close.shape:
+            raise ValueError("Panel fields must be 2D arrays of one shape (bars x symbols)")
+        
+        # Group symbols by their first bar so every group is a dense block
+        has_bars = np.isfinite(close)
+        starts = np.where(has_bars.any(axis=0), has_bars.argmax(axis=0), len(close))
+        groups = np.unique(starts).tolist()
+        if len(groups) == 1:
+            start = groups[0]
+            block = self._panel_block(high[start:], low[start:], close[start:])
+            if start == 0:
+                return block
+            return {key: np.concatenate((np.full((start, close.shape[1]), np.nan), values))
+                    for key, values in block.items()}
+        
+        lines: Dict[Tuple, np.ndarray] = {}
+        for start in groups:
+            columns = np.flatnonzero(starts == start)
+            block = self._panel_block(high[start:, columns], low[start:, columns], close[start:, columns])
+            for key, values in block.items():
+                if key not in lines:
+                    lines[key] = np.full(close.shape, np.nan)
+                lines[key][start:, columns] = values
+        return lines
+    
+    def _panel_block(self, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> Dict[Tuple, np.ndarray]:
+        """Indicators of one dense panel block, keyed by (name, line)"""
+        numpy_backend = NUMPY_BACKEND
+        macd, signal, histogram = numpy_backend.MACD(
+            close,
+            fastperiod=self.config.MACD_FAST,
+            slowperiod=self.config.MACD_SLOW,
+            signalperiod=self.config.MACD_SIGNAL
+        )
+        adx, plus_di, minus_di = numpy_backend.DMI(high, low, close, timeperiod=self.config.ADX_PERIOD)
+        slowk, slowd = numpy_backend.STOCH(
+            high,
+            low,
+            close,
+            fastk_period=self.config.STOCH_K,
+            slowk_period=self.config.STOCH_SMOOTH,
+            slowd_period=self.config.STOCH_D
+        )
+        return {
+            ('ema_fast', None): numpy_backend.EMA(close, timeperiod=self.config.EMA_FAST),
+            ('ema_slow', None): numpy_backend.EMA(close, timeperiod=self.config.EMA_SLOW),
+            ('macd', 'macd'): macd,
+            ('macd', 'signal'): signal,
+            ('macd', 'histogram'): histogram,
+            ('adx', 'adx'): adx,
+            ('adx', 'plus_di'): plus_di,
+            ('adx', 'minus_di'): minus_di,
+            ('rsi', None): numpy_backend.RSI(close, timeperiod=self.config.RSI_PERIOD),
+            ('stochastic', 'k'): slowk,
+            ('stochastic', 'd'): slowd,
+            # calculate_cci's default period
+            ('cci', None): numpy_backend.CCI(high, low, close, timeperiod=20),
+        }
+    
+    def get_panel_signals(
+        self,
+        panel: Dict[str, Any],
+        symbols: Optional[List[Any]] = None
+    ) -> Dict[Any, Dict[str, Any]]:
+        """
+        Trend and momentum signals for every symbol of a panel
+        
+        Args:
+            panel: 'High', 'Low' and 'Close' panels (see calculate_panel)
+            symbols: Column labels for array panels (default: the DataFrame
+                columns, or column positions)
+        
+        Returns:
+            Dict mapping symbol to {'trend_signal', 'momentum_signal'}, scored
+            exactly like get_trend_signal/get_momentum_signal on its frame
+        """
+        close = panel['Close']
+        if symbols is None:
+            symbols = list(close.columns) if isinstance(close, pd.DataFrame) else list(range(np.shape(close)[1]))
+        
+        # Only the latest bar of each line is scored
+        latest = {
+            key: values[-1] if len(values) else np.full(values.shape[1], np.nan)
+            for key, values in self._panel_lines(panel).items()
+        }
+        trend = [latest[key] for key in (('ema_fast', None), ('ema_slow', None), ('macd', 'histogram'),
+                                         ('adx', 'adx'), ('adx', 'plus_di'), ('adx', 'minus_di'))]
+        momentum = [latest[key] for key in (('rsi', None), ('stochastic', 'k'), ('cci', None))]
+        
+        return {
+            symbol: {
+                'trend_signal': self._trend_signal(*(values[i] for values in trend)),
+                'momentum_signal': self._momentum_signal(*(values[i] for values in momentum)),
+            }
+            for i, symbol in enumerate(symbols)
+        }
+
+
+def make_panel(frames: Dict[Any, pd.DataFrame], fields: Tuple[str, ...] = PRICE_COLUMNS) -> Dict[str, pd.DataFrame]:
+    """
+    Stack per-symbol OHLCV frames into a panel for calculate_panel
+    
+    Frames are aligned on their latest bar rather than on timestamps, so each
+    symbol keeps exactly its own bars (shorter histories get leading NaN
+    rows) and panel indicators match the per-frame ones.
+    
+    Args:
+        frames: Dict mapping symbol to OHLCV DataFrame
+        fields: Columns to stack; those missing from any frame are skipped
+    
+    Returns:
+        Dict mapping field to a (bars x symbols) DataFrame
+    """
+    symbols = list(frames)
+    length = max((len(df) for df in frames.values()), default=0)
+    panel = {}
+    for field in fields:
+        if not all(field in df.columns for df in frames.values()):
+            continue
+        values = np.full((length, len(symbols)), np.nan)
+        for i, df in enumerate(frames.values()):
+            if len(df):
+                values[length - len(df):, i] = df[field].to_numpy(dtype=np.float64)
+        panel[field] = pd.DataFrame(values, columns=symbols)
+    return panel
+
 
 if __name__ == "__main__":
     # Test indicators
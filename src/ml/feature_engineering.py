@@ -4,12 +4,14 @@ Creates ML features from market data and indicators
 """
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 import warnings
 
-from src.indicators.technical import TechnicalIndicators
+from src.indicators.technical import TechnicalIndicators, IndicatorContext
 from src.indicators.smc import SMCAnalyzer
+from src.utils.compact import compact_results, expand_ohlcv
+from config.settings import MLConfig
 from src.utils.logger import get_logger
 
 warnings.filterwarnings('ignore', category=RuntimeWarning)
@@ -35,12 +37,19 @@ class FeatureEngineer:
         self.smc_analyzer = SMCAnalyzer()
         self.logger = logger
     
-    def create_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def create_features(
+        self,
+        df: pd.DataFrame,
+        indicator_context: Optional[IndicatorContext] = None
+    ) -> pd.DataFrame:
         """
         Create all ML features from OHLCV data
         
         Args:
             df: DataFrame with OHLCV data
+            indicator_context: Indicator context already filled for the same
+                bars (e.g. by the sentiment analysis), reused instead of
+                recomputing the indicators
             
         Returns:
             DataFrame with features
@@ -48,10 +57,10 @@ class FeatureEngineer:
         try:
             self.logger.info("Creating ML features", category="ml_training")
             
-            features_df = df.copy()
+            features_df = expand_ohlcv(df).copy()
             
             # Technical indicator features
-            features_df = self._add_indicator_features(features_df)
+            features_df = self._add_indicator_features(features_df, indicator_context)
             
             # Price pattern features
             features_df = self._add_price_features(features_df)
@@ -74,6 +83,9 @@ class FeatureEngineer:
             # Drop NaN values
             features_df = features_df.dropna()
             
+            if self.tech_indicators.compact:
+                features_df = compact_results(features_df)
+            
             self.logger.info(f"Created {len(features_df.columns)} features", category="ml_training")
             
             return features_df
@@ -82,8 +94,17 @@ class FeatureEngineer:
             self.logger.error(f"Error creating features: {str(e)}", category="ml_training")
             return df
     
-    def _add_indicator_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _add_indicator_features(
+        self,
+        df: pd.DataFrame,
+        indicator_context: Optional[IndicatorContext] = None
+    ) -> pd.DataFrame:
         """Add technical indicator features"""
+        with self.tech_indicators.context(df, indicator_context):
+            return self._indicator_columns(df)
+    
+    def _indicator_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Indicator columns, computed through the active indicator context"""
         # RSI
         df['rsi'] = self.tech_indicators.calculate_rsi(df)
         
@@ -177,11 +198,37 @@ class FeatureEngineer:
             # Market structure score (simple version)
             df['structure_score'] = df['higher_high'].rolling(10).sum() - df['lower_low'].rolling(10).sum()
             
+            if MLConfig.USE_SMC_HISTORY_FEATURES:
+                df = self._add_smc_history_features(df)
+            
         except Exception as e:
             self.logger.warning(f"Error adding SMC features: {str(e)}", category="ml_training")
         
         return df
     
+    def _add_smc_history_features(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Add per-bar SMC state from SMCAnalyzer.analyze_history()
+        
+        Undefined states are filled so dropna() keeps the rows: bars-since
+        counts fall back to the bars elapsed in the frame, distances to 0
+        with a presence flag, and premium/discount position to equilibrium.
+        """
+        history = self.smc_analyzer.analyze_history(df)
+        
+        elapsed = pd.Series(np.arange(1, len(df) + 1, dtype=np.float64), index=df.index)
+        for column in ('smc_bars_since_bos', 'smc_bars_since_choch'):
+            history[column] = history[column].fillna(elapsed)
+        
+        for column, flag in (('smc_fvg_distance', 'smc_has_fvg'),
+                             ('smc_liquidity_distance', 'smc_has_liquidity')):
+            history[flag] = history[column].notna().astype(int)
+            history[column] = history[column].fillna(0.0)
+        
+        history['smc_pd_position'] = history['smc_pd_position'].fillna(0.5)
+        
+        return pd.concat([df, history], axis=1)
+    
     def _add_candlestick_patterns(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add candlestick pattern features (20+ patterns)"""
         try:
@@ -324,6 +371,15 @@ class FeatureEngineer:
             'higher_high', 'lower_low', 'structure_score',
         ]
         
+        if MLConfig.USE_SMC_HISTORY_FEATURES:
+            base_features += [
+                'smc_trend', 'smc_bars_since_bos', 'smc_bars_since_choch',
+                'smc_bullish_obs', 'smc_bearish_obs',
+                'smc_fvg_distance', 'smc_has_fvg',
+                'smc_liquidity_distance', 'smc_has_liquidity',
+                'smc_pd_position',
+            ]
+        
         # Advanced features (newly added)
         advanced_features = [
             # Candlestick patterns
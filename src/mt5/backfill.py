@@ -0,0 +1,307 @@
+"""
+History Backfill
+Resumable chunked download of long OHLCV histories to local storage
+"""
+import calendar
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from .bar_store import read_frame, series_name, write_frame
+from .data_fetcher import MT5DataFetcher, Timeframe, _ensure_mt5_imported
+from .fetch_scheduler import FetchScheduler
+from config.settings import DataConfig
+
+# Chunks ending less than this long ago may still hold a forming bar (bar
+# times are in server time, hours off UTC); they are written but not
+# checkpointed, so the next run fetches them again
+_SETTLE_SECONDS = 86400
+
+
+def _epoch(value: Union[datetime, pd.Timestamp, int, float]) -> int:
+    """Epoch seconds of a date; naive datetimes are taken as UTC"""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            return calendar.timegm(value.timetuple())
+        return int(value.timestamp())
+    return int(value)
+
+
+class HistoryBackfill:
+    """
+    Downloads a date range of bars in chunks and stores each chunk on arrival
+    
+    The range is split into chunks of ``chunk_bars`` bars aligned to the
+    epoch, so runs over overlapping ranges share chunks. Chunks are fetched
+    through a FetchScheduler with up to ``concurrency`` in flight: MT5 copies
+    the next chunk while earlier ones are validated and written, and no
+    more than ``concurrency`` chunks are held in memory. Every chunk is
+    written to ``<directory>/<symbol>_<timeframe>/`` as it arrives and
+    recorded in the series' checkpoint.json, so an interrupted backfill
+    resumes with the chunks still missing. Chunks the broker holds no bars
+    for (before its history starts, or market closures) are recorded with
+    0 bars and no file.
+    
+    Usage:
+        backfill = HistoryBackfill()
+        report = backfill.run('EURUSD', 'M15', datetime(2020, 1, 1))
+        df = backfill.load('EURUSD', 'M15')
+        manager.train_new_model(df)
+    """
+    
+    def __init__(
+        self,
+        fetcher: Optional[MT5DataFetcher] = None,
+        scheduler: Optional[FetchScheduler] = None,
+        directory: Optional[Path] = None,
+        chunk_bars: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        retries: int = 2
+    ):
+        """
+        Initialize backfill
+        
+        Args:
+            fetcher: Data fetcher for the chunks (default the scheduler's, or
+                a new MT5DataFetcher)
+            scheduler: Fetch scheduler to share (default one per run)
+            directory: Storage directory (default DataConfig.BACKFILL_DIR)
+            chunk_bars: Bars per chunk (default DataConfig.BACKFILL_CHUNK_BARS)
+            concurrency: Chunks in flight (default DataConfig.BACKFILL_CONCURRENCY)
+            retries: Further attempts for a chunk whose fetch failed
+        """
+        self.scheduler = scheduler
+        self.fetcher = fetcher or (scheduler.fetcher if scheduler is not None else MT5DataFetcher())
+        self.directory = Path(directory) if directory is not None else DataConfig.BACKFILL_DIR
+        self.chunk_bars = chunk_bars or DataConfig.BACKFILL_CHUNK_BARS
+        self.concurrency = max(1, concurrency or DataConfig.BACKFILL_CONCURRENCY)
+        self.retries = retries
+        self._clock = time.time
+        
+        self.stats = {
+            "runs": 0,
+            "chunks_fetched": 0,
+            "chunks_skipped": 0,
+            "chunks_failed": 0,
+            "bars": 0,
+            "seconds": 0.0,
+        }
+    
+    # ==================== CHUNKS ====================
+    
+    def _series_dir(self, symbol: str, timeframe: str) -> Path:
+        return self.directory / series_name(symbol, timeframe)
+    
+    def plan(self, timeframe: str, start_date, end_date=None) -> List[Tuple[int, int]]:
+        """
+        Chunks covering a date range
+        
+        Args:
+            timeframe: Timeframe string
+            start_date: First bar time (datetime or epoch seconds)
+            end_date: End of the range, exclusive (default now, with the
+                chunk holding now keeping its aligned end, so every run
+                rewrites the same chunk)
+        
+        Returns:
+            (start, end) epoch seconds of each chunk, end exclusive
+        """
+        bar_seconds = Timeframe.to_minutes(Timeframe.from_string(timeframe)) * 60
+        span = self.chunk_bars * bar_seconds
+        start = _epoch(start_date)
+        end = _epoch(end_date) if end_date is not None else int(self._clock())
+        chunks = []
+        while start < end:
+            boundary = (start // span + 1) * span
+            if end_date is not None:
+                boundary = min(boundary, end)
+            chunks.append((start, boundary))
+            start = boundary
+        return chunks
+    
+    def _chunk_path(self, symbol: str, timeframe: str, chunk: Tuple[int, int]) -> Path:
+        return self._series_dir(symbol, timeframe) / f"{chunk[0]}-{chunk[1]}.npz"
+    
+    def _checkpoint_path(self, symbol: str, timeframe: str) -> Path:
+        return self._series_dir(symbol, timeframe) / "checkpoint.json"
+    
+    def checkpoint(self, symbol: str, timeframe: str) -> Dict[str, int]:
+        """
+        Completed chunks of a series
+        
+        Returns:
+            Dict mapping 'start-end' chunk keys to their bar counts
+        """
+        path = self._checkpoint_path(symbol, timeframe)
+        if not path.exists():
+            return {}
+        try:
+            return json.loads(path.read_text())["chunks"]
+        except (OSError, ValueError, KeyError) as e:
+            # The chunk files are still there; only the fetches are repeated
+            print(f"⚠️  Ignoring unreadable backfill checkpoint {path}: {str(e)}")
+            return {}
+    
+    def _is_empty(self, symbol: str, timeframe: str, chunk: Tuple[int, int]) -> bool:
+        """
+        Whether MT5 answers a chunk's range with no bars rather than an error
+        
+        The fetcher reports both as a failed fetch; runs on the API thread.
+        """
+        symbol = self.fetcher.find_symbol(symbol)
+        if symbol is None:
+            return False
+        rates = _ensure_mt5_imported().copy_rates_range(
+            symbol, Timeframe.from_string(timeframe).value,
+            datetime.fromtimestamp(chunk[0], timezone.utc), datetime.fromtimestamp(chunk[1] - 1, timezone.utc)
+        )
+        return rates is not None and len(rates) == 0
+    
+    def _save_checkpoint(self, symbol: str, timeframe: str, chunks: Dict[str, int]):
+        path = self._checkpoint_path(symbol, timeframe)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f"checkpoint.{os.getpid()}.tmp")
+        temporary.write_text(json.dumps({
+            "symbol": symbol,
+            "timeframe": timeframe.upper(),
+            "chunks": chunks,
+        }, indent=1, sort_keys=True))
+        os.replace(temporary, path)
+    
+    # ==================== BACKFILL ====================
+    
+    def run(self, symbol: str, timeframe: str, start_date, end_date=None, validate: bool = True) -> Dict[str, Any]:
+        """
+        Backfill a date range, skipping the chunks already checkpointed
+        
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe string
+            start_date: First bar time (datetime or epoch seconds)
+            end_date: End of the range, exclusive (default now)
+            validate: Whether to validate each chunk
+        
+        Returns:
+            Dict with 'chunks', 'skipped', 'fetched', 'failed', 'bars',
+            'seconds' and 'bars_per_sec'; failed chunks are left out of
+            the checkpoint and fetched again by the next run
+        """
+        chunks = self.plan(timeframe, start_date, end_date)
+        done = self.checkpoint(symbol, timeframe)
+        pending = deque((chunk, 0) for chunk in chunks if f"{chunk[0]}-{chunk[1]}" not in done)
+        report = {"chunks": len(chunks), "skipped": len(chunks) - len(pending), "fetched": 0, "failed": 0, "bars": 0}
+        
+        scheduler = self.scheduler or FetchScheduler(self.fetcher)
+        started = time.perf_counter()
+        in_flight = {}
+        try:
+            while pending or in_flight:
+                while pending and len(in_flight) < self.concurrency:
+                    chunk, attempt = pending.popleft()
+                    # copy_rates_range includes its end date
+                    future = scheduler.submit(
+                        symbol, timeframe, self.chunk_bars,
+                        start_date=datetime.fromtimestamp(chunk[0], timezone.utc),
+                        end_date=datetime.fromtimestamp(chunk[1] - 1, timezone.utc),
+                        validate=validate, compact=False
+                    )
+                    in_flight[future] = (chunk, attempt, False)
+                
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    chunk, attempt, probed = in_flight.pop(future)
+                    if probed:
+                        empty = future.exception() is None and future.result()
+                        df = pd.DataFrame() if empty else None
+                    else:
+                        df = future.result()
+                        if df is None:
+                            # Tell a range without bars from a failed fetch
+                            probe = scheduler.call(self._is_empty, symbol, timeframe, chunk)
+                            in_flight[probe] = (chunk, attempt, True)
+                            continue
+                    if df is None:
+                        if attempt < self.retries:
+                            pending.append((chunk, attempt + 1))
+                        else:
+                            report["failed"] += 1
+                        continue
+                    
+                    if len(df):
+                        times = df.index.to_numpy().astype('datetime64[s]').astype('int64')
+                        df = df.iloc[times.searchsorted(chunk[0]):times.searchsorted(chunk[1])]
+                        write_frame(self._chunk_path(symbol, timeframe, chunk), df)
+                    if chunk[1] + _SETTLE_SECONDS <= self._clock():
+                        done[f"{chunk[0]}-{chunk[1]}"] = len(df)
+                        self._save_checkpoint(symbol, timeframe, done)
+                    report["fetched"] += 1
+                    report["bars"] += len(df)
+        finally:
+            if self.scheduler is None:
+                scheduler.shutdown(wait=not in_flight)
+        
+        report["seconds"] = time.perf_counter() - started
+        report["bars_per_sec"] = report["bars"] / report["seconds"] if report["seconds"] else None
+        self.stats["runs"] += 1
+        self.stats["chunks_fetched"] += report["fetched"]
+        self.stats["chunks_skipped"] += report["skipped"]
+        self.stats["chunks_failed"] += report["failed"]
+        self.stats["bars"] += report["bars"]
+        self.stats["seconds"] += report["seconds"]
+        
+        rate = f"{report['bars_per_sec']:,.0f} bars/sec" if report["bars_per_sec"] else "-"
+        print(f"✓ Backfilled {symbol} {timeframe}: {report['bars']:,} bars in {report['fetched']} chunks "
+              f"({report['skipped']} already stored, {report['failed']} failed), {rate}")
+        return report
+    
+    def load(self, symbol: str, timeframe: str, start_date=None, end_date=None) -> Optional[pd.DataFrame]:
+        """
+        Stored bars of a series, e.g. as training data
+        
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe string
+            start_date: First bar time (default all stored)
+            end_date: End of the range, exclusive (default all stored)
+        
+        Returns:
+            DataFrame of the stored bars (oldest first) or None if nothing
+            in the range is stored
+        """
+        start = _epoch(start_date) if start_date is not None else None
+        end = _epoch(end_date) if end_date is not None else None
+        directory = self._series_dir(symbol, timeframe)
+        chunks = []
+        for path in directory.glob('*.npz') if directory.exists() else ():
+            try:
+                chunk = tuple(int(part) for part in path.stem.split('-'))
+            except ValueError:
+                continue
+            if (start is None or chunk[1] > start) and (end is None or chunk[0] < end):
+                chunks.append((chunk, path))
+        if not chunks:
+            return None
+        
+        df = pd.concat([read_frame(path) for _, path in sorted(chunks)])
+        # Chunks of runs over different ranges may overlap
+        df = df[~df.index.duplicated(keep='last')].sort_index()
+        if start is not None:
+            df = df[df.index >= pd.Timestamp(start, unit='s')]
+        if end is not None:
+            df = df[df.index < pd.Timestamp(end, unit='s')]
+        return df if len(df) else None
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """Backfill statistics"""
+        seconds = self.stats["seconds"]
+        return {**self.stats, "bars_per_sec": self.stats["bars"] / seconds if seconds else None}
+    
+    def __repr__(self) -> str:
+        return f"<HistoryBackfill chunk_bars={self.chunk_bars} concurrency={self.concurrency}>"
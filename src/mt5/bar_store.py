@@ -0,0 +1,246 @@
+"""
+Bar Store
+Local per-(symbol, timeframe) OHLCV history persisted between runs
+"""
+import atexit
+import os
+import re
+import threading
+import time
+import weakref
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.settings import DataConfig
+
+# Stores with unwritten merges, flushed when the interpreter exits
+_open_stores: "weakref.WeakSet[BarStore]" = weakref.WeakSet()
+
+
+def series_name(symbol: str, timeframe: str) -> str:
+    """File name stem of a (symbol, timeframe) series"""
+    # Broker symbols may contain characters such as '#' or '/'
+    return f"{re.sub(r'[^A-Za-z0-9._-]', '_', symbol)}_{timeframe.upper()}"
+
+
+def write_frame(path: Path, df: pd.DataFrame):
+    """Write a bar frame to an .npz file, replacing it atomically"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    arrays = {column: df[column].to_numpy() for column in df.columns}
+    temporary = path.with_name(f"{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp.npz")
+    np.savez(temporary, time=df.index.to_numpy(), columns=np.array(df.columns, dtype=str), **arrays)
+    # Replace atomically so a crash never leaves a half-written series
+    os.replace(temporary, path)
+
+
+def read_frame(path: Path) -> pd.DataFrame:
+    """Read a bar frame written by write_frame"""
+    with np.load(path, allow_pickle=False) as data:
+        index = pd.DatetimeIndex(data['time'], name='time')
+        columns = [str(column) for column in data['columns']]
+        return pd.DataFrame({column: data[column] for column in columns}, index=index)
+
+
+class BarStore:
+    """
+    Local store of OHLCV bars per symbol and timeframe
+    
+    The fetcher merges freshly fetched bars into the store and serves
+    windows of the stored history, so a refresh only has to download the
+    bars since the last stored one. Every series is written to
+    ``<directory>/<symbol>_<timeframe>.npz`` and loaded lazily on first use,
+    so a restart starts from the stored history. A series is written on its
+    first merge and then at most every ``flush_seconds``; later merges are
+    written by flush(), which also runs at interpreter exit.
+    """
+    
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        max_bars: Optional[int] = None,
+        persist: bool = True,
+        flush_seconds: Optional[float] = None
+    ):
+        """
+        Initialize bar store
+        
+        Args:
+            directory: Storage directory (default DataConfig.BAR_STORE_DIR)
+            max_bars: Bars kept per series (default DataConfig.BAR_STORE_MAX_BARS)
+            persist: Read and write series on disk (False keeps them in memory)
+            flush_seconds: Minimum time between writes of a series (default
+                DataConfig.BAR_STORE_FLUSH_SECONDS, 0 writes every merge)
+        """
+        self.directory = Path(directory) if directory is not None else DataConfig.BAR_STORE_DIR
+        self.max_bars = max_bars or DataConfig.BAR_STORE_MAX_BARS
+        self.persist = persist
+        self.flush_seconds = DataConfig.BAR_STORE_FLUSH_SECONDS if flush_seconds is None else flush_seconds
+        self._series: Dict[Tuple[str, str], pd.DataFrame] = {}
+        self._saved_at: Dict[Tuple[str, str], float] = {}
+        self._dirty: Set[Tuple[str, str]] = set()
+        self._lock = threading.Lock()
+        self._clock = time.monotonic
+        
+        self.stats = {
+            "loads": 0,
+            "merges": 0,
+            "bars_merged": 0,
+            "saves": 0,
+        }
+    
+    def _path(self, symbol: str, timeframe: str) -> Path:
+        return self.directory / f"{series_name(symbol, timeframe)}.npz"
+    
+    def _load(self, symbol: str, timeframe: str) -> Optional[pd.DataFrame]:
+        path = self._path(symbol, timeframe)
+        if not self.persist or not path.exists():
+            return None
+        try:
+            df = read_frame(path)
+        except Exception as e:
+            # A damaged file only costs a full fetch
+            print(f"⚠️  Ignoring unreadable bar store file {path}: {str(e)}")
+            return None
+        self.stats["loads"] += 1
+        return df
+    
+    def _save(self, symbol: str, timeframe: str, df: pd.DataFrame):
+        write_frame(self._path(symbol, timeframe), df)
+        self.stats["saves"] += 1
+    
+    def get(self, symbol: str, timeframe: str) -> Optional[pd.DataFrame]:
+        """
+        Stored bars for a series, loading them from disk on first use
+        
+        Returns:
+            DataFrame of stored bars (oldest first) or None if nothing is stored
+        """
+        key = (symbol, timeframe.upper())
+        with self._lock:
+            if key not in self._series:
+                df = self._load(*key)
+                if df is None:
+                    return None
+                self._series[key] = df
+            return self._series[key]
+    
+    def last_time(self, symbol: str, timeframe: str) -> Optional[pd.Timestamp]:
+        """Open time of the newest stored bar, or None"""
+        df = self.get(symbol, timeframe)
+        return df.index[-1] if df is not None and len(df) else None
+    
+    def merge(self, symbol: str, timeframe: str, bars: pd.DataFrame, replace: bool = False) -> pd.DataFrame:
+        """
+        Merge fetched bars into a series
+        
+        Stored bars within the fetched time range are replaced, so the
+        forming bar fetched earlier is updated with its latest values. The
+        series is trimmed to ``max_bars`` and written to disk, or marked for
+        the next flush when it was written less than ``flush_seconds`` ago.
+        
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe string
+            bars: Fetched bars, oldest first
+            replace: Discard the stored bars (e.g. when the fetch does not
+                reach back to them)
+        
+        Returns:
+            The merged series
+        """
+        key = (symbol, timeframe.upper())
+        stored = None if replace else self.get(*key)
+        with self._lock:
+            if stored is None or not len(stored):
+                merged = bars.copy()
+            elif not len(bars):
+                merged = stored
+            else:
+                # Stored bars after the fetched range stay, so results merged
+                # out of order (e.g. from concurrent fetches) lose nothing
+                before = stored.iloc[:stored.index.searchsorted(bars.index[0], side='left')]
+                after = stored.iloc[stored.index.searchsorted(bars.index[-1], side='right'):]
+                parts = [part for part in (before, bars, after) if len(part)]
+                merged = pd.concat(parts) if len(parts) > 1 else bars.copy()
+            if len(merged) > self.max_bars:
+                merged = merged.iloc[-self.max_bars:].copy()
+            
+            self._series[key] = merged
+            self.stats["merges"] += 1
+            self.stats["bars_merged"] += len(bars)
+            if self.persist:
+                saved_at = self._saved_at.get(key)
+                now = self._clock()
+                if saved_at is None or now - saved_at >= self.flush_seconds:
+                    self._save(*key, merged)
+                    self._saved_at[key] = now
+                    self._dirty.discard(key)
+                else:
+                    self._dirty.add(key)
+                    _open_stores.add(self)
+            return merged
+    
+    def flush(self):
+        """Write every series with merges not yet on disk"""
+        with self._lock:
+            for key in list(self._dirty):
+                self._save(*key, self._series[key])
+                self._saved_at[key] = self._clock()
+            self._dirty.clear()
+    
+    def window(self, symbol: str, timeframe: str, count: int) -> Optional[pd.DataFrame]:
+        """
+        The newest ``count`` stored bars
+        
+        The window is a new frame over the stored series, so columns added
+        to it stay out of the store; copy it before modifying values in place.
+        """
+        df = self.get(symbol, timeframe)
+        if df is None:
+            return None
+        return df.iloc[max(len(df) - count, 0):]
+    
+    def clear(self, symbol: Optional[str] = None, timeframe: Optional[str] = None, delete: bool = False):
+        """
+        Drop stored series from memory (and from disk with ``delete``)
+        
+        Args:
+            symbol: Only this symbol (default all)
+            timeframe: Only this timeframe (default all)
+            delete: Also remove the files
+        """
+        with self._lock:
+            for key in list(self._series):
+                if (symbol is None or key[0] == symbol) and (timeframe is None or key[1] == timeframe.upper()):
+                    del self._series[key]
+                    self._saved_at.pop(key, None)
+                    self._dirty.discard(key)
+            if not (delete and self.persist and self.directory.exists()):
+                return
+            for path in self.directory.glob('*.npz'):
+                # Timeframe names hold no '_', symbols may ('EURUSD_i')
+                stored_timeframe = path.stem.rpartition('_')[2]
+                if symbol is not None and path.stem != series_name(symbol, stored_timeframe):
+                    continue
+                if timeframe is not None and stored_timeframe != timeframe.upper():
+                    continue
+                path.unlink()
+    
+    def get_statistics(self) -> Dict[str, int]:
+        """Store statistics"""
+        return {**self.stats, "series": len(self._series), "unsaved": len(self._dirty)}
+    
+    def __repr__(self) -> str:
+        return f"<BarStore series={len(self._series)} directory={self.directory}>"
+
+
+@atexit.register
+def _flush_open_stores():
+    for store in list(_open_stores):
+        try:
+            store.flush()
+        except Exception as e:
+            print(f"⚠️  Could not write bar store {store.directory}: {str(e)}")
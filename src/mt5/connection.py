@@ -12,13 +12,20 @@ from functools import wraps
 # MT5 is only available on Windows and should only be imported when actually used
 mt5 = None
 
+def import_metatrader5():
+    """The MetaTrader5 module, or the offline fake if MT5Config.BACKEND is 'fake'"""
+    if MT5Config.BACKEND == "fake":
+        from .fake_mt5 import get_fake_mt5
+        return get_fake_mt5()
+    import MetaTrader5
+    return MetaTrader5
+
 def _ensure_mt5_imported():
     """Lazy import MetaTrader5 module"""
     global mt5
     if mt5 is None:
         try:
-            import MetaTrader5 as _mt5
-            mt5 = _mt5
+            mt5 = import_metatrader5()
         except ImportError as e:
             raise ImportError(
                 "MetaTrader5 package is not installed or not available on this platform. "
@@ -29,6 +36,21 @@ def _ensure_mt5_imported():
 
 from config.settings import MT5Config
 
+# Counts successful connects (MT5Connection and mt5_connector), so caches of
+# terminal state such as SymbolDirectory can tell when they may be stale
+_connection_epoch = 0
+
+
+def connection_epoch() -> int:
+    """Number of successful MT5 connects in this process"""
+    return _connection_epoch
+
+
+def mark_connected():
+    """Record a successful (re)connect, invalidating terminal state caches"""
+    global _connection_epoch
+    _connection_epoch += 1
+
 
 class MT5ConnectionError(Exception):
     """Custom exception for MT5 connection errors"""
@@ -173,6 +195,7 @@ class MT5Connection:
                 self._connected = True
                 self._last_connection_time = datetime.now()
                 self._last_error = None
+                mark_connected()
                 
                 # Update statistics
                 self.stats["total_connections"] += 1
@@ -2,15 +2,21 @@
 MT5 Data Fetcher
 Retrieves OHLCV and tick data from MetaTrader 5 with validation and error handling
 """
+import time
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any, Tuple
+from datetime import datetime, timedelta, timezone
+from typing import Optional, List, Dict, Any, Iterator, NamedTuple, Tuple
 from enum import Enum
 
-from .connection import MT5Connection, ensure_connection, MT5ConnectionError
+from .connection import MT5Connection, ensure_connection, MT5ConnectionError, import_metatrader5
 from .validator import DataValidator
-from config.settings import DataConfig
+from .bar_store import BarStore
+from .rates import rates_to_frame, ticks_to_frame
+from .symbol_directory import SymbolDirectory
+from .tick_bars import TickBarAggregator, empty_bar_frame
+from src.utils.compact import compact_ohlcv
+from config.settings import DataConfig, PerformanceConfig
 
 # Lazy import of MetaTrader5 to prevent import errors on startup
 mt5 = None
@@ -20,8 +26,7 @@ def _ensure_mt5_imported():
     global mt5
     if mt5 is None:
         try:
-            import MetaTrader5 as _mt5
-            mt5 = _mt5
+            mt5 = import_metatrader5()
         except ImportError as e:
             raise ImportError(
                 "MetaTrader5 package is not installed or not available on this platform. "
@@ -79,6 +84,17 @@ class Timeframe(Enum):
         return mapping.get(timeframe, 0)
 
 
+class FetchedRates(NamedTuple):
+    """Raw MT5 rates handed from the fetch phase to the processing phase"""
+    symbol: str                  # resolved broker symbol
+    timeframe: str
+    count: int                   # requested window length
+    rates: np.ndarray            # MT5 rates record array
+    digits: Optional[int]        # symbol digits, for compact frames
+    stored: bool = False         # merge into the bar store
+    store_from: Optional[pd.Timestamp] = None  # first new bar; None replaces the stored series
+
+
 class MT5DataFetcher:
     """
     Fetches and manages market data from MetaTrader 5
@@ -92,12 +108,14 @@ class MT5DataFetcher:
     - Rate limiting compliance
     """
     
-    def __init__(self, connection: Optional[MT5Connection] = None):
+    def __init__(self, connection: Optional[MT5Connection] = None, bar_store: Optional[BarStore] = None):
         """
         Initialize data fetcher
         
         Args:
             connection: MT5Connection instance (optional, uses global MT5 if None)
+            bar_store: Local bar store for incremental refreshes (default a
+                BarStore in DataConfig.BAR_STORE_DIR if DataConfig.BAR_STORE_ENABLED)
         """
         print(f"[DEBUG] MT5DataFetcher.__init__() called")
         print(f"[DEBUG]   connection parameter = {connection}")
@@ -105,6 +123,11 @@ class MT5DataFetcher:
         
         self.connection = connection  # None means use global MT5 API
         self.validator = DataValidator()
+        if bar_store is None and DataConfig.BAR_STORE_ENABLED:
+            bar_store = BarStore()
+        self.bar_store = bar_store
+        self.symbols = SymbolDirectory(_ensure_mt5_imported)
+        self._scheduler = None
         
         # Check if MT5 is initialized
         if connection is None:
@@ -128,7 +151,9 @@ class MT5DataFetcher:
             "failed_requests": 0,
             "total_bars_fetched": 0,
             "total_ticks_fetched": 0,
+            "incremental_requests": 0,
         }
+        self._clock = time.time
     
     def get_symbol_info(self, symbol: str) -> Optional[Dict[str, Any]]:
         """
@@ -208,7 +233,8 @@ class MT5DataFetcher:
         count: int = 1000,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
-        validate: bool = True
+        validate: bool = True,
+        compact: Optional[bool] = None
     ) -> Optional[pd.DataFrame]:
         """
         Get OHLCV data for a symbol
@@ -220,6 +246,9 @@ class MT5DataFetcher:
             start_date: Start date for data (optional)
             end_date: End date for data (optional)
             validate: Whether to validate data
+            compact: Return float32 prices and int32 volumes, with the
+                symbol's digits in ``df.attrs`` (default
+                PerformanceConfig.COMPACT_MODE)
             
         Returns:
             Optional[pd.DataFrame]: OHLCV data or None if failed
@@ -228,112 +257,15 @@ class MT5DataFetcher:
         self.stats["total_requests"] += 1
         
         try:
-            # Check MT5 connection first
-            _mt5 = _ensure_mt5_imported()
-            terminal_info = _mt5.terminal_info()
-            print(f"[DEBUG]   MT5 terminal_info: {terminal_info is not None}")
-            if not terminal_info:
-                print(f"[DEBUG]   ✗ MT5 NOT CONNECTED - Error: {_mt5.last_error()}")
+            fetched = self.fetch_rates(symbol, timeframe, count, start_date, end_date)
+            if fetched is None:
                 self.stats["failed_requests"] += 1
                 return None
             
-            # Ensure symbol is selected/visible in Market Watch
-            # First, try to find the correct symbol name
-            correct_symbol = self.find_symbol(symbol)
-            if correct_symbol is None:
-                print(f"[DEBUG]   ✗ SYMBOL NOT FOUND: '{symbol}' is not available")
-                print(f"[DEBUG]   Try checking available symbols with mt5.symbols_get()")
-                
-                # Show some available symbols for debugging
-                available = self.get_available_symbols("*FX*")  # Try forex symbols
-                if not available:
-                    available = self.get_available_symbols()  # Try all symbols
-                
-                if available:
-                    print(f"[DEBUG]   Available symbols (first 10): {available[:10]}")
-                
-                self.stats["failed_requests"] += 1
-                return None
-            
-            # Update symbol if we found a different name
-            if correct_symbol != symbol:
-                print(f"[DEBUG]   Using symbol: {correct_symbol} (instead of {symbol})")
-                symbol = correct_symbol
-            
-            # Check if symbol needs to be selected
-            info = _mt5.symbol_info(symbol)
-            if info is None or not info.visible:
-                print(f"[DEBUG]   Symbol {symbol} not visible. Attempting to select...")
-                if not _mt5.symbol_select(symbol, True):
-                    error = _mt5.last_error()
-                    print(f"[DEBUG]   ✗ SYMBOL SELECT FAILED - MT5 Error: {error}")
-                    print(f"[DEBUG]   This usually means the symbol is not available in your broker's Market Watch")
-                    print(f"[DEBUG]   Please check if the symbol exists in your MT5 terminal")
-                    self.stats["failed_requests"] += 1
-                    return None
-                else:
-                    print(f"[DEBUG]   ✓ Symbol {symbol} selected")
-
-            # Convert timeframe string to MT5 constant
-            print(f"[DEBUG]   Converting timeframe: {timeframe}")
-            tf = Timeframe.from_string(timeframe)
-            print(f"[DEBUG]   ✓ Timeframe value: {tf.value}")
-            
-            # Get data
-            print(f"[DEBUG]   Calling mt5.copy_rates_from_pos({symbol}, {tf.value}, 0, {count})")
-            if start_date and end_date:
-                rates = _mt5.copy_rates_range(symbol, tf.value, start_date, end_date)
-            elif start_date:
-                rates = _mt5.copy_rates_from(symbol, tf.value, start_date, count)
-            else:
-                rates = _mt5.copy_rates_from_pos(symbol, tf.value, 0, count)
-            
-            print(f"[DEBUG]   Result type: {type(rates)}, Length: {len(rates) if rates is not None else 0}")
-            
-            if rates is None or len(rates) == 0:
-                error = _mt5.last_error()
-                print(f"[DEBUG]   ✗ FETCH FAILED - MT5 Error: {error}")
-                self.stats["failed_requests"] += 1
-                return None
-            
-            print(f"[DEBUG]   ✓ Successfully fetched {len(rates)} rates")
-            
-            # Convert to DataFrame
-            df = pd.DataFrame(rates)
-            df['time'] = pd.to_datetime(df['time'], unit='s')
-            df.set_index('time', inplace=True)
-            
-            # Rename columns for consistency
-            df.rename(columns={
-                'open': 'Open',
-                'high': 'High',
-                'low': 'Low',
-                'close': 'Close',
-                'tick_volume': 'Volume',
-                'spread': 'Spread',
-                'real_volume': 'RealVolume'
-            }, inplace=True)
-            
-            # Select relevant columns
-            columns = ['Open', 'High', 'Low', 'Close', 'Volume']
-            if 'Spread' in df.columns:
-                columns.append('Spread')
-            if 'RealVolume' in df.columns:
-                columns.append('RealVolume')
-            
-            df = df[columns]
-            
-            # Validate data if requested
-            if validate:
-                is_valid, issues = self.validator.validate_ohlcv(df, symbol, timeframe)
-                if not is_valid:
-                    print(f"⚠️  Data validation issues for {symbol} {timeframe}: {issues}")
-                    # Attempt to clean data
-                    df = self.validator.clean_ohlcv(df)
+            df = self.build_ohlcv(fetched, validate=validate, compact=compact)
             
             # Update statistics
             self.stats["successful_requests"] += 1
-            self.stats["total_bars_fetched"] += len(df)
             
             return df
             
@@ -342,6 +274,208 @@ class MT5DataFetcher:
             print(f"Error fetching OHLCV for {symbol} {timeframe}: {str(e)}")
             return None
     
+    # ==================== Fetch Phases ====================
+    # get_ohlcv runs both phases in turn; FetchScheduler runs fetch_rates on
+    # its MT5 thread and build_ohlcv on a worker pool.
+    
+    def fetch_rates(
+        self,
+        symbol: str,
+        timeframe: str = "H1",
+        count: int = 1000,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Optional[FetchedRates]:
+        """
+        MT5 API phase of get_ohlcv: resolve the symbol and copy the rates
+        
+        Position-based requests with a bar store fetch only the tail since
+        the last stored bar.
+        
+        Returns:
+            Optional[FetchedRates]: Raw rates or None if failed
+        """
+        _mt5 = _ensure_mt5_imported()
+        # A cached resolution means the terminal answered recently; in that
+        # steady state copy_rates is the only MT5 call
+        resolved = self.symbols.is_resolved(symbol)
+        if not resolved and not self._terminal_connected(_mt5):
+            return None
+        
+        # Ensure symbol is selected/visible in Market Watch
+        # First, try to find the correct symbol name
+        correct_symbol = self.find_symbol(symbol)
+        if correct_symbol is None:
+            self.symbols.invalidate(symbol)
+            print(f"[DEBUG]   ✗ SYMBOL NOT FOUND: '{symbol}' is not available")
+            print(f"[DEBUG]   Try checking available symbols with mt5.symbols_get()")
+            
+            # Show some available symbols for debugging
+            available = self.get_available_symbols("*FX*")  # Try forex symbols
+            if not available:
+                available = self.get_available_symbols()  # Try all symbols
+            
+            if available:
+                print(f"[DEBUG]   Available symbols (first 10): {available[:10]}")
+            
+            return None
+        
+        # Update symbol if we found a different name
+        if correct_symbol != symbol:
+            print(f"[DEBUG]   Using symbol: {correct_symbol} (instead of {symbol})")
+            requested, symbol = symbol, correct_symbol
+        else:
+            requested = symbol
+        
+        # Check if symbol needs to be selected
+        info = self.symbols.symbol_info(symbol)
+        if info is None or not info.visible:
+            print(f"[DEBUG]   Symbol {symbol} not visible. Attempting to select...")
+            if not _mt5.symbol_select(symbol, True):
+                error = _mt5.last_error()
+                print(f"[DEBUG]   ✗ SYMBOL SELECT FAILED - MT5 Error: {error}")
+                print(f"[DEBUG]   This usually means the symbol is not available in your broker's Market Watch")
+                print(f"[DEBUG]   Please check if the symbol exists in your MT5 terminal")
+                self.symbols.invalidate(requested)
+                return None
+            else:
+                print(f"[DEBUG]   ✓ Symbol {symbol} selected")
+                info = self.symbols.symbol_info(symbol, refresh=True)
+
+        # Convert timeframe string to MT5 constant
+        print(f"[DEBUG]   Converting timeframe: {timeframe}")
+        tf = Timeframe.from_string(timeframe)
+        print(f"[DEBUG]   ✓ Timeframe value: {tf.value}")
+        
+        # Position-based requests only need the bars missing from the store
+        store = self.bar_store
+        if store is not None and not (start_date or end_date) and count <= store.max_bars:
+            fetched = self._fetch_tail(_mt5, symbol, timeframe, tf, count, info)
+            if fetched is None:
+                self._fetch_failed(_mt5, requested, resolved)
+            return fetched
+        
+        # Get data
+        print(f"[DEBUG]   Calling mt5.copy_rates_from_pos({symbol}, {tf.value}, 0, {count})")
+        if start_date and end_date:
+            rates = _mt5.copy_rates_range(symbol, tf.value, start_date, end_date)
+        elif start_date:
+            rates = _mt5.copy_rates_from(symbol, tf.value, start_date, count)
+        else:
+            rates = _mt5.copy_rates_from_pos(symbol, tf.value, 0, count)
+        
+        print(f"[DEBUG]   Result type: {type(rates)}, Length: {len(rates) if rates is not None else 0}")
+        
+        if rates is None or len(rates) == 0:
+            error = _mt5.last_error()
+            print(f"[DEBUG]   ✗ FETCH FAILED - MT5 Error: {error}")
+            self._fetch_failed(_mt5, requested, resolved)
+            return None
+        
+        print(f"[DEBUG]   ✓ Successfully fetched {len(rates)} rates")
+        return FetchedRates(symbol, timeframe, count, rates, getattr(info, 'digits', None))
+    
+    def _terminal_connected(self, _mt5) -> bool:
+        """Check the terminal connection, printing the MT5 error if it is down"""
+        terminal_info = _mt5.terminal_info()
+        print(f"[DEBUG]   MT5 terminal_info: {terminal_info is not None}")
+        if not terminal_info:
+            print(f"[DEBUG]   ✗ MT5 NOT CONNECTED - Error: {_mt5.last_error()}")
+            return False
+        return True
+    
+    def _fetch_failed(self, _mt5, symbol: str, resolved: bool):
+        """Drop the cached lookups of a failed fetch so the next one re-resolves"""
+        self.symbols.invalidate(symbol)
+        if resolved:
+            # The terminal check was skipped; run it now for the diagnostics
+            self._terminal_connected(_mt5)
+    
+    def _fetch_tail(
+        self,
+        _mt5,
+        symbol: str,
+        timeframe: str,
+        tf: Timeframe,
+        count: int,
+        info
+    ) -> Optional[FetchedRates]:
+        """
+        Copy the bars missing from the stored series for a ``count`` window
+        
+        The tail request starts at a wall-clock estimate of the bars since
+        the last stored one and doubles until it reaches back to the stored
+        (forming) bar, since bar times are in server time.
+        """
+        stored = self.bar_store.get(symbol, timeframe)
+        last_seconds = stored.index[-1].value // 10**9 if stored is not None and len(stored) else None
+        if last_seconds is None or len(stored) < count:
+            wanted = count
+        else:
+            self.stats["incremental_requests"] += 1
+            bar_seconds = Timeframe.to_minutes(tf) * 60
+            wanted = min(max(int((self._clock() - last_seconds) // bar_seconds) + 2, 2), count)
+        
+        while True:
+            rates = _mt5.copy_rates_from_pos(symbol, tf.value, 0, wanted)
+            if rates is None or len(rates) == 0:
+                print(f"[DEBUG]   ✗ FETCH FAILED - MT5 Error: {_mt5.last_error()}")
+                return None
+            # Done once the fetch overlaps the store or nothing older exists
+            overlaps = last_seconds is not None and rates['time'][0] <= last_seconds
+            if wanted == count or overlaps or len(rates) < wanted:
+                break
+            wanted = min(wanted * 2, count)
+        
+        print(f"[DEBUG]   ✓ Fetched {len(rates)} rates ({'tail' if wanted < count else 'full'})")
+        replace = last_seconds is None or len(stored) < count or not overlaps
+        return FetchedRates(symbol, timeframe, count, rates, getattr(info, 'digits', None),
+                            stored=True, store_from=None if replace else stored.index[-1])
+    
+    def build_ohlcv(
+        self,
+        fetched: FetchedRates,
+        validate: bool = True,
+        compact: Optional[bool] = None
+    ) -> pd.DataFrame:
+        """
+        Processing phase of get_ohlcv: convert, validate and store the rates
+        
+        Args:
+            fetched: Result of fetch_rates
+            validate: Whether to validate the new bars
+            compact: Return float32 prices and int32 volumes (default
+                PerformanceConfig.COMPACT_MODE)
+        
+        Returns:
+            pd.DataFrame: OHLCV data
+        """
+        df = rates_to_frame(fetched.rates)
+        self.stats["total_bars_fetched"] += len(df)
+        symbol, timeframe = fetched.symbol, fetched.timeframe
+        
+        if fetched.store_from is not None:
+            # Only the bars from the stored forming bar on are new
+            df = df.iloc[df.index.searchsorted(fetched.store_from, side='left'):]
+        if validate:
+            df = self._validated(df, symbol, timeframe)
+        if fetched.stored:
+            self.bar_store.merge(symbol, timeframe, df, replace=fetched.store_from is None)
+            df = self.bar_store.window(symbol, timeframe, fetched.count)
+        
+        if PerformanceConfig.COMPACT_MODE if compact is None else compact:
+            df = compact_ohlcv(df, digits=fetched.digits)
+        return df
+    
+    def _validated(self, df: pd.DataFrame, symbol: str, timeframe: str) -> pd.DataFrame:
+        """Validate fetched bars, cleaning them if issues are found"""
+        is_valid, issues = self.validator.validate_ohlcv(df, symbol, timeframe)
+        if not is_valid:
+            print(f"⚠️  Data validation issues for {symbol} {timeframe}: {issues}")
+            # Attempt to clean data
+            df = self.validator.clean_ohlcv(df)
+        return df
+    
     @ensure_connection
     def get_ticks(
         self,
@@ -380,10 +514,7 @@ class MT5DataFetcher:
                 self.stats["failed_requests"] += 1
                 return None
             
-            # Convert to DataFrame
-            df = pd.DataFrame(ticks)
-            df['time'] = pd.to_datetime(df['time'], unit='s')
-            df.set_index('time', inplace=True)
+            df = ticks_to_frame(ticks)
             
             self.stats["successful_requests"] += 1
             self.stats["total_ticks_fetched"] += len(df)
@@ -395,6 +526,104 @@ class MT5DataFetcher:
             print(f"Error fetching ticks for {symbol}: {str(e)}")
             return None
     
+    def iter_tick_bars(
+        self,
+        symbol: str,
+        start_date: datetime,
+        end_date: Optional[datetime] = None,
+        bar: str = "1m",
+        price: str = "bid",
+        chunk_seconds: Optional[int] = None,
+        include_forming: bool = False
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Stream bars built from ticks, one copy_ticks_range page at a time
+        
+        Only one page of ticks is held at once, so memory stays flat however
+        long the range is. Dates are UTC, as MT5 tick times are.
+        
+        Args:
+            symbol: Trading symbol
+            start_date: First tick time
+            end_date: Last tick time (default now)
+            bar: Bar specification: time ('10s', '2m'), tick count ('500t')
+                or range in points ('20r')
+            price: Tick price the bars are built from ('bid', 'ask' or 'last')
+            chunk_seconds: Page length (default DataConfig.TICK_CHUNK_SECONDS)
+            include_forming: Also yield the last, incomplete bar
+        
+        Yields:
+            pd.DataFrame: Bars completed by each page (pages completing no
+            bar are skipped)
+        
+        Raises:
+            RuntimeError: If the symbol is unknown or a page fails
+        """
+        _mt5 = _ensure_mt5_imported()
+        name = self.symbols.resolve(symbol)
+        if name is None:
+            raise RuntimeError(f"Symbol not found: {symbol}")
+        info = self.symbols.symbol_info(name)
+        aggregator = TickBarAggregator(bar, point=getattr(info, 'point', None), price=price)
+        
+        if end_date is None:
+            end_date = datetime.fromtimestamp(self._clock(), timezone.utc)
+            if start_date.tzinfo is None:
+                end_date = end_date.replace(tzinfo=None)
+        chunk = timedelta(seconds=chunk_seconds or DataConfig.TICK_CHUNK_SECONDS)
+        end_ms = pd.Timestamp(end_date).value // 10**6
+        page_start = start_date
+        while page_start <= end_date:
+            page_end = min(page_start + chunk, end_date)
+            ticks = _mt5.copy_ticks_range(name, page_start, page_end, _mt5.COPY_TICKS_ALL)
+            if ticks is None:
+                raise RuntimeError(f"copy_ticks_range failed for {name}: {_mt5.last_error()}")
+            self.stats["total_ticks_fetched"] += len(ticks)
+            
+            # Range ends are inclusive; a tick on a page boundary belongs to the next page
+            until_ms = pd.Timestamp(page_end).value // 10**6 if page_end < end_date else end_ms + 1
+            if len(ticks):
+                ticks = ticks[ticks['time_msc'] < until_ms]
+            bars = aggregator.update(ticks, until_msc=until_ms)
+            del ticks  # not kept alive while the generator is suspended
+            if len(bars):
+                yield bars
+            if page_end >= end_date:
+                break
+            page_start = page_end
+        
+        if include_forming:
+            bars = aggregator.flush()
+            if len(bars):
+                yield bars
+    
+    def get_tick_bars(
+        self,
+        symbol: str,
+        start_date: datetime,
+        end_date: Optional[datetime] = None,
+        bar: str = "1m",
+        **kwargs
+    ) -> Optional[pd.DataFrame]:
+        """
+        Bars built from ticks over a date range (see iter_tick_bars)
+        
+        Returns:
+            Optional[pd.DataFrame]: OHLCV bars or None if failed
+        """
+        self.stats["total_requests"] += 1
+        try:
+            frames = list(self.iter_tick_bars(symbol, start_date, end_date, bar=bar, **kwargs))
+        except Exception as e:
+            self.stats["failed_requests"] += 1
+            print(f"Error building {bar} bars for {symbol}: {str(e)}")
+            return None
+        
+        self.stats["successful_requests"] += 1
+        if not frames:
+            return empty_bar_frame()
+        return pd.concat(frames) if len(frames) > 1 else frames[0]
+    
     def get_multi_timeframe_data(
         self,
         symbol: str,
@@ -414,19 +643,30 @@ class MT5DataFetcher:
         Returns:
             Dict[str, pd.DataFrame]: Data for each timeframe
         """
-        result = {}
+        # MT5 calls for the timeframes run back to back on the scheduler's
+        # API thread while earlier results are converted and validated
+        return self.get_scheduler().fetch_many([symbol], timeframes, count, validate=validate).get(symbol, {})
         
-        for tf in timeframes:
-            df = self.get_ohlcv(symbol, tf, count, validate=validate)
-            if df is not None:
-                result[tf] = df
+    def get_scheduler(self):
+        """
+        Fetch scheduler running this fetcher's requests concurrently
         
-        return result
+        Returns:
+            FetchScheduler, created on first use
+        """
+        if self._scheduler is None:
+            from .fetch_scheduler import FetchScheduler
+            self._scheduler = FetchScheduler(self)
+        return self._scheduler
     
     def find_symbol(self, symbol: str) -> Optional[str]:
         """
         Find symbol by searching for exact match or similar names
         
+        Matches are tried exact (case-insensitive), then names starting with
+        the symbol, then names containing it, in broker order. Resolutions
+        are cached in ``self.symbols``.
+        
         Args:
             symbol: Symbol to search for (e.g., "GBPUSD")
             
@@ -434,44 +674,11 @@ class MT5DataFetcher:
             Optional[str]: Exact or closest matching symbol name, or None
         """
         try:
-            _mt5 = _ensure_mt5_imported()
-            # First try exact match
-            info = _mt5.symbol_info(symbol)
-            if info is not None:
-                return symbol
-            
-            # Try to find similar symbols
-            print(f"[DEBUG]   Searching for symbols matching '{symbol}'...")
-            all_symbols = _mt5.symbols_get()
-            if all_symbols is None:
-                return None
-            
-            # Look for symbols containing the search term
-            matches = []
-            symbol_upper = symbol.upper()
-            
-            for s in all_symbols:
-                s_name_upper = s.name.upper()
-                # Exact match (case-insensitive)
-                if s_name_upper == symbol_upper:
-                    matches.append((s.name, 0))  # Priority 0 (highest)
-                # Starts with the symbol
-                elif s_name_upper.startswith(symbol_upper):
-                    matches.append((s.name, 1))  # Priority 1
-                # Contains the symbol
-                elif symbol_upper in s_name_upper:
-                    matches.append((s.name, 2))  # Priority 2
-            
-            if matches:
-                # Sort by priority and return the best match
-                matches.sort(key=lambda x: x[1])
-                print(f"[DEBUG]   Found {len(matches)} matching symbols:")
-                for name, priority in matches[:5]:  # Show top 5
-                    print(f"[DEBUG]     - {name}")
-                return matches[0][0]
-            
-            return None
-            
+            # Exact, prefix and contains matches come from the cached symbol index
+            name = self.symbols.resolve(symbol)
+            if name is not None and name != symbol:
+                print(f"[DEBUG]   Matched '{symbol}' to broker symbol '{name}'")
+            return name
         except Exception as e:
             print(f"[DEBUG]   Error finding symbol: {str(e)}")
             return None
@@ -0,0 +1,610 @@
+"""
+Fake MetaTrader5
+Offline stand-in for the MetaTrader5 package, for tests and benchmarks
+"""
+import calendar
+import fnmatch
+import hashlib
+import random
+import threading
+import time
+from collections import Counter, namedtuple
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .rates import RATE_DTYPE, TICK_DTYPE
+from config.settings import MT5Config
+
+# ==================== MT5 CONSTANTS ====================
+
+TIMEFRAME_M1, TIMEFRAME_M2, TIMEFRAME_M3, TIMEFRAME_M4, TIMEFRAME_M5 = 1, 2, 3, 4, 5
+TIMEFRAME_M6, TIMEFRAME_M10, TIMEFRAME_M12, TIMEFRAME_M15 = 6, 10, 12, 15
+TIMEFRAME_M20, TIMEFRAME_M30 = 20, 30
+TIMEFRAME_H1, TIMEFRAME_H2, TIMEFRAME_H3, TIMEFRAME_H4 = 16385, 16386, 16387, 16388
+TIMEFRAME_H6, TIMEFRAME_H8, TIMEFRAME_H12 = 16390, 16392, 16396
+TIMEFRAME_D1, TIMEFRAME_W1, TIMEFRAME_MN1 = 16408, 32769, 49153
+
+COPY_TICKS_ALL, COPY_TICKS_INFO, COPY_TICKS_TRADE = -1, 1, 2
+
+TICK_FLAG_BID, TICK_FLAG_ASK, TICK_FLAG_LAST = 2, 4, 8
+TICK_FLAG_VOLUME, TICK_FLAG_BUY, TICK_FLAG_SELL = 16, 32, 64
+
+RES_S_OK = 1
+RES_E_FAIL = -1
+RES_E_INVALID_PARAMS = -2
+RES_E_NOT_FOUND = -4
+RES_E_INTERNAL_FAIL = -10000
+RES_E_INTERNAL_FAIL_CONNECT = -10004
+RES_E_INTERNAL_FAIL_TIMEOUT = -10005
+
+_ERROR_MESSAGES = {
+    RES_S_OK: 'Success',
+    RES_E_FAIL: 'Generic fail',
+    RES_E_INVALID_PARAMS: 'Invalid params',
+    RES_E_NOT_FOUND: 'Not found',
+    RES_E_INTERNAL_FAIL: 'Internal IPC general error',
+    RES_E_INTERNAL_FAIL_CONNECT: 'No IPC connection',
+    RES_E_INTERNAL_FAIL_TIMEOUT: 'IPC timeout',
+}
+
+TerminalInfo = namedtuple('TerminalInfo', [
+    'connected', 'trade_allowed', 'tradeapi_disabled', 'maxbars', 'ping_last', 'build',
+    'name', 'company', 'language', 'path', 'data_path',
+])
+AccountInfo = namedtuple('AccountInfo', [
+    'login', 'trade_mode', 'leverage', 'trade_allowed', 'balance', 'credit', 'profit',
+    'equity', 'margin', 'margin_free', 'margin_level', 'name', 'server', 'currency', 'company',
+])
+SymbolInfo = namedtuple('SymbolInfo', [
+    'name', 'description', 'path', 'visible', 'select', 'digits', 'point', 'spread',
+    'trade_mode', 'trade_contract_size', 'trade_tick_value', 'trade_tick_size',
+    'volume_min', 'volume_max', 'volume_step', 'bid', 'ask', 'last', 'time',
+    'currency_base', 'currency_profit', 'currency_margin',
+])
+Tick = namedtuple('Tick', ['time', 'bid', 'ask', 'last', 'volume', 'time_msc', 'flags', 'volume_real'])
+
+# Base price, digits, typical spread (points) and volatility (relative, per
+# sqrt(second)) of the instruments the fake knows by name
+INSTRUMENTS: Dict[str, Tuple[float, int, int, float]] = {
+    'EURUSD': (1.0850, 5, 12, 1.5e-5),
+    'GBPUSD': (1.2650, 5, 15, 1.7e-5),
+    'USDJPY': (149.50, 3, 14, 1.6e-5),
+    'USDCHF': (0.8850, 5, 15, 1.5e-5),
+    'AUDUSD': (0.6550, 5, 14, 1.8e-5),
+    'USDCAD': (1.3550, 5, 18, 1.4e-5),
+    'NZDUSD': (0.6050, 5, 20, 1.8e-5),
+    'EURJPY': (162.20, 3, 20, 1.8e-5),
+    'GBPJPY': (189.10, 3, 28, 2.0e-5),
+    'XAUUSD': (2050.0, 2, 25, 2.5e-5),
+    'XAGUSD': (23.500, 3, 30, 3.5e-5),
+    'BTCUSD': (43000.0, 2, 1500, 5.0e-5),
+    'US30': (38000.0, 1, 20, 2.0e-5),
+}
+
+_MINUTE_TIMEFRAMES = {1, 2, 3, 4, 5, 6, 10, 12, 15, 20, 30}
+_WEEK_OFFSET = 3 * 86400  # Weekly bars open on Sunday; 1970-01-04 was one
+_PERIODS = 600.0 * 3.0 ** np.arange(10)  # Price path components, 10 minutes to ~4.5 months
+_HISTORY_START = 946_684_800  # 2000-01-01
+
+
+def _mix(x: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer: uniformly scrambled uint64s from counters"""
+    # The products wrap by design; NumPy only warns about it for scalars
+    with np.errstate(over='ignore'):
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _uniform(key: int, counters: np.ndarray) -> np.ndarray:
+    """Deterministic uniforms in [0, 1), one per integer counter"""
+    x = np.asarray(counters).astype(np.uint64) + np.uint64(key)
+    return (_mix(x) >> np.uint64(11)) * 2.0 ** -53
+
+
+def _key(*parts) -> int:
+    return int.from_bytes(hashlib.blake2b(':'.join(map(str, parts)).encode(), digest_size=8).digest(), 'little')
+
+
+def _seconds(value: Union[datetime, int, float]) -> float:
+    """Epoch seconds of a request date; naive datetimes are taken as UTC"""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            return calendar.timegm(value.timetuple()) + value.microsecond / 1e6
+        return value.timestamp()
+    return float(value)
+
+
+class _Instrument:
+    """Deterministic price path of one symbol"""
+    
+    def __init__(self, name: str, seed: int):
+        base_name = max((known for known in INSTRUMENTS if name.upper().startswith(known)), key=len, default=None)
+        self.key = _key(seed, name)
+        if base_name is not None:
+            self.base, self.digits, self.spread, self.sigma = INSTRUMENTS[base_name]
+        else:
+            self.base = round(1 + 99 * float(_uniform(self.key, 0)), 2)
+            self.digits, self.spread, self.sigma = 5, 15, 2.0e-5
+        self.point = 10.0 ** -self.digits
+        
+        rng = np.random.default_rng(self.key)
+        self.periods = _PERIODS * rng.uniform(0.9, 1.1, len(_PERIODS))
+        self.phases = rng.uniform(0, 2 * np.pi, len(_PERIODS))
+        self.amplitudes = self.sigma * np.sqrt(self.periods) / 2
+    
+    def mid(self, seconds: np.ndarray) -> np.ndarray:
+        """Unrounded mid price at the given epoch seconds"""
+        seconds = np.asarray(seconds, dtype=np.float64)
+        log_price = np.zeros(seconds.shape)
+        for period, phase, amplitude in zip(self.periods, self.phases, self.amplitudes):
+            log_price += amplitude * np.sin(2 * np.pi * seconds / period + phase)
+        return self.base * np.exp(log_price)
+
+
+class FakeMetaTrader5:
+    """
+    Offline MetaTrader5 with deterministic market data
+    
+    Exposes the parts of the MetaTrader5 package the bot uses, with the same
+    names, constants, record layouts and None/last_error() failure style.
+    Prices follow a seeded path that is a pure function of symbol and time,
+    so overlapping requests (from_pos, from or range) always agree and two
+    instances with the same seed serve identical data. Bars and ticks exist
+    around the clock up to ``clock()``; the newest bar is the forming one.
+    
+    Usage:
+        fake = FakeMetaTrader5(seed=7, suffix='m', latency=0.02)
+        fake.inject_error('copy_rates_from_pos', times=2)
+        install(fake)  # _ensure_mt5_imported() now returns fake
+    """
+    
+    def __init__(
+        self,
+        seed: int = 42,
+        symbols: Optional[Iterable[str]] = None,
+        suffix: str = '',
+        latency: Union[float, Dict[str, float]] = 0.0,
+        fail_rate: float = 0.0,
+        ticks_per_second: float = 2.0,
+        maxbars: int = 100_000,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Initialize fake terminal
+        
+        Args:
+            seed: Market data seed
+            symbols: Broker symbol names (default the INSTRUMENTS names)
+            suffix: Broker suffix appended to the default names (e.g. 'm', '.pro')
+            latency: Seconds slept per API call, or per function name
+            fail_rate: Probability that a data call fails with an IPC timeout
+            ticks_per_second: Average tick rate
+            maxbars: Bars reachable by position, as the terminal's "Max bars in chart"
+            clock: Current epoch seconds
+        """
+        self.seed = seed
+        self.symbols = list(symbols) if symbols is not None else [name + suffix for name in INSTRUMENTS]
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.ticks_per_second = ticks_per_second
+        self.maxbars = maxbars
+        self.clock = clock
+        
+        # Module-style constants, so the instance stands in for the package
+        for name, value in globals().items():
+            if name.isupper() and name.split('_')[0] in ('TIMEFRAME', 'COPY', 'TICK', 'RES'):
+                setattr(self, name, value)
+        
+        self.calls = Counter()
+        self.threads = set()
+        self.connected = False
+        self.login_id = None
+        self.server = None
+        self._selected = set(self.symbols[:4])
+        self._instruments: Dict[str, _Instrument] = {}
+        self._injected: List[List] = []
+        self._random = random.Random(seed)
+        self._last_error = (RES_S_OK, _ERROR_MESSAGES[RES_S_OK])
+        self._lock = threading.Lock()
+    
+    # ==================== CALL HANDLING ====================
+    
+    def inject_error(
+        self,
+        function: str = '*',
+        code: int = RES_E_INTERNAL_FAIL,
+        message: Optional[str] = None,
+        times: int = 1
+    ):
+        """
+        Make the next ``times`` calls of ``function`` ('*' for any) fail
+        
+        The call returns None (False for boolean calls) and last_error()
+        reports ``code``.
+        """
+        with self._lock:
+            self._injected.append([function, code, message or _ERROR_MESSAGES.get(code, 'Error'), times])
+    
+    def disconnect(self):
+        """Simulate the terminal dropping its connection until initialize()"""
+        self.connected = False
+    
+    def _begin(self, function: str, data: bool = True) -> bool:
+        """Record a call and decide whether it fails; False after setting last_error"""
+        with self._lock:
+            self.calls[function] += 1
+            self.threads.add(threading.get_ident())
+            error = None
+            for injected in self._injected:
+                if injected[0] in ('*', function):
+                    error = (injected[1], injected[2])
+                    injected[3] -= 1
+                    break
+            self._injected = [injected for injected in self._injected if injected[3] > 0]
+            if error is None and data and not self.connected:
+                error = (RES_E_INTERNAL_FAIL_CONNECT, _ERROR_MESSAGES[RES_E_INTERNAL_FAIL_CONNECT])
+            if error is None and data and self.fail_rate and self._random.random() < self.fail_rate:
+                error = (RES_E_INTERNAL_FAIL_TIMEOUT, _ERROR_MESSAGES[RES_E_INTERNAL_FAIL_TIMEOUT])
+            self._last_error = error or (RES_S_OK, _ERROR_MESSAGES[RES_S_OK])
+        
+        latency = self.latency.get(function, 0.0) if isinstance(self.latency, dict) else self.latency
+        if latency:
+            time.sleep(latency)
+        return error is None
+    
+    def _fail(self, code: int) -> None:
+        self._last_error = (code, _ERROR_MESSAGES[code])
+        return None
+    
+    def _instrument(self, symbol: str) -> Optional[_Instrument]:
+        if symbol not in self.symbols:
+            return None
+        if symbol not in self._instruments:
+            self._instruments[symbol] = _Instrument(symbol, self.seed)
+        return self._instruments[symbol]
+    
+    # ==================== TERMINAL ====================
+    
+    def initialize(self, path=None, login=None, password=None, server=None, timeout=None, portable=False) -> bool:
+        if not self._begin('initialize', data=False):
+            return False
+        self.connected = True
+        self.login_id = int(login) if login else 10_000_001
+        self.server = server or 'FakeBroker-Demo'
+        return True
+    
+    def login(self, login, password=None, server=None, timeout=None) -> bool:
+        if not self._begin('login'):
+            return False
+        self.login_id, self.server = int(login), server or self.server
+        return True
+    
+    def shutdown(self) -> bool:
+        self._begin('shutdown', data=False)
+        self.connected = False
+        return True
+    
+    def version(self):
+        if not self._begin('version'):
+            return None
+        return (500, 4000, '1 Jan 2024')
+    
+    def last_error(self) -> Tuple[int, str]:
+        return self._last_error
+    
+    def terminal_info(self) -> Optional[TerminalInfo]:
+        if not self._begin('terminal_info'):
+            return None
+        return TerminalInfo(
+            connected=True, trade_allowed=True, tradeapi_disabled=False, maxbars=self.maxbars,
+            ping_last=20_000, build=4000, name='Fake MetaTrader 5', company='Fake Broker Ltd',
+            language='English', path='/opt/fake-mt5', data_path='/opt/fake-mt5/data'
+        )
+    
+    def account_info(self) -> Optional[AccountInfo]:
+        if not self._begin('account_info'):
+            return None
+        return AccountInfo(
+            login=self.login_id, trade_mode=0, leverage=100, trade_allowed=True,
+            balance=10_000.0, credit=0.0, profit=0.0, equity=10_000.0, margin=0.0,
+            margin_free=10_000.0, margin_level=0.0, name='Fake Account', server=self.server,
+            currency='USD', company='Fake Broker Ltd'
+        )
+    
+    # ==================== SYMBOLS ====================
+    
+    def symbols_total(self) -> Optional[int]:
+        if not self._begin('symbols_total'):
+            return None
+        return len(self.symbols)
+    
+    def symbols_get(self, group: Optional[str] = None) -> Optional[Tuple[SymbolInfo, ...]]:
+        """Symbols matching an MT5 group filter such as '*USD*,!EUR*'"""
+        if not self._begin('symbols_get'):
+            return None
+        names = self.symbols
+        if group:
+            patterns = [pattern.strip() for pattern in group.split(',') if pattern.strip()]
+            include = [pattern for pattern in patterns if not pattern.startswith('!')]
+            exclude = [pattern[1:] for pattern in patterns if pattern.startswith('!')]
+            names = [
+                name for name in names
+                if any(fnmatch.fnmatchcase(name.upper(), pattern.upper()) for pattern in include)
+                and not any(fnmatch.fnmatchcase(name.upper(), pattern.upper()) for pattern in exclude)
+            ]
+        return tuple(self._symbol_info(name) for name in names)
+    
+    def symbol_info(self, symbol: str) -> Optional[SymbolInfo]:
+        if not self._begin('symbol_info'):
+            return None
+        if self._instrument(symbol) is None:
+            return self._fail(RES_E_NOT_FOUND)
+        return self._symbol_info(symbol)
+    
+    def symbol_info_tick(self, symbol: str) -> Optional[Tick]:
+        if not self._begin('symbol_info_tick'):
+            return None
+        if self._instrument(symbol) is None:
+            return self._fail(RES_E_NOT_FOUND)
+        return self._last_tick(symbol)
+    
+    def symbol_select(self, symbol: str, enable: bool = True) -> bool:
+        if not self._begin('symbol_select'):
+            return False
+        if self._instrument(symbol) is None:
+            self._fail(RES_E_NOT_FOUND)
+            return False
+        (self._selected.add if enable else self._selected.discard)(symbol)
+        return True
+    
+    def _last_tick(self, symbol: str) -> Tick:
+        now = self.clock()
+        ticks = self._ticks(symbol, now - 60, now)
+        if not len(ticks):
+            ticks = self._ticks(symbol, now - 3600, now)
+        return Tick(*ticks[-1].tolist())
+    
+    def _symbol_info(self, symbol: str) -> SymbolInfo:
+        instrument = self._instrument(symbol)
+        tick = self._last_tick(symbol)
+        currency_base, currency_profit = symbol[:3].upper(), symbol[3:6].upper() or 'USD'
+        return SymbolInfo(
+            name=symbol, description=f"Fake {symbol}", path=f"Fake\\{symbol}",
+            visible=symbol in self._selected, select=symbol in self._selected,
+            digits=instrument.digits, point=instrument.point, spread=instrument.spread,
+            trade_mode=4, trade_contract_size=100_000.0, trade_tick_value=1.0,
+            trade_tick_size=instrument.point, volume_min=0.01, volume_max=100.0, volume_step=0.01,
+            bid=tick.bid, ask=tick.ask, last=tick.last, time=tick.time,
+            currency_base=currency_base, currency_profit=currency_profit, currency_margin=currency_base
+        )
+    
+    # ==================== RATES ====================
+    
+    @staticmethod
+    def _bar_layout(timeframe: int) -> Optional[Tuple[int, int]]:
+        """(bar seconds, grid offset) of a timeframe; (0, 0) for months"""
+        if timeframe in _MINUTE_TIMEFRAMES:
+            return timeframe * 60, 0
+        if TIMEFRAME_H1 <= timeframe <= TIMEFRAME_D1 and timeframe - 16384 in (1, 2, 3, 4, 6, 8, 12, 24):
+            return (timeframe - 16384) * 3600, 0
+        if timeframe == TIMEFRAME_W1:
+            return 7 * 86400, _WEEK_OFFSET
+        if timeframe == TIMEFRAME_MN1:
+            return 0, 0
+        return None
+    
+    @staticmethod
+    def _bar_index(layout: Tuple[int, int], seconds: float) -> int:
+        """Index of the bar open at ``seconds``"""
+        bar_seconds, offset = layout
+        if not bar_seconds:
+            return int(np.datetime64(int(seconds), 's').astype('datetime64[M]').astype(np.int64))
+        return int((seconds - offset) // bar_seconds)
+    
+    @staticmethod
+    def _open_times(layout: Tuple[int, int], index: np.ndarray) -> np.ndarray:
+        bar_seconds, offset = layout
+        if not bar_seconds:
+            return index.astype('datetime64[M]').astype('datetime64[s]').astype(np.int64)
+        return index * bar_seconds + offset
+    
+    def _rates(self, symbol: str, timeframe: int, first: int, last: int) -> Optional[np.ndarray]:
+        """Bars ``first``..``last`` (inclusive indexes) within the available history"""
+        instrument = self._instrument(symbol)
+        layout = self._bar_layout(timeframe)
+        if instrument is None:
+            return self._fail(RES_E_NOT_FOUND)
+        if layout is None:
+            return self._fail(RES_E_INVALID_PARAMS)
+        
+        now = self.clock()
+        current = self._bar_index(layout, now)
+        first = max(first, self._bar_index(layout, _HISTORY_START))
+        last = min(last, current)
+        index = np.arange(first, last + 1, dtype=np.int64)
+        rates = np.zeros(len(index), dtype=RATE_DTYPE)
+        if not len(index):
+            return rates
+        
+        opens = self._open_times(layout, index)
+        closes = np.minimum(self._open_times(layout, index + 1), now)
+        bar_seconds = (closes - opens).astype(np.float64)
+        open_, close = instrument.mid(opens), instrument.mid(closes)
+        
+        # Wicks and activity are per bar draws, so revisits of a bar agree
+        stream = _key(instrument.key, timeframe)
+        swing = instrument.base * instrument.sigma * np.sqrt(np.maximum(bar_seconds, 1.0))
+        rates['time'] = opens
+        rates['open'] = open_.round(instrument.digits)
+        rates['close'] = close.round(instrument.digits)
+        rates['high'] = (np.maximum(open_, close) + swing * _uniform(stream, 3 * index)).round(instrument.digits)
+        rates['low'] = (np.minimum(open_, close) - swing * _uniform(stream, 3 * index + 1)).round(instrument.digits)
+        activity = _uniform(stream, 3 * index + 2)
+        rates['tick_volume'] = 1 + (bar_seconds * self.ticks_per_second * (0.5 + activity)).astype(np.int64)
+        rates['spread'] = instrument.spread + (3 * activity).astype(np.int32)
+        return rates
+    
+    def copy_rates_from_pos(self, symbol: str, timeframe: int, start_pos: int, count: int) -> Optional[np.ndarray]:
+        """``count`` bars ending ``start_pos`` bars before the forming one, oldest first"""
+        if not self._begin('copy_rates_from_pos'):
+            return None
+        layout = self._bar_layout(timeframe)
+        if layout is None:
+            return self._fail(RES_E_INVALID_PARAMS)
+        current = self._bar_index(layout, self.clock())
+        last = current - start_pos
+        first = max(last - count + 1, current - self.maxbars + 1)
+        return self._rates(symbol, timeframe, first, last)
+    
+    def copy_rates_from(self, symbol: str, timeframe: int, date_from, count: int) -> Optional[np.ndarray]:
+        """``count`` bars up to the one open at ``date_from``, oldest first"""
+        if not self._begin('copy_rates_from'):
+            return None
+        layout = self._bar_layout(timeframe)
+        if layout is None:
+            return self._fail(RES_E_INVALID_PARAMS)
+        last = self._bar_index(layout, _seconds(date_from))
+        return self._rates(symbol, timeframe, last - count + 1, last)
+    
+    def copy_rates_range(self, symbol: str, timeframe: int, date_from, date_to) -> Optional[np.ndarray]:
+        """Bars opened within [date_from, date_to]"""
+        if not self._begin('copy_rates_range'):
+            return None
+        layout = self._bar_layout(timeframe)
+        if layout is None:
+            return self._fail(RES_E_INVALID_PARAMS)
+        start = _seconds(date_from)
+        first = self._bar_index(layout, start)
+        if self._open_times(layout, np.array([first]))[0] < start:
+            first += 1
+        return self._rates(symbol, timeframe, first, self._bar_index(layout, _seconds(date_to)))
+    
+    # ==================== TICKS ====================
+    
+    def _ticks(self, symbol: str, start: float, end: float) -> np.ndarray:
+        """Ticks with ``start`` <= time < ``end`` (seconds), oldest first"""
+        instrument = self._instrument(symbol)
+        end = min(end, self.clock())
+        first_second, last_second = int(np.floor(start)), int(np.ceil(end))
+        if last_second <= first_second:
+            return np.zeros(0, dtype=TICK_DTYPE)
+        
+        stream = _key(instrument.key, 'ticks')
+        seconds = np.arange(first_second, last_second, dtype=np.int64)
+        counts = (_uniform(stream, 2 * seconds) * (2 * self.ticks_per_second + 1)).astype(np.int64)
+        tick_seconds = np.repeat(seconds, counts)
+        # Position within its second, spreading the ticks over the second
+        starts = np.repeat(np.cumsum(counts) - counts, counts)
+        position = np.arange(len(tick_seconds)) - starts
+        offset = (position + _uniform(stream, 2 * tick_seconds + 1)) / np.repeat(counts, counts)
+        time_msc = tick_seconds * 1000 + (offset * 1000).astype(np.int64)
+        keep = (time_msc >= start * 1000) & (time_msc < end * 1000)
+        time_msc = time_msc[keep]
+        
+        draws = _uniform(_key(stream, 'draws'), time_msc)
+        spread = (instrument.spread + np.floor(3 * draws)) * instrument.point
+        mid = instrument.mid(time_msc / 1000) + (draws - 0.5) * 2 * instrument.point
+        bid = (mid - spread / 2).round(instrument.digits)
+        ask = (bid + spread).round(instrument.digits)
+        traded = draws < 0.25
+        buy = draws < 0.125
+        volume = np.where(traded, 1 + (draws * 40).astype(np.int64), 0)
+        
+        ticks = np.zeros(len(time_msc), dtype=TICK_DTYPE)
+        ticks['time'] = time_msc // 1000
+        ticks['time_msc'] = time_msc
+        ticks['bid'] = bid
+        ticks['ask'] = ask
+        ticks['last'] = np.where(traded, np.where(buy, ask, bid), 0.0)
+        ticks['volume'] = volume
+        ticks['volume_real'] = volume
+        ticks['flags'] = (TICK_FLAG_BID | TICK_FLAG_ASK) + traded * (
+            TICK_FLAG_LAST | TICK_FLAG_VOLUME) + np.where(traded, np.where(buy, TICK_FLAG_BUY, TICK_FLAG_SELL), 0)
+        return ticks
+    
+    @staticmethod
+    def _filter_ticks(ticks: np.ndarray, flags: int) -> np.ndarray:
+        if flags == COPY_TICKS_TRADE:
+            return ticks[(ticks['flags'] & (TICK_FLAG_LAST | TICK_FLAG_VOLUME)) != 0]
+        if flags == COPY_TICKS_INFO:
+            return ticks[(ticks['flags'] & (TICK_FLAG_BID | TICK_FLAG_ASK)) != 0]
+        return ticks
+    
+    def copy_ticks_range(self, symbol: str, date_from, date_to, flags: int) -> Optional[np.ndarray]:
+        """Ticks within [date_from, date_to]"""
+        if not self._begin('copy_ticks_range'):
+            return None
+        if self._instrument(symbol) is None:
+            return self._fail(RES_E_NOT_FOUND)
+        start, end = _seconds(date_from), _seconds(date_to) + 0.001
+        # A day at a time, so generation never holds more than one day of draws
+        chunks = [self._ticks(symbol, chunk, min(chunk + 86400, end)) for chunk in np.arange(start, end, 86400)]
+        ticks = np.concatenate(chunks) if chunks else np.zeros(0, dtype=TICK_DTYPE)
+        return self._filter_ticks(ticks, flags)
+    
+    def copy_ticks_from(self, symbol: str, date_from, count: int, flags: int) -> Optional[np.ndarray]:
+        """Up to ``count`` ticks from ``date_from`` on"""
+        if not self._begin('copy_ticks_from'):
+            return None
+        if self._instrument(symbol) is None:
+            return self._fail(RES_E_NOT_FOUND)
+        start, now = _seconds(date_from), self.clock()
+        chunks, found = [], 0
+        # Pages sized from the average tick rate until enough ticks are found
+        while found < count and start < now:
+            span = max((count - found) / max(self.ticks_per_second, 0.01) * 1.2, 60.0)
+            ticks = self._filter_ticks(self._ticks(symbol, start, start + span), flags)
+            chunks.append(ticks[:count - found])
+            found += len(chunks[-1])
+            start += span
+        return np.concatenate(chunks) if chunks else np.zeros(0, dtype=TICK_DTYPE)
+    
+    def __repr__(self) -> str:
+        return f"<FakeMetaTrader5 seed={self.seed} symbols={len(self.symbols)} connected={self.connected}>"
+
+
+# ==================== SELECTION ====================
+
+_default: Optional[FakeMetaTrader5] = None
+
+
+def get_fake_mt5() -> FakeMetaTrader5:
+    """The process-wide fake, configured from MT5Config.FAKE_* on first use"""
+    global _default
+    if _default is None:
+        _default = FakeMetaTrader5(
+            seed=MT5Config.FAKE_SEED,
+            suffix=MT5Config.FAKE_SYMBOL_SUFFIX,
+            latency=MT5Config.FAKE_LATENCY_MS / 1000
+        )
+    return _default
+
+
+def install(fake: Optional[FakeMetaTrader5] = None) -> FakeMetaTrader5:
+    """
+    Use a fake as the MetaTrader5 module for the rest of the process
+    
+    Sets MT5Config.BACKEND to 'fake' and drops the module cached by every
+    lazy importer, so connection, fetch and health code all talk to it.
+    
+    Args:
+        fake: Fake to install (default get_fake_mt5())
+    
+    Returns:
+        The installed fake
+    """
+    global _default
+    import sys
+    from . import connection, data_fetcher
+    
+    _default = fake or get_fake_mt5()
+    MT5Config.BACKEND = 'fake'
+    connection.mt5 = None
+    data_fetcher.mt5 = None
+    connector = sys.modules.get('mt5_connector')
+    if connector is not None:
+        connector._mt5 = None
+    return _default
@@ -0,0 +1,205 @@
+"""
+Fetch Scheduler
+Concurrent OHLCV fetching with all MetaTrader5 calls on one dedicated thread
+"""
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+import pandas as pd
+
+from .connection import ensure_connection
+from .data_fetcher import FetchedRates, MT5DataFetcher
+from config.settings import PerformanceConfig
+
+# fetch_rates with the fetcher's reconnect handling, as get_ohlcv has it
+_fetch_rates = ensure_connection(MT5DataFetcher.fetch_rates)
+
+
+class FetchScheduler:
+    """
+    Schedules OHLCV fetches from any thread or asyncio task
+    
+    The MetaTrader5 package is not safe to call from arbitrary threads, so
+    every MT5 call runs on a single API thread owned by the scheduler. The
+    DataFrame conversion, validation and bar store merge of each result run
+    on a worker pool, so the API thread moves on to the next request while
+    earlier results are processed and a batch takes about as long as its
+    MT5 calls alone.
+    
+    Usage:
+        with FetchScheduler(fetcher) as scheduler:
+            data = scheduler.fetch_many(['EURUSD', 'GBPUSD'], ['M15', 'H1'])
+    """
+    
+    def __init__(self, fetcher: Optional[MT5DataFetcher] = None, workers: Optional[int] = None):
+        """
+        Initialize fetch scheduler
+        
+        Args:
+            fetcher: Data fetcher whose phases are scheduled (default a new
+                MT5DataFetcher on the global MT5 API)
+            workers: Processing threads (default PerformanceConfig.MAX_WORKERS)
+        """
+        self.fetcher = fetcher or MT5DataFetcher()
+        self._api = ThreadPoolExecutor(max_workers=1, thread_name_prefix='mt5-api')
+        self._pool = ThreadPoolExecutor(
+            max_workers=workers or PerformanceConfig.MAX_WORKERS,
+            thread_name_prefix='mt5-build'
+        )
+        self._lock = threading.Lock()
+        
+        self.stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+        }
+    
+    def call(self, function: Callable, *args, **kwargs) -> Future:
+        """
+        Run any MT5 call on the API thread
+        
+        Returns:
+            Future of the call's result
+        """
+        return self._api.submit(function, *args, **kwargs)
+    
+    def submit(
+        self,
+        symbol: str,
+        timeframe: str = "H1",
+        count: int = 1000,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        validate: bool = True,
+        compact: Optional[bool] = None
+    ) -> Future:
+        """
+        Schedule one get_ohlcv request
+        
+        Args:
+            Same as MT5DataFetcher.get_ohlcv
+        
+        Returns:
+            Future resolving to the OHLCV DataFrame, or None if the fetch
+            failed (as get_ohlcv returns)
+        """
+        self.fetcher.stats["total_requests"] += 1
+        self._count("submitted")
+        result: Future = Future()
+        
+        def build(fetched: FetchedRates):
+            try:
+                df = self.fetcher.build_ohlcv(fetched, validate=validate, compact=compact)
+            except Exception as e:
+                self._finish(result, symbol, timeframe, error=e)
+                return
+            self._finish(result, symbol, timeframe, df=df)
+        
+        def fetched_done(api: Future):
+            error = api.exception()
+            fetched = None if error is not None else api.result()
+            if fetched is None:
+                self._finish(result, symbol, timeframe, error=error)
+                return
+            try:
+                self._pool.submit(build, fetched)
+            except Exception as e:
+                # E.g. the pool was shut down while the request was in flight
+                self._finish(result, symbol, timeframe, error=e)
+        
+        api = self._api.submit(_fetch_rates, self.fetcher, symbol, timeframe, count, start_date, end_date)
+        api.add_done_callback(fetched_done)
+        return result
+    
+    def _finish(
+        self,
+        result: Future,
+        symbol: str,
+        timeframe: str,
+        df: Optional[pd.DataFrame] = None,
+        error: Optional[BaseException] = None
+    ):
+        if df is None:
+            if error is not None:
+                print(f"Error fetching OHLCV for {symbol} {timeframe}: {str(error)}")
+            self.fetcher.stats["failed_requests"] += 1
+            self._count("failed")
+        else:
+            self.fetcher.stats["successful_requests"] += 1
+            self._count("completed")
+        result.set_result(df)
+    
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+    
+    def submit_many(
+        self,
+        symbols: Iterable[str],
+        timeframes: Iterable[str],
+        count: int = 1000,
+        **kwargs
+    ) -> Dict[Tuple[str, str], Future]:
+        """
+        Schedule every (symbol, timeframe) combination
+        
+        Returns:
+            Dict mapping (symbol, timeframe) to its Future
+        """
+        timeframes = list(timeframes)
+        return {
+            (symbol, tf): self.submit(symbol, tf, count, **kwargs)
+            for symbol in symbols for tf in timeframes
+        }
+    
+    def fetch_many(
+        self,
+        symbols: Iterable[str],
+        timeframes: Iterable[str],
+        count: int = 1000,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> Dict[str, Dict[str, pd.DataFrame]]:
+        """
+        Fetch every (symbol, timeframe) combination and wait for the results
+        
+        Returns:
+            Dict[symbol, Dict[timeframe, DataFrame]]; failed fetches are left
+            out, as in get_multi_timeframe_data
+        """
+        futures = self.submit_many(symbols, timeframes, count, **kwargs)
+        data: Dict[str, Dict[str, pd.DataFrame]] = {}
+        for (symbol, tf), future in futures.items():
+            df = future.result(timeout)
+            data.setdefault(symbol, {})
+            if df is not None:
+                data[symbol][tf] = df
+        return data
+    
+    async def fetch_async(self, symbol: str, timeframe: str = "H1", count: int = 1000, **kwargs) -> Optional[pd.DataFrame]:
+        """Awaitable submit() for asyncio code"""
+        return await asyncio.wrap_future(self.submit(symbol, timeframe, count, **kwargs))
+    
+    def shutdown(self, wait: bool = True):
+        """Stop the API thread and the worker pool, and write the bar store"""
+        self._api.shutdown(wait=wait)
+        self._pool.shutdown(wait=wait)
+        if wait and self.fetcher.bar_store is not None:
+            self.fetcher.bar_store.flush()
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """Scheduler statistics"""
+        with self._lock:
+            return {**self.stats, "pending": self.stats["submitted"] - self.stats["completed"] - self.stats["failed"]}
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+    
+    def __repr__(self) -> str:
+        return f"<FetchScheduler submitted={self.stats['submitted']} pending={self.get_statistics()['pending']}>"
@@ -0,0 +1,89 @@
+"""
+Rate Conversion
+DataFrames built directly on the record arrays returned by MetaTrader5
+"""
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+# Record layouts of copy_rates_* and copy_ticks_* results
+RATE_DTYPE = np.dtype([
+    ('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'), ('close', '<f8'),
+    ('tick_volume', '<u8'), ('spread', '<i4'), ('real_volume', '<u8'),
+])
+TICK_DTYPE = np.dtype([
+    ('time', '<i8'), ('bid', '<f8'), ('ask', '<f8'), ('last', '<f8'), ('volume', '<u8'),
+    ('time_msc', '<i8'), ('flags', '<u4'), ('volume_real', '<f8'),
+])
+
+# MT5 rate fields and their OHLCV column names, in output order
+RATE_COLUMNS: Dict[str, str] = {
+    'open': 'Open',
+    'high': 'High',
+    'low': 'Low',
+    'close': 'Close',
+    'tick_volume': 'Volume',
+    'spread': 'Spread',
+    'real_volume': 'RealVolume',
+}
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def epoch_index(seconds: np.ndarray, name: str = 'time') -> pd.DatetimeIndex:
+    """
+    DatetimeIndex over epoch seconds without parsing
+    
+    int64 seconds are reinterpreted as datetime64[s], so the index shares
+    the memory of ``seconds`` (a field view of a record array is fine).
+    """
+    seconds = np.asarray(seconds)
+    if seconds.dtype != np.int64:
+        seconds = seconds.astype(np.int64)
+    return pd.DatetimeIndex(seconds.view('datetime64[s]'), name=name, copy=False)
+
+
+def records_to_frame(records: np.ndarray, columns: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """
+    DataFrame of field views of an MT5 record array, indexed by its 'time' field
+    
+    No column is copied or parsed; the frame keeps the record array alive.
+    
+    Args:
+        records: Structured array from copy_rates_* or copy_ticks_*
+        columns: Fields to keep mapped to column names (default every field
+            but 'time', unrenamed); fields missing from the array are skipped
+    
+    Returns:
+        pd.DataFrame indexed by bar/tick open time
+    """
+    names = records.dtype.names
+    if columns is None:
+        columns = {field: field for field in names if field != 'time'}
+    data = {column: records[field] for field, column in columns.items() if field in names}
+    return pd.DataFrame(data, index=epoch_index(records['time']), copy=False)
+
+
+def rates_to_frame(rates: np.ndarray, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    OHLCV DataFrame from a copy_rates_* array
+    
+    Args:
+        rates: MT5 rates array
+        columns: OHLCV column names to keep (default Open, High, Low, Close,
+            Volume and, when present, Spread and RealVolume)
+    
+    Returns:
+        pd.DataFrame: OHLCV data
+    """
+    fields = RATE_COLUMNS
+    if columns is not None:
+        keep = set(columns)
+        fields = {field: column for field, column in RATE_COLUMNS.items() if column in keep}
+    return records_to_frame(rates, fields)
+
+
+def ticks_to_frame(ticks: np.ndarray) -> pd.DataFrame:
+    """Tick DataFrame from a copy_ticks_* array, with the MT5 field names"""
+    return records_to_frame(ticks)
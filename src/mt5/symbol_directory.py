@@ -0,0 +1,190 @@
+"""
+Symbol Directory
+Cached symbol resolution and symbol_info lookups for the MT5 fetch path
+"""
+import bisect
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .connection import connection_epoch
+from config.settings import DataConfig
+
+
+def normalize_symbol(name: str) -> str:
+    """Upper-case name without separators ('eur/usd.m' -> 'EURUSDM')"""
+    return re.sub(r'[^A-Z0-9]', '', name.upper())
+
+
+class SymbolDirectory:
+    """
+    Index of the terminal's symbols with cached resolutions
+    
+    ``symbols_get()`` is loaded once and indexed by upper-case and
+    normalized name, so resolving 'EURUSD' to a broker name such as
+    'EURUSD.m' is a dictionary or bisect lookup instead of a scan of every
+    symbol. Resolutions and ``symbol_info`` results are cached for ``ttl``
+    seconds; everything is dropped when the connection epoch changes (a
+    new connect or reconnect) or on invalidate(). Failed lookups are not
+    cached, so a symbol missed while the terminal is still starting up is
+    found by the next call.
+    """
+    
+    def __init__(self, api: Callable[[], Any], ttl: Optional[float] = None):
+        """
+        Initialize symbol directory
+        
+        Args:
+            api: Returns the MetaTrader5 module (e.g. _ensure_mt5_imported)
+            ttl: Cache lifetime in seconds (default DataConfig.SYMBOL_CACHE_TTL_SECONDS)
+        """
+        self.api = api
+        self.ttl = DataConfig.SYMBOL_CACHE_TTL_SECONDS if ttl is None else ttl
+        self._clock = time.time
+        self._lock = threading.RLock()
+        self._reset()
+        
+        self.stats = {
+            "loads": 0,
+            "resolve_hits": 0,
+            "resolve_misses": 0,
+            "info_hits": 0,
+            "info_misses": 0,
+            "invalidations": 0,
+        }
+    
+    def _reset(self):
+        self._names: List[str] = []                # broker order
+        self._upper: Dict[str, int] = {}           # upper-case name -> position
+        self._normalized: Dict[str, int] = {}      # normalized name -> first position
+        self._sorted: List[Tuple[str, int]] = []   # (normalized name, position), for prefixes
+        self._loaded_at: Optional[float] = None
+        self._resolved: Dict[str, Tuple[Optional[str], float]] = {}
+        self._info: Dict[str, Tuple[Any, float]] = {}
+        self._epoch = connection_epoch()
+    
+    def _check_epoch(self):
+        if self._epoch != connection_epoch():
+            self.invalidate()
+    
+    def _fresh(self, stamp: Optional[float]) -> bool:
+        return stamp is not None and self._clock() - stamp < self.ttl
+    
+    def _load(self) -> bool:
+        """(Re)build the index from symbols_get(); False if the terminal returned nothing"""
+        if self._fresh(self._loaded_at):
+            return True
+        symbols = self.api().symbols_get()
+        if not symbols:
+            return False
+        
+        self._names = [s.name for s in symbols]
+        self._upper, self._normalized = {}, {}
+        for position, name in enumerate(self._names):
+            self._upper.setdefault(name.upper(), position)
+            self._normalized.setdefault(normalize_symbol(name), position)
+        self._sorted = sorted((normalize_symbol(name), position) for position, name in enumerate(self._names))
+        self._loaded_at = self._clock()
+        self.stats["loads"] += 1
+        return True
+    
+    def _match(self, symbol: str) -> Optional[str]:
+        """Best broker name for ``symbol``: exact, then prefix, then contains"""
+        key = normalize_symbol(symbol)
+        position = self._upper.get(symbol.upper())
+        if position is None:
+            position = self._normalized.get(key)
+        if position is None and key:
+            # Names starting with the key are contiguous in sorted order;
+            # the first one the broker lists wins, as in a linear scan
+            start = bisect.bisect_left(self._sorted, (key, -1))
+            end = bisect.bisect_left(self._sorted, (key + '\x7f', -1), lo=start)
+            if start < end:
+                position = min(p for _, p in self._sorted[start:end])
+        if position is None and key:
+            position = next((p for p, name in enumerate(self._names) if key in normalize_symbol(name)), None)
+        return self._names[position] if position is not None else None
+    
+    def resolve(self, symbol: str) -> Optional[str]:
+        """
+        Broker name for a symbol
+        
+        Args:
+            symbol: Symbol to look up (e.g. "GBPUSD")
+        
+        Returns:
+            Optional[str]: Exact or closest matching symbol name, or None
+        """
+        with self._lock:
+            self._check_epoch()
+            cached = self._resolved.get(symbol)
+            if cached is not None and self._fresh(cached[1]):
+                self.stats["resolve_hits"] += 1
+                return cached[0]
+            self.stats["resolve_misses"] += 1
+            
+            name = self._match(symbol) if self._load() else None
+            if name is None and self.api().symbol_info(symbol) is not None:
+                # Known to the terminal but missing from symbols_get()
+                name = symbol
+            if name is not None:
+                self._resolved[symbol] = (name, self._clock())
+            return name
+    
+    def symbol_info(self, name: str, refresh: bool = False) -> Any:
+        """
+        Cached symbol_info() for a broker symbol name
+        
+        Args:
+            name: Broker symbol name
+            refresh: Query the terminal even if a cached value is fresh
+        
+        Returns:
+            SymbolInfo or None
+        """
+        with self._lock:
+            self._check_epoch()
+            cached = self._info.get(name)
+            if not refresh and cached is not None and self._fresh(cached[1]):
+                self.stats["info_hits"] += 1
+                return cached[0]
+            self.stats["info_misses"] += 1
+            
+            info = self.api().symbol_info(name)
+            if info is None:
+                self._info.pop(name, None)
+            else:
+                self._info[name] = (info, self._clock())
+            return info
+    
+    def is_resolved(self, symbol: str) -> bool:
+        """Whether ``symbol`` has a fresh cached resolution"""
+        with self._lock:
+            cached = self._resolved.get(symbol)
+            return self._epoch == connection_epoch() and cached is not None and \
+                cached[0] is not None and self._fresh(cached[1])
+    
+    def invalidate(self, symbol: Optional[str] = None):
+        """
+        Drop cached lookups
+        
+        Args:
+            symbol: Only this requested symbol and its broker name (default
+                everything, including the symbol index)
+        """
+        with self._lock:
+            self.stats["invalidations"] += 1
+            if symbol is None:
+                self._reset()
+                return
+            name = self._resolved.pop(symbol, (None, 0))[0]
+            self._info.pop(name or symbol, None)
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """Directory statistics"""
+        with self._lock:
+            return {**self.stats, "symbols": len(self._names), "resolved": len(self._resolved)}
+    
+    def __repr__(self) -> str:
+        return f"<SymbolDirectory symbols={len(self._names)} resolved={len(self._resolved)}>"
@@ -0,0 +1,255 @@
+"""
+Tick Bars
+Incremental OHLCV aggregation of tick streams into time, tick-count and range bars
+"""
+import re
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+BAR_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume', 'Spread', 'RealVolume']
+
+_TIME_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+_RANGE_SEARCH_TICKS = 256
+
+
+def empty_bar_frame() -> pd.DataFrame:
+    """Bar frame without rows"""
+    return pd.DataFrame(columns=BAR_COLUMNS, index=pd.DatetimeIndex([], dtype='datetime64[ms]', name='time'))
+
+
+def parse_bar_spec(spec: Union[str, int]) -> Tuple[str, float]:
+    """
+    Parse a bar specification
+    
+    '10s', '2m', '4h' and '1d' are time bars, '500t' closes a bar every 500
+    ticks and '20r' whenever the bar's high-low range reaches 20 points.
+    
+    Returns:
+        (kind, size): 'time' with milliseconds, 'tick' with a tick count or
+        'range' with points
+    
+    Raises:
+        ValueError: If the specification is not understood
+    """
+    match = re.fullmatch(r'(\d+(?:\.\d+)?)([smhdtr])', str(spec).strip().lower())
+    if match is None or float(match.group(1)) <= 0:
+        raise ValueError(f"Invalid bar specification: {spec!r}")
+    size, unit = float(match.group(1)), match.group(2)
+    if unit in _TIME_UNITS:
+        milliseconds = size * _TIME_UNITS[unit] * 1000
+        if milliseconds != int(milliseconds):
+            raise ValueError(f"Time bars must be whole milliseconds: {spec!r}")
+        return 'time', int(milliseconds)
+    if unit == 't':
+        if size != int(size):
+            raise ValueError(f"Tick bars need a whole number of ticks: {spec!r}")
+        return 'tick', int(size)
+    return 'range', size
+
+
+class TickBarAggregator:
+    """
+    Builds OHLCV bars from tick chunks as they arrive
+    
+    Feed MT5 tick arrays (copy_ticks_* layout) in time order to update();
+    it returns the bars completed so far and carries the forming bar over
+    to the next chunk, so memory depends on the chunk size only. Bars have
+    the rate frame columns: Volume is the tick count, Spread the average
+    spread (in points when ``point`` is given) and RealVolume the summed
+    real volume. Time bars are aligned to the epoch and indexed by their
+    open time; tick and range bars by their first tick.
+    
+    Usage:
+        aggregator = TickBarAggregator('10s', point=0.00001)
+        for ticks in pages:
+            bars = aggregator.update(ticks)
+    """
+    
+    def __init__(self, spec: Union[str, int] = '1m', point: Optional[float] = None, price: str = 'bid'):
+        """
+        Initialize aggregator
+        
+        Args:
+            spec: Bar specification (see parse_bar_spec)
+            point: Symbol point size, for range bars and spreads in points
+            price: Tick field the bars are built from ('bid', 'ask' or 'last');
+                ticks without that price are skipped
+        """
+        self.spec = spec
+        self.kind, self.size = parse_bar_spec(spec)
+        if self.kind == 'range' and point is None:
+            raise ValueError("Range bars need the symbol point size")
+        self.point = point
+        self.price = price
+        self._forming: Optional[Dict[str, np.ndarray]] = None
+        
+        self.stats = {
+            "ticks": 0,
+            "bars": 0,
+        }
+    
+    # ==================== SEGMENTATION ====================
+    
+    def _segments(self, prices: np.ndarray, time_msc: np.ndarray) -> Tuple[np.ndarray, bool, bool]:
+        """
+        Bar starts within a chunk
+        
+        Returns:
+            (starts, continues, last_complete): segment start indexes,
+            whether the first segment belongs to the forming bar, and
+            whether the last segment is already a complete bar
+        """
+        forming = self._forming
+        if self.kind == 'time':
+            ids = time_msc // self.size
+            starts = np.r_[0, np.flatnonzero(np.diff(ids)) + 1]
+            return starts, forming is not None and forming['id'][0] == ids[0], False
+        
+        if self.kind == 'tick':
+            offset = int(forming['count'][0]) if forming is not None else 0
+            ids = (offset + np.arange(len(prices))) // self.size
+            starts = np.r_[0, np.flatnonzero(np.diff(ids)) + 1]
+            last_count = offset * (len(starts) == 1) + len(prices) - starts[-1]
+            return starts, forming is not None, last_count == self.size
+        
+        return self._range_segments(prices)
+    
+    def _range_segments(self, prices: np.ndarray) -> Tuple[np.ndarray, bool, bool]:
+        # A bar closes on the tick that stretches its range to the target;
+        # the search looks ahead in doubling windows, so the Python loop
+        # runs per bar rather than per tick
+        target = self.size * self.point * (1 - 1e-9)
+        forming = self._forming
+        high, low = (forming['high'][0], forming['low'][0]) if forming is not None else (-np.inf, np.inf)
+        starts, start, complete = [0], 0, False
+        while start < len(prices):
+            window = _RANGE_SEARCH_TICKS
+            while True:
+                segment = prices[start:start + window]
+                highs = np.maximum(np.maximum.accumulate(segment), high)
+                lows = np.minimum(np.minimum.accumulate(segment), low)
+                hits = np.flatnonzero(highs - lows >= target)
+                if len(hits) or start + window >= len(prices):
+                    break
+                window *= 2
+            if not len(hits):
+                complete = False
+                break
+            start += int(hits[0]) + 1
+            high, low, complete = -np.inf, np.inf, True
+            if start < len(prices):
+                starts.append(start)
+        return np.array(starts), forming is not None, complete
+    
+    # ==================== AGGREGATION ====================
+    
+    def update(self, ticks: np.ndarray, until_msc: Optional[int] = None) -> pd.DataFrame:
+        """
+        Add a chunk of ticks
+        
+        Args:
+            ticks: Tick array in time order, continuing the previous chunk
+            until_msc: All ticks before this time (ms) have been delivered,
+                which completes a time bar that ends by then
+        
+        Returns:
+            pd.DataFrame of the bars completed by this chunk (may be empty)
+        """
+        prices = ticks[self.price].astype(np.float64) if len(ticks) else np.zeros(0)
+        valid = prices > 0
+        if not valid.all():
+            ticks, prices = ticks[valid], prices[valid]
+        self.stats["ticks"] += len(ticks)
+        
+        done = []
+        if len(ticks):
+            time_msc = ticks['time_msc'].astype(np.int64)
+            starts, continues, last_complete = self._segments(prices, time_msc)
+            bars = self._reduce(ticks, prices, time_msc, starts)
+            if continues:
+                bars = self._merge(self._forming, bars)
+            elif self._forming is not None:
+                done.append(self._forming)
+            self._forming = None
+            if last_complete:
+                done.append(bars)
+            else:
+                if len(bars['open']) > 1:
+                    done.append({key: values[:-1] for key, values in bars.items()})
+                self._forming = {key: values[-1:].copy() for key, values in bars.items()}
+        
+        if self.kind == 'time' and until_msc is not None and self._forming is not None and \
+                (self._forming['id'][0] + 1) * self.size <= until_msc:
+            done.append(self._forming)
+            self._forming = None
+        frame = self._frame(done)
+        self.stats["bars"] += len(frame)
+        return frame
+    
+    def _reduce(self, ticks: np.ndarray, prices: np.ndarray, time_msc: np.ndarray, starts: np.ndarray) -> Dict[str, np.ndarray]:
+        """Per-segment aggregates of a chunk"""
+        ends = np.r_[starts[1:], len(prices)]
+        spread = ticks['ask'].astype(np.float64) - ticks['bid'].astype(np.float64)
+        if self.point:
+            spread = spread / self.point
+        bars = {
+            'time': time_msc[starts],
+            'open': prices[starts],
+            'high': np.maximum.reduceat(prices, starts),
+            'low': np.minimum.reduceat(prices, starts),
+            'close': prices[ends - 1],
+            'count': ends - starts,
+            'spread': np.add.reduceat(spread, starts),
+            'volume': np.add.reduceat(ticks['volume_real'].astype(np.float64), starts),
+        }
+        if self.kind == 'time':
+            bars['id'] = time_msc[starts] // self.size
+            bars['time'] = bars['id'] * self.size
+        return bars
+    
+    @staticmethod
+    def _merge(forming: Dict[str, np.ndarray], bars: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Fold the first segment of a chunk into the forming bar"""
+        bars = {key: values.copy() for key, values in bars.items()}
+        for key in ('time', 'open') + (('id',) if 'id' in bars else ()):
+            bars[key][0] = forming[key][0]
+        bars['high'][0] = max(bars['high'][0], forming['high'][0])
+        bars['low'][0] = min(bars['low'][0], forming['low'][0])
+        for key in ('count', 'spread', 'volume'):
+            bars[key][0] += forming[key][0]
+        return bars
+    
+    def _frame(self, parts) -> pd.DataFrame:
+        if not parts:
+            return empty_bar_frame()
+        bars = {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+        return pd.DataFrame({
+            'Open': bars['open'],
+            'High': bars['high'],
+            'Low': bars['low'],
+            'Close': bars['close'],
+            'Volume': bars['count'],
+            'Spread': bars['spread'] / bars['count'],
+            'RealVolume': bars['volume'],
+        }, index=pd.DatetimeIndex(bars['time'].astype('datetime64[ms]'), name='time'))
+    
+    @property
+    def forming(self) -> Optional[pd.DataFrame]:
+        """The bar still forming, as a one-row frame (None if there is none)"""
+        return self._frame([self._forming]) if self._forming is not None else None
+    
+    def flush(self) -> pd.DataFrame:
+        """Close the forming bar (e.g. at the end of a range) and return it"""
+        frame = self._frame([self._forming] if self._forming is not None else [])
+        self._forming = None
+        self.stats["bars"] += len(frame)
+        return frame
+    
+    def get_statistics(self) -> Dict[str, int]:
+        """Aggregator statistics"""
+        return {**self.stats, "forming": int(self._forming is not None)}
+    
+    def __repr__(self) -> str:
+        return f"<TickBarAggregator spec={self.spec!r} bars={self.stats['bars']}>"
@@ -1,4 +1,4 @@
 # Utilities package
-from .logger import get_logger, Logger
+from .logger import get_logger, CustomLogger as Logger
 
 __all__ = ['get_logger', 'Logger']
@@ -0,0 +1,161 @@
+"""
+Compact Frames
+Opt-in float32/int32 storage for OHLCV frames and indicator results
+
+Error bounds against the float64 pipeline:
+- float32 prices with the symbol's digits recorded are restored exactly
+  (to round(price, digits)) while |price| * 10**digits < 2**23, because the
+  float32 rounding error stays below half a point; columns outside that
+  range are kept in float64. Without digits the relative error is <= 2**-24.
+- Scaled int32 prices (price * 10**digits) are exact while
+  |price| * 10**digits < 2**31.
+- Volumes are exact in int32; columns above 2**31 - 1 are kept in int64.
+- Indicators are computed in float64 from the restored prices, so they equal
+  the float64 results before storage. Storing them as float32 adds a
+  relative error <= 2**-24 (about 6e-8) per value.
+"""
+import sys
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+PRICE_COLUMNS = ('Open', 'High', 'Low', 'Close')
+VOLUME_COLUMNS = ('Volume', 'Spread', 'RealVolume')
+
+# Largest |price| / point kept exact by float32 and by int32 steps
+FLOAT32_EXACT_STEPS = 2 ** 23
+INT32_EXACT_STEPS = np.iinfo(np.int32).max
+
+# Relative error of storing a float64 value as float32 (round to nearest)
+FLOAT32_RELATIVE_ERROR = 2.0 ** -24
+
+
+def is_compact(df: pd.DataFrame) -> bool:
+    """Whether any price column of ``df`` is stored as float32 or scaled int32"""
+    return any(
+        column in df.columns and df[column].dtype in (np.float32, np.int32)
+        for column in PRICE_COLUMNS
+    )
+
+
+def compact_ohlcv(df: pd.DataFrame, digits: Optional[int] = None, scaled: bool = False) -> pd.DataFrame:
+    """
+    Compact copy of an OHLCV frame
+    
+    Prices become float32 (or int32 steps of 10**-digits with ``scaled``) and
+    volumes int32, each only where the column stays within the documented
+    error bound; other columns keep their dtype. The digits and scale are
+    recorded in ``df.attrs`` for expand_ohlcv.
+    
+    Args:
+        df: OHLCV DataFrame
+        digits: Symbol digits (MT5 symbol_info.digits)
+        scaled: Store prices as int32 steps (needs ``digits``)
+    
+    Returns:
+        Compact DataFrame on the same index
+    """
+    if scaled and digits is None:
+        raise ValueError("Scaled int32 prices need the symbol's digits")
+    
+    compact = df.copy(deep=False)
+    scale = 10.0 ** digits if digits is not None else None
+    for column in PRICE_COLUMNS:
+        if column not in df.columns or df[column].dtype in (np.float32, np.int32):
+            continue
+        values = df[column].to_numpy(dtype=np.float64)
+        largest = np.nanmax(np.abs(values)) if len(values) and not np.isnan(values).all() else 0.0
+        if scaled:
+            if np.isnan(values).any() or largest * scale >= INT32_EXACT_STEPS:
+                continue
+            compact[column] = np.rint(values * scale).astype(np.int32)
+        elif scale is None or largest * scale < FLOAT32_EXACT_STEPS:
+            compact[column] = values.astype(np.float32)
+    
+    for column in VOLUME_COLUMNS:
+        if column not in df.columns:
+            continue
+        values = df[column].to_numpy()
+        if values.dtype.kind not in 'iu' or not len(values):
+            continue
+        if values.min() >= 0 and values.max() <= INT32_EXACT_STEPS:
+            compact[column] = values.astype(np.int32)
+    
+    compact.attrs = {**df.attrs, 'digits': digits}
+    if scaled:
+        compact.attrs['price_scale'] = scale
+    return compact
+
+
+def expand_ohlcv(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    float64 prices (and int64 volumes) from a compact frame
+    
+    Prices are restored to the symbol's digits when they were recorded, so
+    they equal the original float64 prices within the documented bounds.
+    Frames that are not compact are returned unchanged.
+    """
+    if not is_compact(df):
+        return df
+    
+    digits = df.attrs.get('digits')
+    scale = df.attrs.get('price_scale')
+    expanded = df.copy(deep=False)
+    for column in PRICE_COLUMNS:
+        if column not in df.columns:
+            continue
+        dtype = df[column].dtype
+        if dtype == np.int32 and scale:
+            expanded[column] = df[column].to_numpy(dtype=np.float64) / scale
+        elif dtype == np.float32:
+            values = df[column].to_numpy(dtype=np.float64)
+            expanded[column] = np.round(values, digits) if digits is not None else values
+    
+    for column in VOLUME_COLUMNS:
+        if column in df.columns and df[column].dtype == np.int32:
+            expanded[column] = df[column].to_numpy(dtype=np.int64)
+    
+    expanded.attrs = {key: value for key, value in df.attrs.items() if key != 'price_scale'}
+    return expanded
+
+
+def compact_results(value: Any) -> Any:
+    """
+    float32 copy of indicator results
+    
+    float64 Series, DataFrames and arrays (also inside dicts, lists and
+    tuples) become float32; everything else is returned as is.
+    """
+    if isinstance(value, (pd.Series, pd.DataFrame)):
+        if isinstance(value, pd.Series):
+            return value.astype(np.float32) if value.dtype == np.float64 else value
+        columns = [column for column, dtype in value.dtypes.items() if dtype == np.float64]
+        return value.astype({column: np.float32 for column in columns}) if columns else value
+    if isinstance(value, np.ndarray):
+        return value.astype(np.float32) if value.dtype == np.float64 else value
+    if isinstance(value, dict):
+        return {key: compact_results(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(compact_results(item) for item in value)
+    return value
+
+
+def memory_usage(value: Any, index: bool = True) -> int:
+    """
+    Approximate bytes held by a frame, array or nested result
+    
+    Args:
+        value: Frame, Series, array, or dict/list/tuple of them
+        index: Count pandas indexes (False for results sharing their
+            input frame's index)
+    """
+    if isinstance(value, (pd.Series, pd.DataFrame)):
+        return int(np.sum(value.memory_usage(index=index, deep=False)))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(memory_usage(item, index) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(memory_usage(item, index) for item in value)
+    return sys.getsizeof(value)
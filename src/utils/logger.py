@@ -61,7 +61,7 @@ class CustomLogger:
         Args:
             level: Minimum log level
             console_output: Enable console logging
-            file_output: Enable file logging
+            file_output: Enable file logging (app.log and the category logs)
             json_output: Enable JSON structured logging
             rotation: Log rotation size/time
             retention: Log retention period
@@ -105,8 +105,9 @@ class CustomLogger:
                 serialize=True,  # JSON serialization
             )
         
-        # Category-specific handlers
-        self._setup_category_handlers(level, rotation, retention)
+        # Category-specific handlers (files as well)
+        if file_output:
+            self._setup_category_handlers(level, rotation, retention)
         
         self._setup_complete = True
         self.logger.info(f"Logging initialized for {self.name}")
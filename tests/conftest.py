@@ -0,0 +1,59 @@
+"""
+Shared pytest fixtures
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils.logger import setup_logging  # noqa: E402
+
+# Before any test module sets up the project logger: keep test runs out of logs/
+setup_logging(file_output=False, json_output=False)
+
+
+def make_ohlcv(n: int = 500, seed: int = 42, freq: str = '1h') -> pd.DataFrame:
+    """Create a random-walk OHLCV frame"""
+    rng = np.random.default_rng(seed)
+    close = 1.08 + np.cumsum(rng.normal(0, 0.0008, n))
+    open_ = close + rng.normal(0, 0.0004, n)
+    high = np.maximum(open_, close) + rng.uniform(0, 0.0010, n)
+    low = np.minimum(open_, close) - rng.uniform(0, 0.0010, n)
+    volume = rng.integers(1000, 10000, n)
+    
+    # Round prices so that equal highs/lows (tie cases) actually occur
+    return pd.DataFrame(
+        {
+            'Open': open_.round(4),
+            'High': high.round(4),
+            'Low': low.round(4),
+            'Close': close.round(4),
+            'Volume': volume,
+        },
+        index=pd.date_range(start='2024-01-01', periods=n, freq=freq),
+    )
+
+
+@pytest.fixture
+def ohlcv() -> pd.DataFrame:
+    """Default 500-bar OHLCV frame"""
+    return make_ohlcv()
+
+
+@pytest.fixture
+def offline_mt5(monkeypatch):
+    """FakeMetaTrader5 (broker suffix '.pro') installed as the MT5 backend for one test"""
+    import mt5_connector
+    from config.settings import MT5Config
+    from src.mt5 import connection, data_fetcher, fake_mt5
+    
+    # install() rebinds these; monkeypatch restores them afterwards
+    for owner, name in ((MT5Config, 'BACKEND'), (connection, 'mt5'), (data_fetcher, 'mt5'),
+                        (fake_mt5, '_default'), (mt5_connector, '_mt5')):
+        monkeypatch.setattr(owner, name, getattr(owner, name))
+    return fake_mt5.install(fake_mt5.FakeMetaTrader5(suffix='.pro'))
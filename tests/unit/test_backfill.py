@@ -0,0 +1,129 @@
+"""
+Tests for the chunked history backfill
+"""
+from datetime import datetime, timezone
+
+import numpy as np
+
+from config.settings import DataConfig
+from src.mt5.backfill import HistoryBackfill
+from src.mt5.bar_store import BarStore
+from src.mt5.data_fetcher import MT5DataFetcher
+
+NOW = 1_718_000_000.5
+START = datetime(2024, 3, 1)
+END = datetime(2024, 6, 1)
+
+
+def _backfill(tmp_path, **kwargs) -> HistoryBackfill:
+    backfill = HistoryBackfill(MT5DataFetcher(bar_store=BarStore(tmp_path / 'bars', persist=False)),
+                               directory=tmp_path / 'history', chunk_bars=500, **kwargs)
+    backfill._clock = lambda: NOW
+    return backfill
+
+
+def _expected(fake, start, end):
+    rates = fake.copy_rates_range('EURUSD.pro', fake.TIMEFRAME_H1, start, end)
+    return rates[rates['time'] < end.replace(tzinfo=timezone.utc).timestamp()]
+
+
+def test_backfill_stores_the_range_in_chunks(offline_mt5, tmp_path):
+    offline_mt5.clock = lambda: NOW
+    offline_mt5.initialize()
+    backfill = _backfill(tmp_path, concurrency=3)
+    
+    report = backfill.run('EURUSD', 'H1', START, END)
+    assert offline_mt5.calls['copy_rates_range'] == report['chunks']
+    df = backfill.load('EURUSD', 'H1')
+    expected = _expected(offline_mt5, START, END)
+    
+    assert report['chunks'] == len(backfill.plan('H1', START, END)) > 4
+    assert report['fetched'] == report['chunks'] and report['failed'] == 0
+    assert report['bars'] == len(df) == len(expected) and report['bars_per_sec'] > 0
+    np.testing.assert_array_equal(df.index.to_numpy().astype('datetime64[s]').astype('int64'), expected['time'])
+    np.testing.assert_array_equal(df['Close'].to_numpy(), expected['close'])
+    assert len(backfill.load('EURUSD', 'H1', datetime(2024, 4, 1), datetime(2024, 4, 2))) == 24
+    
+    # Chunk boundaries are aligned, so a wider range reuses the inner chunks
+    offline_mt5.calls.clear()
+    report = backfill.run('EURUSD', 'H1', datetime(2024, 2, 1), END)
+    assert report['skipped'] == len(backfill.plan('H1', START, END)) - 1
+    assert offline_mt5.calls['copy_rates_range'] == report['fetched']
+    assert len(backfill.load('EURUSD', 'H1')) == len(_expected(offline_mt5, datetime(2024, 2, 1), END))
+
+
+def test_interrupted_backfill_resumes(offline_mt5, tmp_path):
+    offline_mt5.clock = lambda: NOW
+    offline_mt5.initialize()
+    backfill = _backfill(tmp_path, concurrency=1, retries=0)
+    chunks = backfill.plan('H1', START, END)
+    
+    # A failed fetch is followed by a range check, which fails as well
+    offline_mt5.inject_error('copy_rates_range', times=6)
+    first = backfill.run('EURUSD', 'H1', START, END)
+    assert first['failed'] == 3 and first['fetched'] == len(chunks) - 3
+    assert len(backfill.checkpoint('EURUSD', 'H1')) == len(chunks) - 3
+    
+    offline_mt5.calls.clear()
+    resumed = _backfill(tmp_path).run('EURUSD', 'H1', START, END)
+    assert resumed['skipped'] == len(chunks) - 3 and resumed['fetched'] == 3
+    assert offline_mt5.calls['copy_rates_range'] == 3
+    assert len(backfill.load('EURUSD', 'H1')) == len(_expected(offline_mt5, START, END))
+    
+    # The newest chunk may still be forming and is fetched again
+    recent = _backfill(tmp_path).run('EURUSD', 'H1', END)
+    assert recent['fetched'] > 0
+    assert _backfill(tmp_path).run('EURUSD', 'H1', END)['skipped'] == recent['chunks'] - 1
+
+
+def test_chunks_without_bars_are_checkpointed(offline_mt5, tmp_path):
+    offline_mt5.clock = lambda: NOW
+    offline_mt5.initialize()
+    backfill = _backfill(tmp_path, concurrency=2)
+    start, end = datetime(1999, 6, 1), datetime(2000, 6, 1)
+    
+    # The fake's history starts on 2000-01-01
+    report = backfill.run('EURUSD', 'H1', start, end)
+    done = backfill.checkpoint('EURUSD', 'H1')
+    empty = [key for key, bars in done.items() if bars == 0]
+    assert report['failed'] == 0 and report['fetched'] == report['chunks'] == len(done)
+    assert len(empty) >= 3 and len(list((tmp_path / 'history').rglob('*.npz'))) == len(done) - len(empty)
+    # One fetch per chunk plus one range check per empty chunk
+    assert offline_mt5.calls['copy_rates_range'] == report['chunks'] + len(empty)
+    assert len(backfill.load('EURUSD', 'H1')) == len(_expected(offline_mt5, start, end))
+    
+    offline_mt5.calls.clear()
+    assert backfill.run('EURUSD', 'H1', start, end)['skipped'] == report['chunks']
+    assert offline_mt5.calls['copy_rates_range'] == 0
+    
+    # A real error is still retried and reported
+    offline_mt5.inject_error('copy_rates_range', times=2)
+    assert _backfill(tmp_path, retries=0).run('EURUSD', 'H1', end, datetime(2000, 6, 2))['failed'] == 1
+
+
+def test_default_backfill_checkpoints_empty_chunks(offline_mt5, tmp_path, monkeypatch):
+    monkeypatch.setattr(DataConfig, 'BAR_STORE_DIR', tmp_path / 'bars')
+    offline_mt5.clock = lambda: NOW
+    offline_mt5.initialize()
+    backfill = HistoryBackfill(directory=tmp_path / 'history', chunk_bars=500)
+    backfill._clock = lambda: NOW
+    
+    report = backfill.run('EURUSD', 'H1', datetime(1999, 10, 1), datetime(2000, 2, 1))
+    assert report['failed'] == 0 and len(backfill.checkpoint('EURUSD', 'H1')) == report['chunks']
+
+
+def test_open_ended_runs_rewrite_the_newest_chunk(offline_mt5, tmp_path):
+    now = [NOW]
+    offline_mt5.clock = lambda: now[0]
+    offline_mt5.initialize()
+    backfill = _backfill(tmp_path)
+    backfill._clock = lambda: now[0]
+    
+    for hours in range(3):
+        now[0] = NOW + hours * 3600
+        report = backfill.run('EURUSD', 'H1', END)
+    
+    # The newest chunk keeps its aligned end instead of ending at each run's now
+    assert len(list((tmp_path / 'history').rglob('*.npz'))) == report['chunks']
+    expected = _expected(offline_mt5, END, datetime.fromtimestamp(now[0] + 1, timezone.utc))
+    np.testing.assert_array_equal(backfill.load('EURUSD', 'H1')['Close'].to_numpy(), expected['close'])
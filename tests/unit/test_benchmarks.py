@@ -0,0 +1,156 @@
+"""
+Tests for the benchmark package
+"""
+import json
+
+import pytest
+
+from benchmarks import (
+    BenchmarkRunner, compare_results, generate_ohlcv, generate_timeframes,
+    load_results, parse_size, save_results
+)
+from benchmarks.runner import BenchmarkTarget
+from benchmarks.suite import default_targets, frame_methods
+from src.indicators.smc import SMCAnalyzer
+
+
+def test_synthetic_data_is_deterministic_and_valid():
+    first = generate_ohlcv(2000, seed=7)
+    second = generate_ohlcv(2000, seed=7)
+    
+    assert first.equals(second)
+    assert not first.equals(generate_ohlcv(2000, seed=8))
+    assert len(first) == 2000 and first.index.is_monotonic_increasing
+    assert (first['High'] >= first[['Open', 'Close']].max(axis=1)).all()
+    assert (first['Low'] <= first[['Open', 'Close']].min(axis=1)).all()
+    assert (first['Volume'] > 0).all()
+
+
+def test_timeframes_resample_the_base_series():
+    data = generate_timeframes(960, seed=1)
+    
+    assert len(data['M15']) == 960
+    assert len(data['H1']) == 240
+    assert data['H1']['High'].iloc[0] == data['M15']['High'].iloc[:4].max()
+
+
+@pytest.mark.parametrize('text,bars', [('1k', 1000), ('10K', 10000), ('1M', 1_000_000), ('2500', 2500), ('1.5k', 1500)])
+def test_parse_size(text, bars):
+    assert parse_size(text) == bars
+
+
+def test_parse_size_rejects_garbage():
+    with pytest.raises(ValueError):
+        parse_size('lots')
+
+
+def test_frame_methods_cover_public_api():
+    methods = frame_methods(SMCAnalyzer)
+    
+    assert 'analyze' in methods and 'identify_swing_points' in methods
+    assert 'get_cache_stats' not in methods and '_liquidity_tolerance' not in methods
+
+
+def test_default_targets_filter():
+    names = [target.name for target in default_targets(['smcanalyzer.analyze'])]
+    assert names == ['SMCAnalyzer.analyze', 'SMCAnalyzer.analyze_history']
+
+
+def test_runner_records_timings_memory_and_errors(tmp_path):
+    def ok(inputs):
+        df = inputs.ohlcv
+        return lambda: df['Close'].rolling(20).mean()
+    
+    def broken(inputs):
+        def call():
+            raise RuntimeError('boom')
+        return call
+    
+    runner = BenchmarkRunner(
+        [BenchmarkTarget('ok', ok), BenchmarkTarget('broken', broken)],
+        repeat=2
+    )
+    results = runner.run([500, 1000])
+    rows = {(r['target'], r['bars']): r for r in results['results']}
+    
+    assert rows[('ok', 500)]['status'] == 'ok'
+    assert rows[('ok', 1000)]['runs'] == 2
+    assert rows[('ok', 1000)]['peak_memory_bytes'] > 0
+    assert rows[('broken', 500)]['status'] == 'error'
+    assert 'boom' in rows[('broken', 500)]['error']
+    
+    path = save_results(results, tmp_path / 'results.json')
+    assert load_results(path) == json.loads(path.read_text())
+
+
+def test_runner_skips_larger_sizes_after_slow_warmup():
+    runner = BenchmarkRunner([BenchmarkTarget('slow', lambda inputs: lambda: None)], max_seconds=-1)
+    results = runner.run([100, 200])['results']
+    
+    assert [r['status'] for r in results] == ['ok', 'skipped']
+
+
+def _document(**medians):
+    return {'results': [
+        {'target': name, 'bars': 1000, 'status': 'ok', 'median_s': median, 'peak_memory_bytes': 1000}
+        for name, median in medians.items()
+    ]}
+
+
+def test_compare_flags_regressions():
+    baseline = _document(fast=0.100, same=0.100, noisy=0.0001, faster=0.100, gone=0.1)
+    current = _document(fast=0.150, same=0.104, noisy=0.0005, faster=0.050, added=0.1)
+    current['results'].append({'target': 'gone', 'bars': 1000, 'status': 'error', 'error': 'x'})
+    
+    status = {row['target']: row['status'] for row in compare_results(baseline, current)}
+    
+    assert status == {
+        'fast': 'regression',
+        'same': 'unchanged',
+        'noisy': 'unchanged',  # below the absolute noise floor
+        'faster': 'improvement',
+        'gone': 'regression',
+        'added': 'new',
+    }
+
+
+def test_compare_flags_memory_growth():
+    baseline = _document(target=0.1)
+    current = _document(target=0.1)
+    current['results'][0]['peak_memory_bytes'] = 5000
+    
+    row = compare_results(baseline, current)[0]
+    assert row['status'] == 'regression'
+    assert row['reasons'] == ['memory x5.00']
+
+
+def test_pipeline_memory_compact_mode_saves_memory():
+    pytest.importorskip('talib')
+    from benchmarks.memory import pipeline_memory
+    
+    rows = pipeline_memory(1500)
+    
+    assert [row['stage'] for row in rows] == ['ohlcv', 'indicator_cache', 'features']
+    assert all(row['compact_bytes'] < row['float64_bytes'] for row in rows)
+    assert rows[0]['max_relative_error'] == 0
+    assert max(row['max_relative_error'] for row in rows) <= 2 ** -24
+
+
+def test_conversion_matches_legacy_without_copies():
+    from benchmarks.conversion import conversion_timings
+    
+    rows = conversion_timings(n_bars=2000, n_ticks=5000, repeat=1)
+    
+    assert [row['kind'] for row in rows] == ['rates', 'ticks']
+    assert all(row['shares_memory'] for row in rows)
+
+
+def test_fetch_timings_run_against_the_offline_terminal(offline_mt5):
+    from benchmarks.fetch import fetch_timings
+    
+    rows = fetch_timings(['EURUSD', 'XAUUSD'], ['H1'], count=200, latency=0)
+    
+    assert [row['mode'] for row in rows] == ['sequential', 'scheduler', 'scheduler_refresh']
+    assert all(row['bars'] == 400 for row in rows)
+    # A warm refresh is one copy_rates call per request
+    assert rows[-1]['api_calls'] == 2
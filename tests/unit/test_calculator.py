@@ -0,0 +1,106 @@
+"""
+Tests for the indicator calculator cache
+"""
+import pandas as pd
+import pytest
+
+pytest.importorskip('talib')
+
+from src.indicators.calculator import IndicatorCalculator  # noqa: E402
+
+
+class _Clock:
+    def __init__(self, now: float):
+        self.now = now
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+def _calculator(now: float = 1_700_000_000.0) -> IndicatorCalculator:
+    calculator = IndicatorCalculator()
+    calculator._clock = _Clock(now)
+    return calculator
+
+
+def test_new_bar_with_same_length_misses(ohlcv):
+    calculator = _calculator()
+    window = ohlcv.iloc[:300]
+    first = calculator.calculate_for_timeframe(window, 'EURUSD', 'H1')
+    again = calculator.calculate_for_timeframe(window.copy(), 'EURUSD', 'H1')
+    assert again['latest_close'] == first['latest_close']
+    
+    # The fetcher returns a fixed bar count, so the next frame has the same length
+    rolled = calculator.calculate_for_timeframe(ohlcv.iloc[1:301], 'EURUSD', 'H1')
+    assert rolled['latest_close'] == ohlcv['Close'].iloc[300]
+    
+    # So does a revision of the forming bar
+    revised = window.copy()
+    revised.iloc[-1, revised.columns.get_loc('Close')] += 0.001
+    calculator.calculate_for_timeframe(revised, 'EURUSD', 'H1')
+    
+    stats = calculator.get_cache_stats()
+    assert (stats['hits'], stats['misses']) == (1, 3)
+    assert stats['cached_items'] == 3
+    assert stats['cached_bytes'] > 0
+
+
+def test_entries_expire_at_bar_close(ohlcv):
+    hour = 3600
+    calculator = _calculator(now=1_700_000_000 // hour * hour + 10)
+    calculator.calculate_for_timeframe(ohlcv, 'EURUSD', 'H1')
+    
+    calculator._clock.now += hour - 11
+    calculator.calculate_for_timeframe(ohlcv, 'EURUSD', 'H1')
+    assert calculator.get_cache_stats()['hits'] == 1
+    
+    calculator._clock.now += 1
+    calculator.calculate_for_timeframe(ohlcv, 'EURUSD', 'H1')
+    stats = calculator.get_cache_stats()
+    assert stats['expirations'] == 1
+    assert stats['misses'] == 2
+
+
+def test_settings_changes_miss(ohlcv, monkeypatch):
+    calculator = _calculator()
+    calculator.calculate_for_timeframe(ohlcv, 'EURUSD', 'H1')
+    
+    monkeypatch.setattr(calculator.config, 'RSI_PERIOD', 21)
+    calculator.calculate_for_timeframe(ohlcv, 'EURUSD', 'H1')
+    # A rebound attribute with an equal value keeps the cached results
+    monkeypatch.setattr(calculator.config, 'SWEEP_MA_PERIODS', tuple(calculator.config.SWEEP_MA_PERIODS))
+    calculator.calculate_for_timeframe(ohlcv, 'EURUSD', 'H1')
+    
+    stats = calculator.get_cache_stats()
+    assert (stats['hits'], stats['misses']) == (1, 2)
+
+
+def test_cache_is_bounded_by_items_and_bytes(ohlcv, monkeypatch):
+    calculator = _calculator()
+    monkeypatch.setattr(calculator.config, 'CACHE_SIZE', 2)
+    for symbol in ('EURUSD', 'GBPUSD', 'USDJPY'):
+        calculator.calculate_for_timeframe(ohlcv, symbol, 'H1')
+    
+    stats = calculator.get_cache_stats()
+    assert stats['cached_items'] == 2
+    assert stats['evictions'] == 1
+    assert [key[0] for key in calculator.cache] == ['GBPUSD', 'USDJPY']
+    
+    # One entry's worth of bytes keeps only the most recent result
+    monkeypatch.setattr(calculator.config, 'CACHE_MAX_BYTES', stats['cached_bytes'] // 2 + 1)
+    calculator.calculate_for_timeframe(ohlcv, 'AUDUSD', 'H1')
+    stats = calculator.get_cache_stats()
+    assert [key[0] for key in calculator.cache] == ['AUDUSD']
+    assert stats['evictions'] == 3
+    assert stats['cached_bytes'] <= calculator.config.CACHE_MAX_BYTES
+    
+    calculator.clear_cache()
+    assert calculator.get_cache_stats()['cached_bytes'] == 0
+
+
+def test_cached_results_are_not_shared_dicts(ohlcv):
+    calculator = _calculator()
+    first = calculator.calculate_for_timeframe(ohlcv, 'EURUSD', 'H1')
+    first['symbol'] = 'changed'
+    assert calculator.calculate_for_timeframe(ohlcv, 'EURUSD', 'H1')['symbol'] == 'EURUSD'
+    pd.testing.assert_series_equal(first['rsi'], calculator.calculate_for_timeframe(ohlcv, 'EURUSD', 'H1')['rsi'])
@@ -0,0 +1,69 @@
+"""
+Tests for compact float32/int32 frames
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('talib')
+
+from conftest import make_ohlcv  # noqa: E402
+from src.indicators.technical import TechnicalIndicators  # noqa: E402
+from src.utils.compact import (  # noqa: E402
+    FLOAT32_RELATIVE_ERROR, compact_ohlcv, compact_results, expand_ohlcv, is_compact, memory_usage
+)
+
+
+@pytest.mark.parametrize('scaled', [False, True])
+def test_compact_ohlcv_round_trips_exactly(ohlcv, scaled):
+    compact = compact_ohlcv(ohlcv, digits=4, scaled=scaled)
+    
+    assert is_compact(compact) and not is_compact(ohlcv)
+    assert compact['Close'].dtype == (np.int32 if scaled else np.float32)
+    assert compact['Volume'].dtype == np.int32
+    assert memory_usage(compact) < memory_usage(ohlcv)
+    pd.testing.assert_frame_equal(expand_ohlcv(compact), ohlcv)
+
+
+def test_compact_ohlcv_keeps_float64_outside_the_exact_range():
+    df = make_ohlcv(50)
+    df['High'] += 10_000.0
+    compact = compact_ohlcv(df, digits=4)
+    
+    # 10,000 at 4 digits needs 1e8 steps, more than float32 holds exactly
+    assert compact['High'].dtype == np.float64 and compact['Low'].dtype == np.float32
+    pd.testing.assert_frame_equal(expand_ohlcv(compact), df)
+    with pytest.raises(ValueError):
+        compact_ohlcv(df, scaled=True)
+
+
+def test_compact_indicators_match_float64_within_bound(ohlcv):
+    full = TechnicalIndicators(compact=False)
+    compact = TechnicalIndicators(compact=True)
+    frame = compact_ohlcv(ohlcv, digits=4)
+    
+    adx = compact.calculate_adx(frame)
+    assert adx['adx'].dtype == np.float32
+    for key, values in full.calculate_adx(ohlcv).items():
+        np.testing.assert_allclose(adx[key], values, rtol=FLOAT32_RELATIVE_ERROR, equal_nan=True)
+    
+    # Signals are computed from float64 values, so they are unchanged
+    results = compact.calculate_all_indicators(frame)
+    expected = full.calculate_all_indicators(ohlcv)
+    assert results['mfi'].dtype == np.float32
+    for name in ('trend_signal', 'momentum_signal', 'volatility_signal', 'volume_signal'):
+        assert results[name] == expected[name]
+
+
+def test_compact_results_converts_nested_floats():
+    results = compact_results({
+        'line': pd.Series([1.0, 2.0]),
+        'bands': pd.DataFrame({'upper': [1.0], 'count': [3]}),
+        'edges': [np.arange(3.0)],
+        'value': 1.5,
+    })
+    
+    assert results['line'].dtype == np.float32
+    assert results['bands'].dtypes.tolist() == [np.float32, np.int64]
+    assert results['edges'][0].dtype == np.float32
+    assert results['value'] == 1.5
@@ -0,0 +1,145 @@
+"""
+Tests for the MT5 data fetcher bar store
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.mt5.bar_store import BarStore
+from src.mt5.data_fetcher import MT5DataFetcher, Timeframe
+from src.mt5.rates import rates_to_frame
+
+NOW = 1_700_001_800.0  # midway through an H1 bar
+
+
+@pytest.fixture
+def fake_mt5(offline_mt5, monkeypatch):
+    """The offline fake at a fixed time, recording the count of every from_pos request"""
+    offline_mt5.clock = lambda: NOW
+    offline_mt5.requests = []
+    copy_rates_from_pos = offline_mt5.copy_rates_from_pos
+    
+    def recorded(symbol, timeframe, start_pos, count):
+        offline_mt5.requests.append(count)
+        return copy_rates_from_pos(symbol, timeframe, start_pos, count)
+    
+    monkeypatch.setattr(offline_mt5, 'copy_rates_from_pos', recorded)
+    offline_mt5.initialize()
+    return offline_mt5
+
+
+def _advance(fake, seconds: float):
+    now = fake.clock() + seconds
+    fake.clock = lambda: now
+
+
+def _fetcher(fake, directory) -> MT5DataFetcher:
+    fetcher = MT5DataFetcher(bar_store=BarStore(directory))
+    fetcher._clock = lambda: fake.clock()
+    return fetcher
+
+
+def _expected(fake, count):
+    return rates_to_frame(fake.copy_rates_from('EURUSD.pro', Timeframe.H1.value, fake.clock(), count))
+
+
+def test_refresh_fetches_only_the_tail(fake_mt5, tmp_path):
+    fetcher = _fetcher(fake_mt5, tmp_path)
+    first = fetcher.get_ohlcv('EURUSD', 'H1', count=1000)
+    pd.testing.assert_frame_equal(first, _expected(fake_mt5, 1000))
+    
+    # The forming bar is revised and one new bar opens
+    _advance(fake_mt5, 3600)
+    second = fetcher.get_ohlcv('EURUSD', 'H1', count=1000)
+    
+    assert fake_mt5.requests == [1000, 3]
+    pd.testing.assert_frame_equal(second, _expected(fake_mt5, 1000))
+    assert fetcher.stats['incremental_requests'] == 1
+    assert fetcher.stats['total_bars_fetched'] == 1003
+
+
+def test_store_persists_and_grows_the_tail_request(fake_mt5, tmp_path):
+    _fetcher(fake_mt5, tmp_path).get_ohlcv('EURUSD', 'H1', count=500)
+    
+    # Server time runs ahead of the local clock, so the first estimate is short
+    _advance(fake_mt5, 10 * 3600)
+    restarted = _fetcher(fake_mt5, tmp_path)
+    restarted._clock = lambda: fake_mt5.clock() - 8 * 3600
+    result = restarted.get_ohlcv('EURUSD', 'H1', count=500)
+    
+    assert fake_mt5.requests == [500, 4, 8, 16]
+    pd.testing.assert_frame_equal(result, _expected(fake_mt5, 500))
+    assert restarted.bar_store.get_statistics()['loads'] == 1
+
+
+def test_stale_store_is_replaced(fake_mt5, tmp_path):
+    fetcher = _fetcher(fake_mt5, tmp_path)
+    fetcher.get_ohlcv('EURUSD', 'H1', count=200)
+    
+    # More new bars than the window: the tail never reaches the store
+    _advance(fake_mt5, 1500 * 3600)
+    result = fetcher.get_ohlcv('EURUSD', 'H1', count=200)
+    
+    assert fake_mt5.requests[-1] == 200
+    pd.testing.assert_frame_equal(result, _expected(fake_mt5, 200))
+    assert len(fetcher.bar_store.get('EURUSD.pro', 'H1')) == 200
+
+
+def test_out_of_order_merge_keeps_newer_bars(tmp_path):
+    store = BarStore(tmp_path)
+    index = pd.date_range('2024-01-01', periods=10, freq='h', name='time')
+    bars = pd.DataFrame({'Close': np.arange(10.0)}, index=index)
+    
+    store.merge('EURUSD', 'H1', bars)
+    store.merge('EURUSD', 'H1', bars.iloc[3:6] + 100)
+    
+    assert store.get('EURUSD', 'H1')['Close'].tolist() == [0, 1, 2, 103, 104, 105, 6, 7, 8, 9]
+
+
+def test_bar_store_trims_and_clears(tmp_path):
+    store = BarStore(tmp_path, max_bars=100)
+    index = pd.date_range('2024-01-01', periods=150, freq='h', name='time')
+    bars = pd.DataFrame({'Close': np.arange(150.0)}, index=index)
+    
+    store.merge('XAU/USD#', Timeframe.H1.name, bars)
+    assert store.window('XAU/USD#', 'h1', 10)['Close'].tolist() == list(np.arange(140.0, 150.0))
+    assert len(BarStore(tmp_path).get('XAU/USD#', 'H1')) == 100
+    
+    # Columns added to a window stay out of the store
+    window = store.window('XAU/USD#', 'H1', 500)
+    window['Signal'] = 1.0
+    assert list(store.get('XAU/USD#', 'H1').columns) == ['Close']
+    
+    # Only the symbol's own files go, not those of symbols it prefixes
+    store.merge('XAU/USD#_i', 'H1', bars)
+    store.merge('XAU', 'H1', bars)
+    store.clear('XAU/USD#', delete=True)
+    assert store.get('XAU/USD#', 'H1') is None
+    assert sorted(path.name for path in tmp_path.glob('*.npz')) == ['XAU_H1.npz', 'XAU_USD__i_H1.npz']
+    assert len(BarStore(tmp_path).get('XAU/USD#_i', 'H1')) == 100
+
+
+def test_refreshes_are_written_at_most_every_flush_interval(tmp_path):
+    store = BarStore(tmp_path, flush_seconds=60)
+    now = [0.0]
+    store._clock = lambda: now[0]
+    index = pd.date_range('2024-01-01', periods=10, freq='h', name='time')
+    bars = pd.DataFrame({'Close': np.arange(10.0)}, index=index)
+    
+    store.merge('EURUSD', 'H1', bars.iloc[:8])
+    for end in (9, 10):
+        now[0] += 20
+        store.merge('EURUSD', 'H1', bars.iloc[end - 2:end])
+    assert store.get_statistics()['saves'] == 1
+    assert len(BarStore(tmp_path).get('EURUSD', 'H1')) == 8
+    
+    now[0] += 20
+    store.merge('EURUSD', 'H1', bars.iloc[8:])
+    assert store.get_statistics()['saves'] == 2
+    assert len(BarStore(tmp_path).get('EURUSD', 'H1')) == 10
+    
+    store.merge('EURUSD', 'H1', bars.iloc[9:] + 1)
+    assert store.get_statistics()['unsaved'] == 1
+    store.flush()
+    assert BarStore(tmp_path).get('EURUSD', 'H1')['Close'].iloc[-1] == 10
+    assert store.get_statistics()['unsaved'] == 0
@@ -0,0 +1,91 @@
+"""
+Tests for the offline MetaTrader5 stand-in
+"""
+from datetime import datetime, timezone
+
+import numpy as np
+
+import mt5_connector
+from src.mt5 import connection, data_fetcher
+from src.mt5.bar_store import BarStore
+from src.mt5.data_fetcher import MT5DataFetcher
+from src.mt5.fake_mt5 import FakeMetaTrader5, RES_E_INTERNAL_FAIL_CONNECT, RES_E_NOT_FOUND
+from src.mt5.fetch_scheduler import FetchScheduler
+
+NOW = 1_718_000_000.5
+
+
+def _fake(**kwargs) -> FakeMetaTrader5:
+    fake = FakeMetaTrader5(clock=lambda: NOW, **kwargs)
+    fake.initialize()
+    return fake
+
+
+def test_rates_are_seeded_and_agree_across_requests():
+    fake = _fake()
+    rates = fake.copy_rates_from_pos('XAUUSD', fake.TIMEFRAME_M15, 0, 500)
+    start = datetime.fromtimestamp(int(rates['time'][0]), timezone.utc)
+    end = datetime.fromtimestamp(int(rates['time'][-1]), timezone.utc)
+    
+    np.testing.assert_array_equal(fake.copy_rates_range('XAUUSD', fake.TIMEFRAME_M15, start, end), rates)
+    np.testing.assert_array_equal(fake.copy_rates_from('XAUUSD', fake.TIMEFRAME_M15, end, 500), rates)
+    np.testing.assert_array_equal(_fake().copy_rates_from_pos('XAUUSD', 15, 0, 500), rates)
+    assert not np.array_equal(_fake(seed=1).copy_rates_from_pos('XAUUSD', 15, 0, 500), rates)
+    
+    assert rates['time'][-1] <= NOW < rates['time'][-1] + 900
+    assert (rates['open'][1:] == rates['close'][:-1]).all()
+    assert (rates['high'] >= np.maximum(rates['open'], rates['close'])).all()
+    assert (rates['low'] <= np.minimum(rates['open'], rates['close'])).all()
+    assert len(fake.copy_rates_from_pos('XAUUSD', fake.TIMEFRAME_W1, 0, 3)) == 3
+
+
+def test_ticks_are_ordered_and_filtered():
+    fake = _fake()
+    ticks = fake.copy_ticks_range('EURUSD', NOW - 600, NOW, fake.COPY_TICKS_ALL)
+    trades = fake.copy_ticks_range('EURUSD', NOW - 600, NOW, fake.COPY_TICKS_TRADE)
+    
+    assert (np.diff(ticks['time_msc']) > 0).all() and (ticks['ask'] > ticks['bid']).all()
+    assert ticks['time_msc'][0] >= (NOW - 600) * 1000 and ticks['time_msc'][-1] <= NOW * 1000
+    assert 0 < len(trades) < len(ticks) and (trades['volume'] > 0).all()
+    first = fake.copy_ticks_from('EURUSD', NOW - 600, 100, fake.COPY_TICKS_ALL)
+    np.testing.assert_array_equal(first, ticks[:100])
+
+
+def test_errors_and_connection_state():
+    fake = FakeMetaTrader5(clock=lambda: NOW)
+    assert fake.terminal_info() is None and fake.last_error()[0] == RES_E_INTERNAL_FAIL_CONNECT
+    
+    fake.initialize(login=123)
+    assert fake.account_info().login == 123
+    fake.inject_error('copy_rates_from_pos', times=2)
+    results = [fake.copy_rates_from_pos('EURUSD', 1, 0, 10) for _ in range(3)]
+    assert [r is None for r in results] == [True, True, False]
+    assert fake.copy_rates_from_pos('EURUSDm', 1, 0, 10) is None and fake.last_error()[0] == RES_E_NOT_FOUND
+    
+    # Random failures repeat with the seed
+    failures = [[f.copy_rates_from_pos('EURUSD', 1, 0, 1) is None for _ in range(50)]
+                for f in (_fake(fail_rate=0.3), _fake(fail_rate=0.3))]
+    assert failures[0] == failures[1] and 0 < sum(failures[0]) < 50
+    
+    fake.disconnect()
+    assert fake.symbol_info('EURUSD') is None
+
+
+def test_backend_selection_end_to_end(offline_mt5, tmp_path):
+    assert connection._ensure_mt5_imported() is offline_mt5
+    assert data_fetcher._ensure_mt5_imported() is offline_mt5
+    assert mt5_connector.connect(555, 'password', 'FakeBroker-Demo')
+    
+    try:
+        fetcher = MT5DataFetcher(bar_store=BarStore(tmp_path, persist=False))
+        df = fetcher.get_ohlcv('EURUSD', 'H1', count=200)
+        with FetchScheduler(fetcher) as scheduler:
+            data = scheduler.fetch_many(['GBPUSD', 'XAUUSD'], ['M15', 'H4'], count=100)
+    finally:
+        mt5_connector.disconnect()
+    
+    assert len(df) == 200 and df.index.is_monotonic_increasing
+    assert {symbol: sorted(frames) for symbol, frames in data.items()} == \
+        {'GBPUSD': ['H4', 'M15'], 'XAUUSD': ['H4', 'M15']}
+    assert fetcher.symbols.resolve('EURUSD') == 'EURUSD.pro'
+    assert offline_mt5.calls['copy_rates_from_pos'] == 5
@@ -0,0 +1,32 @@
+"""
+Tests for ML feature engineering
+"""
+from conftest import make_ohlcv
+from src.ml.feature_engineering import FeatureEngineer
+
+
+def test_smc_history_features_are_aligned_and_complete(ohlcv):
+    engineer = FeatureEngineer()
+    features = engineer._add_smc_history_features(ohlcv.copy())
+    
+    history = engineer.smc_analyzer.analyze_history(ohlcv)
+    smc_columns = [name for name in engineer.get_feature_names() if name.startswith('smc_')]
+    
+    assert features.index.equals(ohlcv.index)
+    assert set(smc_columns) <= set(features.columns)
+    assert not features[smc_columns].isna().any().any()
+    
+    # Defined values pass through untouched
+    defined = history['smc_bars_since_bos'].notna()
+    assert (features.loc[defined, 'smc_bars_since_bos'] == history.loc[defined, 'smc_bars_since_bos']).all()
+    assert (features['smc_has_fvg'] == history['smc_fvg_distance'].notna()).all()
+
+
+def test_smc_history_features_are_causal():
+    df = make_ohlcv(400, seed=12)
+    engineer = FeatureEngineer()
+    full = engineer._add_smc_history_features(df.copy())
+    prefix = engineer._add_smc_history_features(df.iloc[:250].copy())
+    
+    columns = [name for name in prefix.columns if name.startswith('smc_')]
+    assert full[columns].iloc[:250].equals(prefix[columns])
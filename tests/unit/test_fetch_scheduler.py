@@ -0,0 +1,106 @@
+"""
+Tests for the concurrent fetch scheduler
+"""
+import asyncio
+import contextlib
+import gc
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from src.mt5.bar_store import BarStore
+from src.mt5.data_fetcher import MT5DataFetcher, Timeframe
+from src.mt5.fetch_scheduler import FetchScheduler
+
+SYMBOLS = ['EURUSD', 'GBPUSD', 'USDJPY', 'XAUUSD']
+TIMEFRAMES = ['M15', 'H1', 'H4']
+LATENCY = 0.03
+NOW = 1_700_001_800.0
+
+
+@pytest.fixture
+def fake_mt5(offline_mt5):
+    """The offline fake at a fixed time, with latency on the rate copies"""
+    offline_mt5.clock = lambda: NOW
+    offline_mt5.latency = {'copy_rates_from_pos': LATENCY}
+    offline_mt5.initialize()
+    return offline_mt5
+
+
+def _fetcher(tmp_path) -> MT5DataFetcher:
+    return MT5DataFetcher(bar_store=BarStore(tmp_path, persist=False))
+
+
+@contextlib.contextmanager
+def _no_gc():
+    """Time without collector pauses, as timeit does"""
+    gc.collect()
+    gc.disable()
+    try:
+        yield
+    finally:
+        gc.enable()
+
+
+def test_batch_approaches_pure_api_time(fake_mt5, tmp_path):
+    sequential_fetcher = _fetcher(tmp_path)
+    with _no_gc():
+        started = time.perf_counter()
+        sequential = {symbol: {tf: sequential_fetcher.get_ohlcv(symbol, tf) for tf in TIMEFRAMES} for symbol in SYMBOLS}
+        sequential_time = time.perf_counter() - started
+    
+    batch_fetcher = _fetcher(tmp_path)
+    fake_mt5.threads.clear()
+    with FetchScheduler(batch_fetcher, workers=4) as scheduler, _no_gc():
+        started = time.perf_counter()
+        data = scheduler.fetch_many(SYMBOLS, TIMEFRAMES)
+        elapsed = time.perf_counter() - started
+    
+    api_time = LATENCY * len(SYMBOLS) * len(TIMEFRAMES)
+    processing = sequential_time - api_time
+    # The conversion and validation overlap the MT5 calls instead of adding to them
+    assert elapsed < api_time + 0.75 * processing
+    assert len(fake_mt5.threads) == 1 and threading.get_ident() not in fake_mt5.threads
+    for symbol in SYMBOLS:
+        for tf in TIMEFRAMES:
+            pd.testing.assert_frame_equal(data[symbol][tf], sequential[symbol][tf])
+    assert scheduler.get_statistics() == {'submitted': 12, 'completed': 12, 'failed': 0, 'pending': 0}
+
+
+def test_failures_resolve_to_none(fake_mt5, tmp_path, monkeypatch):
+    monkeypatch.setattr(fake_mt5, 'terminal_info', lambda: None)
+    with FetchScheduler(_fetcher(tmp_path)) as scheduler:
+        assert scheduler.submit('EURUSD', 'H1').result(timeout=5) is None
+        assert scheduler.fetch_many(['EURUSD'], ['H1']) == {'EURUSD': {}}
+    assert scheduler.fetcher.stats['failed_requests'] == 2
+
+
+def test_asyncio_tasks_share_the_api_thread(fake_mt5, tmp_path):
+    fetcher = _fetcher(tmp_path)
+    fake_mt5.threads.clear()
+    
+    async def fetch_all(scheduler):
+        return await asyncio.gather(*(scheduler.fetch_async(symbol, 'H1', count=100) for symbol in SYMBOLS))
+    
+    with FetchScheduler(fetcher) as scheduler:
+        frames = asyncio.run(fetch_all(scheduler))
+        info = scheduler.call(fake_mt5.symbol_info, 'EURUSD.pro').result(timeout=5)
+    
+    assert [len(df) for df in frames] == [100] * len(SYMBOLS)
+    assert info.digits == 5 and len(fake_mt5.threads) == 1
+    # get_multi_timeframe_data goes through the fetcher's own scheduler
+    assert list(fetcher.get_multi_timeframe_data('EURUSD', ['H1', 'H4'], count=50)) == ['H1', 'H4']
+    assert fetcher.get_multi_timeframe_data('EURUSD', []) == {}
+    assert len(fetcher.bar_store.get('EURUSD.pro', Timeframe.H4.name)) == 50
+
+
+def test_requests_in_flight_at_shutdown_resolve_to_none(fake_mt5, tmp_path):
+    scheduler = FetchScheduler(_fetcher(tmp_path))
+    scheduler.call(time.sleep, 0.1)
+    future = scheduler.submit('EURUSD', 'H1', count=100)
+    scheduler.shutdown(wait=False)
+    
+    assert future.result(timeout=5) is None
+    assert scheduler.get_statistics()['failed'] == 1
@@ -0,0 +1,137 @@
+"""
+Parity tests for the NumPy indicator backend
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import make_ohlcv
+from config.settings import PerformanceConfig
+from src.indicators import indicator_backend
+from src.indicators.indicator_backend import NUMPY_BACKEND, NumpyIndicators, get_backend
+from src.indicators.technical import TechnicalIndicators
+
+talib = pytest.importorskip('talib')
+
+CALLS = {
+    'EMA': lambda ta, df: ta.EMA(df['Close'], timeperiod=20),
+    'SMA': lambda ta, df: ta.SMA(df['Close'], timeperiod=200),
+    'MACD': lambda ta, df: ta.MACD(df['Close'], fastperiod=12, slowperiod=26, signalperiod=9),
+    'RSI': lambda ta, df: ta.RSI(df['Close'], timeperiod=14),
+    'ATR': lambda ta, df: ta.ATR(df['High'], df['Low'], df['Close'], timeperiod=14),
+    'ADX': lambda ta, df: ta.ADX(df['High'], df['Low'], df['Close'], timeperiod=14),
+    'PLUS_DI': lambda ta, df: ta.PLUS_DI(df['High'], df['Low'], df['Close'], timeperiod=14),
+    'MINUS_DI': lambda ta, df: ta.MINUS_DI(df['High'], df['Low'], df['Close'], timeperiod=14),
+    'STOCH': lambda ta, df: ta.STOCH(df['High'], df['Low'], df['Close'],
+                                     fastk_period=14, slowk_period=3, slowd_period=3),
+    'CCI': lambda ta, df: ta.CCI(df['High'], df['Low'], df['Close'], timeperiod=20),
+    'WILLR': lambda ta, df: ta.WILLR(df['High'], df['Low'], df['Close'], timeperiod=14),
+    'BBANDS': lambda ta, df: ta.BBANDS(df['Close'], timeperiod=20, nbdevup=2.0, nbdevdn=2.0),
+    'OBV': lambda ta, df: ta.OBV(df['Close'], df['Volume'].astype(float)),
+    'MFI': lambda ta, df: ta.MFI(df['High'], df['Low'], df['Close'], df['Volume'].astype(float), timeperiod=14),
+}
+
+
+def _flat_frame(n, seed):
+    """Random walk with flat stretches (zero ranges and unchanged closes)"""
+    df = make_ohlcv(n, seed=seed)
+    df.iloc[100:130, :4] = 1.08
+    return df
+
+
+@pytest.mark.parametrize('name', sorted(CALLS))
+@pytest.mark.parametrize('frame', ['walk', 'flat', 'short'])
+def test_numpy_matches_talib(name, frame):
+    df = {'walk': lambda: make_ohlcv(3000, seed=3),
+          'flat': lambda: _flat_frame(600, seed=4),
+          'short': lambda: make_ohlcv(30, seed=5)}[frame]()
+    expected = CALLS[name](talib, df)
+    result = CALLS[name](NumpyIndicators, df)
+    if not isinstance(expected, tuple):
+        expected, result = (expected,), (result,)
+    
+    for exp, res in zip(expected, result):
+        assert isinstance(res, pd.Series) and res.index.equals(df.index)
+        np.testing.assert_allclose(res.to_numpy(), exp.to_numpy(), rtol=1e-8, atol=1e-8, equal_nan=True)
+
+
+@pytest.mark.parametrize('name', sorted(CALLS))
+def test_numpy_computes_panels_column_wise(name):
+    frames = [make_ohlcv(800, seed=6), _flat_frame(800, seed=7), make_ohlcv(800, seed=8)]
+    panel = {column: pd.concat([df[column] for df in frames], axis=1, keys=['A', 'B', 'C'])
+             for column in frames[0].columns}
+    result = CALLS[name](NumpyIndicators, panel)
+    if not isinstance(result, tuple):
+        result = (result,)
+    
+    for i, df in enumerate(frames):
+        expected = CALLS[name](NumpyIndicators, df)
+        if not isinstance(expected, tuple):
+            expected = (expected,)
+        for exp, res in zip(expected, result):
+            assert isinstance(res, pd.DataFrame) and list(res.columns) == ['A', 'B', 'C']
+            np.testing.assert_allclose(res.iloc[:, i].to_numpy(), exp.to_numpy(), rtol=1e-12, atol=1e-12,
+                                       equal_nan=True)
+
+
+@pytest.mark.parametrize('frame', ['walk', 'flat', 'short'])
+def test_sweeps_match_talib_per_period(frame):
+    df = {'walk': lambda: make_ohlcv(2000, seed=9),
+          'flat': lambda: _flat_frame(600, seed=10),
+          'short': lambda: make_ohlcv(30, seed=11)}[frame]()
+    high, low, close = df['High'], df['Low'], df['Close']
+    cases = [
+        (NumpyIndicators.SMA_SWEEP(close, range(5, 60)), [talib.SMA(close, p) for p in range(5, 60)]),
+        (NumpyIndicators.EMA_SWEEP(close, range(5, 60)), [talib.EMA(close, p) for p in range(5, 60)]),
+        (NumpyIndicators.RSI_SWEEP(close, range(7, 29)), [talib.RSI(close, p) for p in range(7, 29)]),
+        (NumpyIndicators.ATR_SWEEP(high, low, close, range(7, 29)),
+         [talib.ATR(high, low, close, p) for p in range(7, 29)]),
+    ]
+    for result, expected in cases:
+        assert result.shape == (len(df), len(expected))
+        np.testing.assert_allclose(result, np.column_stack(expected), rtol=1e-8, atol=1e-8, equal_nan=True)
+    
+    with pytest.raises(ValueError):
+        NumpyIndicators.EMA_SWEEP(close, [1, 5])
+
+
+def test_numpy_accepts_arrays():
+    close = make_ohlcv(100)['Close'].to_numpy()
+    result = NumpyIndicators.EMA(close, timeperiod=10)
+    assert isinstance(result, np.ndarray)
+    np.testing.assert_allclose(result, talib.EMA(close, timeperiod=10), rtol=1e-12, equal_nan=True)
+
+
+def test_long_smoothing_stays_accurate():
+    # Spans many recurrence blocks for fast and slow decay alike
+    close = make_ohlcv(200_000, seed=6)['Close'].to_numpy()
+    for period in (2, 5, 200):
+        np.testing.assert_allclose(NumpyIndicators.EMA(close, timeperiod=period),
+                                   talib.EMA(close, timeperiod=period), rtol=1e-10, equal_nan=True)
+
+
+def test_signals_identical_across_backends(ohlcv):
+    reference = TechnicalIndicators(backend='talib')
+    numpy_indicators = TechnicalIndicators(backend='numpy')
+    assert numpy_indicators.backend is NUMPY_BACKEND
+    
+    expected = reference.calculate_all_indicators(ohlcv)
+    result = numpy_indicators.calculate_all_indicators(ohlcv)
+    for name in ('trend_signal', 'momentum_signal', 'volatility_signal', 'volume_signal'):
+        assert result[name]['signal'] == expected[name]['signal'], name
+        assert result[name]['confidence'] == pytest.approx(expected[name]['confidence']), name
+
+
+def test_backend_selection(monkeypatch):
+    assert get_backend('numpy') is NUMPY_BACKEND
+    assert get_backend('talib').name == 'talib'
+    assert get_backend('bogus') is NUMPY_BACKEND
+    
+    monkeypatch.setattr(PerformanceConfig, 'INDICATOR_BACKEND', 'numpy')
+    assert TechnicalIndicators().backend.name == 'numpy'
+    
+    # Without TA-Lib everything falls back to NumPy
+    monkeypatch.setattr(indicator_backend, 'talib', None)
+    assert get_backend('auto') is NUMPY_BACKEND
+    assert get_backend('talib') is NUMPY_BACKEND
+    assert indicator_backend.available_backends() == ['numpy']
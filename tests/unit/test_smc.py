@@ -0,0 +1,369 @@
+"""
+Tests for the Smart Money Concepts analyzer
+"""
+import numpy as np
+import pytest
+
+from conftest import make_ohlcv
+from src.indicators.smc import SMCAnalyzer
+
+
+def _reference_swing_points(df, left, right):
+    """Original nested-loop swing detection, kept as the parity baseline"""
+    highs, lows = [], []
+    for i in range(left, len(df) - right):
+        current_high = df['High'].iloc[i]
+        if all(df['High'].iloc[j] < current_high
+               for j in range(i - left, i + right + 1) if j != i):
+            highs.append((i, current_high))
+        
+        current_low = df['Low'].iloc[i]
+        if all(df['Low'].iloc[j] > current_low
+               for j in range(i - left, i + right + 1) if j != i):
+            lows.append((i, current_low))
+    return highs, lows
+
+
+@pytest.mark.parametrize('seed', [1, 7, 42])
+@pytest.mark.parametrize('left,right', [(5, 5), (3, 7), (1, 1), (2, 4)])
+def test_swing_points_match_reference_loop(seed, left, right):
+    df = make_ohlcv(400, seed=seed)
+    swings = SMCAnalyzer().identify_swing_points(df, left, right)
+    
+    ref_highs, ref_lows = _reference_swing_points(df, left, right)
+    
+    assert [(s.index, s.price) for s in swings['highs']] == ref_highs
+    assert [(s.index, s.price) for s in swings['lows']] == ref_lows
+    assert all(s.timestamp == df.index[s.index] for s in swings['highs'])
+
+
+def test_swing_points_reject_equal_neighbours():
+    df = make_ohlcv(11)
+    df['High'] = [1.0, 1.1, 1.2, 1.3, 1.4, 1.5, 1.5, 1.4, 1.3, 1.2, 1.1]
+    df['Low'] = 0.5
+    
+    swings = SMCAnalyzer().identify_swing_points(df, 3, 3)
+    
+    assert swings['highs'] == []
+    assert swings['lows'] == []
+
+
+def test_swing_point_arrays_mirror_objects(ohlcv):
+    swings = SMCAnalyzer().identify_swing_points(ohlcv)
+    
+    np.testing.assert_array_equal(swings['high_indices'], [s.index for s in swings['highs']])
+    np.testing.assert_array_equal(swings['high_prices'], [s.price for s in swings['highs']])
+    np.testing.assert_array_equal(swings['low_indices'], [s.index for s in swings['lows']])
+    np.testing.assert_array_equal(swings['low_prices'], [s.price for s in swings['lows']])
+
+
+def test_swing_points_short_frame():
+    swings = SMCAnalyzer().identify_swing_points(make_ohlcv(8), 5, 5)
+    
+    assert swings['highs'] == [] and swings['lows'] == []
+    assert len(swings['high_indices']) == 0
+
+
+def test_analyze_computes_swings_once(ohlcv):
+    smc = SMCAnalyzer()
+    smc.analyze(ohlcv)
+    
+    stats = smc.get_cache_stats()
+    assert stats['misses'] == 1
+    assert stats['hits'] >= 4
+
+
+def test_swing_cache_detects_revised_last_bar(ohlcv):
+    smc = SMCAnalyzer()
+    smc.identify_swing_points(ohlcv)
+    
+    revised = ohlcv.copy()
+    revised.iloc[-1, revised.columns.get_loc('Close')] += 0.01
+    smc.identify_swing_points(revised)
+    
+    assert smc.get_cache_stats()['misses'] == 2
+
+
+def test_swing_cache_evicts_least_recently_used(monkeypatch):
+    smc = SMCAnalyzer()
+    monkeypatch.setattr(smc.config, 'SWING_CACHE_SIZE', 2)
+    frames = [make_ohlcv(100, seed=s) for s in range(3)]
+    
+    for df in frames:
+        smc.identify_swing_points(df)
+    smc.identify_swing_points(frames[0])
+    
+    stats = smc.get_cache_stats()
+    assert stats['cached_items'] == 2
+    assert stats['evictions'] == 2
+    assert stats['hits'] == 0
+
+
+def _reference_order_blocks(df, config):
+    """Original row-by-row order block detection, kept as the parity baseline"""
+    blocks = []
+    for i in range(2, len(df) - 1):
+        cur = df.iloc[i]
+        nxt = df.iloc[i + 1]
+        if (cur['Close'] < cur['Open'] and nxt['Close'] > nxt['Open'] and
+                (nxt['Close'] - nxt['Open']) > (cur['Open'] - cur['Close']) * 1.5):
+            kind = 'bullish'
+        elif (cur['Close'] > cur['Open'] and nxt['Close'] < nxt['Open'] and
+                (nxt['Open'] - nxt['Close']) > (cur['Close'] - cur['Open']) * 1.5):
+            kind = 'bearish'
+        else:
+            continue
+        if abs(cur['Close'] - cur['Open']) / (cur['High'] - cur['Low']) < config.OB_MIN_BODY_PERCENTAGE:
+            continue
+        volume_strength = 1.0
+        if i > 5 and cur['Volume'] > df['Volume'].iloc[i-5:i].mean() * config.OB_MIN_VOLUME_MULTIPLIER:
+            volume_strength = 1.5
+        blocks.append((df.index[i], kind, min(cur['Open'], cur['Close']),
+                       max(cur['Open'], cur['Close']), 0.8 * volume_strength))
+    return sorted(blocks, key=lambda x: x[0], reverse=True)[:10]
+
+
+@pytest.mark.parametrize('seed', [1, 7, 42])
+def test_order_blocks_match_reference_loop(seed):
+    df = make_ohlcv(600, seed=seed)
+    smc = SMCAnalyzer()
+    
+    blocks = smc.identify_order_blocks(df)
+    
+    assert blocks
+    assert [(b.timestamp, b.type, b.start_price, b.end_price, b.strength) for b in blocks] == \
+        _reference_order_blocks(df, smc.config)
+
+
+def test_order_block_mask_covers_every_bar(ohlcv):
+    smc = SMCAnalyzer()
+    masks = smc.detect_order_block_mask(ohlcv)
+    
+    assert len(masks['bullish']) == len(ohlcv)
+    assert not (masks['bullish'] & masks['bearish']).any()
+    assert np.isnan(masks['strength'][~(masks['bullish'] | masks['bearish'])]).all()
+    assert masks['bullish'].sum() + masks['bearish'].sum() >= len(smc.identify_order_blocks(ohlcv))
+
+
+def _reference_fvgs(df):
+    """Gap detection from the original loop, with brute-force fill tracking"""
+    gaps = []
+    for i in range(1, len(df) - 1):
+        prev, cur, nxt = df.iloc[i - 1], df.iloc[i], df.iloc[i + 1]
+        if cur['Low'] > prev['High'] and cur['Low'] > nxt['High']:
+            bottom, top = max(prev['High'], nxt['High']), cur['Low']
+            reach = df['High'].iloc[i + 2:].max() if i + 2 < len(df) else -np.inf
+            filled = (reach - bottom) / (top - bottom)
+        elif cur['High'] < prev['Low'] and cur['High'] < nxt['Low']:
+            bottom, top = cur['High'], min(prev['Low'], nxt['Low'])
+            reach = df['Low'].iloc[i + 2:].min() if i + 2 < len(df) else np.inf
+            filled = (top - reach) / (top - bottom)
+        else:
+            continue
+        gaps.append((df.index[i], bottom, top, min(max(filled, 0.0), 1.0)))
+    return sorted(gaps, key=lambda x: x[0], reverse=True)[:10]
+
+
+@pytest.mark.parametrize('seed', [3, 11])
+def test_fvg_match_reference(seed):
+    df = make_ohlcv(3000, seed=seed)
+    fvgs = SMCAnalyzer().identify_fvg(df)
+    
+    assert fvgs
+    expected = _reference_fvgs(df)
+    assert [(f.timestamp, f.start_price, f.end_price) for f in fvgs] == [e[:3] for e in expected]
+    np.testing.assert_allclose([f.filled_percentage for f in fvgs], [e[3] for e in expected])
+
+
+def test_fvg_filled_then_left_behind():
+    df = make_ohlcv(6)
+    # Bearish gap at bar 1 (1.10-1.12); bar 4 trades through it, bar 5 rallies away
+    df['High'] = [1.15, 1.10, 1.16, 1.16, 1.15, 1.20]
+    df['Low'] = [1.12, 1.08, 1.13, 1.13, 1.09, 1.17]
+    df['Open'] = df['Low']
+    df['Close'] = df['High']
+    
+    fvg = SMCAnalyzer().identify_fvg(df)[-1]
+    
+    assert (fvg.type, fvg.start_price, fvg.end_price) == ('bearish', 1.10, 1.12)
+    assert fvg.filled_percentage == 1.0
+    assert not fvg.active
+    assert fvg.mitigated_at == df.index[4]
+
+
+def test_fvg_partial_fill():
+    df = make_ohlcv(5)
+    df['High'] = [1.15, 1.10, 1.16, 1.16, 1.15]
+    df['Low'] = [1.12, 1.08, 1.13, 1.13, 1.11]
+    
+    fvg = SMCAnalyzer().identify_fvg(df)[-1]
+    
+    assert fvg.filled_percentage == pytest.approx(0.5)
+    assert fvg.active
+    assert fvg.mitigated_at is None
+
+
+def test_liquidity_zones_are_unique_per_level(ohlcv):
+    smc = SMCAnalyzer()
+    swings = smc.identify_swing_points(ohlcv)
+    
+    zones = smc.identify_liquidity_zones(ohlcv)
+    
+    for zone_type, prices in (('resistance', swings['high_prices']), ('support', swings['low_prices'])):
+        typed = [z for z in zones if z.type == zone_type]
+        levels = [z.price for z in typed]
+        assert levels == sorted(levels)
+        assert len(set(levels)) == len(levels)
+        # Every swing belongs to at most one zone
+        assert sum(z.touches for z in typed) <= len(prices)
+        for zone in typed:
+            near = np.abs(prices - zone.price) / zone.price < smc.config.LIQUIDITY_TOLERANCE
+            assert near.sum() >= zone.touches
+
+
+def test_cluster_levels_merges_equal_highs():
+    from src.indicators.smc_kernels import NUMPY_KERNELS
+    
+    clusters = NUMPY_KERNELS.cluster_levels(np.array([1.1000, 1.2000, 1.1005, 1.1009, 1.2001, 1.3000]), 0.001)
+    
+    assert [touches for _, touches in clusters] == [3, 2, 1]
+    assert clusters[0][0] == pytest.approx((1.1000 + 1.1005 + 1.1009) / 3)
+
+
+def test_liquidity_zones_atr_tolerance(ohlcv, monkeypatch):
+    smc = SMCAnalyzer()
+    swings = smc.identify_swing_points(ohlcv)
+    monkeypatch.setattr(smc.config, 'LIQUIDITY_ATR_MULTIPLIER', 1000.0)
+    
+    zones = smc.identify_liquidity_zones(ohlcv, use_atr_tolerance=True)
+    
+    assert [(z.type, z.touches) for z in zones] == [
+        ('resistance', len(swings['high_prices'])),
+        ('support', len(swings['low_prices'])),
+    ]
+
+
+def _reference_stop_hunts(df, zones):
+    """Original bar-by-zone stop hunt scan, kept as the parity baseline"""
+    hunts = []
+    for i in range(len(df)):
+        candle = df.iloc[i]
+        rng = candle['High'] - candle['Low']
+        for zone in zones:
+            if zone.type == 'resistance':
+                if (candle['High'] > zone.price and candle['Close'] < zone.price and
+                        (candle['High'] - candle['Close']) / rng > 0.6):
+                    hunts.append(('bearish_stop_hunt', zone.price, df.index[i]))
+            elif zone.type == 'support':
+                if (candle['Low'] < zone.price and candle['Close'] > zone.price and
+                        (candle['Close'] - candle['Low']) / rng > 0.6):
+                    hunts.append(('bullish_stop_hunt', zone.price, df.index[i]))
+    return hunts
+
+
+@pytest.mark.parametrize('seed', [5, 9, 42])
+@pytest.mark.parametrize('limit', [1, 5, 50])
+def test_stop_hunts_match_reference(seed, limit):
+    df = make_ohlcv(1500, seed=seed)
+    smc = SMCAnalyzer()
+    zones = smc.identify_liquidity_zones(df)
+    
+    hunts = smc.detect_stop_hunts(df, limit=limit)
+    
+    expected = _reference_stop_hunts(df, zones)[-limit:]
+    assert expected
+    assert [(h['type'], h['price'], h['timestamp']) for h in hunts] == expected
+
+
+# ==================== Per-bar History ====================
+
+def _prefix_expectations(analyzer, df, t):
+    """Columns of analyze_history() recomputed from analyze() on df[:t + 1]"""
+    prefix = df.iloc[:t + 1]
+    result = analyzer.analyze(prefix)
+    position = {ts: i for i, ts in enumerate(prefix.index)}
+    
+    trend = {'BULLISH': 1, 'BEARISH': -1}.get(result['market_structure']['trend'], 0)
+    latest_bos = result['bos_choch']['latest_bos']
+    latest_choch = result['bos_choch']['latest_choch']
+    
+    close = prefix['Close'].iloc[-1]
+    gaps = [
+        fvg for fvg in result['fair_value_gaps'] if fvg.active
+    ]
+    offsets = [
+        (fvg.start_price - close) if close < fvg.start_price
+        else (fvg.end_price - close) if close > fvg.end_price else 0.0
+        for fvg in gaps
+    ]
+    
+    pd_result = result['premium_discount']
+    return {
+        'smc_trend': trend,
+        'smc_bars_since_bos': t - position[latest_bos['timestamp']] if latest_bos else None,
+        'smc_bars_since_choch': t - position[latest_choch['timestamp']] if latest_choch else None,
+        'smc_fvg_distance': min(offsets, key=abs) / close if offsets else None,
+        'smc_pd_position': pd_result.get('position'),
+        'order_blocks': result['order_blocks'],
+    }
+
+
+@pytest.mark.parametrize('seed', [2, 42])
+def test_history_matches_prefix_analysis(seed):
+    df = make_ohlcv(300, seed=seed)
+    analyzer = SMCAnalyzer()
+    history = analyzer.analyze_history(df)
+    
+    assert history.index.equals(df.index)
+    for t in range(5, len(df), 13):
+        expected = _prefix_expectations(analyzer, df, t)
+        row = history.iloc[t]
+        
+        assert row['smc_trend'] == expected['smc_trend']
+        for column in ('smc_bars_since_bos', 'smc_bars_since_choch',
+                       'smc_fvg_distance', 'smc_pd_position'):
+            if expected[column] is None:
+                assert np.isnan(row[column]), (t, column)
+            else:
+                assert row[column] == pytest.approx(expected[column]), (t, column)
+        
+        # Active order blocks never exceed those analyze() reports
+        blocks = expected['order_blocks']
+        assert row['smc_bullish_obs'] <= sum(ob.type == 'bullish' for ob in blocks)
+        assert row['smc_bearish_obs'] <= sum(ob.type == 'bearish' for ob in blocks)
+
+
+def test_history_order_blocks_expire_on_break():
+    # Gapless candles with short wicks, so order blocks are common
+    df = make_ohlcv(400, seed=8)
+    df['Open'] = df['Close'].shift(1).fillna(df['Open'])
+    df['High'] = df[['Open', 'Close']].max(axis=1) + 0.0001
+    df['Low'] = df[['Open', 'Close']].min(axis=1) - 0.0001
+    analyzer = SMCAnalyzer()
+    history = analyzer.analyze_history(df)
+    close = df['Close'].to_numpy()
+    
+    for t in range(50, len(df), 29):
+        prefix = df.iloc[:t + 1]
+        position = {ts: i for i, ts in enumerate(prefix.index)}
+        expected = {'bullish': 0, 'bearish': 0}
+        for ob in analyzer.identify_order_blocks(prefix):
+            after = close[position[ob.timestamp] + 2:t + 1]
+            broken = (after < ob.start_price).any() if ob.type == 'bullish' else (after > ob.end_price).any()
+            expected[ob.type] += not broken
+        assert history['smc_bullish_obs'].iloc[t] == expected['bullish']
+        assert history['smc_bearish_obs'].iloc[t] == expected['bearish']
+    
+    assert history['smc_bullish_obs'].max() > 0
+    assert history['smc_bearish_obs'].max() > 0
+
+
+def test_history_liquidity_distance_points_at_equal_levels():
+    df = make_ohlcv(400, seed=4)
+    history = SMCAnalyzer().analyze_history(df)
+    distance = history['smc_liquidity_distance']
+    
+    assert distance.notna().any()
+    # Once a level exists it never disappears
+    first = distance.notna().to_numpy().argmax()
+    assert distance.iloc[first:].notna().all()
@@ -0,0 +1,111 @@
+"""
+Parity tests for the SMC kernel backends
+"""
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from conftest import make_ohlcv
+from config.settings import PerformanceConfig
+from src.indicators import smc_kernels
+from src.indicators.smc import SMCAnalyzer
+from src.indicators.smc_kernels import NUMPY_KERNELS, get_kernels, _make_loop_kernels
+
+
+def _loop_kernels(name):
+    if name == 'numba':
+        pytest.importorskip('numba')
+        return get_kernels('numba')
+    # The uncompiled loops run the exact code numba compiles
+    return _make_loop_kernels('loops', compile_loops=False)
+
+
+@pytest.fixture(params=['loops', 'numba'])
+def kernels(request):
+    return _loop_kernels(request.param)
+
+
+@pytest.mark.parametrize('seed', [1, 42])
+@pytest.mark.parametrize('left,right', [(5, 5), (2, 7), (0, 0)])
+def test_swing_mask_parity(kernels, seed, left, right):
+    df = make_ohlcv(300, seed=seed)
+    for column, kind in (('High', 'high'), ('Low', 'low')):
+        values = df[column].to_numpy()
+        np.testing.assert_array_equal(
+            kernels.swing_mask(values, left, right, kind),
+            NUMPY_KERNELS.swing_mask(values, left, right, kind)
+        )
+
+
+@pytest.mark.parametrize('kind', ['below', 'above'])
+def test_first_crossing_parity(kernels, kind):
+    rng = np.random.default_rng(3)
+    values = np.cumsum(rng.normal(0, 1, 1000)).round(1)
+    starts = rng.integers(0, 1001, 400)
+    levels = values[np.minimum(starts, 999)] + rng.normal(0, 5, 400).round(1)
+
+    expected = NUMPY_KERNELS.first_crossing(values, starts, levels, kind)
+    np.testing.assert_array_equal(kernels.first_crossing(values, starts, levels, kind), expected)
+
+    # Brute-force spot checks of the reference
+    for q in range(0, 400, 37):
+        after = values[starts[q]:]
+        hits = np.flatnonzero(after < levels[q] if kind == 'below' else after > levels[q])
+        assert expected[q] == (starts[q] + hits[0] if len(hits) else max(starts[q], len(values)))
+
+
+def test_first_crossing_across_block_levels():
+    # Long enough for the search to recurse over block extremes twice
+    rng = np.random.default_rng(5)
+    values = np.cumsum(rng.normal(0, 1, 300_000))
+    starts = rng.integers(0, len(values), 200)
+    levels = values[starts] + rng.choice([-1, 1], 200) * rng.uniform(0, 400, 200)
+
+    tracemalloc.start()
+    try:
+        result = NUMPY_KERNELS.first_crossing(values, starts, levels, 'below')
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    for q in range(200):
+        hits = np.flatnonzero(values[starts[q]:] < levels[q])
+        assert result[q] == (starts[q] + hits[0] if len(hits) else len(values))
+    assert peak < values.nbytes / 4
+
+
+@pytest.mark.parametrize('relative,tolerance', [(True, 0.001), (False, 0.0015)])
+def test_cluster_levels_parity(kernels, relative, tolerance):
+    prices = make_ohlcv(500, seed=9)['High'].to_numpy()
+    assert kernels.cluster_levels(prices, tolerance, relative) == \
+        NUMPY_KERNELS.cluster_levels(prices, tolerance, relative)
+    assert kernels.cluster_levels(np.array([]), tolerance, relative) == []
+
+
+@pytest.mark.parametrize('backend', ['numpy', 'numba'])
+def test_analysis_identical_across_backends(monkeypatch, backend):
+    if backend == 'numba':
+        pytest.importorskip('numba')
+    df = make_ohlcv(600, seed=21)
+
+    monkeypatch.setattr(PerformanceConfig, 'SMC_KERNEL_BACKEND', 'numpy')
+    reference = SMCAnalyzer()
+    monkeypatch.setattr(PerformanceConfig, 'SMC_KERNEL_BACKEND', backend)
+    analyzer = SMCAnalyzer()
+
+    assert analyzer.get_cache_stats()['kernel_backend'] == backend
+    expected = reference.analyze(df)
+    result = analyzer.analyze(df)
+    for key in expected:
+        if key != 'timestamp':
+            assert result[key] == expected[key], key
+    assert analyzer.analyze_history(df).equals(reference.analyze_history(df))
+
+
+def test_missing_jit_falls_back_to_numpy(monkeypatch):
+    monkeypatch.setattr(smc_kernels, 'numba', None)
+
+    assert get_kernels('auto') is NUMPY_KERNELS
+    assert get_kernels('numba') is NUMPY_KERNELS
+    assert smc_kernels.available_backends() == ['numpy']
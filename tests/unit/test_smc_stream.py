@@ -0,0 +1,89 @@
+"""
+Tests for the incremental SMC stream
+"""
+import numpy as np
+import pytest
+
+from conftest import make_ohlcv
+from src.indicators.smc import SMCAnalyzer
+
+
+def _without_timestamp(result):
+    return {key: value for key, value in result.items() if key != 'timestamp'}
+
+
+def _assert_matches_batch(stream, analyzer):
+    expected = analyzer.analyze(stream.frame())
+    assert _without_timestamp(stream.analyze()) == _without_timestamp(expected)
+
+
+@pytest.mark.parametrize('seed', [3, 42])
+@pytest.mark.parametrize('max_bars', [None, 120])
+def test_stream_matches_batch_bar_by_bar(seed, max_bars):
+    df = make_ohlcv(400, seed=seed)
+    analyzer = SMCAnalyzer()
+    stream = analyzer.create_stream(max_bars=max_bars)
+
+    for i, (ts, row) in enumerate(df.iterrows()):
+        stream.update(ts, row['Open'], row['High'], row['Low'], row['Close'], row['Volume'])
+        if i >= 10 and i % 7 == 0:
+            _assert_matches_batch(stream, analyzer)
+
+    expected_len = len(df) if max_bars is None else max_bars
+    assert stream.bar_count == expected_len
+    assert stream.frame().index.equals(df.index[-expected_len:])
+    _assert_matches_batch(stream, analyzer)
+
+
+@pytest.mark.parametrize('max_bars', [None, 90])
+def test_forming_bar_revisions_roll_back(max_bars):
+    df = make_ohlcv(300, seed=11)
+    rng = np.random.default_rng(0)
+    analyzer = SMCAnalyzer()
+    stream = analyzer.create_stream(max_bars=max_bars)
+
+    for i, (ts, row) in enumerate(df.iterrows()):
+        # Feed a few provisional versions of each bar before the final one
+        for _ in range(2):
+            high = row['High'] + rng.uniform(-0.002, 0.002)
+            low = min(row['Low'] + rng.uniform(-0.002, 0.002), high)
+            stream.update(ts, row['Open'], high, low, (high + low) / 2, row['Volume'] / 2)
+            if i % 23 == 0:
+                _assert_matches_batch(stream, analyzer)
+        stream.update(ts, row['Open'], row['High'], row['Low'], row['Close'], row['Volume'])
+
+    _assert_matches_batch(stream, analyzer)
+    stream_only = analyzer.create_stream(max_bars=max_bars)
+    stream_only.update_frame(df)
+    assert _without_timestamp(stream.analyze()) == _without_timestamp(stream_only.analyze())
+
+
+def test_older_bar_rejected():
+    df = make_ohlcv(20)
+    stream = SMCAnalyzer().create_stream()
+    stream.update_frame(df)
+
+    row = df.iloc[5]
+    with pytest.raises(ValueError):
+        stream.update(df.index[5], row['Open'], row['High'], row['Low'], row['Close'])
+
+
+def test_sync_follows_sliding_fetch():
+    df = make_ohlcv(500, seed=5)
+    analyzer = SMCAnalyzer()
+    stream = analyzer.create_stream(max_bars=200)
+
+    for end in range(200, 500, 37):
+        stream.sync(df.iloc[end - 200:end])
+        assert stream.frame().index.equals(df.index[end - 200:end])
+        _assert_matches_batch(stream, analyzer)
+
+    # A frame from another history reseeds the stream
+    other = make_ohlcv(200, seed=6)
+    stream.sync(other)
+    assert stream.frame().index.equals(other.index)
+    _assert_matches_batch(stream, analyzer)
+
+
+def test_empty_stream_reports_error():
+    assert 'error' in SMCAnalyzer().create_stream().analyze()
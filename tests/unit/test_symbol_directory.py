@@ -0,0 +1,83 @@
+"""
+Tests for symbol resolution caching
+"""
+import pytest
+
+from src.mt5 import connection
+from src.mt5.bar_store import BarStore
+from src.mt5.data_fetcher import MT5DataFetcher
+from src.mt5.fake_mt5 import FakeMetaTrader5, install
+from src.mt5.symbol_directory import SymbolDirectory, normalize_symbol
+
+BROKER_SYMBOLS = ['XAUUSD.pro', 'EURUSD.m', 'eurusd', 'GBPUSD.m', 'GBPUSDx', 'USDJPY#', 'mini.US30']
+
+
+@pytest.fixture
+def fake_mt5(offline_mt5):
+    """A fake broker with BROKER_SYMBOLS in place of the offline fake"""
+    fake = install(FakeMetaTrader5(symbols=BROKER_SYMBOLS))
+    fake.initialize()
+    return fake
+
+
+def test_resolution_priority(fake_mt5):
+    directory = SymbolDirectory(lambda: fake_mt5)
+    
+    assert normalize_symbol('eur/usd.m') == 'EURUSDM'
+    assert directory.resolve('EURUSD') == 'eurusd'          # exact, case-insensitive
+    assert directory.resolve('GBPUSD') == 'GBPUSD.m'        # prefix, first in broker order
+    assert directory.resolve('USD/JPY') == 'USDJPY#'
+    assert directory.resolve('US30') == 'mini.US30'         # contains
+    assert directory.resolve('AUDUSD') is None
+    # One symbols_get for every lookup
+    assert fake_mt5.calls['symbols_get'] == 1
+    assert directory.get_statistics()['symbols'] == len(BROKER_SYMBOLS)
+
+
+def test_steady_state_fetch_is_one_mt5_call(fake_mt5, tmp_path):
+    fetcher = MT5DataFetcher(bar_store=BarStore(tmp_path, persist=False))
+    fetcher.get_ohlcv('XAUUSD', 'H1', count=100)
+    assert fetcher.bar_store.get('XAUUSD.pro', 'H1') is not None
+    
+    fake_mt5.calls.clear()
+    for _ in range(3):
+        df = fetcher.get_ohlcv('XAUUSD', 'H1', count=100)
+    
+    assert len(df) == 100
+    assert dict(fake_mt5.calls) == {'copy_rates_from_pos': 3}
+
+
+def test_ttl_and_reconnect_invalidate(fake_mt5):
+    directory = SymbolDirectory(lambda: fake_mt5, ttl=60)
+    now = [1000.0]
+    directory._clock = lambda: now[0]
+    
+    directory.resolve('XAUUSD')
+    directory.symbol_info('XAUUSD.pro')
+    assert directory.is_resolved('XAUUSD')
+    
+    now[0] += 61
+    assert not directory.is_resolved('XAUUSD')
+    directory.resolve('XAUUSD')
+    assert fake_mt5.calls['symbols_get'] == 2
+    
+    connection.mark_connected()
+    assert not directory.is_resolved('XAUUSD')
+    directory.symbol_info('XAUUSD.pro')
+    assert fake_mt5.calls['symbol_info'] == 2
+    assert directory.get_statistics()['resolved'] == 0
+
+
+def test_failed_resolution_is_retried(offline_mt5, tmp_path):
+    offline_mt5.initialize()
+    fetcher = MT5DataFetcher(bar_store=BarStore(tmp_path, persist=False))
+    
+    # The terminal is still loading its symbols on the first request
+    offline_mt5.inject_error('symbols_get', times=1)
+    assert fetcher.get_ohlcv('EURUSD', 'H1', count=50) is None
+    df = fetcher.get_ohlcv('EURUSD', 'H1', count=50)
+    
+    assert df is not None and len(df) == 50
+    assert fetcher.symbols.resolve('EURUSD') == 'EURUSD.pro'
+    assert fetcher.symbols.resolve('NOSUCH') is None
+    assert not fetcher.symbols.is_resolved('NOSUCH')
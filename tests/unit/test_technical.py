@@ -0,0 +1,230 @@
+"""
+Tests for technical indicators
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('talib')
+
+from conftest import make_ohlcv  # noqa: E402
+from src.indicators.calculator import IndicatorCalculator  # noqa: E402
+from src.indicators.technical import TechnicalIndicators, IndicatorContext, make_panel  # noqa: E402
+from src.ml.feature_engineering import FeatureEngineer  # noqa: E402
+
+
+def _assert_same(result, expected):
+    if isinstance(expected, dict):
+        assert result.keys() == expected.keys()
+        for key in expected:
+            _assert_same(result[key], expected[key])
+    elif isinstance(expected, pd.Series):
+        pd.testing.assert_series_equal(result, expected)
+    else:
+        assert result == expected
+
+
+def test_calculate_all_indicators_reuses_signal_inputs(ohlcv):
+    indicators = TechnicalIndicators()
+    result = indicators.calculate_all_indicators(ohlcv)
+    stats = indicators.last_context_stats
+    
+    # 12 indicators are computed once; the four signals only read them
+    assert stats['computed'] == 12
+    assert stats['reused'] == 12
+    
+    # Same values as computing every indicator and signal on its own
+    plain = TechnicalIndicators()
+    _assert_same(result['rsi'], plain.calculate_rsi(ohlcv))
+    _assert_same(result['macd'], plain.calculate_macd(ohlcv))
+    for name in ('trend_signal', 'momentum_signal', 'volatility_signal', 'volume_signal'):
+        _assert_same(result[name], getattr(plain, f'get_{name}')(ohlcv))
+
+
+def test_context_keys_on_resolved_params(ohlcv):
+    indicators = TechnicalIndicators()
+    with indicators.context(ohlcv) as context:
+        indicators.calculate_rsi(ohlcv)
+        indicators.calculate_rsi(ohlcv, indicators.config.RSI_PERIOD)
+        indicators.calculate_rsi(ohlcv, 7)
+        indicators.calculate_keltner_channels(ohlcv)
+        indicators.calculate_ema(ohlcv, 20)
+    
+    assert context.get_stats()['computed'] == 4
+    assert context.get_stats()['reused'] == 2
+    assert indicators.last_context_stats == context.get_stats()
+    
+    # Nothing is memoized outside a context
+    assert indicators.calculate_rsi(ohlcv) is not indicators.calculate_rsi(ohlcv)
+
+
+def test_context_covers_copies_with_the_same_bars(ohlcv):
+    context = IndicatorContext(ohlcv)
+    changed = ohlcv.copy()
+    changed.iloc[-1, changed.columns.get_loc('Close')] += 0.001
+    
+    assert context.covers(ohlcv.copy())
+    assert not context.covers(changed)
+    assert not context.covers(ohlcv.iloc[:-1])
+
+
+def test_feature_engineering_reuses_sentiment_context(ohlcv):
+    indicators = TechnicalIndicators()
+    with indicators.context(ohlcv) as context:
+        for name in ('get_trend_signal', 'get_momentum_signal', 'get_volatility_signal', 'get_volume_signal'):
+            getattr(indicators, name)(ohlcv)
+    computed = context.computed
+    
+    engineer = FeatureEngineer()
+    shared = engineer._add_indicator_features(ohlcv.copy(), context)
+    fresh = engineer._add_indicator_features(ohlcv.copy())
+    
+    # Everything but the 200 SMA comes from the sentiment pass (ema_20 and
+    # ema_50 are the configured fast/slow EMAs)
+    assert context.reused == 9
+    assert context.computed == computed + 1
+    pd.testing.assert_frame_equal(shared, fresh)
+
+
+def _overlap_profile(df, edges):
+    """Reference profile: each bar's volume split by its overlap with every bin"""
+    volumes = np.zeros(len(edges) - 1)
+    for low, high, volume in zip(df['Low'], df['High'], df['Volume']):
+        if high == low:
+            volumes[min(np.searchsorted(edges, low, side='right') - 1, len(volumes) - 1)] += volume
+            continue
+        overlap = np.minimum(edges[1:], high) - np.maximum(edges[:-1], low)
+        volumes += volume * np.clip(overlap, 0, None) / (high - low)
+    return volumes
+
+
+def test_volume_profile_spreads_volume_by_overlap(ohlcv):
+    profile = TechnicalIndicators().calculate_volume_profile(ohlcv, bins=30)
+    edges, volumes = profile['bin_edges'], profile['volumes']
+    
+    assert edges.shape == (31,) and volumes.shape == (30,)
+    assert edges[0] == ohlcv['Low'].min() and edges[-1] == ohlcv['High'].max()
+    np.testing.assert_allclose(volumes, _overlap_profile(ohlcv, edges), rtol=1e-9, atol=1e-6)
+    assert profile['total_volume'] == pytest.approx(ohlcv['Volume'].sum())
+    
+    poc = volumes.argmax()
+    assert profile['poc'] == pytest.approx((edges[poc] + edges[poc + 1]) / 2)
+    assert profile['value_area_low'] <= profile['poc'] <= profile['value_area_high']
+    inside = (edges[:-1] >= profile['value_area_low']) & (edges[1:] <= profile['value_area_high'])
+    assert volumes[inside].sum() >= 0.70 * volumes.sum()
+
+
+def test_volume_profile_value_area_grows_towards_heavier_side():
+    index = pd.date_range('2024-01-01', periods=3, freq='h')
+    df = pd.DataFrame({
+        'Open': [1.0, 3.0, 0.0], 'Close': [1.0, 3.0, 0.0],
+        'Low': [1.0, 2.0, 0.0], 'High': [3.0, 4.0, 1.0],
+        'Volume': [200.0, 60.0, 40.0],
+    }, index=index)
+    profile = TechnicalIndicators().calculate_volume_profile(df, bins=4, value_area=0.7)
+    
+    np.testing.assert_allclose(profile['bin_edges'], [0, 1, 2, 3, 4])
+    np.testing.assert_allclose(profile['volumes'], [40, 100, 130, 30])
+    assert profile['poc'] == 2.5
+    # 130 plus the heavier neighbour (100) reaches 70% of 300
+    assert (profile['value_area_low'], profile['value_area_high']) == (1.0, 3.0)
+
+
+def test_volume_profile_sessions_match_per_session_profiles(ohlcv):
+    indicators = TechnicalIndicators()
+    sessions = indicators.calculate_volume_profile(ohlcv, bins=12, session='D')
+    days = ohlcv.groupby(ohlcv.index.floor('D'))
+    
+    assert list(sessions['sessions']) == list(days.groups)
+    assert sessions['volumes'].shape == (len(days), 12)
+    for row, (_, day) in enumerate(days):
+        single = indicators.calculate_volume_profile(day, bins=12)
+        np.testing.assert_allclose(sessions['bin_edges'][row], single['bin_edges'])
+        np.testing.assert_allclose(sessions['volumes'][row], single['volumes'], atol=1e-6)
+        for key in ('poc', 'value_area_high', 'value_area_low', 'total_volume'):
+            assert sessions[key][row] == pytest.approx(single[key])
+    
+    # Labels per bar give the same result
+    labels = indicators.calculate_volume_profile(ohlcv, bins=12, session=ohlcv.index.date)
+    np.testing.assert_allclose(labels['volumes'], sessions['volumes'])
+
+
+def _watchlist():
+    # Different lengths, so the panel has leading NaN rows for the short ones
+    return {f"SYM{i}": make_ohlcv(600 - 100 * (i % 3), seed=i) for i in range(7)}
+
+
+def _assert_same_signal(result, expected):
+    assert (result['signal'], result['confidence']) == (expected['signal'], expected['confidence'])
+    assert len(result['indicators']) == len(expected['indicators'])
+    for res, exp in zip(result['indicators'], expected['indicators']):
+        assert res.keys() == exp.keys()
+        assert {k: v for k, v in res.items() if k != 'value'} == {k: v for k, v in exp.items() if k != 'value'}
+        if 'value' in exp:
+            assert res['value'] == pytest.approx(exp['value'], rel=1e-12)
+
+
+def test_panel_signals_match_per_frame_signals():
+    frames = _watchlist()
+    indicators = TechnicalIndicators()
+    signals = indicators.get_panel_signals(make_panel(frames))
+    
+    assert list(signals) == list(frames)
+    for symbol, df in frames.items():
+        _assert_same_signal(signals[symbol]['trend_signal'], indicators.get_trend_signal(df))
+        _assert_same_signal(signals[symbol]['momentum_signal'], indicators.get_momentum_signal(df))
+    
+    # Through the calculator, and with plain arrays
+    assert IndicatorCalculator().calculate_panel_signals(frames).keys() == frames.keys()
+    arrays = {field: values.to_numpy() for field, values in make_panel(frames).items()}
+    array_signals = indicators.get_panel_signals(arrays, symbols=list(frames))
+    assert [s['trend_signal']['signal'] for s in array_signals.values()] == \
+        [s['trend_signal']['signal'] for s in signals.values()]
+
+
+def test_panel_indicators_match_per_frame_indicators():
+    frames = _watchlist()
+    indicators = TechnicalIndicators(backend='numpy')
+    panel = indicators.calculate_panel(make_panel(frames))
+    
+    assert isinstance(panel['rsi'], pd.DataFrame) and list(panel['rsi'].columns) == list(frames)
+    for symbol, df in frames.items():
+        start = len(panel['rsi']) - len(df)
+        assert panel['rsi'][symbol].iloc[:start].isna().all()
+        expected = {
+            'ema_fast': indicators.calculate_ema(df, indicators.config.EMA_FAST),
+            'rsi': indicators.calculate_rsi(df),
+            'cci': indicators.calculate_cci(df),
+            'macd': indicators.calculate_macd(df)['histogram'],
+            'adx': indicators.calculate_adx(df)['adx'],
+            'stochastic': indicators.calculate_stochastic(df)['d'],
+        }
+        for name, values in expected.items():
+            result = panel[name]
+            if isinstance(result, dict):
+                result = result[{'macd': 'histogram', 'adx': 'adx', 'stochastic': 'd'}[name]]
+            np.testing.assert_allclose(result[symbol].iloc[start:].to_numpy(), values.to_numpy(),
+                                       rtol=1e-12, atol=1e-12, equal_nan=True)
+
+
+@pytest.mark.parametrize('backend', ['talib', 'numpy'])
+def test_sweeps_match_single_period_indicators(ohlcv, backend):
+    indicators = TechnicalIndicators(backend=backend)
+    with indicators.context(ohlcv) as context:
+        ema = indicators.calculate_ema_sweep(ohlcv, range(5, 40))
+        rsi = indicators.calculate_rsi_sweep(ohlcv)
+        atr = indicators.calculate_atr_sweep(ohlcv, [7, 14, 21])
+        sma = indicators.calculate_sma_sweep(ohlcv, [10, 200], column='Open')
+        indicators.calculate_ema_sweep(ohlcv, range(5, 40))
+    assert context.get_stats()['reused'] == 1
+    
+    assert list(rsi.columns) == list(indicators.config.SWEEP_OSCILLATOR_PERIODS)
+    assert ema.shape == (len(ohlcv), 35) and ema.index.equals(ohlcv.index)
+    expected = [
+        (ema[20], indicators.calculate_ema(ohlcv, 20)),
+        (rsi[14], indicators.calculate_rsi(ohlcv, 14)),
+        (atr[21], indicators.calculate_atr(ohlcv, 21)),
+        (sma[200], indicators.calculate_sma(ohlcv, 200, column='Open')),
+    ]
+    for result, single in expected:
+        np.testing.assert_allclose(result.to_numpy(), single.to_numpy(), rtol=1e-10, atol=1e-10, equal_nan=True)
@@ -0,0 +1,121 @@
+"""
+Tests for the streaming technical indicators
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('talib')
+
+from conftest import make_ohlcv  # noqa: E402
+from src.indicators.technical import TechnicalIndicators  # noqa: E402
+from src.indicators.technical_stream import BollingerState, EMAState, RSIState, StochasticState, TechnicalStream  # noqa: E402
+
+
+def _history(stream, df):
+    """Indicator values after every bar, as flat columns"""
+    rows = []
+    for row in df.itertuples(name=None):
+        values = stream.update(*row)
+        flat = {}
+        for name, value in values.items():
+            if isinstance(value, dict):
+                flat.update({f"{name}.{key}": v for key, v in value.items()})
+            else:
+                flat[name] = value
+        rows.append(flat)
+    return pd.DataFrame(rows, index=df.index)
+
+
+def _batch(df):
+    indicators = TechnicalIndicators()
+    result = indicators.calculate_all_indicators(df)
+    result['sma'] = indicators.calculate_sma(df, indicators.config.SMA_PERIOD)
+    columns = {}
+    for name in TechnicalStream().states:
+        value = result[name]
+        if isinstance(value, dict):
+            columns.update({f"{name}.{key}": v for key, v in value.items()})
+        else:
+            columns[name] = value
+    return pd.DataFrame(columns, index=df.index).astype(float)
+
+
+@pytest.mark.parametrize('seed,flat', [(3, False), (42, False), (4, True)])
+def test_stream_matches_talib(seed, flat):
+    df = make_ohlcv(600, seed=seed)
+    if flat:
+        # Zero ranges and unchanged closes hit the zero-denominator cases
+        df.iloc[100:130, :4] = 1.08
+    streamed = _history(TechnicalIndicators().create_stream(), df)
+    expected = _batch(df)
+    
+    for column in expected:
+        np.testing.assert_allclose(streamed[column], expected[column], rtol=1e-9, atol=1e-9,
+                                   equal_nan=True, err_msg=column)
+        # Same warm-up as TA-Lib
+        assert streamed[column].isna().sum() == expected[column].isna().sum(), column
+
+
+def test_bollinger_does_not_drift_over_a_long_stream():
+    # Large price levels magnify rounding in running sum-of-squares updates
+    rng = np.random.default_rng(1)
+    close = 30000 + np.cumsum(rng.normal(0, 5, 150_000))
+    df = pd.DataFrame({'Close': close}, index=pd.date_range('2020-01-01', periods=len(close), freq='min'))
+    state = BollingerState(20, 2.0)
+    streamed = pd.DataFrame([state.update(value) for value in close], index=df.index)
+    expected = TechnicalIndicators().calculate_bollinger_bands(df, 20, 2.0)
+    
+    for band in ('upper', 'middle', 'lower'):
+        np.testing.assert_allclose(streamed[band], expected[band], rtol=0, atol=1e-8, equal_nan=True, err_msg=band)
+
+
+def test_forming_bar_revisions_match_closed_bars():
+    df = make_ohlcv(300, seed=8)
+    rng = np.random.default_rng(0)
+    stream = TechnicalStream()
+    for row in df.itertuples(name=None):
+        timestamp, open_, high, low, close, volume = row
+        # Two provisional versions of each bar before its final values
+        for _ in range(2):
+            ticked = close + rng.normal(0, 0.0005)
+            stream.update(timestamp, open_, max(high, ticked), min(low, ticked), ticked, volume * rng.random())
+        stream.update(*row)
+    
+    reference = TechnicalStream()
+    reference.seed(df)
+    assert stream.bar_count == reference.bar_count == len(df)
+    for name, state in stream.states.items():
+        assert repr(state.value) == repr(reference.states[name].value), name
+
+
+def test_sync_resumes_from_the_latest_bar():
+    df = make_ohlcv(400, seed=5)
+    stream = TechnicalStream()
+    stream.seed(df.iloc[:300])
+    
+    # The next fetch revises bar 299 and adds the rest
+    latest = stream.sync(df.iloc[100:])
+    reference = TechnicalStream().seed(df)
+    assert stream.bar_count == len(df)
+    assert repr(latest) == repr(reference)
+    
+    with pytest.raises(ValueError):
+        stream.update(df.index[0], 1.0, 1.0, 1.0, 1.0)
+
+
+def test_states_are_usable_standalone(ohlcv):
+    closes = ohlcv['Close'].tolist()
+    ema = EMAState(10).seed(closes)
+    rsi = RSIState(14).seed(closes[:-1])
+    rsi.update(closes[-1] + 0.01)
+    
+    indicators = TechnicalIndicators()
+    assert ema.value == pytest.approx(indicators.calculate_ema(ohlcv, 10).iloc[-1], rel=1e-12)
+    assert rsi.revise(closes[-1]) == pytest.approx(indicators.calculate_rsi(ohlcv).iloc[-1], rel=1e-9)
+    
+    stochastic = StochasticState()
+    with pytest.raises(ValueError):
+        stochastic.revise(1.0, 1.0, 1.0)
+    bars = list(zip(ohlcv['High'], ohlcv['Low'], ohlcv['Close']))
+    assert stochastic.seed(bars).value['k'] == pytest.approx(indicators.calculate_stochastic(ohlcv)['k'].iloc[-1])
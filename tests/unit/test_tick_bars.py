@@ -0,0 +1,87 @@
+"""
+Tests for tick-built bars
+"""
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.mt5.bar_store import BarStore
+from src.mt5.data_fetcher import MT5DataFetcher
+from src.mt5.fake_mt5 import FakeMetaTrader5
+from src.mt5.tick_bars import TickBarAggregator, parse_bar_spec
+
+NOW = 1_718_000_000.5
+POINT = 1e-5
+
+
+@pytest.fixture(scope='module')
+def ticks() -> np.ndarray:
+    fake = FakeMetaTrader5(clock=lambda: NOW)
+    fake.initialize()
+    return fake.copy_ticks_range('EURUSD', NOW - 7200, NOW, fake.COPY_TICKS_ALL)
+
+
+def _aggregate(ticks, spec, chunks=1) -> pd.DataFrame:
+    aggregator = TickBarAggregator(spec, point=POINT)
+    frames = [aggregator.update(chunk) for chunk in np.array_split(ticks, chunks)]
+    return pd.concat(frames + [aggregator.flush()])
+
+
+@pytest.mark.parametrize('spec', ['10s', '2m', '100t', '5r'])
+def test_chunking_does_not_change_the_bars(ticks, spec):
+    whole = _aggregate(ticks, spec)
+    chunked = _aggregate(ticks, spec, chunks=37)
+    
+    pd.testing.assert_frame_equal(chunked, whole)
+    assert whole['Volume'].sum() == len(ticks)
+    assert whole['RealVolume'].sum() == pytest.approx(ticks['volume_real'].sum())
+
+
+def test_bar_kinds(ticks):
+    time_bars = _aggregate(ticks, '10s', chunks=5)
+    expected = pd.Series(ticks['bid'], index=pd.to_datetime(ticks['time_msc'], unit='ms')).resample('10s').ohlc().dropna()
+    np.testing.assert_array_equal(time_bars[['Open', 'High', 'Low', 'Close']].to_numpy(), expected.to_numpy())
+    spreads = (ticks['ask'] - ticks['bid']) / POINT
+    assert time_bars['Spread'].iloc[0] == pytest.approx(spreads[ticks['time_msc'] < (ticks['time_msc'][0] // 10_000 + 1) * 10_000].mean())
+    
+    tick_bars = _aggregate(ticks, '100t', chunks=5)
+    assert (tick_bars['Volume'].iloc[:-1] == 100).all()
+    
+    range_bars = _aggregate(ticks, '5r', chunks=5)
+    assert ((range_bars['High'] - range_bars['Low']).iloc[:-1] >= 5 * POINT - 1e-12).all()
+    assert (range_bars['High'] - range_bars['Low']).iloc[-1] < 5 * POINT
+
+
+def test_parse_bar_spec():
+    assert parse_bar_spec('10s') == ('time', 10_000)
+    assert parse_bar_spec('2M') == ('time', 120_000)
+    assert parse_bar_spec('500t') == ('tick', 500)
+    assert parse_bar_spec('20r') == ('range', 20.0)
+    for spec in ('1.5t', '0s', '10x', ''):
+        with pytest.raises(ValueError):
+            parse_bar_spec(spec)
+
+
+def test_fetcher_pages_ticks_with_flat_memory(offline_mt5, tmp_path):
+    offline_mt5.clock = lambda: NOW
+    offline_mt5.initialize()
+    fetcher = MT5DataFetcher(bar_store=BarStore(tmp_path, persist=False))
+    fetcher._clock = lambda: NOW
+    start = datetime(2024, 6, 8)
+    
+    tracemalloc.start()
+    try:
+        bars = fetcher.get_tick_bars('EURUSD', start, bar='1m', chunk_seconds=1800, include_forming=True)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    
+    ticks = offline_mt5.copy_ticks_range('EURUSD.pro', start, NOW, offline_mt5.COPY_TICKS_ALL)
+    pd.testing.assert_frame_equal(bars, _aggregate(ticks, '1m'), check_exact=False)
+    pages = int(np.ceil((NOW - pd.Timestamp(start).timestamp()) / 1800))
+    assert offline_mt5.calls['copy_ticks_range'] == pages + 1
+    # Pages of half an hour, not the 24MB of ticks in the range
+    assert peak < 0.25 * ticks.nbytes